@@ -54,6 +54,8 @@ from PlasmaKITypes import *
 from PlasmaGame import *
 from PlasmaGameConstants import *
 import xRandom
+import math
+import time
 
 
 # define the attributes that will be entered in max
@@ -69,6 +71,17 @@ quabKeyList = []
 quabBrainList = []
 quabVarList = {}
 
+# AI scheduler: brain state is kept in lists running parallel to quabBrainList
+quabNextThink = []          # game time at which each brain is due to think again
+kQuabRunThinkInterval = 3.0 # seconds between goal updates for a running quab
+kQuabIdleThinkInterval = 0.0 # idle quabs listen for players every time their turn comes around
+kQuabsPerFrame = 4          # most brains that get to think in one frame
+kQuabFrameBudget = 0.002    # seconds of AI work allowed per frame
+kQuabFleeDistance = 40
+
+# per-frame AI cost instrumentation
+quabAIStats = {'frames' : 0, 'thinks' : 0, 'lastFrameCost' : 0.0, 'maxFrameCost' : 0.0, 'totalCost' : 0.0}
+
 cheater = 0
 
 #====================================
@@ -88,6 +101,7 @@ class ahnyQuabs(ptModifier):
         self.quabIsRunning = []
         self.gameId = 0
         self.joinedToGame = 0
+        self.thinkCursor = 0
 
     ###########################
     def __del__(self):
@@ -276,60 +290,79 @@ class ahnyQuabs(ptModifier):
         if game == None:
             return # no game connection established
 
-        for brain in quabBrainList:
-            if brain == None:
-                continue
-
-            isRunning = brain.runningBehavior(brain.runBehaviorName())
-            isIdling = brain.runningBehavior(brain.idleBehaviorName())
-
-            ## Every three seconds, update goal if we're running
-            if PtGetDniTime() % 3 != 0 and isRunning:
-                continue
-
-            ## Can we hear anyone?
-            playersWeHear = brain.playersICanHear()
-            total = ptVector3(0,0,0)
-            varName = quabVarList[quabBrainList.index(brain)+1]
-            if len(playersWeHear) != 0:
-                for avatar in playersWeHear:
-                    ## Get the normalized vector to each player we hear
-                    vector = brain.vectorToPlayer(avatar)
-                    vector.normalize()
-                    total = total.add(vector)
-
-                ## Scale it up so it's not a foot away
-                escVector = ptVector3(total.getX(),total.getY(),total.getZ())
-                escVector = escVector.scale(40)
-
-                index = quabBrainList.index(brain)
-                loc = quabKeyList[index].getSceneObject().position()
-
-                ## Find the final position
-                target = ptPoint3((escVector.getX() + loc.getX()), (escVector.getY() + loc.getY()) , (escVector.getZ() + loc.getZ()))
-
-                ## Visual representation of goal
-                #PtFindSceneobject("Box01", "Ahnonay").physics.warp(target)
-
-                ## Variable Outputs
-                #print "Total Vector: %f / %f / %f" % (total.getX(), total.getY(), total.getZ())
-                #print "Escape Vector: %f / %f / %f" % (escVector.getX(), escVector.getY(), escVector.getZ())
-                #print "Loc: %f / %f / %f" % (loc.getX(), loc.getY(), loc.getZ())
-                #print "Target: %f / %f / %f" % (target.getX(), target.getY(), target.getZ())
-                #print "Player: %f / %f / %f" % (PtGetLocalAvatar().position().getX(), PtGetLocalAvatar().position().getY(), PtGetLocalAvatar().position().getZ())
-
-                ## Avoid avatars
-                brain.goToGoal(target, 0)
-
-                ## Set 'running' var if we need to
-                if isIdling:
-                    game.setNumericVar(varName, 1)
+        numBrains = len(quabBrainList)
+        if numBrains == 0:
+            return
+        while len(quabNextThink) < numBrains:
+            quabNextThink.append(0.0)
+
+        ## Give a bounded slice of the herd a turn, picking up where the last frame left off
+        startCost = time.clock()
+        thinks = 0
+        looked = 0
+        idx = self.thinkCursor % numBrains
+        while looked < numBrains and thinks < kQuabsPerFrame:
+            looked += 1
+            brain = quabBrainList[idx]
+            if brain != None and seconds >= quabNextThink[idx]:
+                self.IThink(game, idx, brain, seconds)
+                thinks += 1
+            idx = (idx + 1) % numBrains
+            if time.clock() - startCost > kQuabFrameBudget:
+                break
+        self.thinkCursor = idx
+
+        cost = time.clock() - startCost
+        quabAIStats['frames'] += 1
+        quabAIStats['thinks'] += thinks
+        quabAIStats['lastFrameCost'] = cost
+        quabAIStats['totalCost'] += cost
+        if cost > quabAIStats['maxFrameCost']:
+            quabAIStats['maxFrameCost'] = cost
 
-            else:
-                if isRunning:
-                    ## Stop running
-                    brain.startBehavior(brain.idleBehaviorName())
+    ###########################
+    def IThink(self, game, idx, brain, seconds):
+        isRunning = brain.runningBehavior(brain.runBehaviorName())
+        isIdling = brain.runningBehavior(brain.idleBehaviorName())
+
+        ## Can we hear anyone?
+        playersWeHear = brain.playersICanHear()
+        varName = quabVarList.get(idx+1)
+        if len(playersWeHear) != 0 and idx < len(quabKeyList):
+            ## Sum the normalized vectors to each player we hear
+            x = 0.0
+            y = 0.0
+            z = 0.0
+            for avatar in playersWeHear:
+                vector = brain.vectorToPlayer(avatar)
+                vx = vector.getX()
+                vy = vector.getY()
+                vz = vector.getZ()
+                length = math.sqrt(vx*vx + vy*vy + vz*vz)
+                if length > 0.0:
+                    x += vx / length
+                    y += vy / length
+                    z += vz / length
+
+            ## Scale it up so it's not a foot away, and find the final position
+            loc = quabKeyList[idx].getSceneObject().position()
+            target = ptPoint3(x * kQuabFleeDistance + loc.getX(), y * kQuabFleeDistance + loc.getY(), z * kQuabFleeDistance + loc.getZ())
+
+            ## Avoid avatars
+            brain.goToGoal(target, 0)
+
+            ## Set 'running' var if we need to
+            if isIdling and varName != None:
+                game.setNumericVar(varName, 1)
+            quabNextThink[idx] = seconds + kQuabRunThinkInterval
+
+        else:
+            if isRunning:
+                ## Stop running
+                brain.startBehavior(brain.idleBehaviorName())
+                if varName != None:
                     game.setNumericVar(varName, 0)
+            quabNextThink[idx] = seconds + kQuabIdleThinkInterval
 
     ###########################
     def OnAIMsg(self, brain, msgType, userStr, args):
@@ -481,5 +514,13 @@ class ahnyQuabs(ptModifier):
             elif param == "reset":
                 cheater = 0
 
+            elif param == "stats":
+                frames = quabAIStats['frames']
+                if frames:
+                    average = quabAIStats['totalCost'] / frames
+                else:
+                    average = 0.0
+                print "ahnyQuabs: %d frames, %d brain updates, AI cost per frame: last %.3f ms, average %.3f ms, max %.3f ms" % (frames, quabAIStats['thinks'], quabAIStats['lastFrameCost'] * 1000.0, average * 1000.0, quabAIStats['maxFrameCost'] * 1000.0)
+
 
 
@@ -47,6 +47,8 @@ from PlasmaTypes import *
 # for save/load
 import cPickle
 
+import grsnWallState
+
 ## COMMENTED OUT by Jeff due to the re-write in the garrison wall
 
 ##############################################################
@@ -61,8 +63,8 @@ southBlocker = ptAttribSceneobjectList(4,"South Wall Blockers",byObject=1)
 ##############################################################
 
 ## keep track of what to draw
-NorthBlockers = [-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1]
-SouthBlockers = [-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1]
+NorthBlockers = grsnWallState.WallBlockers()
+SouthBlockers = grsnWallState.WallBlockers()
 
 ReceiveInit = false
 """
@@ -75,6 +77,9 @@ kTeamLightsOn = 0
 kTeamLightsOff = 1
 kTeamLightsBlink = 2
 
+NorthDecals = grsnWallState.WallLights(northWall,kTeamLightsOn,kTeamLightsOff)
+SouthDecals = grsnWallState.WallLights(southWall,kTeamLightsOn,kTeamLightsOff)
+
 ## game states
 
 kWaiting    = 0
@@ -151,17 +156,8 @@ class grsnMainWallPython(ptResponder):
                 NorthState == ptClimbingWallMsgState.kNorthQuit or \
                 SouthState == ptClimbingWallMsgState.kSouthQuit):
                     #display wall settings
-                i = 0
-                while (i < 20):
-                    value = SouthBlockers[i] 
-                    if (value > -1):
-                        southWall.value[value].runAttachedResponder(kTeamLightsOn)
-                        print"drawing s wall index",value
-                    value = NorthBlockers[i] 
-                    if (value >  -1):
-                        northWall.value[value].runAttachedResponder(kTeamLightsOn)
-                        print"drawing n wall index",value
-                    i = i + 1
+                SouthDecals.Show(SouthBlockers)
+                NorthDecals.Show(NorthBlockers)
         
         if (type == ptClimbingWallMsgType.kTotalGameState):
             SouthState = state
@@ -190,33 +186,16 @@ class grsnMainWallPython(ptResponder):
                 state == ptClimbingWallMsgState.kNorthQuit or \
                 state == ptClimbingWallMsgState.kSouthQuit):
                     #display wall settings
-                i = 0
-                while (i < 20):
-                    value = SouthBlockers[i] 
-                    if (value > -1):
-                        southWall.value[value].runAttachedResponder(kTeamLightsOn)
-                        print"drawing s wall index",value
-                    value = NorthBlockers[i] 
-                    if (value >  -1):
-                        northWall.value[value].runAttachedResponder(kTeamLightsOn)
-                        print"drawing n wall index",value
-                    i = i + 1
+                SouthDecals.Show(SouthBlockers)
+                NorthDecals.Show(NorthBlockers)
             elif (state == ptClimbingWallMsgState.kSouthSelect):
                 #clear wall settings
-                i = 0
-                while (i < 171):
-                    southWall.value[i].runAttachedResponder(kTeamLightsOff)
-                    if (i < 20):
-                        SouthBlockers[i] = -1
-                    i = i + 1
+                SouthBlockers.Clear()
+                SouthDecals.Show(SouthBlockers)
             elif (state == ptClimbingWallMsgState.kNorthSelect):
                 #clear wall settings
-                i = 0
-                while (i < 171):
-                    if (i < 20):
-                        NorthBlockers[i] = -1
-                    northWall.value[i].runAttachedResponder(kTeamLightsOff)
-                    i = i + 1
+                NorthBlockers.Clear()
+                NorthDecals.Show(NorthBlockers)
 
         elif (type == ptClimbingWallMsgType.kAddBlocker):
             self.SetWallIndex(state,true,value)
@@ -226,45 +205,13 @@ class grsnMainWallPython(ptResponder):
             self.SetWallIndex(state,false,value)
     
     def SetWallIndex(self,index,value,north):
-        global SouthBlockers
-        global NorthBlockers
-        
-        i = 0
-        if (value):
-            if (north):
-                while (NorthBlockers[i] >= 0):
-                    i = i + 1
-                    if (i == 20):
-                        print"yikes - somehow overran the array!"
-                        return
-                NorthBlockers[i] = index
-                print"set north wall index ",index," in slot ",i," to true"
-            else:
-                while (SouthBlockers[i] >= 0):
-                    i = i + 1
-                    if (i == 20):
-                        print"yikes - somehow overran the array!"
-                        return
-                SouthBlockers[i] = index
-                print"set south wall index ",index," in slot ",i," to true"
+        if (north):
+            blockers = NorthBlockers
         else:
-            if (north):
-                while (NorthBlockers[i] != index):
-                    i = i + 1
-                    if (i == 20):
-                        print"this should not get hit - looked for non-existent NorthWall entry!"
-                        return
-                NorthBlockers[i] = -1
-                print"removed index ",index," from list slot ",i
-            else:
-                while (SouthBlockers[i] != index):
-                    i = i + 1
-                    if (i == 20):
-                        print"this should not get hit - looked for non-existent SouthWall entry!"
-                        return
-                SouthBlockers[i] = -1
-                print"removed index ",index," from list slot ",i
-    
-        
+            blockers = SouthBlockers
+        if not blockers.Set(index,value):
+            PtDebugPrint(lambda: "grsnMainWallPython.SetWallIndex():\twall index %d was not changed to %d, north %d" % (index,value,north),level=kDebugDumpLevel)
+            return
+        PtDebugPrint(lambda: "grsnMainWallPython.SetWallIndex():\tset wall index %d to %d, north %d" % (index,value,north),level=kDebugDumpLevel)
 
         """
@@ -47,6 +47,8 @@ from PlasmaTypes import *
 # for save/load
 import cPickle
 
+import grsnWallState
+
 ## COMMENTED OUT by Jeff due to the re-write in the garrison wall
 
 ##############################################################
@@ -62,6 +64,10 @@ ReceiveInit = false
 kTeamLightsOn = 0
 kTeamLightsOff = 1
 
+## what the wall is showing
+NorthWall = grsnWallState.WallBlockers()
+NorthLights = grsnWallState.WallLights(northWall,kTeamLightsOn,kTeamLightsOff)
+
 ## game states
 
 kWaiting    = 0
@@ -120,25 +126,26 @@ class grsnWallImagerDisplayN(ptResponder):
             print "begin receiving total game state"
         
         elif (type == ptClimbingWallMsgType.kAddBlocker and state > 0 and value):
-            northWall.value[state].runAttachedResponder(kTeamLightsOn)
+            NorthWall.Set(state)
+            NorthLights.Show(NorthWall)
     
     def OnClimbingWallEvent(self,type,state,value):
         
         if (type == ptClimbingWallMsgType.kAddBlocker and value == true):            #display wall settings
-            northWall.value[state].runAttachedResponder(kTeamLightsOn)
+            NorthWall.Set(state)
+            NorthLights.Show(NorthWall)
             print"Imager display N drawing n wall index",state
                     
         elif (type == ptClimbingWallMsgType.kRemoveBlocker and value == true):
-            northWall.value[state].runAttachedResponder(kTeamLightsOff)
+            NorthWall.Set(state,0)
+            NorthLights.Show(NorthWall)
             print"Imager display N clearing n wall index",state
         
         elif (type == ptClimbingWallMsgType.kNewState):
             if (state == ptClimbingWallMsgState.kSouthSit or state == ptClimbingWallMsgState.kNorthSit ):
                 #clear wall settings
-                i = 0
-                while (i < 171):
-                    northWall.value[i].runAttachedResponder(kTeamLightsOff)
-                    i = i + 1
+                NorthWall.Clear()
+                NorthLights.Show(NorthWall)
 """
 
 
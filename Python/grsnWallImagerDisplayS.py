@@ -47,6 +47,8 @@ from PlasmaTypes import *
 # for save/load
 import cPickle
 
+import grsnWallState
+
 ## COMMENTED OUT by Jeff due to the re-write in the garrison wall
 
 ##############################################################
@@ -63,6 +65,10 @@ ReceiveInit = false
 kTeamLightsOn = 0
 kTeamLightsOff = 1
 
+## what the wall is showing
+SouthWall = grsnWallState.WallBlockers()
+SouthLights = grsnWallState.WallLights(southWall,kTeamLightsOn,kTeamLightsOff)
+
 ## game states
 
 kWaiting    = 0
@@ -121,23 +127,24 @@ class grsnWallImagerDisplayS(ptResponder):
             print "begin receiving total game state"
         
         elif (type == ptClimbingWallMsgType.kAddBlocker and state > 0 and value == 0):
-            southWall.value[state].runAttachedResponder(kTeamLightsOn)
+            SouthWall.Set(state)
+            SouthLights.Show(SouthWall)
 
     def OnClimbingWallEvent(self,type,state,value):
         
         if (type == ptClimbingWallMsgType.kAddBlocker and value == false):            #display wall settings
-            southWall.value[state].runAttachedResponder(kTeamLightsOn)
+            SouthWall.Set(state)
+            SouthLights.Show(SouthWall)
             print"Imager display S drawing wall index",state
                     
         elif (type == ptClimbingWallMsgType.kRemoveBlocker and value == false):
-            southWall.value[state].runAttachedResponder(kTeamLightsOff)
+            SouthWall.Set(state,0)
+            SouthLights.Show(SouthWall)
             print"Imager display S clearing wall index",state
         
         elif (type == ptClimbingWallMsgType.kNewState):
             if (state == ptClimbingWallMsgState.kSouthSit or state == ptClimbingWallMsgState.kNorthSit ):
                 #clear wall settings
-                i = 0
-                while (i < 171):
-                    southWall.value[i].runAttachedResponder(kTeamLightsOff)
-                    i = i + 1
+                SouthWall.Clear()
+                SouthLights.Show(SouthWall)
 """
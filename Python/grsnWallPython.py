@@ -48,6 +48,8 @@ from PlasmaKITypes import *
 # for save/load
 import cPickle
 
+import grsnWallState
+
 ## COMMENTED OUT by Jeff due to the re-write in the garrison wall
 
 ##############################################################
@@ -178,11 +180,11 @@ kNorthQuit = 13
 SouthState = ptClimbingWallMsgState.kWaiting
 NorthState = ptClimbingWallMsgState.kWaiting
 """
-NorthCount = 0
 BlockerCountLimit = 0
-SouthCount = 0
-NorthWall = [-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1]
-SouthWall = [-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1,-1]
+NorthWall = grsnWallState.WallBlockers()
+SouthWall = grsnWallState.WallBlockers()
+NorthPanelLights = grsnWallState.WallLights(northLights,kTeamLightsOn,kTeamLightsOff)
+SouthPanelLights = grsnWallState.WallLights(southLights,kTeamLightsOn,kTeamLightsOff)
 ReceiveInit = false
 
 class grsnWallPython(ptResponder):
@@ -200,105 +202,31 @@ class grsnWallPython(ptResponder):
         PtDebugPrint("grsnWallPython::Load")        
     
     def LookupIndex(self,index,north):
-        global NorthWall
-        global SouthWall
-        global BlockerCountLimit
-        
-        i = 0
-        print"looking north ",north
         if (north):
-            while (i < BlockerCountLimit):
-                if (NorthWall[i] == index):
-                    print"index found in north list in slot ",i
-                    return true
-                print "north wall [",i,"] = ",NorthWall[i]
-                i = i + 1
-        else:
-            while (i < BlockerCountLimit):
-                if (SouthWall[i] == index):
-                    print"index found in south list in slot ",i
-                    return true
-                print "south wall [",i,"] = ",SouthWall[i]
-                i = i + 1
-        
-        print"index not found"
-        return false
+            return NorthWall.Test(index)
+        return SouthWall.Test(index)
         
     def SetWallIndex(self,index,value,north):
-        global NorthWall
-        global SouthWall
-        global SouthCount
-        global NorthCount
-        
-        i = 0
-        if (value):
-            if (north):
-                while (NorthWall[i] >= 0):
-                    i = i + 1
-                    if (i == 20):
-                        print"yikes - somehow overran the array!"
-                        return
-                NorthWall[i] = index
-                NorthCount = NorthCount + 1
-                print"set north wall index ",index," in slot ",i," to true"
-            else:
-                while (SouthWall[i] >= 0):
-                    i = i + 1
-                    if (i == 20):
-                        print"yikes - somehow overran the array!"
-                        return
-                SouthWall[i] = index
-                SouthCount = SouthCount + 1
-                print"set south wall index ",index," in slot ",i," to true"
+        if (north):
+            wall = NorthWall
         else:
-            if (north):
-                while (NorthWall[i] != index):
-                    i = i + 1
-                    if (i == 20):
-                        print"this should not get hit - looked for non-existent NorthWall entry!"
-                        return
-                NorthWall[i] = -1
-                NorthCount = NorthCount - 1
-                print"removed index ",index," from list slot ",i
-            else:
-                while (SouthWall[i] != index):
-                    i = i + 1
-                    if (i == 20):
-                        print"this should not get hit - looked for non-existent SouthWall entry!"
-                        return
-                SouthWall[i] = -1
-                SouthCount = SouthCount - 1
-                print"removed index ",index," from list slot ",i
+            wall = SouthWall
+        if not wall.Set(index,value):
+            PtDebugPrint(lambda: "grsnWallPython.SetWallIndex():\twall index %d was not changed to %d, north %d" % (index,value,north),level=kDebugDumpLevel)
+            return
+        PtDebugPrint(lambda: "grsnWallPython.SetWallIndex():\tset wall index %d to %d, north %d" % (index,value,north),level=kDebugDumpLevel)
     
     def ClearIndices(self,north):
-        global NorthWall
-        global SouthWall
-        global NorthCount
-        global SouthCount
-        i = 0
-        while (i < 171):
-            if (i < 20):
-                if (north):
-                    NorthWall[i] = -1
-                else:
-                    SouthWall[i] = -1
-        
-            if (north):
-                northLights.value[i].runAttachedResponder(kTeamLightsOff)
-            else:
-                southLights.value[i].runAttachedResponder(kTeamLightsOff)
-            i = i + 1
-        
         if (north):
-            NorthCount = 0
+            NorthWall.Clear()
+            NorthPanelLights.Show(NorthWall)
         else:
-            SouthCount = 0
+            SouthWall.Clear()
+            SouthPanelLights.Show(SouthWall)
 
     def SetSPanelMode(self,state):
         global NorthState
         global SouthState
-        global NorthCount
-        global SouthCount
         global BlockerCountLimit
         global NorthWall
         global SouthWall
@@ -360,8 +288,6 @@ class grsnWallPython(ptResponder):
     def SetNPanelMode(self,state):
         global NorthState
         global SouthState
-        global NorthCount
-        global SouthCount
         global BlockerCountLimit
         global NorthWall
         global SouthWall
@@ -482,18 +408,12 @@ class grsnWallPython(ptResponder):
                 southCountLights.value[i].runAttachedResponder(kRedOn)
                 i = i + 1
             i = 0
-            j = 0
-            while (i < BlockerCountLimit):
-                if (SouthWall[i] > 0):
-                    southCountLights.value[j].runAttachedResponder(kTeamLightsOn)
-                    j = j + 1
+            while (i < SouthWall.Count()):
+                southCountLights.value[i].runAttachedResponder(kTeamLightsOn)
                 i = i + 1
             i = 0
-            j = 0
-            while (i < BlockerCountLimit):
-                if (NorthWall[i] > 0):
-                    northCountLights.value[j].runAttachedResponder(kTeamLightsOn)
-                    j = j + 1
+            while (i < NorthWall.Count()):
+                northCountLights.value[i].runAttachedResponder(kTeamLightsOn)
                 i = i + 1
             
             return
@@ -558,11 +478,10 @@ class grsnWallPython(ptResponder):
                 return
             msg = ptClimbingWallMsg(self.key)
             msg.createGameState(BlockerCountLimit,SouthState,NorthState)
-            i = 0
-            while (i < BlockerCountLimit):
-                msg.addBlocker(NorthWall[i],i,true)
-                msg.addBlocker(SouthWall[i],i,false)
-                i = i + 1
+            for slot, index in enumerate(NorthWall.Serialize()):
+                msg.addBlocker(index,slot,true)
+            for slot, index in enumerate(SouthWall.Serialize()):
+                msg.addBlocker(index,slot,false)
             msg.send()            
     
         
@@ -677,18 +596,17 @@ class grsnWallPython(ptResponder):
         # we clicked or un-clicked on a control panel button corresponding to a wall blocker
         print"found South index ",index
         wallPicked = southWall.value[index]
-        animPicked = southLights.value[index]
         if (self.LookupIndex(index,false)):
             #turn this guy on
             wallPicked.physics.suppress(false)
-            animPicked.runAttachedResponder(kTeamLightsOn)
-            counterPicked = southCountLights.value[SouthCount - 1]
+            SouthPanelLights.Show(SouthWall)
+            counterPicked = southCountLights.value[SouthWall.Count() - 1]
             counterPicked.runAttachedResponder(kTeamLightsOn)
             sPanelSound.run(self.key,avatar=PtGetLocalAvatar(),state='blockerOn')
         else:
             wallPicked.physics.suppress(true)
-            animPicked.runAttachedResponder(kTeamLightsOff)
-            counterPicked = southCountLights.value[SouthCount]
+            SouthPanelLights.Show(SouthWall)
+            counterPicked = southCountLights.value[SouthWall.Count()]
             counterPicked.runAttachedResponder(kTeamLightsOff)
             sPanelSound.run(self.key,avatar=PtGetLocalAvatar(),state='blockerOff')
         return    
@@ -699,18 +617,17 @@ class grsnWallPython(ptResponder):
         # we clicked or un-clicked on a control panel button corresponding to a wall blocker
         print"found North index ",index
         wallPicked = northWall.value[index]
-        animPicked = northLights.value[index]
         if (self.LookupIndex(index,true)):
             #turn this guy on
             wallPicked.physics.suppress(false)
-            animPicked.runAttachedResponder(kTeamLightsOn)
-            counterPicked = northCountLights.value[NorthCount - 1]
+            NorthPanelLights.Show(NorthWall)
+            counterPicked = northCountLights.value[NorthWall.Count() - 1]
             counterPicked.runAttachedResponder(kTeamLightsOn)
             nPanelSound.run(self.key,avatar=PtGetLocalAvatar(),state='blockerOn')
         else:
             wallPicked.physics.suppress(true)
-            animPicked.runAttachedResponder(kTeamLightsOff)
-            counterPicked = northCountLights.value[NorthCount]
+            NorthPanelLights.Show(NorthWall)
+            counterPicked = northCountLights.value[NorthWall.Count()]
             counterPicked.runAttachedResponder(kTeamLightsOff)
             nPanelSound.run(self.key,avatar=PtGetLocalAvatar(),state='blockerOff')
         return
@@ -766,13 +683,13 @@ class grsnWallPython(ptResponder):
             fifteenBtnN.disable()
         
     def ResetSouthPanel(self,enable):
-        global SouthCount
         
         self.EnableSouthButtons(enable)
         ageSDL = PtGetAgeSDL()
         i = 0
-        while i<171:
-            southLights.value[i].runAttachedResponder(kTeamLightsOff)
+        SouthWall.Clear()
+        SouthPanelLights.Show(SouthWall)
+        while i<grsnWallState.kNumPanels:
             if (i < 20):
                 southCountLights.value[i].runAttachedResponder(kTeamLightsOff)
             
@@ -782,19 +699,18 @@ class grsnWallPython(ptResponder):
             i = i + 1
         
         self.ZeroBlockerCount()
-        SouthCount = 0
         #ageSDL.setIndex("southCount",0,0)
         #ageSDL.setIndex("southCountLimit",0,0)
         goBtnSObject.value.runAttachedResponder(kDim)
         
     def ResetNorthPanel(self,enable):
-        global NorthCount
         
         self.EnableNorthButtons(enable)
         ageSDL = PtGetAgeSDL()
         i = 0
-        while i<171:
-            northLights.value[i].runAttachedResponder(kTeamLightsOff)
+        NorthWall.Clear()
+        NorthPanelLights.Show(NorthWall)
+        while i<grsnWallState.kNumPanels:
             if (i < 20):
                 northCountLights.value[i].runAttachedResponder(kTeamLightsOff)
             if (enable):
@@ -806,7 +722,6 @@ class grsnWallPython(ptResponder):
                 #print"disabled north wall ",i
             i = i + 1
         self.ZeroBlockerCount()
-        NorthCount = 0
         #ageSDL.setIndex("northCount",0,0)
         #ageSDL.setIndex("northCountLimit",0,0)
         goBtnNObject.value.runAttachedResponder(kDim)
@@ -827,8 +742,6 @@ class grsnWallPython(ptResponder):
     def OnNotify(self,state,id,events):
         global NorthState
         global SouthState
-        global NorthCount
-        global SouthCount
         global BlockerCountLimit
         global NorthWall
         global SouthWall
@@ -1064,7 +977,7 @@ class grsnWallPython(ptResponder):
                 print"check to see if you've used all your wall blockers"
                 #numSelected = ageSDL["southCount"][0]
                 #maxSelections = ageSDL["southCountLimit"][0]
-                numSelected = SouthCount
+                numSelected = SouthWall.Count()
                 maxSelections = BlockerCountLimit
                 if (numSelected < maxSelections):
                     sPanelSound.run(self.key,avatar=PtGetLocalAvatar(),state='denied')
@@ -1160,7 +1073,7 @@ class grsnWallPython(ptResponder):
                 print"check to see if you've used all your wall blockers"
                 #numSelected = ageSDL["northCount"][0]
                 #maxSelections = ageSDL["northCountLimit"][0]
-                numSelected = NorthCount
+                numSelected = NorthWall.Count()
                 maxSelections = BlockerCountLimit
                 if (numSelected < maxSelections):
                     nPanelSound.run(self.key,avatar=PtGetLocalAvatar(),state='denied')
@@ -1191,7 +1104,7 @@ class grsnWallPython(ptResponder):
                         nPanelSound.run(self.key,avatar=PtGetLocalAvatar(),state='denied')
                         return
                     #numSelected = ageSDL["northCount"][0]
-                    numSelected = NorthCount
+                    numSelected = NorthWall.Count()
                     #ageSDL.setIndex("lastChangedIndexN",0,index)
                     print"numSelected = ",numSelected
                     #maxSelections = ageSDL["northCountLimit"][0]
@@ -1222,7 +1135,7 @@ class grsnWallPython(ptResponder):
                         sPanelSound.run(self.key,avatar=PtGetLocalAvatar(),state='denied')
                         return
                     #numSelected = ageSDL["southCount"][0]
-                    numSelected = SouthCount
+                    numSelected = SouthWall.Count()
                     #ageSDL.setIndex("lastChangedIndexS",0,index)
                     print"numSelected = ",numSelected
                     #maxSelections = ageSDL["southCountLimit"][0]
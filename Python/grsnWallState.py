@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+""" *==LICENSE==*
+
+CyanWorlds.com Engine - MMOG client, server and tools
+Copyright (C) 2011  Cyan Worlds, Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Additional permissions under GNU GPL version 3 section 7
+
+If you modify this Program, or any covered work, by linking or
+combining it with any of RAD Game Tools Bink SDK, Autodesk 3ds Max SDK,
+NVIDIA PhysX SDK, Microsoft DirectX SDK, OpenSSL library, Independent
+JPEG Group JPEG library, Microsoft Windows Media SDK, or Apple QuickTime SDK
+(or a modified version of those libraries),
+containing parts covered by the terms of the Bink SDK EULA, 3ds Max EULA,
+PhysX SDK EULA, DirectX SDK EULA, OpenSSL and SSLeay licenses, IJG
+JPEG Library README, Windows Media SDK EULA, or QuickTime SDK EULA, the
+licensors of this Program grant you additional
+permission to convey the resulting work. Corresponding Source for a
+non-source form of such a combination shall include the source code for
+the parts of OpenSSL and IJG JPEG Library used as well as that of the covered
+work.
+
+You can contact Cyan Worlds, Inc. by email legal@cyan.com
+ or by snail mail at:
+      Cyan Worlds, Inc.
+      14617 N Newport Hwy
+      Mead, WA   99021
+
+ *==LICENSE==* """
+"""
+Module: grsnWallState
+Age: Garrison
+Date: October 2026
+The state of the Gahreesen climbing wall, shared by the control panels, the imager
+displays and the main wall decals.  The blockers each team has picked are held as a
+bitset over the wall's panels, so setting, testing and counting a blocker don't walk a
+list of slots.  The lights that show a wall only get a responder run for the panels
+that changed since they were last drawn.  The blocker list built by Serialize is the
+same one the game messages carry, so whatever the master sends out loads straight back
+in on the other clients.
+"""
+
+from Plasma import *
+from PlasmaTypes import *
+
+# panels on each wall (and lights on each control panel)
+kNumPanels = 171
+# the most blockers a team can ever be given
+kMaxBlockers = 20
+
+# light responder states
+kLightOn = 0
+kLightOff = 1
+
+kAllPanels = (1L << kNumPanels) - 1
+
+
+def IterBits(bits):
+    "yields the index of each set bit, lowest first"
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits = bits ^ low
+
+
+class WallBlockers:
+    "the blockers one team has placed on its wall"
+    def __init__(self):
+        self.bits = 0L
+        self.count = 0
+
+    def Test(self,index):
+        "is there a blocker on this panel?"
+        return (self.bits >> index) & 1
+
+    def Set(self,index,on=1):
+        "place or remove a blocker; returns false if nothing changed"
+        if index < 0 or index >= kNumPanels:
+            PtDebugPrint("grsnWallState: panel index %d is out of range" % (index),level=kErrorLevel)
+            return 0
+        mask = 1L << index
+        if on:
+            if self.bits & mask:
+                return 0
+            if self.count >= kMaxBlockers:
+                PtDebugPrint("grsnWallState: already %d blockers, can't add panel %d" % (self.count,index),level=kErrorLevel)
+                return 0
+            self.bits = self.bits | mask
+            self.count = self.count + 1
+        else:
+            if not self.bits & mask:
+                return 0
+            self.bits = self.bits ^ mask
+            self.count = self.count - 1
+        return 1
+
+    def Count(self):
+        return self.count
+
+    def Clear(self):
+        self.bits = 0L
+        self.count = 0
+
+    def Indices(self):
+        "the panels with a blocker, in order"
+        return list(IterBits(self.bits))
+
+    def Serialize(self):
+        "the blocker list as the game messages carry it"
+        return self.Indices()
+
+    def Load(self,blockers):
+        "replaces the blockers with a list from a game message (see Serialize)"
+        self.Clear()
+        for index in blockers:
+            self.Set(index)
+
+
+class WallLights:
+    "a row of lights (one per panel) showing a team's blockers"
+    def __init__(self,lights,onState=kLightOn,offState=kLightOff):
+        # lights is the ptAttribSceneobjectList, its value isn't filled in until the scene is loaded
+        self.lights = lights
+        self.onState = onState
+        self.offState = offState
+        # every light is off when the wall is loaded, so the first Show only draws the blockers
+        self.shown = 0L
+
+    def Invalidate(self):
+        "forget what is showing, the next Show redraws every light"
+        self.shown = None
+
+    def Show(self,blockers):
+        "runs the light responders for the panels that changed; returns how many ran"
+        bits = blockers.bits
+        if self.shown is None:
+            changed = kAllPanels
+        else:
+            changed = self.shown ^ bits
+        lights = self.lights.value
+        count = 0
+        for index in IterBits(changed):
+            if (bits >> index) & 1:
+                lights[index].runAttachedResponder(self.onState)
+            else:
+                lights[index].runAttachedResponder(self.offState)
+            count = count + 1
+        self.shown = bits
+        return count
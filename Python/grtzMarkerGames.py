@@ -45,8 +45,8 @@ kChronCurCGZGame = "CurCGZGame"
 
 from Plasma import *
 from PlasmaTypes import *
-import string
 import xMarkerGameManager
+import xChronicleStore
 
 def GetCGZGameName(num):
     "returns the name of the game"
@@ -80,17 +80,15 @@ def UpdateScore(gameNum, startTime, bestTime):
         PtDebugPrint("ERROR: grtzMarkerGames.UpdateScore():\tAborting update, invalid game number: %s" %gameNum)
         return
        
-    vault = ptVault()
     gameName = GetCGZGameName(gameNum)    
-    entry = vault.findChronicleEntry(gameName)
     isNewBestTime = 0
     
-    if type(entry) == type(None):
+    if not xChronicleStore.Has(gameName):
         # Here we actually do need to save a startTime value (negative is invalid)
         # But only if we're creating a new variable!
         if startTime < 0:
             startTime = 0.0
-        vault.addChronicleEntry(gameName, 1, "%f,%f" % (startTime, bestTime))
+        xChronicleStore.Set(gameName, [startTime, bestTime])
 
         if bestTime > 0:
             isNewBestTime = 1
@@ -99,53 +97,37 @@ def UpdateScore(gameNum, startTime, bestTime):
         PtDebugPrint("grtzMarkerGames.UpdateScore():\tDEBUG: Game Num: %d, updated for the first time: StartTime = %f  BestTime = %f" %(gameNum,startTime,bestTime))
         return
     else:
-        statString = entry.chronicleGetValue()
-        statList = statString.split(",")
-
-        if len(statList) == 2:
-            try:
-                # If we're not updating startTime, then we'd better get the old one!
-                if startTime < 0:
-                    startTime = string.atof(statList[0])
-                
-                #Only update bestTime if we have a better time
-                oldBestTime = string.atof(statList[1])
-                if bestTime > 0.1:
-                    if bestTime < oldBestTime or oldBestTime < 0.1:
-                        isNewBestTime = 1
-                        PtDebugPrint("grtzMarkerGames.UpdateScore():\tDEBUG: Found new best time, updating...   old best time score: %f" % oldBestTime)
-                    else:
-                        bestTime = oldBestTime
+        statList = xChronicleStore.Get(gameName)
+
+        if statList is not None and len(statList) == 2:
+            # If we're not updating startTime, then we'd better get the old one!
+            if startTime < 0:
+                startTime = statList[0]
+            
+            #Only update bestTime if we have a better time
+            oldBestTime = statList[1]
+            if bestTime > 0.1:
+                if bestTime < oldBestTime or oldBestTime < 0.1:
+                    isNewBestTime = 1
+                    PtDebugPrint("grtzMarkerGames.UpdateScore():\tDEBUG: Found new best time, updating...   old best time score: %f" % oldBestTime)
                 else:
                     bestTime = oldBestTime
-            except:
-                pass
+            else:
+                bestTime = oldBestTime
 
-                PtDebugPrint("grtzMarkerGames.UpdateScore():\tDEBUG: Game Num: %d, updated score: Start Time = %f  BestTime = %f" %(gameNum,startTime,bestTime))
-        entry.chronicleSetValue("%f,%f" %(startTime,bestTime))
-        entry.save()
+            PtDebugPrint("grtzMarkerGames.UpdateScore():\tDEBUG: Game Num: %d, updated score: Start Time = %f  BestTime = %f" %(gameNum,startTime,bestTime))
+        xChronicleStore.Set(gameName, [startTime, bestTime])
 
 def GetGameTime(gameName):
     "returns the currentTime,bestTime"
     # assume no times
     startTime = 0.0
     bestTime = 0.0
-    vault = ptVault()
     
     # is there a chronicle for the GZ games?
-    entry = vault.findChronicleEntry(gameName)
-    if type(entry) != type(None):
-        progressString = entry.chronicleGetValue()
-        progList = progressString.split(',')
-        if len(progList) == 2:
-            try:
-                startTime = string.atof(progList[0])
-            except ValueError:
-                pass
-            try:
-                bestTime = string.atof(progList[1])
-            except ValueError:
-                pass
+    progList = xChronicleStore.Get(gameName)
+    if progList is not None and len(progList) == 2:
+        startTime,bestTime = progList
     return startTime,bestTime
     
 def GetGameProgress():
@@ -156,28 +138,20 @@ def GetGameProgress():
 
 def GetGameScore(gameNum):
     "returns the score for the specified CGZ game number"
-    vault = ptVault()
     gameName = GetCGZGameName(gameNum)
-    entry = vault.findChronicleEntry(gameName)
-    if type(entry) == type(None):
+    if not xChronicleStore.Has(gameName):
         return -1
      
-    statString = entry.chronicleGetValue()
-    statList = statString.split(",")
+    statList = xChronicleStore.Get(gameName)
 
     #Make sure that we've got the correct input
-    if len(statList) != 2:
-        if statString != "":  
+    if statList is None or len(statList) != 2:
+        if statList != []:  
             #If we're here, then we've got corrupted stats, delete existing game stats!
-            entry.chronicle.SetValue("")
-            entry.save()
+            xChronicleStore.Set(gameName, [])
         return -1
         
-    try:
-        bestTime = string.atof(statList[1])
-    except:
-        bestTime = -1
-    return bestTime
+    return statList[1]
 
 
 def GetNumMarkers(gameNum):
@@ -500,3 +474,7 @@ MG14 = [ 1, "GZ guy", 2, 120 ,
 
 
 mgs = [(MG01,'MG01'),(MG02,'MG02'),(MG03,'MG03'),(MG04,'MG04'),(MG05,'MG05'),(MG06,'MG06'),(MG07,'MG07'),(MG08,'MG08'),(MG09,'MG09'),(MG10,'MG10'),(MG11,'MG11'),(MG12,'MG12'),(MG13,'MG13'),(MG14,'MG14'),]
+
+# the scores are kept in the chronicle as "startTime,bestTime"
+for mg in mgs:
+    xChronicleStore.Declare(mg[1], xChronicleStore.kChronFloatList, None)
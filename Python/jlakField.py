@@ -51,6 +51,7 @@ from Plasma import *
 from PlasmaTypes import *
 import xRandom
 import string
+import xKIChatRouter
 
 
 # Shared xKI/jlakField constants
@@ -106,6 +107,10 @@ sdlColumns = [  "jlakColumn00","jlakColumn01","jlakColumn02","jlakColumn03","jla
                 "jlakColumn10","jlakColumn11","jlakColumn12","jlakColumn13","jlakColumn14",\
                 "jlakColumn15","jlakColumn16","jlakColumn17","jlakColumn18","jlakColumn19",\
                 "jlakColumn20","jlakColumn21","jlakColumn22","jlakColumn23","jlakColumn24"]
+# all 25 column positions in one variable: new clients get a bulk move as a single notify
+sdlColumnArray = "jlakColumns"
+# set once the column array has been filled in from the individual column variables
+sdlColumnsSeeded = "jlakColumnsSeeded"
 sdlGUILock = "jlakGUIButtonsLocked"
 byteStartPt = 0
 boolWall = 0
@@ -211,6 +216,19 @@ class jlakField(ptResponder):
             ageSDL.setNotify(self.key,sdl,0.0)
             val = ageSDL[sdl][0]
             byteColumns.append(val)
+        ageSDL.setFlags(sdlColumnArray,1,1)
+        ageSDL.sendToClients(sdlColumnArray)
+        ageSDL.setNotify(self.key,sdlColumnArray,0.0)
+        ageSDL.setFlags(sdlColumnsSeeded,1,1)
+        ageSDL.sendToClients(sdlColumnsSeeded)
+        # the column array is kept current by bulk moves and by folding in single column moves,
+        # so it wins over the individual variables... once it has been seeded from them
+        if ageSDL[sdlColumnsSeeded][0]:
+            byteColumns = list(ageSDL[sdlColumnArray])
+        else:
+            print "jlakField.OnServerInitComplete():  seeding the column array from the column variables"
+            ageSDL[sdlColumnArray] = tuple(byteColumns)
+            ageSDL[sdlColumnsSeeded] = (1,)
         print "jlakField.OnServerInitComplete():  byteColumns = ",byteColumns
 
         kZeroed = ptVector3(0,0,0)
@@ -302,6 +320,14 @@ class jlakField(ptResponder):
             for dn in clkColumnDn.value:
                 dn.disable()
 
+        # column preset commands for the KI chat line
+        xKIChatRouter.RegisterChatCommand("JalakSaveColumns",self.IChatSaveColumns,token="/savecolumns")
+        xKIChatRouter.RegisterChatCommand("JalakLoadColumns",self.IChatLoadColumns,token="/loadcolumns")
+
+
+    def BeginAgeUnLoad(self,avObj):
+        xKIChatRouter.UnregisterChatCommand("JalakSaveColumns")
+        xKIChatRouter.UnregisterChatCommand("JalakLoadColumns")
 
 
     def OnSDLNotify(self,VARname,SDLname,playerID,tag):
@@ -329,27 +355,23 @@ class jlakField(ptResponder):
             else:
                 respWallToggle.run(self.key,state="off",fastforward=0,netPropagate=0)
                 self.DoWallSensors(0)
+        if VARname == sdlColumnArray:
+            # a bulk move: animate every column that changed in one pass
+            newColumns = ageSDL[sdlColumnArray]
+            for id in range(len(newColumns)):
+                if newColumns[id] != byteColumns[id]:
+                    diffPos = self.IAnimateColumn(id,newColumns[id])
+                    PtAtTimeCallback(self.key,diffPos,id)
         if VARname in sdlColumns:
             id = sdlColumns.index(VARname)
-            col = listObjCols[id]
-            oldPos = byteColumns[id]
             newPos = ageSDL[sdlColumns[id]][0]
-            diffPos = abs(newPos-oldPos)
-            #print "oldPos = ",oldPos
-            #print "newPos = ",newPos
-            #print "diffPos = ",diffPos
-            clkColumnUp.value[id].disable()
-            clkColumnDn.value[id].disable()
-            animColumn.byObject[col].playToTime(newPos)
-            byteColumns[id] = newPos
-            print "jlakField.OnSDLNotify(): byteColumns[%d] = %d" % (id,newPos)
-            if newPos > oldPos:
-                dir = "up"
-            else:
-                dir = "down"
-            if not self.bulkMove:
-                respSfxColumn.run(self.key,state=(dir),objectName=listSfxCols[id])
-            PtAtTimeCallback(self.key,diffPos,id)
+            # ignore the echo of a column we already moved with the column array
+            if newPos != byteColumns[id]:
+                diffPos = self.IAnimateColumn(id,newPos)
+                PtAtTimeCallback(self.key,diffPos,id)
+                # single column moves (and moves from older clients) are folded into the column array
+                if self.sceneobject.isLocallyOwned():
+                    ageSDL.setIndex(sdlColumnArray,id,newPos)
         if VARname == sdlGUILock:
             boolGUILock = ageSDL[sdlGUILock][0]
             print "jlakField.OnSDLNotify(): boolGUILock = ",boolGUILock
@@ -430,6 +452,25 @@ class jlakField(ptResponder):
             print "jlakField.OnSDLNotify(): byteRect = ",byteRect
 
 
+    def IAnimateColumn(self,id,newPos):
+        "starts a column moving to newPos, returns how long it will take"
+        col = listObjCols[id]
+        oldPos = byteColumns[id]
+        diffPos = abs(newPos-oldPos)
+        clkColumnUp.value[id].disable()
+        clkColumnDn.value[id].disable()
+        animColumn.byObject[col].playToTime(newPos)
+        byteColumns[id] = newPos
+        print "jlakField.OnSDLNotify(): byteColumns[%d] = %d" % (id,newPos)
+        if newPos > oldPos:
+            dir = "up"
+        else:
+            dir = "down"
+        if not self.bulkMove:
+            respSfxColumn.run(self.key,state=(dir),objectName=listSfxCols[id])
+        return diffPos
+
+
     def OnNotify(self,state,id,events):
         ageSDL = PtGetAgeSDL()
         #print "jlakField.OnNotify(): id = ",id
@@ -586,11 +627,7 @@ class jlakField(ptResponder):
             notify.send()
             
             #Now finally start the movement....
-            i = 0
-            for col in listObjCols:
-                if newColumns[i] != byteColumns[i]:
-                    self.MoveColumn(i,newColumns[i])
-                i += 1
+            self.MoveColumns(newColumns)
             
 
     def getMaxDist(self, maxDist, oldPoint, newPoint):
@@ -612,6 +649,24 @@ class jlakField(ptResponder):
             ageSDL[sdlColumns[id]] = (pos,)
 
 
+    def MoveColumns(self,newColumns):
+        "moves all the columns, new clients see it as a single notify"
+        ageSDL = PtGetAgeSDL()
+        changed = []
+        i = 0
+        for pos in newColumns:
+            if pos != byteColumns[i]:
+                changed.append(i)
+            i += 1
+        if not changed:
+            return
+        # new clients animate the whole move from the column array...
+        ageSDL[sdlColumnArray] = tuple(newColumns)
+        # ...older clients only know about the individual column variables (new clients ignore these echoes)
+        for i in changed:
+            ageSDL[sdlColumns[i]] = (newColumns[i],)
+
+
     def DropWidget(self,widget):
         ageSDL = PtGetAgeSDL()
 
@@ -763,6 +818,23 @@ class jlakField(ptResponder):
             respBulkMoveSFX.run(self.key, state='end', netPropagate=0)
 
 
+    def IGetPresetFileName(self,chatmessage,command):
+        fName = chatmessage[len(command):].strip()
+        if fName:
+            return fName + ".txt"
+        return "JalakColumns.txt"
+
+
+    def IChatSaveColumns(self,chatmessage,command):
+        self.SaveColumns(self.IGetPresetFileName(chatmessage,command))
+        return None
+
+
+    def IChatLoadColumns(self,chatmessage,command):
+        self.LoadColumns(self.IGetPresetFileName(chatmessage,command))
+        return None
+
+
     def SaveColumns(self,fName):
         fWrite = file(fName,'w')
         print "jlakField.SaveColumns(): writing to presets file '%s'" % (fName)
@@ -810,16 +882,7 @@ class jlakField(ptResponder):
                 print "invalid height parameter, must be a # between ",kMinPos," and ",kMaxPos
                 return
             newPos = param
-            anythingMoved = 0
-            i = 0
-            for col in listObjCols:
-                if byteColumns[i] != newPos:
-                    self.MoveColumn(i,newPos,0)
-                    anythingMoved = 1
-                i += 1
-            if anythingMoved:
-                #respGameOps.run(self.key,state="reset")
-                pass
+            self.MoveColumns([newPos] * len(listObjCols))
         elif target == "reset":
             if param == "widgets":
                 self.ResetWidgets()
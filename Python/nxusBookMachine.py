@@ -56,6 +56,8 @@ from PlasmaVaultConstants import *
 from xPsnlVaultSDL import *
 
 import xLocTools
+import xVaultIndex
+import xPublicAgeIndex
 
 import PlasmaControlKeys
 import datetime
@@ -251,11 +253,11 @@ kPublicAgesDescription = {
 }
 
 # hood sorting vars
-kSortNone = 0
-kSortNameAsc = 1
-kSortNameDesc = 2
-kSortPopAsc = 3
-kSortPopDesc = 4
+kSortNone = xPublicAgeIndex.kSortNone
+kSortNameAsc = xPublicAgeIndex.kSortNameAsc
+kSortNameDesc = xPublicAgeIndex.kSortNameDesc
+kSortPopAsc = xPublicAgeIndex.kSortPopAsc
+kSortPopDesc = xPublicAgeIndex.kSortPopDesc
 
 #controls for hood sorting var
 kSortControlId = {
@@ -325,6 +327,36 @@ class LinkListEntry():
         if spawnPoint is not None:
             self.als.setSpawnPoint(spawnPoint)
 
+class PublicHoodLinks():
+    "the public hoods as LinkListEntry's, made as the GUI pages through them"
+    def __init__(self, hoods, hoodSort, hiddenLanguages, entries):
+        self.hoods = hoods
+        self.hoodSort = hoodSort
+        self.hiddenLanguages = hiddenLanguages
+        self.entries = entries
+
+    def __len__(self):
+        return self.hoods.Count(self.hoodSort, self.hiddenLanguages)
+
+    def __getitem__(self, index):
+        page = self.hoods.GetPage(index, 1, self.hoodSort, self.hiddenLanguages)
+        if not page:
+            raise IndexError, index
+        hood = page[0]
+        try:
+            (cachedHood, entry) = self.entries[hood.guid]
+            if cachedHood is hood:
+                return entry
+        except KeyError:
+            pass
+        stringLinkInfo = str(hood.population) #TODO: i10n
+        description = hood.ageInfo.getAgeDescription()
+
+        entry = LinkListEntry(hood.displayName, stringLinkInfo, description)
+        entry.setLinkStruct(hood.ageInfo) #create link to instance, use default spawnPoint
+        self.entries[hood.guid] = (hood, entry)
+        return entry
+
 class nxusBookMachine(ptModifier):
     "The Nexus python code"
     def __init__(self):
@@ -356,7 +388,8 @@ class nxusBookMachine(ptModifier):
 
         self.indexDisplayStart = 0
 
-        self.publicHoods = list()
+        self.publicHoods = xPublicAgeIndex.PublicAgeIndex()
+        self.publicHoodEntries = dict() #hood guid -> (hood, LinkListEntry) for the hoods we have shown
         self.neighborhoodEntry = None
         self.publicAges = {
             'city' : AgeData(ageFilename = 'city', defaultMaxPop = 20, linkVisible = 1),
@@ -389,8 +422,11 @@ class nxusBookMachine(ptModifier):
         respButtonPress.run(self.key, fastforward = 1)
 
         # hide all the linking panels in the machine - will draw appropriate when selected
+        self.linkPanels = dict()
+        self.drawnLinkPanel = None
         for objPanel in objlistLinkPanels.value:
             objPanel.draw.disable()
+            self.linkPanels[objPanel.getName()] = objPanel
 
     def OnServerInitComplete(self):
         ageSDL = PtGetAgeSDL()
@@ -479,7 +515,8 @@ class nxusBookMachine(ptModifier):
     def gotPublicAgeList(self, ages):
         if not ages:
             PtDebugPrint("nxusBookMachine.gotPublicAgeList() - got an empty list, which we assume are hoods, clearing hood list")
-            self.publicHoods = list()
+            self.publicHoods.Clear()
+            self.publicHoodEntries.clear()
             self.IUpdateLinks(kCategoryPublic)
             return
 
@@ -492,7 +529,7 @@ class nxusBookMachine(ptModifier):
                 # if the current population and number of owners is zero then don't display it
                 #looks like it doesn't work (at least on Dirtsand)
                 if age[2] != 0 or age[1] != 0:
-                    hoods.append(AgeInstance(age))
+                    hoods.append(age)
             else:
                 PtDebugPrint("nxusBookMachine.gotPublicAgeList() - got the list of %s instances" % ageFilename)
                 try:
@@ -512,57 +549,24 @@ class nxusBookMachine(ptModifier):
             self.IUpdateLinks(kCategoryCity)
 
         if hoods:
-            self.publicHoods = hoods
-            self.IUpdateLinks(kCategoryPublic)
-
-    def ISortPublicHoods(self, hoods, hoodSort = kSortNone):
+            # only the hoods that came, went or changed population move in the index
+            if self.publicHoods.Update(hoods):
+                for guid in self.publicHoodEntries.keys():
+                    if self.publicHoods.Get(guid) is None:
+                        del self.publicHoodEntries[guid]
+                self.IUpdateLinks(kCategoryPublic)
+
+    def IGetHiddenHoodLanguages(self):
         # if the language is not English, French, or German, we assume it is English and treat it as such
-        hoodsToSort = list()
-        for hood in hoods:
-            hoodLanguage = hood.ageInfo.getAgeLanguage()
-            allowLanguage = self.showHoodLanguages.get(hoodLanguage, True)
-            if allowLanguage:
-                hoodsToSort.append(hood)
-
-        if hoodSort == kSortNone:
-            return hoodsToSort
-
-        reverse = (hoodSort in (kSortNameDesc, kSortPopDesc))
-        if hoodSort in (kSortNameAsc, kSortNameDesc):
-            return sorted(hoodsToSort, key = lambda hood: hood.ageInfo.getDisplayName(), reverse = reverse)
-        else:
-            return sorted(hoodsToSort, key = lambda hood: hood.population, reverse = reverse)
+        hidden = [language for (language, show) in self.showHoodLanguages.iteritems() if not show]
+        hidden.sort()
+        return hidden
 
     def IFindAgeLinkInFolder(self, folder, ageName):
-        ageName = ageName.lower()
-        contents = folder.getChildNodeRefList()
-        for content in contents:
-            link = content.getChild().upcastToAgeLinkNode()
-            if link is not None:
-                info = link.getAgeInfo()
-            else:
-                link = content.getChild()
-                info = link.upcastToAgeInfoNode()
-
-            if info.getAgeFilename().lower() == ageName:
-                return link
-        return None
+        return xVaultIndex.FindAgeLink(folder, ageName)
 
     def IFindAgeInfoInFolder(self, folder, ageName):
-        ageName = ageName.lower()
-        contents = folder.getChildNodeRefList()
-        for content in contents:
-            link = content.getChild()
-            link = link.upcastToAgeLinkNode()
-            if link is not None:
-                info = link.getAgeInfo()
-            else:
-                link = content.getChild()
-                info = link.upcastToAgeInfoNode()
-
-            if info.getAgeFilename().lower() == ageName:
-                return info
-        return None
+        return xVaultIndex.FindAgeInfo(folder, ageName)
 
     def IGetHoodLinkNode(self):
         vault = ptVault()
@@ -1248,11 +1252,12 @@ class nxusBookMachine(ptModifier):
         else:
             panelName = self.IGetLinkPanelName(self.presentedBookAls)
             PtDebugPrint("drawing link panel: %s" % (panelName))
-            for objPanel in objlistLinkPanels.value:
-                if objPanel.getName() == panelName:
-                    objPanel.draw.enable()
-                else:
-                    objPanel.draw.disable()
+            objPanel = self.linkPanels.get(panelName)
+            if self.drawnLinkPanel is not None and self.drawnLinkPanel is not objPanel:
+                self.drawnLinkPanel.draw.disable()
+            if objPanel is not None:
+                objPanel.draw.enable()
+            self.drawnLinkPanel = objPanel
 
     def IChoosePublicInstances(self):
         for (ageFilename, entry) in self.publicAges.iteritems():
@@ -1356,19 +1361,8 @@ class nxusBookMachine(ptModifier):
         self.categoryLinksList[kCategoryCity] = cityLinks
 
     def IUpdatePublicLinksList(self):
-        sortedHoods = self.ISortPublicHoods(self.publicHoods, self.publicHoodSort)
-
-        hoodLinks = list()
-        for hood in sortedHoods:
-            displayName = hood.ageInfo.getDisplayName()
-            stringLinkInfo = str(hood.population) #TODO: i10n
-            description = hood.ageInfo.getAgeDescription()
-
-            newEntry = LinkListEntry(displayName, stringLinkInfo, description)
-            newEntry.setLinkStruct(hood.ageInfo) #create link to instance, use default spawnPoint
-            hoodLinks.append(newEntry)
-
-        self.categoryLinksList[kCategoryPublic] = hoodLinks
+        # the entries are made a page at a time, as the list is scrolled
+        self.categoryLinksList[kCategoryPublic] = PublicHoodLinks(self.publicHoods, self.publicHoodSort, self.IGetHiddenHoodLanguages(), self.publicHoodEntries)
 
     def IGetGZLinkNode(self):
         childAgeFolder = self.IGetHoodInfoNode().getChildAgesFolder()
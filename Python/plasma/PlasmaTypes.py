@@ -46,6 +46,9 @@ interfacing with the Plasma 2.0 engine.
 """
 from Plasma import *
 from PlasmaConstants import *
+import Plasma
+import sys
+import types
 
 ####################################
 # Utility functions
@@ -146,17 +149,62 @@ def PtAssert(cond, msg):
     "Plasma assert. Just like the Python one but we can set it to NOP in release"
     assert cond,msg
 
+# cached copy of PtGetPythonLoggingLevel(), so it isn't fetched from the engine for every message
+_PtLoggingLevel = None
+# module name -> logging level, overrides the global level for that module's messages
+_PtModuleLoggingLevels = {}
+
+def PtRefreshLoggingLevel():
+    "Re-reads the python logging level from the engine (call after it was changed from the console)"
+    global _PtLoggingLevel
+    _PtLoggingLevel = PtGetPythonLoggingLevel()
+    return _PtLoggingLevel
+
+def PtSetPythonLoggingLevel(level):
+    "Sets the python logging level in the engine and in the PtDebugPrint cache"
+    global _PtLoggingLevel
+    Plasma.PtSetPythonLoggingLevel(level)
+    _PtLoggingLevel = level
+
+def PtSetModuleLoggingLevel(moduleName,level=None):
+    "Overrides the logging level for PtDebugPrints from one module, None removes the override"
+    if level is None:
+        if moduleName in _PtModuleLoggingLevels:
+            del _PtModuleLoggingLevels[moduleName]
+    else:
+        _PtModuleLoggingLevels[moduleName] = level
+
+def PtIsLoggingLevel(level,moduleName=None):
+    "Returns true if a PtDebugPrint at this level would be printed"
+    if moduleName is not None and _PtModuleLoggingLevels:
+        try:
+            return level >= _PtModuleLoggingLevels[moduleName]
+        except LookupError:
+            pass
+    if _PtLoggingLevel is None:
+        PtRefreshLoggingLevel()
+    return level >= _PtLoggingLevel
+
 def PtDebugPrint(*msgs,**keywords):
-    "Plasma debug print. Will be NOP'd when released"
+    """Plasma debug print. Will be NOP'd when released
+    Lazy formatting: pass the message as a function (lambda) and it is only called when the level is printed."""
     try:
         level = keywords['level']
     except LookupError:
         level = kErrorLevel
-    if level >= PtGetPythonLoggingLevel():
+    moduleName = None
+    if _PtModuleLoggingLevels:
+        moduleName = sys._getframe(1).f_globals.get('__name__')
+    if PtIsLoggingLevel(level,moduleName):
         if level == 4:
-            PtAssert(0,msgs[0])
+            msg = msgs[0]
+            if type(msg) == types.FunctionType:
+                msg = msg()
+            PtAssert(0,msg)
         else:
             for msg in msgs:
+                if type(msg) == types.FunctionType:
+                    msg = msg()
                 print msg
 
 def PtGetObjectName(obj):
@@ -226,6 +274,12 @@ class ptResponderStateError(exceptions.Exception):
 #
 # Attributes that will be exposed in Max to be filled in by <someone>
 
+# Every PythonFileComponent gets its own copy of its module, so the glue code keeps where
+# each module's attributes are here, where all the copies can find it.
+# (these start with an underscore so that 'from PlasmaTypes import *' leaves them alone)
+_glueManifests = {}     # module name -> (id -> path to the attribute, ids in reverse order, id -> named attribute type, globals fingerprint)
+_glueStats = {}         # module name -> [globals walked, manifest reused]
+
 ####################################
 # base class for all attributes
 ####################################
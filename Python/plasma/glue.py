@@ -48,6 +48,8 @@ glue_cl = None       # the class of the modifier
 glue_inst = None     # instance of the class modifier
 glue_params = None   # parameters dictionary: mapped id to instance
 glue_paramKeys = None # this is the parameter ID list, that should be sorted
+glue_named = None    # named attribute types: mapped id to 1 (activator) or 2 (responder)
+import PlasmaTypes as glue_types  # holds the manifests shared by every copy of this module
 try:
     x = glue_verbose
 except NameError:
@@ -81,18 +83,20 @@ def glue_delInst():
     global glue_cl
     global glue_params
     global glue_paramKeys
+    global glue_named
     if type(glue_inst) != type(None):
         del glue_inst
     # remove our references
     glue_cl = None
     glue_params = None
     glue_paramKeys = None
+    glue_named = None
 def glue_getVersion():
     inst = glue_getInst()
     ver = inst.version
     glue_delInst()
     return ver
-def glue_findAndAddAttribs(obj, glue_params):
+def glue_findAndAddAttribs(obj, glue_params, path=(), glue_paths=None):
     if isinstance(obj,ptAttribute):
         if glue_params.has_key(obj.id):
             if glue_verbose:
@@ -100,28 +104,104 @@ def glue_findAndAddAttribs(obj, glue_params):
                 print "%s has id %d which is already defined in %s" % (obj.name, obj.id, glue_params[obj.id].name)
         else:
             glue_params[obj.id] = obj
+            if glue_paths != None:
+                glue_paths[obj.id] = path
     elif type(obj) == type([]):
-        for o in obj:
-            glue_findAndAddAttribs(o, glue_params)
+        for i in range(len(obj)):
+            glue_findAndAddAttribs(obj[i], glue_params, path + (i,), glue_paths)
     elif type(obj) == type({}):
-        for o in obj.values():
-            glue_findAndAddAttribs(o, glue_params)
+        for k in obj.keys():
+            glue_findAndAddAttribs(obj[k], glue_params, path + (k,), glue_paths)
     elif type(obj) == type( () ):
-        for o in obj:
-            glue_findAndAddAttribs(o, glue_params)
-            
+        for i in range(len(obj)):
+            glue_findAndAddAttribs(obj[i], glue_params, path + (i,), glue_paths)
+
+def glue_getManifestName():
+    # the manifests are kept by module name, without one there's nothing to share it with
+    try:
+        return glue_name
+    except NameError:
+        return None
+
+def glue_getStats():
+    "returns [globals walked, manifest reused] for this module"
+    name = glue_getManifestName()
+    try:
+        return glue_types._glueStats[name]
+    except KeyError:
+        stats = glue_types._glueStats[name] = [0,0]
+        return stats
+
+def glue_getFingerprint():
+    "the global names (and container sizes) of this copy, an attribute added on reload changes it"
+    gd = globals()
+    names = gd.keys()
+    names.sort()
+    fingerprint = []
+    for name in names:
+        obj = gd[name]
+        if type(obj) in (type([]), type({}), type( () )):
+            fingerprint.append((name,len(obj)))
+        else:
+            fingerprint.append(name)
+    return tuple(fingerprint)
+
+def glue_buildManifest():
+    "walk the globals for the attributes and remember where they were for the other copies of this module"
+    params = {}
+    paths = {}
+    gd = globals()
+    for name in gd.keys():
+        glue_findAndAddAttribs(gd[name], params, (name,), paths)
+    # the parameter sorted key list
+    keys = params.keys()
+    keys.sort()
+    keys.reverse()    # reserve the order because PlasmaMax will ask for them in reverse order
+    named = {}
+    for id in keys:
+        if isinstance(params[id],ptAttribNamedActivator):
+            named[id] = 1
+        elif isinstance(params[id],ptAttribNamedResponder):
+            named[id] = 2
+    manifest = (paths, tuple(keys), named, glue_getFingerprint())
+    glue_getStats()[0] += 1
+    name = glue_getManifestName()
+    if name != None:
+        glue_types._glueManifests[name] = manifest
+    return (params, manifest)
+
+def glue_findFromManifest(manifest):
+    "find this copy's attributes from the manifest, returns None if they aren't where it says"
+    if manifest[3] != glue_getFingerprint():
+        return None
+    params = {}
+    gd = globals()
+    for id, path in manifest[0].items():
+        try:
+            obj = gd[path[0]]
+            for k in path[1:]:
+                obj = obj[k]
+        except (KeyError,IndexError,TypeError):
+            return None
+        if not isinstance(obj,ptAttribute) or obj.id != id:
+            return None
+        params[id] = obj
+    glue_getStats()[1] += 1
+    return params
+
 def glue_getParamDict():
     global glue_params
     global glue_paramKeys
+    global glue_named
     if type(glue_params) == type(None):
-        glue_params = {}
-        gd = globals()
-        for obj in gd.values():
-            glue_findAndAddAttribs(obj, glue_params)
-        # rebuild the parameter sorted key list
-        glue_paramKeys = glue_params.keys()
-        glue_paramKeys.sort()
-        glue_paramKeys.reverse()    # reserve the order because PlasmaMax will ask for them in reverse order
+        manifest = glue_types._glueManifests.get(glue_getManifestName())
+        if manifest != None:
+            glue_params = glue_findFromManifest(manifest)
+        if type(glue_params) == type(None):
+            # first copy of this module (or it has changed), so walk the globals
+            glue_params, manifest = glue_buildManifest()
+        glue_paramKeys = manifest[1]
+        glue_named = manifest[2]
     return glue_params
 def glue_getClassName():
     cl = glue_getClass()
@@ -149,7 +229,7 @@ def glue_getParam(number):
     pd = glue_getParamDict()
     if pd != None:
         # see if there is a paramKey list
-        if type(glue_paramKeys) == type([]):
+        if type(glue_paramKeys) == type(()):
             if number >= 0 and number < len(glue_paramKeys):
                 return pd[glue_paramKeys[number]].getdef()
             else:
@@ -189,14 +269,10 @@ def glue_setParam(id,value):
 def glue_isNamedAttribute(id):
     pd = glue_getParamDict()
     if pd != None:
-        try:
-            if isinstance(pd[id],ptAttribNamedActivator):
-                return 1
-            if isinstance(pd[id],ptAttribNamedResponder):
-                return 2
-        except KeyError:
-            if glue_verbose:
-                print "Could not find id=%d attribute" % (id)
+        if pd.has_key(id):
+            return glue_named.get(id,0)
+        if glue_verbose:
+            print "Could not find id=%d attribute" % (id)
     return 0
 def glue_isMultiModifier():
     inst = glue_getInst()
@@ -208,7 +284,7 @@ def glue_getVisInfo(number):
     pd = glue_getParamDict()
     if pd != None:
         # see if there is a paramKey list
-        if type(glue_paramKeys) == type([]):
+        if type(glue_paramKeys) == type(()):
             if number >= 0 and number < len(glue_paramKeys):
                 return pd[glue_paramKeys[number]].getVisInfo()
             else:
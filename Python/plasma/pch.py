@@ -80,6 +80,8 @@ def help():
     print "  setvar(name,value) - sets instance variable 'name' to 'value' in the"
     print "                       selected module"
     print "  getvar(name) - returns the instance variable object (in selected module)"
+    print "  showglue()  - shows how many times each module's globals were walked for"
+    print "                attributes and how many copies reused the manifest"
 # modules
 def getmods():
     "get all the PythonFileComponent modules"
@@ -301,3 +303,17 @@ def getvar(vname):
         ist = __pmods[__sel][1].__dict__[name]
         if isinstance(ist,PlasmaTypes.ptModifier):
             return ist.__dict__[vname]
+def showglue():
+    "show how the attribute manifests were used while loading the age"
+    walks = 0
+    reuses = 0
+    names = PlasmaTypes._glueStats.keys()
+    names.sort()
+    print "Attribute manifests:"
+    for name in names:
+        stats = PlasmaTypes._glueStats[name]
+        print "  %s: %d walk(s), reused %d time(s)" % (name,stats[0],stats[1])
+        walks += stats[0]
+        reuses += stats[1]
+    print "%d module(s), %d global walks, %d reuses" % (len(names),walks,reuses)
+    return (walks,reuses)
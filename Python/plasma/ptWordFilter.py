@@ -63,74 +63,35 @@ class LanguageFilter:
         "returns censored sentence"
         return sentence
 
+# splits a sentence into words, keeping the whitespace and punctuation between them
+kWordSplitRE = re.compile('([%s])' % re.escape(string.whitespace + string.punctuation))
+
 class ExactMatchListFilter(LanguageFilter):
     def __init__(self,wordlist):
         self.wordlist = wordlist
     def test(self,sentence):
         "return the rating of sentence in question"
         rated = xRatedG     # assume rated lowest level
-        startidx = 0
-        for endidx in range(len(sentence)):
-            if sentence[endidx] in string.whitespace or sentence[endidx] in string.punctuation:
-                if startidx != endidx:
-                    try:
-                        # find and get rating and substitute
-                        rating = self.wordlist[string.lower(sentence[startidx:endidx])]
-                    except LookupError:
-                        # couldn't find word
-                        rating = None
-                    if rating != None and rating.rating > rated:
-                        # substitute into string
-                        rated = rating.rating
-                startidx = endidx + 1
-        if startidx < len(sentence):
-            try:
-                # find and get rating and substitute
-                rating = self.wordlist[string.lower(sentence[startidx:])]
-            except LookupError:
-                # couldn't find word
-                rating = None
-            if rating != None and rating.rating > rated:
-                # substitute into string
-                rated = rating.rating
+        # every other item is a word, the ones in between are the separators
+        for word in kWordSplitRE.split(sentence)[::2]:
+            if word:
+                rating = self.wordlist.get(word.lower())
+                if rating != None and rating.rating > rated:
+                    rated = rating.rating
         return rated
         
     def censor(self,sentence,censorLevel):
         "censors a sentence to a rating"
         # break into words, but perserve original punctuation
-        censored = ""
-        startidx = 0
-        for endidx in range(len(sentence)):
-            if sentence[endidx] in string.whitespace or sentence[endidx] in string.punctuation:
-                if startidx != endidx:
-                    try:
-                        # find and get rating and substitute
-                        rating = self.wordlist[string.lower(sentence[startidx:endidx])]
-                    except LookupError:
-                        # couldn't find word
-                        rating = None
-                    if rating != None and rating.rating > censorLevel:
-                        # substitute into string
-                        censored += rating.substitute + sentence[endidx]
-                    else:
-                        censored += sentence[startidx:endidx] + sentence[endidx]
-                else:
-                    censored += sentence[startidx]
-                startidx = endidx + 1
-        if startidx < len(sentence):
-            # Special after loop processing!
-            try:
-                # find and get rating and substitute
-                rating = self.wordlist[string.lower(sentence[startidx:])]
-            except LookupError:
-                # couldn't find word
-                rating = None
-            if rating != None and rating.rating > censorLevel:
-                # substitute into string
-                censored += rating.substitute
-            else:
-                censored += sentence[startidx:]
-        return censored
+        parts = kWordSplitRE.split(sentence)
+        for idx in xrange(0,len(parts),2):
+            word = parts[idx]
+            if word:
+                rating = self.wordlist.get(word.lower())
+                if rating != None and rating.rating > censorLevel:
+                    # substitute into string
+                    parts[idx] = rating.substitute
+        return "".join(parts)
 
 class REFilter(LanguageFilter):
     def __init__(self,regexp,rating):
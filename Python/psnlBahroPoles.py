@@ -56,6 +56,7 @@ import xRandom
 import copy
 from xPsnlVaultSDL import *
 import string
+import xChronicleStore
 
 
 # Max attributes
@@ -123,6 +124,9 @@ respCleftHandGlow = ptAttribResponder(52, "resp: Cleft hand glow", ["1", "2", "3
 clickCleftBook = ptAttribActivator(53, "Cleft book clickable")
 respCleftLinkOut = ptAttribResponder(54, "Cleft link out",netForce=1)
 
+# the age solutions are children of this one
+xChronicleStore.Declare("BahroCave", xChronicleStore.kChronString, None, 0)
+
 #globals
 boolCleftTotem = 0
 kTimerCleftTotemClk = 42
@@ -239,13 +243,10 @@ class psnlBahroPoles(ptModifier):
             print "ERROR: psnlBahroPoles.OnServerInitComplete():\tNo SDL for boolCleftSolved, using 0"
 
         if not boolCleftSolved:
-            vault = ptVault()
             if ptVault().amOwnerOfCurrentAge():
-                entry = vault.findChronicleEntry("CleftSolved")
-                if type(entry) != type(None):
-                    if entry.chronicleGetValue() == "yes":
-                        boolCleftSolved = 1
-                        ageSDL["psnlCleftSolved"] = (1,)
+                if xChronicleStore.Get("CleftSolved") == "yes":
+                    boolCleftSolved = 1
+                    ageSDL["psnlCleftSolved"] = (1,)
         
         if boolCleftTotem:
             if boolCleftSolved:
@@ -725,21 +726,18 @@ class psnlBahroPoles(ptModifier):
         if age == "Garden":
             age = "Eder"
         
-        vault = ptVault()
+        chron = xChronicleStore.GetNode("JourneyClothProgress")
 
-        if type(vault) != type(None):
-            chron = vault.findChronicleEntry("JourneyClothProgress")
+        if type(chron) != type(None):
+            ageChronRefList = chron.getChildNodeRefList()
 
-            if type(chron) != type(None):
-                ageChronRefList = chron.getChildNodeRefList()
+            for ageChron in ageChronRefList:
+                ageChild = ageChron.getChild()
 
-                for ageChron in ageChronRefList:
-                    ageChild = ageChron.getChild()
+                ageChild = ageChild.upcastToChronicleNode()
 
-                    ageChild = ageChild.upcastToChronicleNode()
-
-                    if ageChild.chronicleGetName() == age:
-                        return len(ageChild.chronicleGetValue() )
+                if ageChild.chronicleGetName() == age:
+                    return len(ageChild.chronicleGetValue() )
 
         return 0
 
@@ -905,14 +903,9 @@ class psnlBahroPoles(ptModifier):
 
 
     def SetJCProgressComplete(self):
-        vault = ptVault()
-
-        if type(vault) != type(None):
-            chron = vault.findChronicleEntry("JourneyClothProgress")
-
-            if type(chron) != type(None):
-                chron.chronicleSetValue("Z")
-                chron.save()
+        if xChronicleStore.Has("JourneyClothProgress"):
+            # the journey cloths look at it in the vault
+            xChronicleStore.Set("JourneyClothProgress", "Z", now=1)
 
         #sdl = xPsnlVaultSDL(1)
         #sdl["CleftVisited"] = (1,)
@@ -1059,21 +1052,28 @@ class psnlBahroPoles(ptModifier):
 
         # handle if someone left while poles going up or while last pole is going down
         if (freq[5] == 3 and freq[4] == 1) or (freq[5] > 0 and (freq[6] > 0 or freq[7] > 0 or freq[8] > 0 or freq[9] > 0)):
-            if self.Poles["Teledahn"]["State"] < 6:
-                self.SetCurrentState("Teledahn", 6)
-                PtDebugPrint("DEBUG:psnlBahroPoles.ValidityCheck:  fixed bad teledahn state")
-                
-            if self.Poles["Garrison"]["State"] < 6:
-                self.SetCurrentState("Garrison", 6)
-                PtDebugPrint("DEBUG:psnlBahroPoles.ValidityCheck:  fixed bad garrison state")
+            # send all the fixes to the vault in one update
+            sdl = xPsnlVaultSDL(1)
+            sdl.transaction()
+            try:
+                if self.Poles["Teledahn"]["State"] < 6:
+                    self.SetCurrentState("Teledahn", 6)
+                    PtDebugPrint("DEBUG:psnlBahroPoles.ValidityCheck:  fixed bad teledahn state")
+                    
+                if self.Poles["Garrison"]["State"] < 6:
+                    self.SetCurrentState("Garrison", 6)
+                    PtDebugPrint("DEBUG:psnlBahroPoles.ValidityCheck:  fixed bad garrison state")
 
-            if self.Poles["Garden"]["State"] < 6:
-                self.SetCurrentState("Garden", 6)
-                PtDebugPrint("DEBUG:psnlBahroPoles.ValidityCheck:  fixed bad garden state")
-                
-            if self.Poles["Kadish"]["State"] < 6:
-                self.SetCurrentState("Kadish", 6)
-                PtDebugPrint("DEBUG:psnlBahroPoles.ValidityCheck:  fixed bad kadish state")
+                if self.Poles["Garden"]["State"] < 6:
+                    self.SetCurrentState("Garden", 6)
+                    PtDebugPrint("DEBUG:psnlBahroPoles.ValidityCheck:  fixed bad garden state")
+                    
+                if self.Poles["Kadish"]["State"] < 6:
+                    self.SetCurrentState("Kadish", 6)
+                    PtDebugPrint("DEBUG:psnlBahroPoles.ValidityCheck:  fixed bad kadish state")
+            finally:
+                # always close the transaction, or every later write would wait on it
+                sdl.commit()
         elif freq[4] == 4 or freq[5] == 4:
             sdl = xPsnlVaultSDL(1)
             sdl.BatchSet( [("TeledahnPoleState", (6,)), ("KadishPoleState", (6,)), ("GarrisonPoleState", (6,)), ("GardenPoleState", (6,))] )
@@ -1108,9 +1108,7 @@ class psnlBahroPoles(ptModifier):
 ### SECTION ADDED (from bhroBahroYeeshaCave.py) TO CREATE BAHROCAVE SOLUTION HERE IN PERSONAL AGE
 
     def CheckBahroCaveSolution(self):
-        vault = ptVault()
-        entry = vault.findChronicleEntry("BahroCave")
-        if type(entry) == type(None):
+        if not xChronicleStore.Has("BahroCave"):
             return 0
         else:
             var = self.GetAgeVariable("Teledahn", "SolutionSymbol")
@@ -1131,19 +1129,17 @@ class psnlBahroPoles(ptModifier):
                 if not newint in bahroSolList:
                     bahroSolList.append(newint)
 
-        vault = ptVault()
-        entry = vault.findChronicleEntry("BahroCave")
-        if type(entry) == type(None):
+        if not xChronicleStore.Has("BahroCave"):
             #PtDebugPrint("DEBUG: psnlBahroPoles.OnServerInitComplete: Did not find BahroCave chronicle...creating")
-            vault.addChronicleEntry("BahroCave",0,"0")
+            xChronicleStore.Set("BahroCave", "0", now=1)
 
         agelist = ["Teledahn", "Garden", "Garrison", "Kadish"]
         print "creating BahroCave solution in the chronicle..."
+        entry = xChronicleStore.GetNode("BahroCave")
         for v in range(len(agelist)):
             newnode = ptVaultChronicleNode(0)
             newnode.chronicleSetName(agelist[v])
             newnode.chronicleSetValue("0," + str(bahroSolList[v]) + ",0")
-            entry = vault.findChronicleEntry("BahroCave")
             entry.addNode(newnode)
         print "new bahro cave solution = ",self.GetBahroCaveSolution()
 
@@ -1164,8 +1160,9 @@ class psnlBahroPoles(ptModifier):
 
 
     def GetAgeNode(self, age):
-        vault = ptVault()
-        chron = vault.findChronicleEntry("BahroCave")
+        chron = xChronicleStore.GetNode("BahroCave")
+        if chron is None:
+            return None
         ageChronRefList = chron.getChildNodeRefList()
         for ageChron in ageChronRefList:
             ageChild = ageChron.getChild()
@@ -55,6 +55,7 @@ from PlasmaVaultConstants import *
 from PlasmaNetConstants import *
 import PlasmaControlKeys
 import xLinkingBookDefs
+import xLinkBookModel
 from xPsnlVaultSDL import *
 
 import xVisitorUtils #For non-subscription based players
@@ -175,22 +176,13 @@ class psnlBookshelf(ptModifier):
     def OnServerInitComplete(self):
         global stupidHackForLock
 
-        ageVault = ptAgeVault()
-        ageInfoNode = ageVault.getAgeInfo()
-        locked = 1
-
-        ageInfoChildren = ageInfoNode.getChildNodeRefList()
-        for ageInfoChildRef in ageInfoChildren:
-            ageInfoChild = ageInfoChildRef.getChild()
-            folder = ageInfoChild.upcastToFolderNode()
-            if folder and folder.folderGetName() == "AgeData":
-                ageDataChildren = folder.getChildNodeRefList()
-                for ageDataChildRef in ageDataChildren:
-                    ageDataChild = ageDataChildRef.getChild()
-                    chron = ageDataChild.upcastToChronicleNode()
-                    if chron and chron.getName() == "AhnonayLocked":
-                        locked = bool(int(chron.getValue()))
-                break
+        # the model may still hold the books of the last age we were in
+        xLinkBookModel.Reset()
+        locked = xLinkBookModel.GetAgeDataChronicle("AhnonayLocked")
+        if locked is None:
+            locked = 1
+        else:
+            locked = bool(int(locked))
 
         vault = ptVault()
         if not vault.inMyPersonalAge():
@@ -257,8 +249,12 @@ class psnlBookshelf(ptModifier):
                 pass
 
 
+    def OnVaultEvent(self,event,tupdata):
+        xLinkBookModel.OnVaultEvent(event,tupdata)
+
     def OnAgeVaultEvent(self,event,tupdata):
         PtDebugPrint("psnlBookshelf.OnAgeVaultEvent()\t:OnAgeKIEvent recvd. Event=%d and data= " % (event),tupdata)
+        xLinkBookModel.OnVaultEvent(event,tupdata)
         if event == PtVaultCallbackTypes.kVaultConnected:
             print "psnlBookshelf: kVaultConnected event"
             # tupdata is ()
@@ -1175,25 +1171,13 @@ class psnlBookshelf(ptModifier):
             print "psnlBookshelf.IGetLinkFromBook(): Going to Ahnonay... special case."
             return "Ahnonay"
 
-        hoodInfo = self.IGetHoodInfoNode()
-        if hoodInfo:
-            childAgeFolder = hoodInfo.getChildAgesFolder()
-            contents = childAgeFolder.getChildNodeRefList()
-            for content in contents:
-                link = content.getChild()
-                link = link.upcastToAgeLinkNode()
-                if not link: # Don't break if it's not what you expect...
-                    continue
-                
-                info = link.getAgeInfo()
-                if info and info.getAgeFilename() == ageName:
-                    if ageName == "Garrison":
-                        continue
-                    else:
-                        # found our link
-                        print "psnlBookshelf.IGetLinkFromBook():\tfound Child link ", info.getAgeFilename()
-                        IsChildLink = 1
-                        return link
+        if ageName != "Garrison":
+            link = self.IGetHoodChildLink(ageName)
+            if link:
+                # found our link
+                print "psnlBookshelf.IGetLinkFromBook():\tfound Child link ", ageName
+                IsChildLink = 1
+                return link
 
         if isCityLink:
             # if we got here then we're a city link but we couldn't find the child age
@@ -1209,22 +1193,14 @@ class psnlBookshelf(ptModifier):
             
             return ageLink
 
-        ageVault = ptAgeVault()
-        PAL = ageVault.getAgesIOwnFolder()
-        contents = PAL.getChildNodeRefList()
-        for content in contents:
-            link = content.getChild()
-            link = link.upcastToAgeLinkNode()
-            info = link.getAgeInfo()
-            if info and info.getAgeFilename() == ageName:
-                # found our link
-                print "psnlBookshelf.IGetLinkFromBook():\tfound Owned link", info.getAgeFilename()
-                IsChildLink = 0
-                return link
+        link = xLinkBookModel.GetOwnedAgeLink(ageName)
+        if link:
+            # found our link
+            print "psnlBookshelf.IGetLinkFromBook():\tfound Owned link", ageName
+            IsChildLink = 0
+            return link
 
         print "psnlBookshelf.IGetLinkFromBook():\tERROR -- couldn't find link to", ageName
-        print "info = ",info
-        print "info.getAgeFilename() = ",info.getAgeFilename()
         print "spTitle = ",spTitle
         return None
     
@@ -1242,8 +1218,7 @@ class psnlBookshelf(ptModifier):
         global CityBookAges
         
         ageVault = ptAgeVault()
-        PAL = ageVault.getAgesIOwnFolder()
-        contents = PAL.getChildNodeRefList()
+        ownedLinks = xLinkBookModel.GetOwnedAgeLinks()
 
         # check for the dang city book and do stuff
         if self.HasCityBook():
@@ -1274,13 +1249,7 @@ class psnlBookshelf(ptModifier):
                         if lockName == parent.getName():
                             respOpenLock.run(self.key,objectName=rkey,fastforward=1)
         
-        for content in contents:
-            link = content.getChild()
-            link = link.upcastToAgeLinkNode()
-            info = link.getAgeInfo()
-            if not info:
-                continue
-            ageName = info.getAgeFilename()
+        for ageName, link in ownedLinks or []:
             try:
                 index = linkLibrary.index(ageName)    
             except:
@@ -1337,27 +1306,13 @@ class psnlBookshelf(ptModifier):
                             respReturnTray.run(self.key,objectName=rkey,fastforward=1)
 
         ## Ahnonay Hackage!
-        guid = None
-        locked = 0
-        volatile = 0
-        ageVault = ptAgeVault()
-        ageInfoNode = ageVault.getAgeInfo()
-
-        ageInfoChildren = ageInfoNode.getChildNodeRefList()
-        for ageInfoChildRef in ageInfoChildren:
-            ageInfoChild = ageInfoChildRef.getChild()
-            folder = ageInfoChild.upcastToFolderNode()
-            if folder and folder.folderGetName() == "AgeData":
-                ageDataChildren = folder.getChildNodeRefList()
-                for ageDataChildRef in ageDataChildren:
-                    ageDataChild = ageDataChildRef.getChild()
-                    chron = ageDataChild.upcastToChronicleNode()
-                    if chron and chron.getName() == "AhnonayLink":
-                        guid = chron.getValue()
-                    elif chron and chron.getName() == "AhnonayLocked":
-                        locked = chron.getValue()
-                    elif chron and chron.getName() == "AhnonayVolatile":
-                        volatile = chron.getValue()
+        guid = xLinkBookModel.GetAgeDataChronicle("AhnonayLink")
+        locked = xLinkBookModel.GetAgeDataChronicle("AhnonayLocked")
+        if locked is None:
+            locked = 0
+        volatile = xLinkBookModel.GetAgeDataChronicle("AhnonayVolatile")
+        if volatile is None:
+            volatile = 0
 
         if guid != None:
             try:
@@ -1454,19 +1409,9 @@ class psnlBookshelf(ptModifier):
                             actLock.enable(objectName=key)
                             break
         
-        ageVault = ptAgeVault()
-        PAL = ageVault.getAgesIOwnFolder()
-        if type(PAL) != type(None):
-            contents = PAL.getChildNodeRefList()
-
-            for content in contents:
-                link = content.getChild()
-                link = link.upcastToAgeLinkNode()
-                info = link.getAgeInfo()
-                if not info:
-                    continue
-                ageName = info.getAgeFilename()
-
+        ownedLinks = xLinkBookModel.GetOwnedAgeLinks()
+        if type(ownedLinks) != type(None):
+            for ageName, link in ownedLinks:
                 if (ageName == "city" or ageName == "BaronCityOffice") or (ageName in CityBookAges.keys()):
                     continue
             
@@ -1554,27 +1499,15 @@ class psnlBookshelf(ptModifier):
 
 
         ## Ahnonay Hackage!
-        guid = None
-        locked = 0
-        volatile = 0
-        ageVault = ptAgeVault()
-        ageInfoNode = ageVault.getAgeInfo()
-
-        ageInfoChildren = ageInfoNode.getChildNodeRefList()
-        for ageInfoChildRef in ageInfoChildren:
-            ageInfoChild = ageInfoChildRef.getChild()
-            folder = ageInfoChild.upcastToFolderNode()
-            if folder and folder.folderGetName() == "AgeData":
-                ageDataChildren = folder.getChildNodeRefList()
-                for ageDataChildRef in ageDataChildren:
-                    ageDataChild = ageDataChildRef.getChild()
-                    chron = ageDataChild.upcastToChronicleNode()
-                    if chron and chron.getName() == "AhnonayLink":
-                        guid = chron.getValue()
-                    elif chron and chron.getName() == "AhnonayLocked":
-                        locked = bool(int(chron.getValue()))
-                    elif chron and chron.getName() == "AhnonayVolatile":
-                        volatile = chron.getValue()
+        guid = xLinkBookModel.GetAgeDataChronicle("AhnonayLink")
+        locked = xLinkBookModel.GetAgeDataChronicle("AhnonayLocked")
+        if locked is None:
+            locked = 0
+        else:
+            locked = bool(int(locked))
+        volatile = xLinkBookModel.GetAgeDataChronicle("AhnonayVolatile")
+        if volatile is None:
+            volatile = 0
 
         if guid != None:
             ageName = "Ahnonay"
@@ -1669,24 +1602,8 @@ class psnlBookshelf(ptModifier):
             info = ptAgeInfoStruct()
             info.setAgeFilename("Ahnonay")
             info.setAgeInstanceName("Ahnonay")
-            guid = None
-            ageVault = ptAgeVault()
-            ageInfoNode = ageVault.getAgeInfo()
-
-            ageInfoChildren = ageInfoNode.getChildNodeRefList()
-            for ageInfoChildRef in ageInfoChildren:
-                ageInfoChild = ageInfoChildRef.getChild()
-                folder = ageInfoChild.upcastToFolderNode()
-                if folder and folder.folderGetName() == "AgeData":
-                    ageDataChildren = folder.getChildNodeRefList()
-                    for ageDataChildRef in ageDataChildren:
-                        ageDataChild = ageDataChildRef.getChild()
-                        chron = ageDataChild.upcastToChronicleNode()
-                        if chron and chron.getName() == "AhnonayLink":
-                            guid = chron.getValue()
-                            print guid
-                            break
-                    break
+            guid = xLinkBookModel.GetAgeDataChronicle("AhnonayLink")
+            print guid
             info.setAgeInstanceGuid(guid)
 
             link = ptAgeLinkStruct()
@@ -1852,52 +1769,8 @@ class psnlBookshelf(ptModifier):
             actBookshelfExit.enable()
 
 
-    def IGetHoodLinkNode(self):
-        vault = ptVault()
-        folder = vault.getAgesIOwnFolder()
-        contents = folder.getChildNodeRefList()
-        for content in contents:
-            link = content.getChild()
-            link = link.upcastToAgeLinkNode()
-            if type(link) != type(None):
-                info = link.getAgeInfo()
-            if not info:
-                continue
-            ageName = info.getAgeFilename()
-            if ageName == "Neighborhood":
-                return link
-        return None
-
-
-    def IGetHoodInfoNode(self):
-        link = self.IGetHoodLinkNode()
-        if type(link) == type(None):
-            return None
-        info = link.getAgeInfo()
-        return info
-
-
     def IGetHoodChildLink(self, age):
-        hoodInfo = self.IGetHoodInfoNode()
-        if hoodInfo:
-            childAgeFolder = hoodInfo.getChildAgesFolder()
-            if type(childAgeFolder) != type(None):
-                contents = childAgeFolder.getChildNodeRefList()
-                #childAgeLinkNodes = []
-                #GZLinkNode = None
-                for content in contents:
-                    link = content.getChild().upcastToAgeLinkNode()
-                    if not link: # Don't break if corrupt/not agelink
-                        continue
-                    
-                    info = link.getAgeInfo()
-                    if not info:
-                        continue
-                    ageName = info.getAgeFilename()
-                    #print "name = ",name
-                    if ageName == age:
-                        return link
-        return None    
+        return xLinkBookModel.GetHoodChildLink(age)
 
 
     def HasCityBook(self):
@@ -1918,20 +1791,7 @@ class psnlBookshelf(ptModifier):
                 print "psnlBookshelf.HasCityBook(): owner does NOT have city book"
                 return 0
 
-        CityLinks = []
-        vault = ptVault()
-        entryCityLinks = vault.findChronicleEntry("CityBookLinks")
-        if type(entryCityLinks) != type(None):
-            valCityLinks = entryCityLinks.chronicleGetValue()
-            print "valCityLinks = ",valCityLinks
-            CityLinks = valCityLinks.split(",")
-            print "CityLinks = ",CityLinks
-            for tmpLink in CityLinks:
-                if tmpLink in xLinkingBookDefs.CityBookLinks:
-                    return 1
-        else:
-            print "can't find CityBookLinks chron entry"
-        return 0
+        return xLinkBookModel.HasCityLinks()
 
         vault = ptAgeVault()
         # look for city book age links
@@ -1975,18 +1835,6 @@ class psnlBookshelf(ptModifier):
 
 
     def GetOwnedAgeLink(self, vault, age):
-        PAL = vault.getAgesIOwnFolder()
-        if type(PAL) != type(None):
-            contents = PAL.getChildNodeRefList()
-            for content in contents:
-                link = content.getChild().upcastToAgeLinkNode()
-                info = link.getAgeInfo()
-                if not info:
-                    continue
-                ageName = info.getAgeFilename()
-                print "found %s, looking for %s" % (ageName, age)
-                if ageName == age:
-                    return link
-
-        return None
+        # only this age's AgesIOwn folder is ever asked for
+        return xLinkBookModel.GetOwnedAgeLink(age)
 
@@ -51,6 +51,7 @@ from Plasma import *
 from PlasmaTypes import *
 import string
 import xRandom
+import xTimerWheel
 
 
 respCalStoneFire = ptAttribResponder(1,"resp: cal stones active",['on','off'])
@@ -146,6 +147,8 @@ class psnlCalendarStones(ptResponder):
 
 
     def OnTimer(self,id):
+        if xTimerWheel.OnTimer(self,id):
+            return
         if not fireworks and not fireworksTestMode:
             return
         if not self.sceneobject.isLocallyOwned():
@@ -185,7 +188,8 @@ class psnlCalendarStones(ptResponder):
         elif stage == 2:
             timer = self.GetExplodeTime()
             rocket += 1
-        PtAtTimeCallback(self.key,timer,rocket)
+        # the three rockets' chains share engine callbacks
+        xTimerWheel.AtTime(self,timer,rocket)
 
 
     def GetLaunchTime(self):
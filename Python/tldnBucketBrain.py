@@ -53,6 +53,7 @@ from Plasma import *
 from PlasmaTypes import *
 import PlasmaControlKeys
 from xEnum import Enum
+from xStateMachine import StateMachine
 
 #These variables are global but are necessary for the max inputs:
 kOff = "off"
@@ -152,6 +153,73 @@ kStringAgeSDLPowerOn       = "tldnWorkroomPowerOn"
 kBucketStates = Enum("Stop, QRun, QBoardQRun, Run, Dump, QStop, DumpQBoard, DumpQStop, DumpQBoardQStop, QBoard, Boarded")
 kBucketInputs = Enum("Power, Timer, StopCB, Board, BoardCB, Dump, DumpCB, WCPswitch")
 
+#Transitions that depend on the riders or the loop mode (called with the brain)
+def DockedRiderState(brain, val):
+    if brain.RiderInDockedBucket() == 1:
+        return kBucketStates.Boarded
+    return kBucketStates.Stop
+
+def DockedRiderStateFF(brain, val):
+    return (DockedRiderState(brain, val), 1)
+
+def DumpDoneState(brain, val):
+    if brain.GetAgeSDL()[kStringAgeSDLLoopMode][0] == 1:
+        return kBucketStates.Run
+    return DockedRiderStateFF(brain, val)
+
+def DumpDoneQBoardState(brain, val):
+    if brain.GetAgeSDL()[kStringAgeSDLLoopMode][0] == 1:
+        return (kBucketStates.QBoardQRun, 1)
+    return (kBucketStates.QBoard, 1)
+
+#The bucket state machine: (state, input) -> new state or (new state, fastforward)
+#Power transitions are picked by the power value (1 = on, 0 = off)
+kBucketTransitions = {
+    (kBucketStates.QStop,           kBucketInputs.Power):       {1: (kBucketStates.Run, 1)},
+    (kBucketStates.Stop,            kBucketInputs.Power):       {1: kBucketStates.QRun},
+    (kBucketStates.QRun,            kBucketInputs.Power):       {0: DockedRiderStateFF},
+    (kBucketStates.Run,             kBucketInputs.Power):       {0: kBucketStates.QStop},
+    (kBucketStates.QBoard,          kBucketInputs.Power):       {1: (kBucketStates.QBoardQRun, 1)},
+    (kBucketStates.QBoardQRun,      kBucketInputs.Power):       {0: (kBucketStates.QBoard, 1)},
+    (kBucketStates.Boarded,         kBucketInputs.Power):       {1: kBucketStates.QRun},
+    (kBucketStates.Dump,            kBucketInputs.Power):       {0: kBucketStates.DumpQStop},
+    (kBucketStates.DumpQStop,       kBucketInputs.Power):       {1: (kBucketStates.Dump, 1)},
+    (kBucketStates.DumpQBoard,      kBucketInputs.Power):       {0: (kBucketStates.DumpQBoardQStop, 1)},
+    (kBucketStates.DumpQBoardQStop, kBucketInputs.Power):       {1: (kBucketStates.DumpQBoard, 1)},
+
+    (kBucketStates.QRun,            kBucketInputs.Timer):       kBucketStates.Run,
+
+    (kBucketStates.QStop,           kBucketInputs.StopCB):      kBucketStates.Stop,
+
+    (kBucketStates.Stop,            kBucketInputs.Board):       kBucketStates.QBoard,
+    (kBucketStates.Boarded,         kBucketInputs.Board):       kBucketStates.QBoard,
+    (kBucketStates.QRun,            kBucketInputs.Board):       kBucketStates.QBoardQRun,
+    (kBucketStates.Dump,            kBucketInputs.Board):       kBucketStates.DumpQBoard,
+    (kBucketStates.DumpQStop,       kBucketInputs.Board):       kBucketStates.DumpQBoardQStop,
+
+    (kBucketStates.QBoard,          kBucketInputs.BoardCB):     DockedRiderState,
+    (kBucketStates.QBoardQRun,      kBucketInputs.BoardCB):     kBucketStates.Run,
+    (kBucketStates.DumpQBoard,      kBucketInputs.BoardCB):     (kBucketStates.Dump, 1),
+    (kBucketStates.DumpQBoardQStop, kBucketInputs.BoardCB):     (kBucketStates.DumpQStop, 1),
+
+    (kBucketStates.Run,             kBucketInputs.Dump):        kBucketStates.Dump,
+    (kBucketStates.Stop,            kBucketInputs.Dump):        kBucketStates.DumpQStop,
+
+    (kBucketStates.Dump,            kBucketInputs.DumpCB):      DumpDoneState,
+    (kBucketStates.DumpQStop,       kBucketInputs.DumpCB):      DockedRiderStateFF,
+    (kBucketStates.DumpQBoard,      kBucketInputs.DumpCB):      DumpDoneQBoardState,
+    (kBucketStates.DumpQBoardQStop, kBucketInputs.DumpCB):      kBucketStates.QBoard,
+
+    (kBucketStates.Stop,            kBucketInputs.WCPswitch):   kBucketStates.Run,
+    (kBucketStates.Boarded,         kBucketInputs.WCPswitch):   kBucketStates.Run,
+    (kBucketStates.QRun,            kBucketInputs.WCPswitch):   kBucketStates.Run,
+    (kBucketStates.QStop,           kBucketInputs.WCPswitch):   kBucketStates.Run,
+    (kBucketStates.QBoard,          kBucketInputs.WCPswitch):   (kBucketStates.QBoardQRun, 1),
+    (kBucketStates.DumpQBoardQStop, kBucketInputs.WCPswitch):   (kBucketStates.DumpQBoard, 1),
+    (kBucketStates.DumpQStop,       kBucketInputs.WCPswitch):   (kBucketStates.Dump, 1),
+}
+kBucketMachine = StateMachine("tldnBucketBrain", kBucketStates, kBucketInputs, kBucketTransitions)
+
       
 
 class tldnBucketBrain(ptResponder):
@@ -161,8 +229,9 @@ class tldnBucketBrain(ptResponder):
         ptResponder.__init__(self)
         self.id = 5006
         
-        version = 18
+        version = 19
         self.version = version
+        self.ageSDL = None
         PtDebugPrint("__init__tldnBucketBrain v.%s" %version)
 
 
@@ -1008,213 +1077,36 @@ class tldnBucketBrain(ptResponder):
             
 
     def UpdateBucketState(self, param, val=0):
-        "This is the TRUE bucket brain (i.e. state machine)"
-        global buckets
-
+        "This is the TRUE bucket brain (i.e. state machine, see kBucketTransitions)"
         #Get the current bucke state...
-        ageSDL = PtGetAgeSDL()
+        ageSDL = self.GetAgeSDL()
         curBucketState = ageSDL[kStringAgeSDLBucketState][0]
 
-        fastforward = 0  #fastforward to state       
-        error = 0  #error reporting
-
         PtDebugPrint("tldnBucketBrain.UpdateBucketState():-->Incomming state change request: state (%s), parameter (%s), value (%s)" % (kBucketStates.ToString(curBucketState), kBucketInputs.ToString(param),val),level=kDebugDumpLevel)
 
-
-        ############[ Power ]#############
-        if param == kBucketInputs.Power:
-            #--------------[ Power-->QStop ]---------------
-            if curBucketState == kBucketStates.QStop and val == 1:
-                curBucketState = kBucketStates.Run
-                fastforward = 1
-            #--------------[ Power-->Stop ]---------------
-            elif curBucketState ==  kBucketStates.Stop and val == 1:
-                curBucketState = kBucketStates.QRun
-            #--------------[ Power-->QRun ]---------------
-            elif curBucketState == kBucketStates.QRun and val == 0:
-                if self.RiderInDockedBucket() == 1:
-                    curBucketState = kBucketStates.Boarded
-                else:
-                    curBucketState = kBucketStates.Stop
-                fastforward = 1
-            #--------------[ Power-->Run ]---------------
-            elif curBucketState == kBucketStates.Run and val == 0:
-                curBucketState = kBucketStates.QStop
-            #--------------[ Power-->QBoard ]---------------
-            elif curBucketState == kBucketStates.QBoard and val == 1:
-                curBucketState = kBucketStates.QBoardQRun
-                fastforward = 1
-            #--------------[ Power-->QBoardQRun ]---------------
-            elif curBucketState == kBucketStates.QBoardQRun and val == 0:
-                curBucketState = kBucketStates.QBoard
-                fastforward = 1
-            #--------------[ Power-->Boarded ]---------------
-            elif curBucketState == kBucketStates.Boarded and val == 1:
-                curBucketState = kBucketStates.QRun
-            #--------------[ Power-->Dump ]---------------
-            elif curBucketState == kBucketStates.Dump and val == 0:
-                curBucketState = kBucketStates.DumpQStop
-            #--------------[ Power-->DumpQStop ]---------------
-            elif curBucketState == kBucketStates.DumpQStop and val == 1:
-                curBucketState = kBucketStates.Dump
-                fastforward = 1
-            #--------------[ Power-->DumpQBoard ]---------------
-            elif curBucketState == kBucketStates.DumpQBoard and val == 0:
-                curBucketState = kBucketStates.DumpQBoardQStop
-                fastforward = 1
-            #--------------[ Power-->DumpQBoardQStop ]---------------
-            elif curBucketState == kBucketStates.DumpQBoardQStop and val == 1:
-                curBucketState = kBucketStates.DumpQBoard
-                fastforward = 1
-            else:
-                error = 1
-
-        ############[ Timer ]#############                
-        elif param == kBucketInputs.Timer:
-            if curBucketState == kBucketStates.QRun:
-                curBucketState = kBucketStates.Run
-            else:
-                error = 1
-
-        ############[ StopCB ]#############
-        elif param == kBucketInputs.StopCB:
-            if curBucketState == kBucketStates.QStop:
-                curBucketState = kBucketStates.Stop
-            else:
-                error = 1
-
-        ############[ Board ]#############
-        elif param == kBucketInputs.Board:
-            #--------------[ Board-->QStop ]---------------
-            if curBucketState == kBucketStates.Stop:
-                curBucketState = kBucketStates.QBoard
-            #--------------[ Board-->Boarded ]---------------
-            elif curBucketState == kBucketStates.Boarded:
-                curBucketState = kBucketStates.QBoard
-            #--------------[ Board-->QRun ]---------------                
-            elif curBucketState == kBucketStates.QRun:
-                curBucketState = kBucketStates.QBoardQRun
-            #--------------[ Board-->Dump ]---------------                
-            elif curBucketState == kBucketStates.Dump:
-                curBucketState = kBucketStates.DumpQBoard
-            #--------------[ Board-->DumpQStop ]---------------
-            elif curBucketState == kBucketStates.DumpQStop:
-                curBucketState = kBucketStates.DumpQBoardQStop
-            else:
-                error = 1
-
-
-        
-        ############[ BoardCB ]#############
-        elif param == kBucketInputs.BoardCB:
-            riderInBucket = self.RiderInDockedBucket()  #Tye might not be necessary to put this here...
-
-            #--------------[ BoardCB-->QBoard ]---------------
-            if curBucketState == kBucketStates.QBoard:
-                if riderInBucket == 1:
-                    curBucketState = kBucketStates.Boarded
-                else:
-                    curBucketState = kBucketStates.Stop
-            #--------------[ BoardCB-->QBoardQRun ]---------------
-            elif curBucketState == kBucketStates.QBoardQRun:
-                curBucketState = kBucketStates.Run
-            #--------------[ BoardCB-->DumpQBoard ]---------------
-            elif curBucketState == kBucketStates.DumpQBoard:
-                curBucketState = kBucketStates.Dump
-                fastforward = 1
-            #--------------[ BoardCB-->DumpQBoardQStop ]---------------
-            elif curBucketState == kBucketStates.DumpQBoardQStop:
-                curBucketState = kBucketStates.DumpQStop
-                fastforward = 1
-            else:
-                error = 1
-                
-
-
-        ############[ Dump ]#############
-        elif param == kBucketInputs.Dump:
-            #--------------[ Dump-->Run ]---------------
-            if curBucketState == kBucketStates.Run:
-                curBucketState = kBucketStates.Dump
-            elif curBucketState == kBucketStates.Stop:
-                curBucketState = kBucketStates.DumpQStop
-            else:
-                error = 1
-
-
-        ############[ DumpCB ]#############
-        elif param == kBucketInputs.DumpCB:
-            #Get Loop mode....
-            loopMode = ageSDL[kStringAgeSDLLoopMode][0]
-            #--------------[ DumpCB-->Dump ]---------------
-            if curBucketState == kBucketStates.Dump:
-                if loopMode == 1:
-                    curBucketState = kBucketStates.Run
-                else:
-                    fastforward = 1
-                    if self.RiderInDockedBucket():
-                        curBucketState = kBucketStates.Boarded
-                    else:
-                        curBucketState = kBucketStates.Stop
-            #--------------[ DumpCB-->DumpQStop ]---------------
-            elif curBucketState == kBucketStates.DumpQStop:
-                fastforward = 1
-                if self.RiderInDockedBucket():
-                    curBucketState = kBucketStates.Boarded
-                else:
-                    curBucketState = kBucketStates.Stop
-            #--------------[ DumpCB-->DumpQBoard ]---------------
-            elif curBucketState == kBucketStates.DumpQBoard:
-                fastforward = 1
-                if loopMode == 1:
-                    curBucketState = kBucketStates.QBoardQRun
-                else:
-                    curBucketState = kBucketStates.QBoard
-            #--------------[ DumpCB-->DumpQBoardQStop ]---------------
-            elif curBucketState == kBucketStates.DumpQBoardQStop:
-                curBucketState = kBucketStates.QBoard
-            else:
-                error = 1
-
-        ############[ WCPswitch ]#############
-        elif param == kBucketInputs.WCPswitch:
-            instantStartStates = (kBucketStates.Stop, kBucketStates.Boarded, kBucketStates.QRun, kBucketStates.QStop)
-            #--------------[ WCPswitch-->instantStartStates ]---------------
-            if curBucketState in instantStartStates:
-                curBucketState = kBucketStates.Run
-            #--------------[ WCPswitch-->QBoard ]---------------
-            elif curBucketState == kBucketStates.QBoard:
-                curBucketState = kBucketStates.QBoardQRun
-                fastforward = 1
-            #--------------[ WCPswitch-->DumpQBoardQStop ]---------------
-            elif curBucketState == kBucketStates.DumpQBoardQStop:
-                curBucketState = kBucektStates.DumpQBoard
-                fastforward = 1
-            #--------------[ WCPswitch-->DumpQStop ]---------------    
-            elif curBucketState == kBucketStates.DumpQStop:
-                curBucketState = kBucketStates.Dump
-                fastforward = 1
-            else:
-                error = 1
-
-
-
-        ############[ UNRECOGNIZED INPUT ]#############    
-        else:
+        if kBucketInputs.ToString(param) is None:
             #Need to cut out here; if we try to enter error reporting below, then we'll crash the script!
             PtDebugPrint("ERROR: tldnBucketBrain.UpdateBucketState():-->Unknown input: %s" % param,level=kErrorLevel)
             return
 
+        transition = kBucketMachine.Transition(curBucketState, param, val, self)
+
         #Propigate to all clients if an error did not occur
         #Tye: we could just prop to all clients irregardless of an error?!???
-        if error:
+        if transition is None:
             PtDebugPrint("ERROR: tldnBucketBrain.UpdateBucketState():-->Unknown state (%s), parameter (%s), and value (%s) combo" % (kBucketStates.ToString(curBucketState), kBucketInputs.ToString(param),val),level=kErrorLevel)
         else:
             #Push state to other clients..
+            curBucketState, fastforward = transition
             PtDebugPrint("tldnBucketBrain.UpdateBucketState(): ----[ Updating EVERYONE\'s State to: %s ]----" % (kBucketStates.ToString(curBucketState)),level=kDebugDumpLevel)
             ageSDL[kStringAgeSDLBucketState] = (curBucketState, fastforward)
 
 
+    def GetAgeSDL(self):
+        "The age SDL doesn't change while we're in the age, so only get it once"
+        if self.ageSDL is None:
+            self.ageSDL = PtGetAgeSDL()
+        return self.ageSDL
 
 
     def RunBucketState(self, curBucketState, fastforward = 0, param = 0):
@@ -1400,7 +1292,7 @@ class tldnBucketBrain(ptResponder):
         "Find out if a rider is in the docked bucket"
         global buckets
                 
-        ageSDL = PtGetAgeSDL()
+        ageSDL = self.GetAgeSDL()
 
         riders = ageSDL[kStringAgeSDLRiders]
         bucketAtEntry = ageSDL[kStringAgeSDLBucketAtEntry][0]
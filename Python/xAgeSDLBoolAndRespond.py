@@ -51,6 +51,7 @@ one of two responders depending on true/false
 
 from Plasma import *
 from PlasmaTypes import *
+import xSDLDispatch
 import string
 
 # ---------
@@ -88,14 +89,14 @@ class xAgeSDLBoolAndRespond(ptResponder):
         
         try:
             ageSDL = PtGetAgeSDL()
-            ageSDL.setNotify(self.key,stringVar1Name.value,0.0)
-            ageSDL.setNotify(self.key,stringVar2Name.value,0.0)
+            xSDLDispatch.SubscribeSDL(self,stringVar1Name.value)
+            xSDLDispatch.SubscribeSDL(self,stringVar2Name.value)
             if ageSDL[stringVar1Name.value][0] and ageSDL[stringVar2Name.value][0]:
-                PtDebugPrint("DEBUG: xAgeSDLBoolAndRespond.OnServerInitComplete:\tRunning true responder on %s, fastforward=%d" % (self.sceneobject.getName(), boolFFOnInit.value))
+                PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolAndRespond.OnServerInitComplete:\tRunning true responder on %s, fastforward=%d" % (self.sceneobject.getName(), boolFFOnInit.value),level=kDebugDumpLevel)
                 respBoolTrue.run(self.key,fastforward=boolFFOnInit.value)
                 boolCurrentState = true
             else:
-                PtDebugPrint("DEBUG: xAgeSDLBoolAndRespond.OnServerInitComplete:\tRunning false responder on %s, fastforward=%d" % (self.sceneobject.getName(), boolFFOnInit.value))
+                PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolAndRespond.OnServerInitComplete:\tRunning false responder on %s, fastforward=%d" % (self.sceneobject.getName(), boolFFOnInit.value),level=kDebugDumpLevel)
                 respBoolFalse.run(self.key,fastforward=boolFFOnInit.value)
                 boolCurrentState = false
         except:
@@ -111,13 +112,16 @@ class xAgeSDLBoolAndRespond(ptResponder):
             boolCurrentState = false
 
     def OnSDLNotify(self,VARname,SDLname,playerID,tag):
+        xSDLDispatch.DispatchSDLNotify(self,VARname,SDLname,playerID,tag)
+
+    def OnSDLChange(self,VARname,SDLname,playerID,tag,value):
         global boolCurrentState
         
         # is it a var we care about?
         if VARname != stringVar1Name.value and VARname != stringVar2Name.value:
             return
         ageSDL = PtGetAgeSDL()
-        PtDebugPrint("DEBUG: xAgeSDLBoolAndRespond.OnSDLNotify():\t VARname:%s, SDLname:%s, tag:%s, value:%d" % (VARname,SDLname,tag,ageSDL[VARname][0]))
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolAndRespond.OnSDLNotify():\t VARname:%s, SDLname:%s, tag:%s, value:%d" % (VARname,SDLname,tag,value[0]),level=kDebugDumpLevel)
 
         # is state change from player or vault manager?
         if playerID: # non-zero means it's a player
@@ -126,7 +130,7 @@ class xAgeSDLBoolAndRespond(ptResponder):
         else:   # invalid player aka Vault Manager
             objAvatar = None
             fastforward = boolVltMgrFastForward.value # we need to skip any one-shots
-        PtDebugPrint("DEBUG: xAgeSDLBoolAndRespond.OnSDLNotify():\tnotification from playerID: %d" % (playerID))
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolAndRespond.OnSDLNotify():\tnotification from playerID: %d" % (playerID),level=kDebugDumpLevel)
 
         # does the change change our current state?
         if boolCurrentState == false and (ageSDL[stringVar1Name.value][0] and ageSDL[stringVar2Name.value][0]):
@@ -134,14 +138,14 @@ class xAgeSDLBoolAndRespond(ptResponder):
         elif boolCurrentState == true and not (ageSDL[stringVar1Name.value][0] and ageSDL[stringVar2Name.value][0]):
             boolCurrentState = false
         else:
-            PtDebugPrint("DEBUG: xAgeSDLBoolAndRespond.OnSDLNotify():\t %s ANDed state didn't change." % (self.sceneobject.getName()))
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolAndRespond.OnSDLNotify():\t %s ANDed state didn't change." % (self.sceneobject.getName()),level=kDebugDumpLevel)
             return
-        PtDebugPrint("DEBUG: xAgeSDLBoolAndRespond.OnSDLNotify():\t state changed to %d" % (boolCurrentState))
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolAndRespond.OnSDLNotify():\t state changed to %d" % (boolCurrentState),level=kDebugDumpLevel)
             
         # run the appropriate responder!
         if boolCurrentState:
-            PtDebugPrint("DEBUG: xAgeSDLBoolAndRespond.OnSDLNotify:\tRunning true responder on %s, fastforward=%d" % (self.sceneobject.getName(), fastforward))
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolAndRespond.OnSDLNotify:\tRunning true responder on %s, fastforward=%d" % (self.sceneobject.getName(), fastforward),level=kDebugDumpLevel)
             respBoolTrue.run(self.key,avatar=objAvatar,fastforward=fastforward)
         else:
-            PtDebugPrint("DEBUG: xAgeSDLBoolAndRespond.OnSDLNotify:\tRunning false responder on %s, fastforward=%d" % (self.sceneobject.getName(), fastforward))
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolAndRespond.OnSDLNotify:\tRunning false responder on %s, fastforward=%d" % (self.sceneobject.getName(), fastforward),level=kDebugDumpLevel)
             respBoolFalse.run(self.key,avatar=objAvatar,fastforward=fastforward)
@@ -50,6 +50,7 @@ detects changes in two age sdl bools and sets a third...A and B => C
 
 from Plasma import *
 from PlasmaTypes import *
+import xSDLDispatch
 import string
 
 # ---------
@@ -79,28 +80,31 @@ class xAgeSDLBoolAndSet(ptResponder):
         ageSDL = PtGetAgeSDL()
         ageSDL.setFlags(stringResult.value,1,1)
         ageSDL.sendToClients(stringResult.value)
-        ageSDL.setNotify(self.key,stringOpA.value,0.0)
-        ageSDL.setNotify(self.key,stringOpB.value,0.0)
+        xSDLDispatch.SubscribeSDL(self,stringOpA.value)
+        xSDLDispatch.SubscribeSDL(self,stringOpB.value)
         # correct state (doesn't hurt if it's already correct)
         try:
             result = (ageSDL[stringOpA.value][0] and ageSDL[stringOpB.value][0])
             ageSDL[stringResult.value] = ( result, )
-            PtDebugPrint("DEBUG: xAgeSDLBoolAndSet.OnServerInitComplete:\tset %s=%d" % (stringResult.value,result))
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolAndSet.OnServerInitComplete:\tset %s=%d" % (stringResult.value,result),level=kDebugDumpLevel)
         except:
             PtDebugPrint("ERROR: xAgeSDLBoolAndSet.OnServerInitComplete:\tcan't access age sdl")
         
     def OnSDLNotify(self,VARname,SDLname,playerID,tag):
+        xSDLDispatch.DispatchSDLNotify(self,VARname,SDLname,playerID,tag)
+
+    def OnSDLChange(self,VARname,SDLname,playerID,tag,value):
         # is it a var we care about?
         if VARname != stringOpA.value and VARname != stringOpB.value:
             return
         ageSDL = PtGetAgeSDL()
-        PtDebugPrint("DEBUG: xAgeSDLBoolAndSet.OnSDLNotify():\t VARname:%s, SDLname:%s, tag:%s, value:%d" % (VARname,SDLname,tag,ageSDL[VARname][0]))
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolAndSet.OnSDLNotify():\t VARname:%s, SDLname:%s, tag:%s, value:%d" % (VARname,SDLname,tag,value[0]),level=kDebugDumpLevel)
 
         # Set the sdl value
         try:
             result = (ageSDL[stringOpA.value][0] and ageSDL[stringOpB.value][0])
             ageSDL[stringResult.value] = ( result, )
-            PtDebugPrint("DEBUG: xAgeSDLBoolAndSet.OnSDLNotify:\tset %s=%d" % (stringResult.value,result))
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolAndSet.OnSDLNotify:\tset %s=%d" % (stringResult.value,result),level=kDebugDumpLevel)
         except:
             PtDebugPrint("ERROR: xAgeSDLBoolAndSet.OnServerInitComplete:\tcan't access age sdl")
 
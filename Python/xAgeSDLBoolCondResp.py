@@ -66,7 +66,7 @@ class xAgeSDLBoolCondResp(ptResponder):
         self.id = 1000
         self.version = 1
 
-        PtDebugPrint("DEBUG: xAgeSDLBoolCondResp.__init__: version = %d" % self.version)
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolCondResp.__init__: version = %d" % self.version,level=kDebugDumpLevel)
         self.invalidVarName = 0
         self.initFinished = 0
 
@@ -87,7 +87,7 @@ class xAgeSDLBoolCondResp(ptResponder):
         #print "DEBUG: xAgeSDLBoolCondResp.OnServerInitComplete()\tRegistered var is: %s = %s" % (strSDLVar.value, ageSDL[strSDLVar.value][0])
         if ageSDL[strSDLVar.value][0] == boolOnTrue.value:
             respResponder.run(self.key, fastforward=boolInitFF.value)
-            PtDebugPrint("DEBUG: xAgeSDLBoolCondResp.OnServerInitComplete():\tRunning responder on %s, fastforward=%d" % (self.sceneobject.getName(), boolInitFF.value))
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolCondResp.OnServerInitComplete():\tRunning responder on %s, fastforward=%d" % (self.sceneobject.getName(), boolInitFF.value),level=kDebugDumpLevel)
 
         self.initFinished = 1
 
@@ -97,12 +97,12 @@ class xAgeSDLBoolCondResp(ptResponder):
             return
 
         if self.invalidVarName:
-            PtDebugPrint("DEBUG: xAgeSDLBoolCondResp.OnNotify():\tRunning responder on %s, fastforward=%d" % (self.sceneobject.getName(), boolInitFF.value))
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolCondResp.OnNotify():\tRunning responder on %s, fastforward=%d" % (self.sceneobject.getName(), boolInitFF.value),level=kDebugDumpLevel)
             return
 
         ageSDL = PtGetAgeSDL()
         curVal = ageSDL[strSDLVar.value][0]
 
         if id == actTrigger.id and curVal == boolOnTrue.value:
-            PtDebugPrint("DEBUG: xAgeSDLBoolCondResp.OnNotify():\tRunning repsonder on %s" %self.sceneobject.getName())
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolCondResp.OnNotify():\tRunning repsonder on %s" %self.sceneobject.getName(),level=kDebugDumpLevel)
             respResponder.run(self.key)
@@ -51,6 +51,7 @@ one of two responders depending on new state
 
 from Plasma import *
 from PlasmaTypes import *
+import xSDLDispatch
 import string
 
 # ---------
@@ -93,12 +94,12 @@ class xAgeSDLBoolRespond(ptResponder):
             if type(stringVarName.value) == type("") and stringVarName.value != "":
                 ageSDL.setFlags(stringVarName.value,1,1)
                 ageSDL.sendToClients(stringVarName.value)
-                ageSDL.setNotify(self.key,stringVarName.value,0.0)
+                xSDLDispatch.SubscribeSDL(self,stringVarName.value)
                 if ageSDL[stringVarName.value][0]:
-                    PtDebugPrint("DEBUG: xAgeSDLBoolRespond.IFinishInit():\tRunning true responder on %s, fastforward=%d" % (self.sceneobject.getName(), boolFFOnInit.value))
+                    PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolRespond.IFinishInit():\tRunning true responder on %s, fastforward=%d" % (self.sceneobject.getName(), boolFFOnInit.value),level=kDebugDumpLevel)
                     respBoolTrue.run(self.key,fastforward=boolFFOnInit.value)
                 else:
-                    PtDebugPrint("DEBUG: xAgeSDLBoolRespond.IFinishInit():\tRunning false responder on %s, fastforward=%d" % (self.sceneobject.getName(), boolFFOnInit.value))
+                    PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolRespond.IFinishInit():\tRunning false responder on %s, fastforward=%d" % (self.sceneobject.getName(), boolFFOnInit.value),level=kDebugDumpLevel)
                     respBoolFalse.run(self.key,fastforward=boolFFOnInit.value)
             else:
                 PtDebugPrint("ERROR: xAgeSDLBoolRespond.IFinishInit():\tERROR: missing SDL var name")
@@ -118,12 +119,14 @@ class xAgeSDLBoolRespond(ptResponder):
 
     # in case someone other than me changes my var(s)
     def OnSDLNotify(self,VARname,SDLname,playerID,tag):
+        xSDLDispatch.DispatchSDLNotify(self,VARname,SDLname,playerID,tag)
+
+    def OnSDLChange(self,VARname,SDLname,playerID,tag,value):
         
         # is it a var we care about?
         if VARname != stringVarName.value:
             return
-        ageSDL = PtGetAgeSDL()
-        PtDebugPrint("DEBUG: xAgeSDLBoolRespond.OnSDLNotify():\t VARname:%s, SDLname:%s, tag:%s, value:%d" % (VARname,SDLname,tag,ageSDL[stringVarName.value][0]))
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolRespond.OnSDLNotify():\t VARname:%s, SDLname:%s, tag:%s, value:%d" % (VARname,SDLname,tag,value[0]),level=kDebugDumpLevel)
             
         # is state change from player or vault manager?
         if playerID: # non-zero means it's a player
@@ -132,12 +135,12 @@ class xAgeSDLBoolRespond(ptResponder):
         else:   # invalid player aka Vault Manager
             objAvatar = None
             fastforward = boolVltMgrFastForward.value # we need to skip any one-shots
-        PtDebugPrint("DEBUG: xAgeSDLBoolRespond.OnSDLNotify():\tnotification from playerID: %d" % (playerID))
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolRespond.OnSDLNotify():\tnotification from playerID: %d" % (playerID),level=kDebugDumpLevel)
 
         # run the appropriate responder!
-        if ageSDL[stringVarName.value][0]:
-            PtDebugPrint("DEBUG: xAgeSDLBoolRespond.OnSDLNotify:\tRunning true responder on %s, fastforward=%d" % (self.sceneobject.getName(), fastforward))
+        if value[0]:
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolRespond.OnSDLNotify:\tRunning true responder on %s, fastforward=%d" % (self.sceneobject.getName(), fastforward),level=kDebugDumpLevel)
             respBoolTrue.run(self.key,avatar=objAvatar,fastforward=fastforward)
         else:
-            PtDebugPrint("DEBUG: xAgeSDLBoolRespond.OnSDLNotify:\tRunning false responder on %s, fastforward=%d" % (self.sceneobject.getName(), fastforward))
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolRespond.OnSDLNotify:\tRunning false responder on %s, fastforward=%d" % (self.sceneobject.getName(), fastforward),level=kDebugDumpLevel)
             respBoolFalse.run(self.key,avatar=objAvatar,fastforward=fastforward)
@@ -84,7 +84,7 @@ class xAgeSDLBoolSet(ptResponder):
             return
         else:
             if type(actTrigger.value) == type([]) and len(actTrigger.value) > 0:
-                PtDebugPrint("DEBUG: xAgeSDLBoolSet.OnNotify():\t local player requesting %s change via %s" % (stringVarName.value,actTrigger.value[0].getName()) )
+                PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolSet.OnNotify():\t local player requesting %s change via %s" % (stringVarName.value,actTrigger.value[0].getName()),level=kDebugDumpLevel)
                 pass
                 
         # error check
@@ -96,5 +96,5 @@ class xAgeSDLBoolSet(ptResponder):
         # Set the sdl value
         ageSDL.setTagString(stringVarName.value,stringInfo.value)
         ageSDL[stringVarName.value] = (intValue.value,)
-        PtDebugPrint("DEBUG: xAgeSDLBoolSet.OnNotify():\tset age SDL var %s to %d" % (stringVarName.value,intValue.value) )
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolSet.OnNotify():\tset age SDL var %s to %d" % (stringVarName.value,intValue.value),level=kDebugDumpLevel)
 
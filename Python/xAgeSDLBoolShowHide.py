@@ -50,6 +50,7 @@ Detects age SDL bool type variable change and shows (on true) or hides (on false
 
 from Plasma import *
 from PlasmaTypes import *
+import xSDLDispatch
 import string
 
 stringVarName = ptAttribString(1,"Age SDL Var Name")
@@ -75,7 +76,7 @@ class xAgeSDLBoolShowHide(ptMultiModifier):
                 if type(stringVarName.value) == type("") and stringVarName.value != "":
                     ageSDL.setFlags(stringVarName.value,1,1)
                     ageSDL.sendToClients(stringVarName.value)
-                    ageSDL.setNotify(self.key,stringVarName.value,0.0)
+                    xSDLDispatch.SubscribeSDL(self,stringVarName.value)
                     if not (ageSDL[stringVarName.value][0] ^ boolShowOnTrue.value):
                         self.EnableObject()
                     else:
@@ -93,7 +94,7 @@ class xAgeSDLBoolShowHide(ptMultiModifier):
                 if type(stringVarName.value) == type("") and stringVarName.value != "":
                     ageSDL.setFlags(stringVarName.value,1,1)
                     ageSDL.sendToClients(stringVarName.value)
-                    ageSDL.setNotify(self.key,stringVarName.value,0.0)
+                    xSDLDispatch.SubscribeSDL(self,stringVarName.value)
                     if not (ageSDL[stringVarName.value][0] ^ boolShowOnTrue.value):
                         self.EnableObject()
                     else:
@@ -111,13 +112,15 @@ class xAgeSDLBoolShowHide(ptMultiModifier):
         else:
             self.DisableObject()
 
-    def OnSDLNotify(self,VARname,SDLname,playerID,tag):        
+    def OnSDLNotify(self,VARname,SDLname,playerID,tag):
+        xSDLDispatch.DispatchSDLNotify(self,VARname,SDLname,playerID,tag)
+
+    def OnSDLChange(self,VARname,SDLname,playerID,tag,value):
         if VARname != stringVarName.value:
             return
-        ageSDL = PtGetAgeSDL()
         #PtDebugPrint("Received SDLNotify on %s" % self.sceneobject.getName())
         try:
-            if not (ageSDL[stringVarName.value][0] ^ boolShowOnTrue.value):
+            if not (value[0] ^ boolShowOnTrue.value):
                 self.EnableObject()
             else:
                 self.DisableObject()
@@ -126,12 +129,12 @@ class xAgeSDLBoolShowHide(ptMultiModifier):
             pass
 
     def EnableObject(self):
-        PtDebugPrint("DEBUG: xAgeSDLBoolShowHide.EnableObject:  Attempting to enable drawing and collision on %s..." % self.sceneobject.getName())
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolShowHide.EnableObject:  Attempting to enable drawing and collision on %s..." % self.sceneobject.getName(),level=kDebugDumpLevel)
         self.sceneobject.draw.enable()
         self.sceneobject.physics.suppress(false)
 
     def DisableObject(self):
-        PtDebugPrint("DEBUG: xAgeSDLBoolShowHide.DisableObject:  Attempting to disable drawing and collision on %s..." % self.sceneobject.getName())
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolShowHide.DisableObject:  Attempting to disable drawing and collision on %s..." % self.sceneobject.getName(),level=kDebugDumpLevel)
         self.sceneobject.draw.disable()
         self.sceneobject.physics.suppress(true)
 
@@ -143,5 +146,5 @@ class xAgeSDLBoolShowHide(ptMultiModifier):
                 elif param.lower() in ("off", "0", "false"):
                     self.DisableObject()
                 else:
-                    PtDebugPrint("DEBUG: xAgeSDLBoolShowHide.OnBackDoorMsg:  Received unexpected parameter on %s" % self.sceneobject.getName())
+                    PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolShowHide.OnBackDoorMsg:  Received unexpected parameter on %s" % self.sceneobject.getName(),level=kDebugDumpLevel)
                     pass
@@ -49,6 +49,7 @@ Author: Bill Slease
 
 from Plasma import *
 from PlasmaTypes import *
+import xSDLDispatch
 import string
 
 # ---------
@@ -83,12 +84,12 @@ class xAgeSDLBoolToggle(ptResponder):
         ageSDL.setFlags(stringVarName.value,1,1)
         ageSDL.sendToClients(stringVarName.value)
         if type(stringVarName.value) == type("") and stringVarName.value != "":
-            ageSDL.setNotify(self.key,stringVarName.value,0.0)
+            xSDLDispatch.SubscribeSDL(self,stringVarName.value)
             try:
                 boolCurrentValue = ageSDL[stringVarName.value][0]
             except:
                 PtDebugPrint("ERROR: xAgeSDLBoolToggle.OnServerInitComplete():\tERROR reading age SDL")
-            PtDebugPrint("DEBUG: xAgeSDLBoolToggle.OnServerInitComplete():\t%s = %d" % (stringVarName.value,boolCurrentValue) )
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolToggle.OnServerInitComplete():\t%s = %d" % (stringVarName.value,boolCurrentValue),level=kDebugDumpLevel)
         else:
             PtDebugPrint("ERROR: xAgeSDLBoolToggle.OnServerInitComplete():\tERROR: missing SDL var name")
         
@@ -98,7 +99,7 @@ class xAgeSDLBoolToggle(ptResponder):
         # is this notify something I should act on?
         if id == actTrigger.id and state and PtFindAvatar(events) == PtGetLocalAvatar():
             if type(actTrigger.value) == type([]) and len(actTrigger.value) > 0:
-                PtDebugPrint("DEBUG: xAgeSDLBoolToggle.OnNotify():\t local player requesting %s change via %s" % (stringVarName.value,actTrigger.value[0].getName()) )
+                PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolToggle.OnNotify():\t local player requesting %s change via %s" % (stringVarName.value,actTrigger.value[0].getName()),level=kDebugDumpLevel)
         else:
             return
                 
@@ -116,14 +117,16 @@ class xAgeSDLBoolToggle(ptResponder):
             boolCurrentValue = true
             ageSDL.setTagString(stringVarName.value,stringInfo.value)
         ageSDL[stringVarName.value] = (boolCurrentValue,)
-        PtDebugPrint("DEBUG: xAgeSDLBoolToggle.OnNotify():\tset age SDL var %s to %d" % (stringVarName.value,boolCurrentValue) )
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolToggle.OnNotify():\tset age SDL var %s to %d" % (stringVarName.value,boolCurrentValue),level=kDebugDumpLevel)
 
     # in case someone other than me changes my var(s)
     def OnSDLNotify(self,VARname,SDLname,playerID,tag):
+        xSDLDispatch.DispatchSDLNotify(self,VARname,SDLname,playerID,tag)
+
+    def OnSDLChange(self,VARname,SDLname,playerID,tag,value):
         global boolCurrentValue
         
-        ageSDL = PtGetAgeSDL()
         if VARname == stringVarName.value:
-            PtDebugPrint("DEBUG: xAgeSDLBoolToggle.OnSDLNotify():\t VARname:%s, SDLname:%s, tag:%s, value:%d" % (VARname,SDLname,tag,ageSDL[stringVarName.value][0]))
-            boolCurrentValue = ageSDL[stringVarName.value][0]
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolToggle.OnSDLNotify():\t VARname:%s, SDLname:%s, tag:%s, value:%d" % (VARname,SDLname,tag,value[0]),level=kDebugDumpLevel)
+            boolCurrentValue = value[0]
 
@@ -50,6 +50,7 @@ toggles an age sdl bool only if another age sdl bool is true
 
 from Plasma import *
 from PlasmaTypes import *
+import xSDLDispatch
 import string
 
 # ---------
@@ -86,13 +87,13 @@ class xAgeSDLBoolToggleDependent(ptResponder):
         ageSDL = PtGetAgeSDL()
         ageSDL.setFlags(stringVarTarget.value,1,1)
         ageSDL.sendToClients(stringVarTarget.value)
-        ageSDL.setNotify(self.key,stringVarTarget.value,0.0)
+        xSDLDispatch.SubscribeSDL(self,stringVarTarget.value)
         try:
             boolCurrentValue = ageSDL[stringVarTarget.value][0]
         except:
             PtDebugPrint("ERROR: xAgeSDLBoolToggleDependent.OnServerInitComplete():\tERROR reading age SDL")
             pass
-        PtDebugPrint("DEBUG: xAgeSDLBoolToggleDependent.OnServerInitComplete():\t%s = %d, %s = %d" % (stringVarEnabler.value,ageSDL[stringVarEnabler.value][0],stringVarTarget.value,boolCurrentValue) )
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolToggleDependent.OnServerInitComplete():\t%s = %d, %s = %d" % (stringVarEnabler.value,ageSDL[stringVarEnabler.value][0],stringVarTarget.value,boolCurrentValue),level=kDebugDumpLevel)
         
     def OnNotify(self,state,id,events):
         global boolCurrentValue
@@ -103,7 +104,7 @@ class xAgeSDLBoolToggleDependent(ptResponder):
         if not PtWasLocallyNotified(self.key):
             return
         else:
-            PtDebugPrint("DEBUG: xAgeSDLBoolToggleDependent.OnNotify():\t local player requesting %s change via %s" % (stringVarTarget.value,actTrigger.value[0].getName()) )
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolToggleDependent.OnNotify():\t local player requesting %s change via %s" % (stringVarTarget.value,actTrigger.value[0].getName()),level=kDebugDumpLevel)
         
 
         ageSDL = PtGetAgeSDL()
@@ -117,14 +118,16 @@ class xAgeSDLBoolToggleDependent(ptResponder):
             boolCurrentValue = true
             ageSDL.setTagString(stringVarTarget.value,stringInfo.value)
         ageSDL[stringVarTarget.value] = (boolCurrentValue,)
-        PtDebugPrint("DEBUG: xAgeSDLBoolToggleDependent.OnNotify():\tset age SDL var %s to %d" % (stringVarTarget.value,boolCurrentValue) )
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolToggleDependent.OnNotify():\tset age SDL var %s to %d" % (stringVarTarget.value,boolCurrentValue),level=kDebugDumpLevel)
 
     # in case someone other than me changes my var(s)
     def OnSDLNotify(self,VARname,SDLname,playerID,tag):
+        xSDLDispatch.DispatchSDLNotify(self,VARname,SDLname,playerID,tag)
+
+    def OnSDLChange(self,VARname,SDLname,playerID,tag,value):
         global boolCurrentValue
         
-        ageSDL = PtGetAgeSDL()
         if VARname == stringVarTarget.value:
-            PtDebugPrint("DEBUG: xAgeSDLBoolToggleDependent.OnSDLNotify():\t VARname:%s, SDLname:%s, tag:%s, value:%d" % (VARname,SDLname,tag,ageSDL[stringVarTarget.value][0]))
-            boolCurrentValue = ageSDL[stringVarTarget.value][0]
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLBoolToggleDependent.OnSDLNotify():\t VARname:%s, SDLname:%s, tag:%s, value:%d" % (VARname,SDLname,tag,value[0]),level=kDebugDumpLevel)
+            boolCurrentValue = value[0]
 
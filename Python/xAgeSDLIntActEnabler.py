@@ -49,6 +49,7 @@ Author: Adam Van Ornum
 
 from Plasma import *
 from PlasmaTypes import *
+import xSDLDispatch
 
 # define the attributes that will be entered in max
 stringSDLVarName = ptAttribString(1,"Age SDL Variable")
@@ -73,7 +74,7 @@ class xAgeSDLIntActEnabler(ptResponder):
     def OnServerInitComplete(self):
         ageSDL = PtGetAgeSDL()
 
-        PtDebugPrint("DEBUG: xAgeSDLIntActEnabler.OnServerInitComplete:\tOn %s" % stringSDLVarName.value)
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLIntActEnabler.OnServerInitComplete:\tOn %s" % stringSDLVarName.value,level=kDebugDumpLevel)
         
         try:
             self.enabledStateList = stringStartValues.value.split(",")
@@ -82,9 +83,9 @@ class xAgeSDLIntActEnabler(ptResponder):
         except:
             PtDebugPrint("ERROR: xAgeSDLIntActEnabler.OnServerInitComplete():\tERROR: couldn't process start state list")
 
-        PtDebugPrint("DEBUG: xAgeSDLIntActEnabler.OnServerInitComplete:\tSetting notify on %s" % stringSDLVarName.value)
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLIntActEnabler.OnServerInitComplete:\tSetting notify on %s" % stringSDLVarName.value,level=kDebugDumpLevel)
         
-        ageSDL.setNotify(self.key,stringSDLVarName.value,0.0)
+        xSDLDispatch.SubscribeSDL(self,stringSDLVarName.value)
 
         try:
             SDLvalue = ageSDL[stringSDLVarName.value][0]
@@ -92,23 +93,25 @@ class xAgeSDLIntActEnabler(ptResponder):
             PtDebugPrint("ERROR: xAgeSDLIntActEnabler.OnServerInitComplete():\tERROR: age sdl read failed, SDLvalue = %d by default. stringSDLVarName = %s" % (intDefault.value,stringSDLVarName.value))
             SDLvalue = intDefault.value
 
-        PtDebugPrint("DEBUG: xAgeSDLIntActEnabler.OnServerInitComplete:\tCurrent SDL value = %d" % SDLvalue)
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLIntActEnabler.OnServerInitComplete:\tCurrent SDL value = %d" % SDLvalue,level=kDebugDumpLevel)
                 
         if  SDLvalue in self.enabledStateList:
             actActivator.enable()
-            PtDebugPrint("DEBUG: xAgeSDLIntActEnabler.OnServerInitComplete:\t%s activator enabled" % stringSDLVarName.value)
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLIntActEnabler.OnServerInitComplete:\t%s activator enabled" % stringSDLVarName.value,level=kDebugDumpLevel)
         else:
             actActivator.disable()
-            PtDebugPrint("DEBUG: xAgeSDLIntActEnabler.OnServerInitComplete:\t%s activator disabled" % stringSDLVarName.value)
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLIntActEnabler.OnServerInitComplete:\t%s activator disabled" % stringSDLVarName.value,level=kDebugDumpLevel)
             
     def OnSDLNotify(self,VARname,SDLname,PlayerID,tag):
+        xSDLDispatch.DispatchSDLNotify(self,VARname,SDLname,PlayerID,tag)
+
+    def OnSDLChange(self,VARname,SDLname,PlayerID,tag,value):
         if VARname != stringSDLVarName.value:
             return
 
-        ageSDL = PtGetAgeSDL()
-        PtDebugPrint("DEBUG: xAgeSDLIntActEnabler.OnSDLNotify received: %s" % VARname)
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLIntActEnabler.OnSDLNotify received: %s" % VARname,level=kDebugDumpLevel)
         
-        SDLvalue = ageSDL[stringSDLVarName.value][0]
+        SDLvalue = value[0]
         
         if  SDLvalue in self.enabledStateList:
             PtDebugPrint("DEBUG: xAgeSDLIntActEnabler.OnSDLNotify: enabling activator")
@@ -50,6 +50,7 @@ increments, decrements or sets an age SDL integer with options for min value, ma
 
 from Plasma import *
 from PlasmaTypes import *
+import xSDLDispatch
 import string
 
 # ---------
@@ -91,13 +92,13 @@ class xAgeSDLIntChange(ptResponder):
         if type(stringVarName.value) == type("") and stringVarName.value != "":
             ageSDL.setFlags(stringVarName.value,1,1)
             ageSDL.sendToClients(stringVarName.value)
-            ageSDL.setNotify(self.key,stringVarName.value,0.0)
+            xSDLDispatch.SubscribeSDL(self,stringVarName.value)
             try:
                 intCurrentValue = ageSDL[stringVarName.value][0]
             except:
                 PtDebugPrint("ERROR: xAgeSDLIntChange.OnServerInitComplete():\tERROR reading age SDL")
                 pass
-            PtDebugPrint("DEBUG: xAgeSDLIntChange.OnServerInitComplete():\t%s = %d" % (stringVarName.value,intCurrentValue) )
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLIntChange.OnServerInitComplete():\t%s = %d" % (stringVarName.value,intCurrentValue),level=kDebugDumpLevel)
         else:
             PtDebugPrint("ERROR: xAgeSDLIntChange.OnServerInitComplete():\tERROR: missing SDL var name")
             pass
@@ -112,7 +113,7 @@ class xAgeSDLIntChange(ptResponder):
             return
         else:
             if type(actTrigger.value) == type([]) and len(actTrigger.value) > 0:
-                PtDebugPrint("DEBUG: xAgeSDLIntChange.OnNotify():\t local player requesting %s change via %s" % (stringVarName.value,actTrigger.value[0].getName()) )
+                PtDebugPrint(lambda: "DEBUG: xAgeSDLIntChange.OnNotify():\t local player requesting %s change via %s" % (stringVarName.value,actTrigger.value[0].getName()),level=kDebugDumpLevel)
                 pass
                 
         # error check
@@ -143,15 +144,17 @@ class xAgeSDLIntChange(ptResponder):
             
         ageSDL.setTagString(stringVarName.value,stringInfo.value)
         ageSDL[stringVarName.value] = (intCurrentValue,)        
-        PtDebugPrint("DEBUG: xAgeSDLIntChange.OnNotify():\t%s age SDL var %s to %d" % (stringOp,stringVarName.value,intCurrentValue) )
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLIntChange.OnNotify():\t%s age SDL var %s to %d" % (stringOp,stringVarName.value,intCurrentValue),level=kDebugDumpLevel)
 
     # in case someone other than me changes my var(s)
     def OnSDLNotify(self,VARname,SDLname,playerID,tag):
+        xSDLDispatch.DispatchSDLNotify(self,VARname,SDLname,playerID,tag)
+
+    def OnSDLChange(self,VARname,SDLname,playerID,tag,value):
         global intCurrentValue
         
-        ageSDL = PtGetAgeSDL()
         if VARname == stringVarName.value:
-            PtDebugPrint("DEBUG: xAgeSDLIntChange.OnSDLNotify():\t VARname:%s, SDLname:%s, tag:%s, value:%d" % (VARname,SDLname,tag,ageSDL[stringVarName.value][0]))
-            intCurrentValue = ageSDL[stringVarName.value][0]
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLIntChange.OnSDLNotify():\t VARname:%s, SDLname:%s, tag:%s, value:%d" % (VARname,SDLname,tag,value[0]),level=kDebugDumpLevel)
+            intCurrentValue = value[0]
 
 
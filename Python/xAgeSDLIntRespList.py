@@ -49,6 +49,7 @@ Author: Adam Van Ornum
 
 from Plasma import *
 from PlasmaTypes import *
+import xSDLDispatch
 import re
 
 # define the attributes that will be entered in max1
@@ -86,7 +87,7 @@ class xAgeSDLIntRespList(ptResponder):
     def OnServerInitComplete(self):
         ageSDL = PtGetAgeSDL()
         PtDebugPrint("DEBUG: xAgeSDLIntRespList.OnServerInitComplete:\tProcessing")
-        ageSDL.setNotify(self.key,stringSDLVarName.value,0.0)
+        xSDLDispatch.SubscribeSDL(self,stringSDLVarName.value)
         try:
             SDLvalue = ageSDL[stringSDLVarName.value][0]
         except:
@@ -99,16 +100,18 @@ class xAgeSDLIntRespList(ptResponder):
             for key in respList.byObject.keys():
                 #match = regexp.search(key)
                 if key == respName:#match:
-                    PtDebugPrint("DEBUG: xAgeSDLIntRespList.OnServerInitComplete:\tRunning responder - %s" % (stringFormat.value % SDLvalue))
+                    PtDebugPrint(lambda: "DEBUG: xAgeSDLIntRespList.OnServerInitComplete:\tRunning responder - %s" % (stringFormat.value % SDLvalue),level=kDebugDumpLevel)
                     #respList.run(self.key,avatar=None,objectName=match.group(),fastforward=boolStartFF.value)
                     respList.run(self.key,avatar=None,objectName=respName,fastforward=boolStartFF.value)
                     break
             
     def OnSDLNotify(self,VARname,SDLname,PlayerID,tag):
+        xSDLDispatch.DispatchSDLNotify(self,VARname,SDLname,PlayerID,tag)
+
+    def OnSDLChange(self,VARname,SDLname,PlayerID,tag,value):
         if VARname != stringSDLVarName.value:
             return
             
-        ageSDL = PtGetAgeSDL()
         # is state change from player or vault manager?
         if PlayerID: # non-zero means it's a player
             objAvatar = ptSceneobject(PtGetAvatarKeyFromClientID(PlayerID),self.key)
@@ -119,11 +122,11 @@ class xAgeSDLIntRespList(ptResponder):
         if tag == "fastforward":
             objAvatar = None
             fastforward = 1
-        PtDebugPrint("DEBUG: xAgeSDLIntRespList.OnSDLNotify():\tnotification from PlayerID: %d" % (PlayerID))
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLIntRespList.OnSDLNotify():\tnotification from PlayerID: %d" % (PlayerID),level=kDebugDumpLevel)
         
-        SDLvalue = ageSDL[stringSDLVarName.value][0]
+        SDLvalue = value[0]
         
-        PtDebugPrint("DEBUG: xAgeSDLIntRespList.OnSDLNotify received: %s = %d" % (VARname, SDLvalue))
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLIntRespList.OnSDLNotify received: %s = %d" % (VARname, SDLvalue),level=kDebugDumpLevel)
         
         #regexp = re.compile(".*_%s" % (stringFormat.value % SDLvalue))
         respName = (stringFormat.value % SDLvalue)
@@ -132,7 +135,7 @@ class xAgeSDLIntRespList(ptResponder):
             for key in respList.byObject.keys():
                 #match = regexp.search(key)
                 if key == respName:#match:
-                    PtDebugPrint("DEBUG: xAgeSDLIntRespList.OnSDLNotify:\tRunning responder - %s" % (stringFormat.value % SDLvalue))
+                    PtDebugPrint(lambda: "DEBUG: xAgeSDLIntRespList.OnSDLNotify:\tRunning responder - %s" % (stringFormat.value % SDLvalue),level=kDebugDumpLevel)
                     #respList.run(self.key,avatar=objAvatar,objectName=match.group(),fastforward=fastforward)
                     respList.run(self.key,avatar=objAvatar,objectName=respName,fastforward=fastforward)
                     break
@@ -51,6 +51,7 @@ Enter in the states you wish the item to be visible in as a comma separated list
 
 from Plasma import *
 from PlasmaTypes import *
+import xSDLDispatch
 import string
 
 stringVarName = ptAttribString(1,"Age SDL Var Name")
@@ -91,7 +92,7 @@ class xAgeSDLIntShowHide(ptMultiModifier):
                 PtDebugPrint("ERROR: xAgeSDLIntShowHide.OnServerInitComplete():\tERROR: couldn't process start state list")
                 pass
             
-            ageSDL.setNotify(self.key,stringVarName.value,0.0)
+            xSDLDispatch.SubscribeSDL(self,stringVarName.value)
             try:
                 SDLvalue = ageSDL[stringVarName.value][0]
             except:
@@ -100,11 +101,11 @@ class xAgeSDLIntShowHide(ptMultiModifier):
 
             try:
                 if  SDLvalue in self.enabledStateList:
-                    PtDebugPrint("DEBUG: xAgeSDLIntShowHide.OnServerInitComplete: Attempting to enable drawing and collision on %s..." % self.sceneobject.getName())
+                    PtDebugPrint(lambda: "DEBUG: xAgeSDLIntShowHide.OnServerInitComplete: Attempting to enable drawing and collision on %s..." % self.sceneobject.getName(),level=kDebugDumpLevel)
                     self.sceneobject.draw.enable()
                     self.sceneobject.physics.suppress(false)
                 else:
-                    PtDebugPrint("DEBUG: xAgeSDLIntShowHide.OnServerInitComplete: Attempting to disable drawing and collision on %s..." % self.sceneobject.getName())
+                    PtDebugPrint(lambda: "DEBUG: xAgeSDLIntShowHide.OnServerInitComplete: Attempting to disable drawing and collision on %s..." % self.sceneobject.getName(),level=kDebugDumpLevel)
                     self.sceneobject.draw.disable()
                     self.sceneobject.physics.suppress(true)
             except:
@@ -117,32 +118,34 @@ class xAgeSDLIntShowHide(ptMultiModifier):
     def runDefault(self):
         PtDebugPrint("xAgeSDLIntShowHide: running internal default")
         if  intDefault.value in self.enabledStateList:
-            PtDebugPrint("DEBUG: xAgeSDLIntShowHide.OnServerInitComplete: Attempting to enable drawing and collision on %s..." % self.sceneobject.getName())
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLIntShowHide.OnServerInitComplete: Attempting to enable drawing and collision on %s..." % self.sceneobject.getName(),level=kDebugDumpLevel)
             self.sceneobject.draw.enable()
             self.sceneobject.physics.suppress(false)
         else:
-            PtDebugPrint("DEBUG: xAgeSDLIntShowHide.OnServerInitComplete: Attempting to disable drawing and collision on %s..." % self.sceneobject.getName())
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLIntShowHide.OnServerInitComplete: Attempting to disable drawing and collision on %s..." % self.sceneobject.getName(),level=kDebugDumpLevel)
             self.sceneobject.draw.disable()
             self.sceneobject.physics.suppress(true)
 
-    def OnSDLNotify(self,VARname,SDLname,playerID,tag):        
+    def OnSDLNotify(self,VARname,SDLname,playerID,tag):
+        xSDLDispatch.DispatchSDLNotify(self,VARname,SDLname,playerID,tag)
+
+    def OnSDLChange(self,VARname,SDLname,playerID,tag,value):
         if VARname != stringVarName.value:
             return
 
-        ageSDL = PtGetAgeSDL()
-        SDLvalue = ageSDL[stringVarName.value][0]
+        SDLvalue = value[0]
         if  SDLvalue in self.enabledStateList:
             self.EnableObject()
         else:
             self.DisableObject()
 
     def EnableObject(self):
-        PtDebugPrint("DEBUG: xAgeSDLIntShowHide.EnableObject:  Attempting to enable drawing and collision on %s..." % self.sceneobject.getName())
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLIntShowHide.EnableObject:  Attempting to enable drawing and collision on %s..." % self.sceneobject.getName(),level=kDebugDumpLevel)
         self.sceneobject.draw.enable()
         self.sceneobject.physics.suppress(false)
 
     def DisableObject(self):
-        PtDebugPrint("DEBUG: xAgeSDLIntShowHide.DisableObject:  Attempting to disable drawing and collision on %s..." % self.sceneobject.getName())
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLIntShowHide.DisableObject:  Attempting to disable drawing and collision on %s..." % self.sceneobject.getName(),level=kDebugDumpLevel)
         self.sceneobject.draw.disable()
         self.sceneobject.physics.suppress(true)
 
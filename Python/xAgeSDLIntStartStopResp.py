@@ -49,6 +49,7 @@ Author: Adam Van Ornum
 
 from Plasma import *
 from PlasmaTypes import *
+import xSDLDispatch
 
 # define the attributes that will be entered in max
 stringSDLVarName = ptAttribString(1,"Age SDL Variable")
@@ -86,7 +87,7 @@ class xAgeSDLIntStartStopResp(ptResponder):
             pass
         
         PtDebugPrint("DEBUG: xAgeSDLIntStartStopResp.OnServerInitComplete:\tProcessing")
-        ageSDL.setNotify(self.key,stringSDLVarName.value,0.0)
+        xSDLDispatch.SubscribeSDL(self,stringSDLVarName.value)
         try:
             SDLvalue = ageSDL[stringSDLVarName.value][0]
         except:
@@ -103,13 +104,15 @@ class xAgeSDLIntStartStopResp(ptResponder):
             respStop.run(self.key,avatar=None,fastforward=fastforward)
             
     def OnSDLNotify(self,VARname,SDLname,PlayerID,tag):
+        xSDLDispatch.DispatchSDLNotify(self,VARname,SDLname,PlayerID,tag)
+
+    def OnSDLChange(self,VARname,SDLname,PlayerID,tag,value):
         if VARname != stringSDLVarName.value:
             return
         
-        ageSDL = PtGetAgeSDL()
-        SDLvalue = ageSDL[stringSDLVarName.value][0]
+        SDLvalue = value[0]
         
-        PtDebugPrint("DEBUG: xAgeSDLIntStartStopResp.OnSDLNotify received: %s = %d" % (VARname, SDLvalue))
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLIntStartStopResp.OnSDLNotify received: %s = %d" % (VARname, SDLvalue),level=kDebugDumpLevel)
         
         if  SDLvalue in self.enabledStateList:
             PtDebugPrint("DEBUG: xAgeSDLIntStartStopResp.OnSDLNotify: running start responder")
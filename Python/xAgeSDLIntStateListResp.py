@@ -58,6 +58,7 @@ Author: Tye Hooley
 
 from Plasma import *
 from PlasmaTypes import *
+import xSDLDispatch
 
 
 # Need this to override the ptAttribResponder as it does
@@ -139,7 +140,7 @@ class xAgeSDLIntStateListResp(ptResponder):
     def Initialize(self):
         # Setup SDL callback...
         ageSDL = PtGetAgeSDL()
-        ageSDL.setNotify(self.key,strSDLVarName.value,0.0)
+        xSDLDispatch.SubscribeSDL(self,strSDLVarName.value)
         try:
             SDLvalue = ageSDL[strSDLVarName.value][0]
         except:
@@ -165,21 +166,23 @@ class xAgeSDLIntStateListResp(ptResponder):
             return
 
             
-        PtDebugPrint("DEBUG: xAgeSDLIntStateListResp.OnServerInitComplete():\t Registered State List: %s " % self.dictStates)
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLIntStateListResp.OnServerInitComplete():\t Registered State List: %s " % self.dictStates,level=kDebugDumpLevel)
         
         #Set to current state
         self.UpdateState(SDLvalue, None, boolStartFF.value)
 
 
     def OnSDLNotify(self,VARname,SDLname,PlayerID,tag):
+        xSDLDispatch.DispatchSDLNotify(self,VARname,SDLname,PlayerID,tag)
+
+    def OnSDLChange(self,VARname,SDLname,PlayerID,tag,value):
         if VARname != strSDLVarName.value:
             return
         
         # Grab SDL Variable
-        ageSDL = PtGetAgeSDL()
-        SDLvalue = ageSDL[strSDLVarName.value][0]
+        SDLvalue = value[0]
 
-        PtDebugPrint("DEBUG: xAgeSDLIntStateListResp.OnSDLNotify received: %s = %d" % (VARname, SDLvalue))
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLIntStateListResp.OnSDLNotify received: %s = %d" % (VARname, SDLvalue),level=kDebugDumpLevel)
 
         # is state change from player or vault manager?
         if PlayerID: # non-zero means it's a player
@@ -199,7 +202,7 @@ class xAgeSDLIntStateListResp(ptResponder):
 
     def UpdateState(self, SDLval, avatar, fastforward):
         if  self.dictStates.has_key(SDLval):  #Run the responder only if we have the state
-            PtDebugPrint("DEBUG: xAgeSDLIntStateListResp.OnSDLNotify: running state responder: %s" % self.dictStates[SDLval])
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLIntStateListResp.OnSDLNotify: running state responder: %s" % self.dictStates[SDLval],level=kDebugDumpLevel)
             respEnterState.run(self.key,state=self.dictStates[SDLval], avatar=avatar, fastforward=fastforward)
         else:
             PtDebugPrint("ERROR: xAgeSDLIntStateListResp.OnSDLNotify: Couldn't find state: %d " % SDLval)
@@ -49,6 +49,7 @@ Author: Adam Van Ornum
 
 from Plasma import *
 from PlasmaTypes import *
+import xSDLDispatch
 
 # define the attributes that will be entered in max
 # NOTE:  The state value tuples string should be a string of value pairs
@@ -84,7 +85,7 @@ class xAgeSDLVarSet(ptResponder):
         ageSDL.setFlags(stringSDLVarToSet.value,1,1)
         ageSDL.sendToClients(stringSDLVarToSet.value)
         
-        PtDebugPrint("DEBUG: xAgeSDLVarSet.OnServerInitComplete:\tOn %s" % stringSDLVarName.value)
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLVarSet.OnServerInitComplete:\tOn %s" % stringSDLVarName.value,level=kDebugDumpLevel)
         
         # Parse out the state, value pairs and add them to the dictionary
         try:
@@ -99,9 +100,9 @@ class xAgeSDLVarSet(ptResponder):
             PtDebugPrint("ERROR: xAgeSDLVarSet.OnServerInitComplete():\tERROR: couldn't process start state list")
             pass
         
-        PtDebugPrint("DEBUG: xAgeSDLVarSet.OnServerInitComplete:\tSetting notify on %s" % stringSDLVarName.value)
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLVarSet.OnServerInitComplete:\tSetting notify on %s" % stringSDLVarName.value,level=kDebugDumpLevel)
         
-        ageSDL.setNotify(self.key,stringSDLVarName.value,0.0)
+        xSDLDispatch.SubscribeSDL(self,stringSDLVarName.value)
 
         try:
             SDLvalue = ageSDL[stringSDLVarName.value][0]
@@ -109,14 +110,14 @@ class xAgeSDLVarSet(ptResponder):
             PtDebugPrint("ERROR: xAgeSDLVarSet.OnServerInitComplete():\tERROR: age sdl read failed, SDLvalue = %d by default. stringSDLVarName = %s" % (intDefault.value,stringSDLVarName.value))
             SDLvalue = intDefault.value
         
-        PtDebugPrint("DEBUG: xAgeSDLVarSet.OnServerInitComplete:\tCurrent SDL value = %d" % SDLvalue)
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLVarSet.OnServerInitComplete:\tCurrent SDL value = %d" % SDLvalue,level=kDebugDumpLevel)
         
         # Check if the current SDL value represents a state in the dictionary and set the other SDL value to the value in the dictionary (yay for values!)
         if  self.enabledStateDict.has_key(int(SDLvalue)):
             ageSDL[stringSDLVarToSet.value] = (self.enabledStateDict[int(SDLvalue)],)
             if type(stringSDLVarToSet) != type(None) and stringSDLVarToSet.value != "":
                 ageSDL.setTagString(stringSDLVarToSet.value,stringTag.value)
-            PtDebugPrint("DEBUG: xAgeSDLVarSet.OnServerInitComplete:\t%s setting %s to %d" % (stringSDLVarName.value, stringSDLVarToSet.value, self.enabledStateDict[int(SDLvalue)]))
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLVarSet.OnServerInitComplete:\t%s setting %s to %d" % (stringSDLVarName.value, stringSDLVarToSet.value, self.enabledStateDict[int(SDLvalue)]),level=kDebugDumpLevel)
         
         # If the value is not in the dictionary then just set the state to 0        
         #else:
@@ -124,20 +125,23 @@ class xAgeSDLVarSet(ptResponder):
         #    PtDebugPrint("xAgeSDLVarSet.OnServerInitComplete:\t%s setting %s to 0" % (stringSDLVarName.value, stringSDLVarToSet.value))
             
     def OnSDLNotify(self,VARname,SDLname,PlayerID,tag):
+        xSDLDispatch.DispatchSDLNotify(self,VARname,SDLname,PlayerID,tag)
+
+    def OnSDLChange(self,VARname,SDLname,PlayerID,tag,value):
         if VARname != stringSDLVarName.value:
             return
         
         ageSDL = PtGetAgeSDL()
-        PtDebugPrint("DEBUG: xAgeSDLVarSet.OnSDLNotify received: %s" % VARname)
+        PtDebugPrint(lambda: "DEBUG: xAgeSDLVarSet.OnSDLNotify received: %s" % VARname,level=kDebugDumpLevel)
         
-        SDLvalue = ageSDL[stringSDLVarName.value][0]
+        SDLvalue = value[0]
         
         # Check if the current SDL value represents a state in the dictionary and set the other SDL value to the value in the dictionary (yay for values!)
         if  self.enabledStateDict.has_key(int(SDLvalue)):
             ageSDL[stringSDLVarToSet.value] = (self.enabledStateDict[int(SDLvalue)],)
             if type(stringSDLVarToSet) != type(None) and stringSDLVarToSet.value != "":
                 ageSDL.setTagString(stringSDLVarToSet.value,stringTag.value)
-            PtDebugPrint("DEBUG: xAgeSDLVarSet.OnServerInitComplete:\t%s setting %s to %d, tag string: %s" % (stringSDLVarName.value, stringSDLVarToSet.value, self.enabledStateDict[int(SDLvalue)], stringTag.value))
+            PtDebugPrint(lambda: "DEBUG: xAgeSDLVarSet.OnServerInitComplete:\t%s setting %s to %d, tag string: %s" % (stringSDLVarName.value, stringSDLVarToSet.value, self.enabledStateDict[int(SDLvalue)], stringTag.value),level=kDebugDumpLevel)
         
         # If the value is not in the dictionary then just set the state to 0            
         #else:
@@ -472,7 +472,15 @@ def CanShowSeasonal(clothingItem):
 
 def CanShowClothingItem(clothingItem):
     "returns true if this item is elegable for showing"
-    
+    # the answer only changes with the closet, the wardrobe or the day, so the catalog remembers it
+    catalog = GetClothingCatalog()
+    canShow = catalog.visible.get(clothingItem.name)
+    if canShow is None:
+        canShow = ICanShowClothingItem(clothingItem)
+        catalog.visible[clothingItem.name] = canShow
+    return canShow
+
+def ICanShowClothingItem(clothingItem):
     #if we're a visitor, don't allow paid clothing items
     if IsVisitorPlayer and not clothingItem.free:
         PtDebugPrint("The following item is not allowed to free players: %s" % clothingItem.name)
@@ -495,43 +503,32 @@ def CanShowClothingItem(clothingItem):
     return false
 
 def ItemInWardrobe(clothingItem):
-    avatar = PtGetLocalAvatar()
-    clothingList = avatar.avatar.getWardrobeClothingList()
-    for item in clothingList:
-        ctype,saturation,inCloset,inClosClr1,inClosClr2 = FindSaturationAndCloset(item[0],item[1])
-        closetItem = ClothingItem(item,ctype,saturation,inCloset,inClosClr1,inClosClr2)
-        # hopefully name is enough to determine if it's in the closet, but we can be more accurate if necessary
-        if clothingItem.name == closetItem.name:
-            return 1
+    # hopefully name is enough to determine if it's in the closet, but we can be more accurate if necessary
+    if clothingItem.name in GetClothingCatalog().wardrobe:
+        return 1
     return 0
 
+def IGetGroupItems(name):
+    "returns (item,ClothingItem) pairs in the same group as the named item (but not icons) that can be shown"
+    catalog = GetClothingCatalog()
+    try:
+        clothingType = catalog.itemType[name]
+        targetGroup = catalog.items[name].groupName
+    except KeyError:
+        # not in the closet: like before, look through the last clothing type for items without a group
+        clothingType = CLxref[-1][0]
+        targetGroup = ""
+    retVal = []
+    for pair in catalog.groups.get((clothingType,targetGroup),[]):
+        if CanShowClothingItem(pair[1]):
+            retVal.append(pair)
+    return retVal
+
 def GetAllWithSameGroup(name):
     "returns a list of items in the same group as the one passed in (but not icons)"
-    global TheCloset
-    global CLxref
     retVal = []
-    avatar = PtGetLocalAvatar()
-    targetGroup = ""
-    clothinglist = []
-    groupFound = 0
-    for idx in range(len(CLxref)):
-        clothingType = CLxref[idx][0]
-        clothinglist = avatar.avatar.getClosetClothingList(clothingType)
-        for item in clothinglist:
-            ctype,saturation,inCloset,inClosClr1,inClosClr2 = FindSaturationAndCloset(item[0],item[1])
-            newitem = ClothingItem(item,ctype,saturation,inCloset,inClosClr1,inClosClr2)
-            if newitem.name == name:
-                targetGroup = newitem.groupName
-                groupFound = 1
-                break
-        if groupFound:
-            break
-    for item in clothinglist:
-        ctype,saturation,inCloset,inClosClr1,inClosClr2 = FindSaturationAndCloset(item[0],item[1])
-        newitem = ClothingItem(item,ctype,saturation,inCloset,inClosClr1,inClosClr2)
-        if newitem.groupName == targetGroup and not newitem.meshicon:
-            if CanShowClothingItem(newitem):
-                retVal.append(item)
+    for item,clothingItem in IGetGroupItems(name):
+        retVal.append(item)
     return retVal
 
 def GroupHasClothing(iconItem):
@@ -543,12 +540,68 @@ def GroupHasClothing(iconItem):
     
 def UsesSameGroup(name1, name2):
     "check to see if the two clothing items share the same group"
-    group = GetAllWithSameGroup(name1)
-    for item in group:
+    for item,clothingItem in IGetGroupItems(name1):
         if item[0] == name2:
             return 1
     return 0
 
+class ClothingCatalog:
+    "The closet and wardrobe of the local avatar, with every clothing item parsed once"
+    def __init__(self):
+        avatar = PtGetLocalAvatar()
+        self.gender = avatar.avatar.getAvatarClothingGroup()
+        self.day = None
+        self.items = {}         # item name -> ClothingItem (first clothing type that has it)
+        self.itemType = {}      # item name -> clothing type it was found under
+        self.closet = {}        # clothing type -> list of (item,ClothingItem), in closet order
+        self.groups = {}        # (clothing type,group name) -> list of (item,ClothingItem) that aren't icons
+        self.accessories = []   # list of accessory ClothingItems, in closet order
+        self.visible = {}       # item name -> can it be shown (today)
+        for xref in CLxref:
+            clothingType = xref[0]
+            pairs = []
+            for item in avatar.avatar.getClosetClothingList(clothingType):
+                ctype,saturation,inCloset,inClosClr1,inClosClr2 = FindSaturationAndCloset(item[0],item[1])
+                newitem = ClothingItem(item,ctype,saturation,inCloset,inClosClr1,inClosClr2)
+                pair = (item,newitem)
+                pairs.append(pair)
+                if not self.items.has_key(newitem.name):
+                    self.items[newitem.name] = newitem
+                    self.itemType[newitem.name] = clothingType
+                if not newitem.meshicon:
+                    self.groups.setdefault((clothingType,newitem.groupName),[]).append(pair)
+            self.closet[clothingType] = pairs
+        for accitem in avatar.avatar.getClosetClothingList(kAccessoryClothingItem):
+            self.accessories.append(ClothingItem(accitem,0,0.0,1,0,0)) # default is inCloset
+        self.wardrobe = set()
+        for item in avatar.avatar.getWardrobeClothingList():
+            self.wardrobe.add(item[0])
+
+    def checkDay(self):
+        "seasonal items come and go with the day, so forget what could be shown when it changes"
+        if PtIsInternalRelease():
+            curTime = time.localtime(time.time())
+        else:
+            curTime = time.localtime(PtGetServerTime())
+        today = (curTime[0],curTime[1],curTime[2])
+        if today != self.day:
+            self.day = today
+            self.visible = {}
+
+TheCatalog = None
+
+def GetClothingCatalog():
+    "returns the clothing catalog, building it if the closet has changed since it was last used"
+    global TheCatalog
+    if TheCatalog is None or TheCatalog.gender != PtGetLocalAvatar().avatar.getAvatarClothingGroup():
+        TheCatalog = ClothingCatalog()
+    TheCatalog.checkDay()
+    return TheCatalog
+
+def InvalidateClothingCatalog():
+    global TheCatalog
+    TheCatalog = None
+
 # a few small utility functions to help with the management of the scroll buttons
 def IsRightArrow(id):
     if (id >= kIDBtnHairRightAccArrow and id <= kIDBtnFeetRightAccArrow) or (id >= kIDBtnHairRightOptArrow and id <= kIDBtnFeetRightOptArrow):
@@ -1212,6 +1265,7 @@ class xAvatarCustomization(ptModifier):
                 PtDebugPrint("Adding seasonal item "+item.name+" to your closet since you are wearing it")
                 avatar = PtGetLocalAvatar()
                 avatar.avatar.addWardrobeClothingItem(item.name,ptColor().white(),ptColor().white())
+                InvalidateClothingCatalog()
     
     def ILinkToCloset(self):
         linkmgr = ptNetLinkingMgr()
@@ -1256,6 +1310,7 @@ class xAvatarCustomization(ptModifier):
             if clothingName not in clothingList:
                 print "adding Yeesha reward clothing %s to wardrobe" % (clothingName)
                 avatar.avatar.addWardrobeClothingItem(clothingName,ptColor().white(),ptColor().black())
+                InvalidateClothingCatalog()
             else:
                 print "player already has Yeesha reward clothing, doing nothing"
             folder = vault.getChronicleFolder()
@@ -1280,6 +1335,7 @@ class xAvatarCustomization(ptModifier):
 
     def OnClothingUpdate(self):
         "Avatars clothing has changed"
+        InvalidateClothingCatalog()
         GetClothingWorn()
 
     def IGetHairColor(self):
@@ -2110,15 +2166,10 @@ class TextureGroup:
             self.listboxID = kUpperBodyAccLB
         else:
             self.listboxID = kLwrBodyAccLB
-        clothinglist = GetAllWithSameGroup(meshName)
         self.clothingItems = []
-        for item in clothinglist:
-            ctype,saturation,inCloset,inClosClr1,inClosClr2 = FindSaturationAndCloset(item[0],item[1])
-            newitem = ClothingItem(item,ctype,saturation,inCloset,inClosClr1,inClosClr2)
-            # make sure we're not supposed to hide the item
-            if CanShowClothingItem(newitem):
-                if not newitem.meshicon:
-                    self.clothingItems.append(newitem)
+        # these have already been checked to be showable, non-icon items
+        for item,newitem in IGetGroupItems(meshName):
+            self.clothingItems.append(newitem)
         # now sort the list so that logos appear directly after the clothing they are logos for
         sortedList = []
         for item in self.clothingItems[:]:
@@ -2165,13 +2216,10 @@ class ClothingGroup:
         self.numberItems = numberItems
         self.accessories = []
         # get the clothing items for this group
-        avatar = PtGetLocalAvatar()
-        clothinglist = avatar.avatar.getClosetClothingList(clothingType)
+        catalog = GetClothingCatalog()
         # build the list of clothing items
         self.clothingItems = []
-        for item in clothinglist:
-            ctype,saturation,inCloset,inClosClr1,inClosClr2 = FindSaturationAndCloset(item[0],item[1])
-            newitem = ClothingItem(item,ctype,saturation,inCloset,inClosClr1,inClosClr2)
+        for item,newitem in catalog.closet.get(clothingType,[]):
             # make sure we're not supposed to hide the item
             if CanShowClothingItem(newitem):
                 if (listboxID == kUpperBodyOptionsLB or listboxID == kLwrBodyOptionsLB) and newitem.meshicon and GroupHasClothing(newitem):
@@ -2201,10 +2249,7 @@ class ClothingCloset:
         for xref in CLxref:
             self.clothingGroups[xref[1]] = ClothingGroup(xref[0],xref[1],xref[4])
         # get the accessories
-        avatar = PtGetLocalAvatar()
-        acclist = avatar.avatar.getClosetClothingList(kAccessoryClothingItem)
-        for accitem in acclist:
-            accCI = ClothingItem(accitem,0,0.0,1,0,0) # default is inCloset
+        for accCI in GetClothingCatalog().accessories:
             if CanShowClothingItem(accCI):
                 group = self.findGroup(accCI.groupwith)
                 if type(group) != type(None):
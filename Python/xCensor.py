@@ -45,6 +45,7 @@ This module will censor a sentence, depending on censorLevel
 """
 from ptWordFilter import *
 
+import re
 import xCensorFilters
 
 SpecialPunctuation = '#$%&*+-@_|~'
@@ -65,14 +66,84 @@ SpecialPunctuation = '#$%&*+-@_|~'
 
 SentenceFilters = xCensorFilters.xSentenceFilters
 
+class CompiledCensor:
+    """SentenceFilters compiled for one censor level:
+    - each run of REFilters is merged into one combined expression, which is used to skip the whole
+      run with a single search when nothing in the sentence matches (the usual case)
+    - each ExactMatchListFilter is reduced to a dict of only the words that need substituting at this level
+    The steps run in the same order as SentenceFilters so the output is identical."""
+    def __init__(self,filters,censorLevel):
+        self.censorLevel = censorLevel
+        self.steps = []
+        reGroup = []
+        for sfilter in filters:
+            if isinstance(sfilter,REFilter):
+                if sfilter.rating.rating > censorLevel:
+                    reGroup.append(sfilter)
+                continue
+            self.IAddREGroup(reGroup)
+            reGroup = []
+            if isinstance(sfilter,ExactMatchListFilter):
+                substitutes = {}
+                for word,rating in sfilter.wordlist.items():
+                    if rating.rating > censorLevel:
+                        substitutes[word.lower()] = rating.substitute
+                if substitutes:
+                    self.steps.append((self.ICensorWords,substitutes))
+            else:
+                # unknown filter type, just run it as is
+                self.steps.append((self.ICensorFilter,sfilter))
+        self.IAddREGroup(reGroup)
+
+    def IAddREGroup(self,reGroup):
+        if reGroup:
+            combinedRE = re.compile("|".join(["(?:%s)" % (sfilter.compiledRE.pattern) for sfilter in reGroup]), re.IGNORECASE | re.MULTILINE)
+            self.steps.append((self.ICensorREGroup,(combinedRE,reGroup)))
+
+    def ICensorREGroup(self,sentence,data):
+        combinedRE,reGroup = data
+        if combinedRE.search(sentence) is None:
+            return sentence
+        for sfilter in reGroup:
+            sentence = sfilter.compiledRE.sub(sfilter.rating.substitute,sentence)
+        return sentence
+
+    def ICensorWords(self,sentence,substitutes):
+        parts = kWordSplitRE.split(sentence)
+        # every other item is a word, the ones in between are the separators
+        for idx in xrange(0,len(parts),2):
+            word = parts[idx]
+            if word:
+                substitute = substitutes.get(word.lower())
+                if substitute is not None:
+                    parts[idx] = substitute
+        return "".join(parts)
+
+    def ICensorFilter(self,sentence,sfilter):
+        return sfilter.censor(sentence,self.censorLevel)
+
+    def censor(self,sentence):
+        for step,data in self.steps:
+            sentence = step(sentence,data)
+        return sentence
+
+# censor level -> CompiledCensor, built the first time each level is used
+CompiledCensors = {}
+
+def GetCompiledCensor(censorLevel):
+    try:
+        return CompiledCensors[censorLevel]
+    except KeyError:
+        compiled = CompiledCensor(SentenceFilters,censorLevel)
+        CompiledCensors[censorLevel] = compiled
+        return compiled
+
 def xCensor(sentence,censorLevel):
     "censors sentence for words for above ratingLevel. Returns censored sentence"
     # make sure they stay within reasonable censorLevels
     if censorLevel > xRatedR:
         censorLevel = xRatedR
-    for sfilter in SentenceFilters:
-        sentence = sfilter.censor(sentence,censorLevel)
-    return sentence
+    return GetCompiledCensor(censorLevel).censor(sentence)
 
 def xWhatRating(sentence):
     "Returns the censorship level of a sentence"
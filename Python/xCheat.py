@@ -113,6 +113,8 @@ def GetYeeshaPage(args):
 
 def GetAgeJourneyCloths(args):
     import Plasma
+    import PlasmaVaultConstants
+    import xVaultIndex
 
     ageChronNode = None
     ageName = Plasma.PtGetAgeName()
@@ -125,16 +127,7 @@ def GetAgeJourneyCloths(args):
 
     vault = Plasma.ptVault()
     chron = vault.findChronicleEntry("JourneyClothProgress")
-    ageChronRefList = chron.getChildNodeRefList()
-    
-    for ageChron in ageChronRefList:
-        ageChild = ageChron.getChild()
-
-        ageChild = ageChild.upcastToChronicleNode()
-
-        if ageChild.chronicleGetName() == ageName:
-            ageChronNode = ageChild
-            break
+    ageChronNode = xVaultIndex.FindNode(chron,PlasmaVaultConstants.PtVaultNodeTypes.kChronicleNode,ageName)
 
     if type(ageChronNode) == type(None):
         newNode = Plasma.ptVaultChronicleNode(0)
@@ -444,20 +437,12 @@ def CGZKillAll(args):
 
 def ShowHiddenFolder(args):
     import Plasma
+    import PlasmaVaultConstants
+    import xVaultIndex
     # search thru the age journal folders
     vault = Plasma.ptVault()
-    jfolder = None
-    master_agefolder = vault.getAgeJournalsFolder()
-    if type(master_agefolder) != type(None):
-        agefolderRefs = master_agefolder.getChildNodeRefList()
-        for agefolderRef in agefolderRefs:
-            agefolder = agefolderRef.getChild()
-            agefolder = agefolder.upcastToFolderNode()
-            if type(agefolder) != type(None):
-                # look for the Hidden folder
-                if "Hidden" == agefolder.folderGetName():
-                    jfolder = agefolder
-                    break
+    # look for the Hidden folder
+    jfolder = xVaultIndex.FindNode(vault.getAgeJournalsFolder(),PlasmaVaultConstants.PtVaultNodeTypes.kFolderNode,"Hidden")
     if jfolder:
         # need to try to find the game
         print "Hidden folder contents:"
@@ -475,21 +460,12 @@ def ShowHiddenFolder(args):
 
 def RemoveHiddenContent(args):
     import Plasma
-    import Plasma
+    import PlasmaVaultConstants
+    import xVaultIndex
     # search thru the age journal folders
     vault = Plasma.ptVault()
-    jfolder = None
-    master_agefolder = vault.getAgeJournalsFolder()
-    if type(master_agefolder) != type(None):
-        agefolderRefs = master_agefolder.getChildNodeRefList()
-        for agefolderRef in agefolderRefs:
-            agefolder = agefolderRef.getChild()
-            agefolder = agefolder.upcastToFolderNode()
-            if type(agefolder) != type(None):
-                # look for the Hidden folder
-                if "Hidden" == agefolder.folderGetName():
-                    jfolder = agefolder
-                    break
+    # look for the Hidden folder
+    jfolder = xVaultIndex.FindNode(vault.getAgeJournalsFolder(),PlasmaVaultConstants.PtVaultNodeTypes.kFolderNode,"Hidden")
     if jfolder:
         print "Removing content"
         jfolder.removeAllNodes()
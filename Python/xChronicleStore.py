@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+""" *==LICENSE==*
+
+CyanWorlds.com Engine - MMOG client, server and tools
+Copyright (C) 2011  Cyan Worlds, Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Additional permissions under GNU GPL version 3 section 7
+
+If you modify this Program, or any covered work, by linking or
+combining it with any of RAD Game Tools Bink SDK, Autodesk 3ds Max SDK,
+NVIDIA PhysX SDK, Microsoft DirectX SDK, OpenSSL library, Independent
+JPEG Group JPEG library, Microsoft Windows Media SDK, or Apple QuickTime SDK
+(or a modified version of those libraries),
+containing parts covered by the terms of the Bink SDK EULA, 3ds Max EULA,
+PhysX SDK EULA, DirectX SDK EULA, OpenSSL and SSLeay licenses, IJG
+JPEG Library README, Windows Media SDK EULA, or QuickTime SDK EULA, the
+licensors of this Program grant you additional
+permission to convey the resulting work. Corresponding Source for a
+non-source form of such a combination shall include the source code for
+the parts of OpenSSL and IJG JPEG Library used as well as that of the covered
+work.
+
+You can contact Cyan Worlds, Inc. by email legal@cyan.com
+ or by snail mail at:
+      Cyan Worlds, Inc.
+      14617 N Newport Hwy
+      Mead, WA   99021
+
+ *==LICENSE==* """
+"""
+Module: xChronicleStore
+Age: global
+Date: October 2026
+Keeps the player's chronicle entries in memory.  The chronicle folder is walked once and
+every entry's node is remembered by name, so reads don't go to the vault.  Entries are
+declared with a kind (int, float, string, list or dict), and values come back already
+converted from their strings.
+Writes are held back and written in one batch, either when the flush timer runs on the
+modifier given to Attach() (the KI) or when Flush() is called (the KI does so on age
+unload).  Without a modifier they are written right away.
+The modifier must forward its OnTimer to xTimerWheel, and the OnVaultEvent of a global
+script must be forwarded to this module.  GetChronicleStats counts the vault operations
+made.
+"""
+
+from Plasma import *
+from PlasmaTypes import *
+from PlasmaVaultConstants import *
+import weakref
+import xTimerWheel
+
+# seconds to wait for more writes before flushing
+kFlushDelay = 2.0
+kFlushTimerName = "chronicleFlush"
+
+
+class ChronicleKind:
+    "how the value of a chronicle entry is read from and written to its string"
+    def __init__(self, name, parse, format):
+        self.name = name
+        self.parse = parse
+        self.format = format
+
+def _FormatInt(value):
+    return "%d" % (value)
+
+def _FormatFloat(value):
+    return "%f" % (value)
+
+kChronInt = ChronicleKind("int", int, _FormatInt)
+kChronFloat = ChronicleKind("float", float, _FormatFloat)
+kChronString = ChronicleKind("string", str, str)
+
+def ListOf(kind=kChronString, sep=","):
+    "values separated by sep; an empty string is an empty list"
+    def _Parse(text):
+        if not text:
+            return []
+        return [kind.parse(item) for item in text.split(sep)]
+    def _Format(value):
+        return sep.join([kind.format(item) for item in value])
+    return ChronicleKind("list of %s" % (kind.name), _Parse, _Format)
+
+def DictOf(kind=kChronString, sep=",", assign="="):
+    "key=value pairs separated by sep"
+    def _Parse(text):
+        value = {}
+        if text:
+            for item in text.split(sep):
+                key, val = item.split(assign, 1)
+                value[key] = kind.parse(val)
+        return value
+    def _Format(value):
+        keys = value.keys()
+        keys.sort()
+        return sep.join(["%s%s%s" % (key, assign, kind.format(value[key])) for key in keys])
+    return ChronicleKind("dict of %s" % (kind.name), _Parse, _Format)
+
+kChronList = ListOf(kChronString)
+kChronFloatList = ListOf(kChronFloat)
+kChronDict = DictOf(kChronString)
+
+
+gSchemas = {}       # name -> (kind, chronicle entry type, default)
+gLoaded = 0
+gFolderID = None
+gNodes = {}         # name -> chronicle node
+gNodeNames = {}     # node ID -> name
+gMissing = {}       # names the vault doesn't have
+gParsed = {}        # name -> (string, value)
+gPending = {}       # name -> value waiting to be written
+gDriver = None
+gStats = {'loads' : 0, 'finds' : 0, 'adds' : 0, 'saves' : 0, 'reads' : 0, 'writes' : 0}
+
+
+def Declare(name, kind, default=None, entryType=1):
+    "declares the kind of an entry, the default used when it is missing or broken, and its type when it is added"
+    gSchemas[name] = (kind, entryType, default)
+
+def _Schema(name):
+    try:
+        return gSchemas[name]
+    except KeyError:
+        return (kChronString, 1, None)
+
+def _Copy(value):
+    # don't let callers change what we have cached
+    if isinstance(value, list):
+        return value[:]
+    if isinstance(value, dict):
+        return value.copy()
+    return value
+
+
+def ILoad():
+    "remembers every entry at the top of the chronicle folder"
+    global gLoaded
+    global gFolderID
+    if gLoaded:
+        return
+    folder = ptVault().getChronicleFolder()
+    if folder is None:
+        return
+    gStats['loads'] += 1
+    gLoaded = 1
+    gFolderID = folder.getID()
+    for ref in folder.getChildNodeRefList():
+        child = ref.getChild()
+        if child is not None and child.getType() == PtVaultNodeTypes.kChronicleNode:
+            IAddNode(child.upcastToChronicleNode())
+
+def IAddNode(node):
+    name = node.chronicleGetName()
+    # the first one wins, like findChronicleEntry
+    if name not in gNodes:
+        gNodes[name] = node
+        gNodeNames[node.getID()] = name
+        if name in gMissing:
+            del gMissing[name]
+
+def IGetNode(name):
+    ILoad()
+    node = gNodes.get(name)
+    if node is not None or name in gMissing:
+        return node
+    # the vault also finds entries further down the chronicle tree
+    gStats['finds'] += 1
+    node = ptVault().findChronicleEntry(name)
+    if node is None:
+        gMissing[name] = 1
+    else:
+        gNodes[name] = node
+        gNodeNames[node.getID()] = name
+    return node
+
+
+def Has(name):
+    "true if there is such an entry (or one is about to be written)"
+    return name in gPending or IGetNode(name) is not None
+
+def Get(name, addMissing=0):
+    """returns the value of the entry, or its declared default if it is missing or can't be read;
+    with addMissing the default is written to the chronicle in that case"""
+    kind, entryType, default = _Schema(name)
+    if name in gPending:
+        return _Copy(gPending[name])
+    node = IGetNode(name)
+    if node is None:
+        if addMissing:
+            Set(name, default)
+        return _Copy(default)
+    text = node.chronicleGetValue()
+    parsed = gParsed.get(name)
+    if parsed is not None and parsed[0] == text:
+        return _Copy(parsed[1])
+    gStats['reads'] += 1
+    try:
+        value = kind.parse(text)
+    except (ValueError, TypeError):
+        PtDebugPrint("xChronicleStore: can't read '%s' as %s from chronicle %s, using %s" % (text, kind.name, name, default), level=kErrorLevel)
+        if addMissing:
+            Set(name, default)
+        return _Copy(default)
+    gParsed[name] = (text, value)
+    return _Copy(value)
+
+def GetNode(name):
+    "returns the chronicle node of the entry (for entries with children), writing the entry first if it is waiting"
+    if name in gPending:
+        Flush()
+    return IGetNode(name)
+
+def Set(name, value, now=0):
+    "changes the entry (adding it if needed); it is written with the next flush, or right away with now"
+    kind, entryType, default = _Schema(name)
+    text = kind.format(value)
+    node = IGetNode(name)
+    if node is not None and node.chronicleGetValue() == text:
+        if name in gPending:
+            del gPending[name]
+        return
+    gStats['writes'] += 1
+    gPending[name] = _Copy(value)
+    driver = None
+    if gDriver is not None:
+        driver = gDriver()
+    if now or driver is None:
+        Flush()
+    elif not xTimerWheel.HasTimer(driver, kFlushTimerName):
+        xTimerWheel.AtTime(driver, kFlushDelay, Flush, name=kFlushTimerName)
+
+def Flush():
+    "writes all the waiting entries to the vault"
+    if not gPending:
+        return
+    pending = gPending.items()
+    gPending.clear()
+    vault = ptVault()
+    for name, value in pending:
+        kind, entryType, default = _Schema(name)
+        text = kind.format(value)
+        node = IGetNode(name)
+        if node is not None:
+            if node.chronicleGetValue() != text:
+                node.chronicleSetValue(text)
+                node.save()
+                gStats['saves'] += 1
+        else:
+            vault.addChronicleEntry(name, entryType, text)
+            gStats['adds'] += 1
+            # look for the new node next time instead of adding another one
+            if name in gMissing:
+                del gMissing[name]
+
+def Attach(modifier):
+    "writes are flushed by a timer on this modifier"
+    global gDriver
+    gDriver = weakref.ref(modifier)
+
+def Reset():
+    "forgets everything, e.g. when a different player's vault is connected"
+    global gLoaded
+    global gFolderID
+    if gPending:
+        PtDebugPrint("xChronicleStore: dropping unwritten chronicles %s" % (gPending.keys()), level=kErrorLevel)
+    gLoaded = 0
+    gFolderID = None
+    gNodes.clear()
+    gNodeNames.clear()
+    gMissing.clear()
+    gParsed.clear()
+    gPending.clear()
+    if gDriver is not None and gDriver() is not None:
+        xTimerWheel.CancelTimer(gDriver(), kFlushTimerName)
+
+def GetChronicleStats():
+    "returns the vault operations made (loads, finds, adds, saves) and the values read and written"
+    return gStats.copy()
+
+
+def OnVaultEvent(event, tupdata):
+    "keep the entries current; call from the OnVaultEvent of a global script"
+    if event == PtVaultCallbackTypes.kVaultNodeRefAdded:
+        # tupdata is ( ptVaultNodeRef )
+        # someone may have added one of the entries we didn't find (maybe further down the tree)
+        gMissing.clear()
+        if gLoaded and tupdata[0].getParentID() == gFolderID:
+            child = tupdata[0].getChild()
+            if child is not None and child.getType() == PtVaultNodeTypes.kChronicleNode:
+                IAddNode(child.upcastToChronicleNode())
+    elif event == PtVaultCallbackTypes.kVaultNodeRefRemoved:
+        # tupdata is ( childID, parentID )
+        name = gNodeNames.get(tupdata[0])
+        if name is not None:
+            del gNodeNames[tupdata[0]]
+            del gNodes[name]
+            if name in gParsed:
+                del gParsed[name]
+    elif event == PtVaultCallbackTypes.kVaultConnected or event == PtVaultCallbackTypes.kVaultDisconnected:
+        Reset()
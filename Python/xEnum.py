@@ -79,6 +79,13 @@ class Enum:
             i = i + 1
 
         self.lookup = lookup
+        # value -> name, for ToString
+        self.names = { }
+        for name, value in lookup.items():
+            self.names[value] = name
+            # plain attributes, so enum.Name doesn't go through __getattr__
+            if not hasattr(Enum, name) and not self.__dict__.has_key(name):
+                self.__dict__[name] = value
 
 
     def __getattr__(self, attr):
@@ -98,9 +105,7 @@ class Enum:
         return len(self.lookup)
 
     def ToString(self, x):
-        for key in self.lookup.keys():
-            if self.lookup[key] == x:
-                return key
+        return self.names.get(x)
 
 if __name__ == "__main__":
     animal = Enum("Cow, Pig, Dog = 5, Cat, Lizard")
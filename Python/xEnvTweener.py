@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+""" *==LICENSE==*
+
+CyanWorlds.com Engine - MMOG client, server and tools
+Copyright (C) 2011  Cyan Worlds, Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Additional permissions under GNU GPL version 3 section 7
+
+If you modify this Program, or any covered work, by linking or
+combining it with any of RAD Game Tools Bink SDK, Autodesk 3ds Max SDK,
+NVIDIA PhysX SDK, Microsoft DirectX SDK, OpenSSL library, Independent
+JPEG Group JPEG library, Microsoft Windows Media SDK, or Apple QuickTime SDK
+(or a modified version of those libraries),
+containing parts covered by the terms of the Bink SDK EULA, 3ds Max EULA,
+PhysX SDK EULA, DirectX SDK EULA, OpenSSL and SSLeay licenses, IJG
+JPEG Library README, Windows Media SDK EULA, or QuickTime SDK EULA, the
+licensors of this Program grant you additional
+permission to convey the resulting work. Corresponding Source for a
+non-source form of such a combination shall include the source code for
+the parts of OpenSSL and IJG JPEG Library used as well as that of the covered
+work.
+
+You can contact Cyan Worlds, Inc. by email legal@cyan.com
+ or by snail mail at:
+      Cyan Worlds, Inc.
+      14617 N Newport Hwy
+      Mead, WA   99021
+
+ *==LICENSE==* """
+"""
+Module: xEnvTweener
+Age: global
+Date: October 2026
+Shared support for the scripts that animate the age environment (fog, for now).
+Keyframes are parsed and compiled once into a table of segments, so finding the value
+at a position is a bisect and one multiply-add per channel.  SetFog only passes new
+fog settings to the engine when they differ visibly from the ones it passed last;
+GetFogStats counts the calls that were made and the ones that were left out.
+The tweeners of an age share one scheduler tick: AddTweener(modifier,rate) has
+modifier.UpdateFog() called every rate seconds.  The tick runs on the timer wheel of
+one of the registered modifiers, so they all forward their OnTimer to xTimerWheel.
+"""
+
+from Plasma import *
+from PlasmaTypes import *
+import bisect
+import traceback
+import weakref
+import xTimerWheel
+
+# differences smaller than these aren't visible, so the engine isn't told about them
+kColorThreshold = 1.0 / 512.0
+kDistanceThreshold = 0.5
+kDensityThreshold = 0.005
+
+kTickTimerName = "envTweener"
+
+# the fog settings last passed to the engine
+gFogColor = None
+gFogMode = None
+gFogParams = None
+gFogStats = {'calls' : 0, 'suppressed' : 0, 'ticks' : 0}
+
+# the registered tweeners and the modifier whose timer wheel runs the tick
+gTweeners = []
+gDriver = None
+
+
+def ParseValues(text, count=3):
+    "parses 'a,b,c' (parentheses allowed) into a tuple of count floats"
+    values = text.strip().strip("()").split(",")
+    if len(values) != count:
+        raise ValueError, "expected %d values in '%s'" % (count, text)
+    return tuple([float(value) for value in values])
+
+
+class Keyframes:
+    "values (tuples of floats) at positions, linearly interpolated between them"
+    def __init__(self, frames, wrap=0):
+        """frames is a list of (position, values); with wrap the values go round from the
+        last frame back to the first one at position 1.0 (e.g. a day cycle)"""
+        frames = list(frames)
+        frames.sort()
+        if wrap:
+            frames.append((frames[0][0] + 1.0, frames[0][1]))
+        self.wrap = wrap
+        self.positions = []
+        self.bases = []
+        self.slopes = []
+        for i in range(len(frames)):
+            position, values = frames[i]
+            self.positions.append(position)
+            self.bases.append(tuple(values))
+            if i + 1 < len(frames) and frames[i+1][0] > position:
+                nextPos, nextValues = frames[i+1]
+                span = nextPos - position
+                self.slopes.append(tuple([(b - a) / span for a, b in zip(values, nextValues)]))
+            else:
+                self.slopes.append(tuple([0.0] * len(values)))
+
+    def Evaluate(self, position):
+        "returns the values at position"
+        if self.wrap:
+            position = self.positions[0] + (position - self.positions[0]) % 1.0
+        i = bisect.bisect_right(self.positions, position) - 1
+        if i < 0:
+            return self.bases[0]
+        t = position - self.positions[i]
+        return tuple([base + slope * t for base, slope in zip(self.bases[i], self.slopes[i])])
+
+
+def IChanged(old, new, thresholds):
+    if old is None or len(old) != len(new):
+        return 1
+    for i in range(len(new)):
+        if abs(new[i] - old[i]) > thresholds[i]:
+            return 1
+    return 0
+
+def SetFog(mode, values):
+    """passes fog settings to the engine; values are (red, green, blue, start, end, density)
+    and mode is "Linear", "Exponential" or "Exponential2" (which don't use start)"""
+    global gFogColor
+    global gFogMode
+    global gFogParams
+    color = tuple(values[:3])
+    if IChanged(gFogColor, color, (kColorThreshold,) * 3):
+        PtFogSetDefColor(ptColor(red=color[0], green=color[1], blue=color[2]))
+        gFogColor = color
+        gFogStats['calls'] += 1
+    else:
+        gFogStats['suppressed'] += 1
+
+    if mode == "Linear":
+        params = tuple(values[3:6])
+        thresholds = (kDistanceThreshold, kDistanceThreshold, kDensityThreshold)
+    elif mode == "Exponential" or mode == "Exponential2":
+        params = tuple(values[4:6])
+        thresholds = (kDistanceThreshold, kDensityThreshold)
+    else:
+        PtDebugPrint("xEnvTweener.SetFog: What type of Fog? %s" % (mode),level=kErrorLevel)
+        return
+    if mode != gFogMode or IChanged(gFogParams, params, thresholds):
+        if mode == "Linear":
+            PtFogSetDefLinear(params[0], params[1], params[2])
+        elif mode == "Exponential":
+            PtFogSetDefExp(params[0], params[1])
+        else:
+            PtFogSetDefExp2(params[0], params[1])
+        gFogMode = mode
+        gFogParams = params
+        gFogStats['calls'] += 1
+    else:
+        gFogStats['suppressed'] += 1
+
+def ResetFog():
+    "forget the fog settings last passed to the engine (e.g. a new age has its own)"
+    global gFogColor
+    global gFogMode
+    global gFogParams
+    gFogColor = None
+    gFogMode = None
+    gFogParams = None
+
+def GetFogStats():
+    "returns the number of engine fog calls made and suppressed, and the scheduler ticks run"
+    return gFogStats.copy()
+
+
+class _Tweener:
+    def __init__(self, modifier, rate):
+        self.ref = weakref.ref(modifier)
+        self.rate = rate
+        self.due = 0.0
+
+def AddTweener(modifier, rate):
+    "calls modifier.UpdateFog() right away and then every rate seconds"
+    RemoveTweener(modifier, 0)
+    tweener = _Tweener(modifier, max(rate, xTimerWheel.kTickLength))
+    tweener.due = PtGetGameTime()
+    gTweeners.append(tweener)
+    IArmTick()
+
+def RemoveTweener(modifier, rearm=1):
+    "stops calling modifier.UpdateFog()"
+    global gDriver
+    for tweener in gTweeners[:]:
+        if tweener.ref() is modifier or tweener.ref() is None:
+            gTweeners.remove(tweener)
+    if gDriver is not None and gDriver() is modifier:
+        xTimerWheel.CancelTimer(modifier, kTickTimerName)
+        gDriver = None
+    if rearm:
+        IArmTick()
+
+def IArmTick():
+    "(re)arms the tick for the earliest due tweener, on a live registered modifier"
+    global gDriver
+    driver = None
+    if gDriver is not None:
+        driver = gDriver()
+    due = None
+    for tweener in gTweeners[:]:
+        modifier = tweener.ref()
+        if modifier is None:
+            gTweeners.remove(tweener)
+            continue
+        if driver is None:
+            driver = modifier
+            gDriver = weakref.ref(driver)
+        if due is None or tweener.due < due:
+            due = tweener.due
+    if due is None:
+        if driver is not None:
+            xTimerWheel.CancelTimer(driver, kTickTimerName)
+        gDriver = None
+        return
+    xTimerWheel.AtTime(driver, max(due - PtGetGameTime(), 0.0), ITick, name=kTickTimerName)
+
+def ITick():
+    gFogStats['ticks'] += 1
+    now = PtGetGameTime()
+    for tweener in gTweeners[:]:
+        modifier = tweener.ref()
+        if modifier is None or tweener.due > now + xTimerWheel.kTickLength:
+            continue
+        tweener.due += tweener.rate
+        if tweener.due < now:
+            # fell behind, don't try to catch up
+            tweener.due = now + tweener.rate
+        try:
+            modifier.UpdateFog()
+        except:
+            PtDebugPrint("xEnvTweener: error updating %s" % (modifier.__class__.__name__),level=kErrorLevel)
+            traceback.print_exc()
+    IArmTick()
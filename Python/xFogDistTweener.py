@@ -51,6 +51,8 @@ littlebigworld?
 from Plasma import *
 from PlasmaTypes import *
 import math
+import xTimerWheel
+import xEnvTweener
 
 # define the attributes that will be entered in max
 FogMode         = ptAttribDropDownList(1, "Fog Mode", ("Linear", "Exponential", "Exponential2"))
@@ -87,26 +89,16 @@ class xFogDistTweener(ptMultiModifier):
         self.version = version
         print "__init__xFogDistTweener v.", version        
 
-        self.PointA_RGBList = []
-        self.PointB_RGBList = []
+        self.fogCurve = None
 
     ###########################
     def OnFirstUpdate(self):
-        self.PointA_RGBList = PointA_RGB.value.split(",")
-        self.PointA_RGBList[0] = float(self.PointA_RGBList[0])
-        self.PointA_RGBList[1] = float(self.PointA_RGBList[1])
-        self.PointA_RGBList[2] = float(self.PointA_RGBList[2])
-
-        self.PointB_RGBList = PointB_RGB.value.split(",")
-        self.PointB_RGBList[0] = float(self.PointB_RGBList[0])
-        self.PointB_RGBList[1] = float(self.PointB_RGBList[1])
-        self.PointB_RGBList[2] = float(self.PointB_RGBList[2])
-
-        print "xFogDistTweener.OnFirstUpdate: PointA_RGB=(%s,%s,%s), PointB_RGB=(%s,%s,%s)" % (self.PointA_RGBList[0], self.PointA_RGBList[1], self.PointA_RGBList[2], self.PointB_RGBList[0], self.PointB_RGBList[1], self.PointB_RGBList[2])
-        print "xFogDistTweener.OnFirstUpdate: PointA_SED=(%s,%s,%s), PointB_SED=(%s,%s,%s)" % (PointA_Start.value, PointA_End.value, PointA_Density.value, PointB_Start.value, PointB_End.value, PointB_Density.value)
-        
+        # the new age has its own fog
+        xEnvTweener.ResetFog()
+        self.CompileFogCurve()
+
         if not OnlyInRegion.value:
-            PtAtTimeCallback(self.key, 0, 1)
+            self.StartFogTimer()
 
     ###########################
     def OnNotify(self,state,id,events):
@@ -119,68 +111,44 @@ class xFogDistTweener(ptMultiModifier):
             if events[0][1] == 1:
                 print "xFogDistTweener.OnNotify: Entered"
                 Enabled = 1
-                PtAtTimeCallback(self.key, 0, 1)
+                self.StartFogTimer()
 
             elif events[0][1] == 0:
                 print "xFogDistTweener.OnNotify: Exited"
-                PtClearTimerCallbacks(self.key)
+                xEnvTweener.RemoveTweener(self)
                 Enabled = 0
 
     ###########################
     def OnTimer(self, id):
-        global Enabled
+        # the fog is updated by the xEnvTweener tick, which may run on our timer wheel
+        xTimerWheel.OnTimer(self, id)
 
-        if Enabled or not OnlyInRegion.value:
-            self.UpdateFog()
-            PtAtTimeCallback(self.key, RefreshRate.value, 1)
+    ###########################
+    def StartFogTimer(self):
+        # update right away, then every RefreshRate seconds (but at most once a tick)
+        xEnvTweener.AddTweener(self, RefreshRate.value)
+
+    ###########################
+    def CompileFogCurve(self):
+        "the fog settings from point A (0.0) to point B (1.0)"
+        PointA_Values = xEnvTweener.ParseValues(PointA_RGB.value) + (PointA_Start.value, PointA_End.value, PointA_Density.value)
+        PointB_Values = xEnvTweener.ParseValues(PointB_RGB.value) + (PointB_Start.value, PointB_End.value, PointB_Density.value)
+        print "xFogDistTweener.CompileFogCurve: PointA_RGB=(%s,%s,%s), PointB_RGB=(%s,%s,%s)" % (PointA_Values[:3] + PointB_Values[:3])
+        print "xFogDistTweener.CompileFogCurve: PointA_SED=(%s,%s,%s), PointB_SED=(%s,%s,%s)" % (PointA_Values[3:] + PointB_Values[3:])
+        self.fogCurve = xEnvTweener.Keyframes([(0.0, PointA_Values), (1.0, PointB_Values)])
 
     ###########################
     def UpdateFog(self):
-        TweenPct = self.CalculateDistanceBetweenPoints()
+        if OnlyInRegion.value and not Enabled:
+            xEnvTweener.RemoveTweener(self)
+            return
 
         # A Little something for weird lag causing OnFirstUpdate to fail
-        try:
-            self.PointA_RGBList[0]
-        except:
-            self.PointA_RGBList = PointA_RGB.value.split(",")
-            self.PointA_RGBList[0] = float(self.PointA_RGBList[0])
-            self.PointA_RGBList[1] = float(self.PointA_RGBList[1])
-            self.PointA_RGBList[2] = float(self.PointA_RGBList[2])
-
-            self.PointB_RGBList = PointB_RGB.value.split(",")
-            self.PointB_RGBList[0] = float(self.PointB_RGBList[0])
-            self.PointB_RGBList[1] = float(self.PointB_RGBList[1])
-            self.PointB_RGBList[2] = float(self.PointB_RGBList[2])
-
-        NewR = self.PointA_RGBList[0] + ((self.PointB_RGBList[0] - self.PointA_RGBList[0]) * TweenPct)
-        NewG = self.PointA_RGBList[1] + ((self.PointB_RGBList[1] - self.PointA_RGBList[1]) * TweenPct)
-        NewB = self.PointA_RGBList[2] + ((self.PointB_RGBList[2] - self.PointA_RGBList[2]) * TweenPct)
+        if self.fogCurve is None:
+            self.CompileFogCurve()
 
-        NewS = PointA_Start.value + ((PointB_Start.value - PointA_Start.value) * TweenPct)
-        NewE = PointA_End.value + ((PointB_End.value - PointA_End.value) * TweenPct)
-        NewD = PointA_Density.value + ((PointB_Density.value - PointA_Density.value) * TweenPct)
-
-        #print "xFogDistTweener.UpdateFog: The new fog RGB is (%.3f, %.3f, %.3f)" % (NewR, NewG, NewB)
-        #print "xFogDistTweener.UpdateFog: The new fog Density is (%.3f, %.3f, %.3f)" % (NewS, NewE, NewD)
-
-        newfogcolor = ptColor(red=NewR, green=NewG, blue=NewB)
-
-        PtFogSetDefColor(newfogcolor)
-
-        if FogMode.value == "Linear":
-            #print "xFogDistTweener.UpdateFog: Using Linear Fog"
-            PtFogSetDefLinear(NewS, NewE, NewD)
-
-        elif FogMode.value == "Exponential":
-            #print "xFogDistTweener.UpdateFog: Using Exponential Fog"
-            PtFogSetDefExp(NewE, NewD)
-
-        elif FogMode.value == "Exponential2":
-            #print "xFogDistTweener.UpdateFog: Using Exponential2 Fog"
-            PtFogSetDefExp2(NewE, NewD)
-
-        else:
-            print "xFogDistTweener.UpdateFog: What type of Fog?"
+        TweenPct = self.CalculateDistanceBetweenPoints()
+        xEnvTweener.SetFog(FogMode.value, self.fogCurve.Evaluate(TweenPct))
 
     ###########################
     def CalculateDistanceBetweenPoints(self):
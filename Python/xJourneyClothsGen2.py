@@ -55,6 +55,7 @@ from PlasmaVaultConstants import *
 from PlasmaNetConstants import *
 import xRandom
 import xEnum
+import xVaultIndex
 from xPsnlVaultSDL import *
 
 # define the attributes that will be entered in max
@@ -244,17 +245,7 @@ class xJourneyClothsGen2(ptModifier):
 
 
     def GetCurrentAgeChronicle(self, chron):
-        ageChronRefList = chron.getChildNodeRefList()
-
-        for ageChron in ageChronRefList:
-            ageChild = ageChron.getChild()
-
-            ageChild = ageChild.upcastToChronicleNode()
-
-            if ageChild.chronicleGetName() == Age.value:
-                return ageChild
-
-        return None
+        return xVaultIndex.FindNode(chron, PtVaultNodeTypes.kChronicleNode, Age.value)
 
     def IPlayHandAnim(self, length):
         PtDebugPrint ("You've found %s JourneyCloths" % (length))
@@ -85,6 +85,15 @@ import math
 
 import xLocTools
 import xEnum
+import xVaultIndex
+import xSDLDispatch
+import xKIPlayerList
+import xKIChatHistory
+import xLocCache
+import xChronicleStore
+import xTimerWheel
+import xMarkerGameUtils
+from xKIChatRouter import *
 from xMarkerGameManager import * #Logic for Marker Games
 from xMarkerGameKIDisplay import * #Support to display user-created marker game details within the KI
 
@@ -187,6 +196,8 @@ kMarkerGameTimer=5
 kDumpLogsTimer=6
 kLightStopID=7
 kJalakBtnDelayTimer=8
+kChatDrawTimer=9
+kChatLogTimer=10
 
 #===== KI limits
 kMaxPictures = 15
@@ -227,6 +238,21 @@ kChronicleOnlyPMsType = 2
 kChronicleBuddiesOnRequest = "PlayerKIBuddiesOnRequest"
 kChronicleBuddiesOnRequestType = 2
 kChronCGZPlaying = "CGZPlaying"
+kChronicleKILight = "KILightStop"
+kChronicleFeather = "feather"
+
+# the chronicle entries the KI reads when it is set up; None defaults are filled in from the KI
+xChronicleStore.Declare(kChronicleCensorLevel,xChronicleStore.kChronInt,None,kChronicleCensorLevelType)
+xChronicleStore.Declare(kChronicleKILevel,xChronicleStore.kChronInt,None,kChronicleKILevelType)
+xChronicleStore.Declare(kChronicleKIMarkerLevel,xChronicleStore.kChronInt,None,kChronicleKIMarkerLevelType)
+xChronicleStore.Declare(kChronicleFontSize,xChronicleStore.kChronInt,None,kChronicleFontSizeType)
+xChronicleStore.Declare(kChronicleFadeTime,xChronicleStore.kChronInt,None,kChronicleFadeTimeType)
+xChronicleStore.Declare(kChronicleOnlyPMs,xChronicleStore.kChronInt,None,kChronicleOnlyPMsType)
+xChronicleStore.Declare(kChronicleBuddiesOnRequest,xChronicleStore.kChronInt,None,kChronicleBuddiesOnRequestType)
+xChronicleStore.Declare(kChronicleGZGames,xChronicleStore.kChronString,None,kChronicleGZGamesType)
+xChronicleStore.Declare(kChronicleGZMarkersAquired,xChronicleStore.kChronString,None,kChronicleGZMarkersAquiredType)
+xChronicleStore.Declare(kChronicleKILight,xChronicleStore.kChronInt,-1)
+xChronicleStore.Declare(kChronicleFeather,xChronicleStore.kChronInt,0)
 # ==============
 # BlackBar globals
 #----Controls
@@ -289,6 +315,7 @@ kminiMGInactive = 1012
 
 #----
 kMaxChatSize = 2048
+kChatLogFlushTime = 1.0
 kMaxNumChatItems = 50
 kStartNumChatItems = 9
 kStartOffScreenLine = 0
@@ -306,6 +333,9 @@ kChatInterAgeSelf=10
 kChatCCRMessage=11
 kChatCCRMessageSelf=12
 kChatCCRMessageFromPlayer=13
+# the lines in the mini/micro KI chat areas, and the ones waiting for the chat log
+ChatHistory = xKIChatHistory.ChatHistory(kMaxChatSize)
+ChatLogBuffer = xKIChatHistory.ChatLogBuffer()
 #----fading the lists
 kFadeNotActive=0
 kFadeFullDisp=1
@@ -336,6 +366,8 @@ gFeather = 0
 #
 # this a list of playerfolder and players, all one giant list
 BKPlayerList = []
+# what IRefreshPlayerListDisplay last put in the player list: (kind,text,color,selectMode,closePrev) per row
+BKPlayerListRows = []
 
 BKPlayerSelected = None
 PreviouslySelectedPlayer = None
@@ -368,6 +400,8 @@ FolderOfDevices = None
 #==Content list
 BKCurrentContent = None
 BKContentList = []
+# processed contents of vault folders: (folderID,isPlayerFolder,isInbox,OnlyGetPMsFromBuddies) -> (folder IDs it depends on,child node IDs,contents)
+BKContentCache = {}
 BKContentListTopLine = 0
 #
 
@@ -780,6 +814,31 @@ kChatPetitionCommands = {
 }
 
 
+def InvalidateContentCache(event,tupdata):
+    "drops the processed folder contents that a vault event touches"
+    if not BKContentCache:
+        return
+    if event == PtVaultCallbackTypes.kVaultConnected or event == PtVaultCallbackTypes.kVaultDisconnected:
+        BKContentCache.clear()
+        return
+    if event == PtVaultCallbackTypes.kVaultNodeRefAdded:
+        # tupdata is ( ptVaultNodeRef )
+        folderID = tupdata[0].getParentID()
+        nodeID = tupdata[0].getChildID()
+    elif event == PtVaultCallbackTypes.kVaultNodeRefRemoved:
+        # tupdata is ( childID, parentID )
+        folderID = tupdata[1]
+        nodeID = tupdata[0]
+    elif event == PtVaultCallbackTypes.kVaultNodeSaved:
+        # tupdata is ( ptVaultNode ), a saved node may sort differently now
+        folderID = None
+        nodeID = tupdata[0].getID()
+    else:
+        return
+    for key, entry in BKContentCache.items():
+        if folderID in entry[0] or nodeID in entry[1]:
+            del BKContentCache[key]
+
 def CMPplayerOnline(playerA,playerB):
     elPlayerA = playerA.getChild()
     elPlayerB = playerB.getChild()
@@ -815,6 +874,7 @@ class xKI(ptModifier):
         self.id = 199
         self.version = MaxVersionNumber
         self.isChatting = 0
+        self.chatDrawPending = 0
         FolderOfDevices = DeviceFolder(PtGetLocalizedString("KI.Folders.Devices"))
         PtDebugPrint("__xKI: Max version %d - minor version %d.a" % (MaxVersionNumber,MinorVersionNumber))
         #
@@ -882,6 +942,7 @@ class xKI(ptModifier):
         global AmICCR
         global ChatLogFile
 
+        xChronicleStore.Attach(self)
         # create the dnicoordinate keeper
         self.dnicoords = ptDniCoordinates()
         # to start with we will use randized numbers instead of the real thing
@@ -894,6 +955,7 @@ class xKI(ptModifier):
             AmICCR = 0
 
         xBookGUIs.LoadAllBookGUIs()
+        self.IRegisterChatCommands()
 
         logoutText = ptGUIControlTextBox(KIYesNo.dialog.getControlFromTag(kYesNoLogoutTextID))
         logoutText.hide()
@@ -919,6 +981,8 @@ class xKI(ptModifier):
 
     def OnServerInitComplete(self):
         global AgeName
+        # pick up any logging level change made from the console while in the last age
+        PtRefreshLoggingLevel()
         if self.markerGameDisplay != None:
             self.markerGameDisplay = None
 
@@ -970,28 +1034,20 @@ class xKI(ptModifier):
 
 
     def GetKILightChron(self):
-        vault = ptVault()
-        entry = vault.findChronicleEntry("KILightStop")
-        if type(entry) != type(None):
-            entryValue = entry.chronicleGetValue()
-            remaining = string.atoi(entryValue)
-            return remaining
+        if xChronicleStore.Has(kChronicleKILight):
+            return xChronicleStore.Get(kChronicleKILight)
         else:
             PtDebugPrint("no KI light", level=kDebugDumpLevel)
             return -1
 
 
     def SetKILightChron(self,remaining):
-        vault = ptVault()
-        entry = vault.findChronicleEntry("KILightStop")
-        if type(entry) != type(None):
-            entryValue = entry.chronicleGetValue()
-            oldVal = string.atoi(entryValue)
-            if remaining == oldVal:
+        if xChronicleStore.Has(kChronicleKILight):
+            if remaining == xChronicleStore.Get(kChronicleKILight):
                 return
             PtDebugPrint("set KI light chron to: ", remaining, level=kDebugDumpLevel)
-            entry.chronicleSetValue("%d" % (remaining))
-            entry.save()
+            # the light machines read it from the vault, and we may be leaving the age
+            xChronicleStore.Set(kChronicleKILight,remaining,now=1)
 
 
     def DoKILight(self,state,ff,remaining=0):
@@ -1029,6 +1085,12 @@ class xKI(ptModifier):
 
 
     def BeginAgeUnLoad(self,avObj):
+        # get the settings into the vault before we go
+        xChronicleStore.Flush()
+        # the age vault belongs to the age we are leaving
+        InvalidateSDLCache(1)
+        # so do the age's SDL subscriptions
+        xSDLDispatch.ResetSDLDispatch()
         ageName = PtGetAgeName()
         if ageName == "Descent":
             return
@@ -1296,7 +1358,7 @@ class xKI(ptModifier):
                 elif (event[2] == 999): # the book is being offered by someone else
                     BookOfferer = event[1]
                     avID = PtGetClientIDFromAvatarKey(BookOfferer.getKey())
-                    if ptVault().getIgnoreListFolder().playerlistHasPlayer(avID):
+                    if xKIPlayerList.IsIgnored(avID):
                         OfferedBookMode = kNotOffering
                         PtNotifyOffererLinkRejected(avID)
                         BookOfferer = None
@@ -1503,10 +1565,13 @@ class xKI(ptModifier):
         IsYeeshaBookEnabled = 1
         IsEntireYeeshaBookEnabled = 1
 
+        chronStats = xChronicleStore.GetChronicleStats()
         self.IDetermineCensorLevel()
         self.IDetermineKILevel()
         self.IDetermineKIFlags()
         self.IDetermineGZ()
+        newStats = xChronicleStore.GetChronicleStats()
+        PtDebugPrint("xKI: chronicle vault operations during setup: %d loads, %d finds, %d adds, %d saves" % tuple([newStats[op] - chronStats[op] for op in ('loads','finds','adds','saves')]),level=kDebugDumpLevel)
 
         # Hide all dialogs first, then we'll show the one we want
         KINanoBlackBar.dialog.hide()
@@ -1594,33 +1659,16 @@ class xKI(ptModifier):
         #== find the folder where the markerfolders might be
         # search thru the age journal folders
         vault = ptVault()
-        jfolder = None
-        master_agefolder = vault.getAgeJournalsFolder()
-        if type(master_agefolder) != type(None):
-            agefolderRefs = master_agefolder.getChildNodeRefList()
-            for agefolderRef in agefolderRefs:
-                agefolder = agefolderRef.getChild()
-                agefolder = agefolder.upcastToFolderNode()
-                if type(agefolder) != type(None):
-                    # look for the Hidden folder
-                    if self.IsFolderHidden(agefolder):
-                        jfolder = agefolder
-                        break
-        return jfolder
+        # look for the Hidden folder
+        return xVaultIndex.FindNode(vault.getAgeJournalsFolder(),PtVaultNodeTypes.kFolderNode,"Hidden")
     def IFindGameInFolder(self,folder,gameName):
         "find the marker game in the folder"
         if folder:
             # need to try to find the game
-            folderRefs = folder.getChildNodeRefList()
-            for jref in folderRefs:
-                jnode = jref.getChild()
-                jnode = jnode.upcastToMarkerGameNode()
-                # is it a marker folder list?
-                if type(jnode) != type(None):
-                    # is it named the right one?
-                    if jnode.getGameName() == gameName:
-                        PtDebugPrint("Found %s marker game in folder %s" % (folder.folderGetName(),jnode.folderGetName()), level=kDebugDumpLevel)
-                        return jnode
+            jnode = xVaultIndex.FindNode(folder,PtVaultNodeTypes.kMarkerGameNode,gameName)
+            if type(jnode) != type(None):
+                PtDebugPrint("Found %s marker game in folder %s" % (gameName,folder.folderGetName()), level=kDebugDumpLevel)
+                return jnode
         return None
 #Tye: The previous two functions may not be necessary! (please check)
 
@@ -2762,6 +2810,9 @@ class xKI(ptModifier):
                         logoutButton.hide()
 
                         # clear out all chat on micro KI
+                        ChatHistory.clear()
+                        ChatHistory.forget("micro")
+                        ChatHistory.forget("mini")
                         chatarea = ptGUIControlMultiLineEdit(KIMicro.dialog.getControlFromTag(kChatDisplayArea))
                         chatarea.setString("")
                         chatarea.moveCursor(PtGUIMultiLineDirection.kBufferStart)
@@ -3777,20 +3828,15 @@ class xKI(ptModifier):
         elif command == kGZUpdated:
             if value != 0:
                 # setting the max in the GZ marker chronicle
-                vault = ptVault()
                 # is there a chronicle for the GZ games?
-                entry = vault.findChronicleEntry(kChronicleGZMarkersAquired)
-                if type(entry) != type(None):
-                    markers = entry.chronicleGetValue()
-                    if len(markers) < value:
-                        # need to increase the capacity of the markers - start as active
-                        markers += kGZMarkerAvailable * (value - len(markers))
-                        entry.chronicleSetValue(markers)
-                        entry.save()
-                else:
+                markers = xChronicleStore.Get(kChronicleGZMarkersAquired)
+                if markers is None:
                     # if there is none, then just add another entry - start off as active
-                    markers = kGZMarkerAvailable * value
-                    vault.addChronicleEntry(kChronicleGZMarkersAquired,kChronicleGZMarkersAquiredType,markers)
+                    xChronicleStore.Set(kChronicleGZMarkersAquired,kGZMarkerAvailable * value,now=1)
+                elif len(markers) < value:
+                    # need to increase the capacity of the markers - start as active
+                    markers += kGZMarkerAvailable * (value - len(markers))
+                    xChronicleStore.Set(kChronicleGZMarkersAquired,markers,now=1)
             self.IDetermineKILevel()
             self.IDetermineGZ()
             self.IRefreshMiniKIMarkerDisplay()
@@ -4230,6 +4276,9 @@ class xKI(ptModifier):
         global BKFolderSelected
         global BKFolderTopLine
         global WeAreTakingAPicture
+        # the chronicle writes are flushed on our timer wheel
+        if xTimerWheel.OnTimer(self,id):
+            return
         #PtDebugPrint("xKI:OnTimer id=%d  FadeMode=%d" % (id,FadeMode) )
         if id == kFadeTimer:
             if PtIsSinglePlayerMode():
@@ -4286,6 +4335,10 @@ class xKI(ptModifier):
             self.DoKILight(0,0)
         elif id == kJalakBtnDelayTimer:
             self.SetJalakGUIButtons(1)
+        elif id == kChatDrawTimer:
+            self.IDrawChat()
+        elif id == kChatLogTimer:
+            ChatLogBuffer.flush(ChatLogFile)
 
 
     def OnScreenCaptureDone(self,image):
@@ -4414,6 +4467,7 @@ class xKI(ptModifier):
         "A high level player vault event"
         global theKILevel
         PtDebugPrint("xKI:OnVaultNotify recvd. Event=%d and data= " % (event),tupdata,level=kDebugDumpLevel)
+        xVaultIndex.OnVaultNotify(event,tupdata)
         try:
             test = tupdata[0]
         except:
@@ -4453,14 +4507,25 @@ class xKI(ptModifier):
     def OnAgeVaultEvent(self,event,tupdata):
         "A low level age vault event"
         PtDebugPrint("xKI:OnAgeVaultEvent recvd. Event=%d and data= " % (event),tupdata,level=kDebugDumpLevel)
-        self.HandleVaultTypeEvents(event,tupdata)
+        OnSDLVaultEvent(event,tupdata)
+        InvalidateContentCache(event,tupdata)
+        dplChanged = xKIPlayerList.OnVaultEvent(event,tupdata)
+        self.HandleVaultTypeEvents(event,tupdata,dplChanged)
 
     def OnVaultEvent(self,event,tupdata):
         "A low level player vault event"
         PtDebugPrint("xKI:OnVaultEvent recvd. Event=%d and data= " % (event),tupdata,level=kDebugDumpLevel)
-        self.HandleVaultTypeEvents(event,tupdata)
-
-    def HandleVaultTypeEvents(self,event,tupdata):
+        xVaultIndex.OnVaultEvent(event,tupdata)
+        xChronicleStore.OnVaultEvent(event,tupdata)
+        if event == PtVaultCallbackTypes.kVaultConnected or event == PtVaultCallbackTypes.kVaultDisconnected:
+            # the cached marker game data may belong to the player we were before
+            xMarkerGameUtils.InvalidateGameDataCache()
+        OnSDLVaultEvent(event,tupdata)
+        InvalidateContentCache(event,tupdata)
+        dplChanged = xKIPlayerList.OnVaultEvent(event,tupdata)
+        self.HandleVaultTypeEvents(event,tupdata,dplChanged)
+
+    def HandleVaultTypeEvents(self,event,tupdata,dplChanged=1):
         global theKILevel
         # make sure that the bigKI dialog is loaded before trying to update it
         if PtIsDialogLoaded("KIMain"):
@@ -4475,9 +4540,11 @@ class xKI(ptModifier):
                 PtDebugPrint("xKI: kVaultNodeSaved event (id=%d,type=%d)" % (tupdata[0].getID(),tupdata[0].getType()),level=kDebugDumpLevel)
                 # tupdata is ( ptVaultNode )
                 # if a player info has changed then reget player info stuff
+                # (unless it's no one we list or nothing we show has changed)
                 if tupdata[0].getType() == PtVaultNodeTypes.kPlayerInfoNode:
-                    self.IRefreshPlayerList()
-                    self.IRefreshPlayerListDisplay()
+                    if dplChanged:
+                        self.IRefreshPlayerList()
+                        self.IRefreshPlayerListDisplay()
                 elif tupdata[0].getType() == PtVaultNodeTypes.kAgeInfoNode:
                     # an age info was updated... refresh everything of the like
                     self.IBigKISetStatics()
@@ -4592,25 +4659,18 @@ class xKI(ptModifier):
         global theCensorLevel
         # assume that they have none...
         theCensorLevel = xCensor.xRatedPG
-        vault = ptVault()
-        entry = vault.findChronicleEntry(kChronicleCensorLevel)
-        if type(entry) == type(None):
+        level = xChronicleStore.Get(kChronicleCensorLevel)
+        if level is None:
             # not found... add current level chronicle
-            vault.addChronicleEntry(kChronicleCensorLevel,kChronicleCensorLevelType,"%d" % (theCensorLevel))
+            xChronicleStore.Set(kChronicleCensorLevel,theCensorLevel,now=1)
         else:
-            theCensorLevel = string.atoi(entry.chronicleGetValue())
+            theCensorLevel = level
         PtDebugPrint("xKI: the censor level is %d" % (theCensorLevel),level=kWarningLevel)
     def ISaveCensorLevel(self):
         "Set the Censor level in the chronicle"
+        # written right away: xSimpleImager reads this entry straight from the vault
         global theCensorLevel
-        # assume that they have none...
-        vault = ptVault()
-        entry = vault.findChronicleEntry(kChronicleCensorLevel)
-        if type(entry) != type(None):
-            entry.chronicleSetValue("%d" % (theCensorLevel))
-            entry.save()
-        else:
-            vault.addChronicleEntry(kChronicleCensorLevel,kChronicleCensorLevelType,"%d" % (theCensorLevel))
+        xChronicleStore.Set(kChronicleCensorLevel,theCensorLevel,now=1)
         PtDebugPrint("xKI: Saving Censor level of %d" % (theCensorLevel),level=kWarningLevel)
 
     def IDetermineKILevel(self):
@@ -4620,41 +4680,25 @@ class xKI(ptModifier):
         global gFeather
         # assume that they have none...
         theKILevel = kNanoKI
-        vault = ptVault()
-        entry = vault.findChronicleEntry(kChronicleKILevel)
-        if type(entry) == type(None):
+        oldLevel = xChronicleStore.Get(kChronicleKILevel)
+        if oldLevel is None:
             # not found... add current level chronicle
-            vault.addChronicleEntry(kChronicleKILevel,kChronicleKILevelType,"%d" % (theKILevel))
-        else:
-            oldLevel = string.atoi(entry.chronicleGetValue())
-            if oldLevel >= kLowestKILevel and oldLevel <= kHighestKILevel:
-                theKILevel = oldLevel
+            xChronicleStore.Set(kChronicleKILevel,theKILevel)
+        elif oldLevel >= kLowestKILevel and oldLevel <= kHighestKILevel:
+            theKILevel = oldLevel
         PtDebugPrint("xKI: the KI level is %d" % (theKILevel),level=kWarningLevel)
         # set the KIMarkerLevel
         #   assume no level
         gKIMarkerLevel = 0
-        entry = vault.findChronicleEntry(kChronicleKIMarkerLevel)
-        if type(entry) == type(None):
-            # not found... add current level chronicle
-            vault.addChronicleEntry(kChronicleKIMarkerLevel,kChronicleKIMarkerLevelType,"%d" % (gKIMarkerLevel))
+        level = xChronicleStore.Get(kChronicleKIMarkerLevel)
+        if level is None:
+            # not found (or broken)... add current level chronicle
+            xChronicleStore.Set(kChronicleKIMarkerLevel,gKIMarkerLevel)
         else:
-            try:
-                gKIMarkerLevel = string.atoi(entry.chronicleGetValue())
-            except:
-                PtDebugPrint("ERROR: xKI.IDetermineKILevel(): Chronicle entry error with the KI's Marker Level, resetting to the default value")
-                entry.chronicleSetValue("%d" % (gKIMarkerLevel))
-                entry.save()
+            gKIMarkerLevel = level
 
         PtDebugPrint("xKI: the KIMarker level is %d" % (gKIMarkerLevel),level=kWarningLevel)
-        entry = vault.findChronicleEntry("feather")
-        if type(entry) == type(None):
-            # not found... add current level chronicle
-            gFeather = 0
-        else:
-            try:
-                gFeather = string.atoi(entry.chronicleGetValue())
-            except ValueError:
-                gFeather = 0
+        gFeather = xChronicleStore.Get(kChronicleFeather)
 
     def IUpgradeKIMarkerLevel(self,newLevel):
         "upgrade the KIMarker level to something"
@@ -4663,54 +4707,36 @@ class xKI(ptModifier):
         if theKILevel > kMicroKI:
             if newLevel > gKIMarkerLevel:
                 gKIMarkerLevel = newLevel
-                vault = ptVault()
-                entry = vault.findChronicleEntry(kChronicleKIMarkerLevel)
-                if type(entry) == type(None):
-                    # not found... add current level chronicle
-                    PtDebugPrint("xKI: KIMarker level not found - set to %d" % (gKIMarkerLevel),level=kWarningLevel)
-                    vault.addChronicleEntry(kChronicleKIMarkerLevel,kChronicleKIMarkerLevelType,"%d" % (gKIMarkerLevel))
-                else:
-                    PtDebugPrint("xKI: KIMarker upgrading existing level to %d" % (gKIMarkerLevel),level=kWarningLevel)
-                    entry.chronicleSetValue("%d" % (gKIMarkerLevel))
-                    entry.save()
+                PtDebugPrint("xKI: KIMarker upgrading level to %d" % (gKIMarkerLevel),level=kWarningLevel)
+                # the marker machines read it back from the vault
+                xChronicleStore.Set(kChronicleKIMarkerLevel,gKIMarkerLevel,now=1)
 
     def IDetermineFontSize(self):
         "Set the FontSize from saved"
-        # assume that they have none...
-        fontSize = self.IGetFontSize()
-        vault = ptVault()
-        entry = vault.findChronicleEntry(kChronicleFontSize)
-        if type(entry) == type(None):
+        fontSize = xChronicleStore.Get(kChronicleFontSize)
+        if fontSize is None:
             # not found... add current level chronicle
-            vault.addChronicleEntry(kChronicleFontSize,kChronicleFontSizeType,"%d" % (fontSize))
+            fontSize = self.IGetFontSize()
+            xChronicleStore.Set(kChronicleFontSize,fontSize)
         else:
-            fontSize = string.atoi(entry.chronicleGetValue())
             self.ISetFontSize(fontSize)
         PtDebugPrint("xKI: the Saved Font Size is %d" % (fontSize),level=kWarningLevel)
     def ISaveFontSize(self):
         "Set the FontSize from saved"
-        # assume that they have none...
         fontSize = self.IGetFontSize()
-        vault = ptVault()
-        entry = vault.findChronicleEntry(kChronicleFontSize)
-        if type(entry) != type(None):
-            entry.chronicleSetValue("%d" % (fontSize))
-            entry.save()
-        else:
-            vault.addChronicleEntry(kChronicleFontSize,kChronicleFontSizeType,"%d" % (fontSize))
+        xChronicleStore.Set(kChronicleFontSize,fontSize)
         PtDebugPrint("xKI: Saving Font Size of %d" % (fontSize),level=kWarningLevel)
 
     def IDetermineFadeTime(self):
         "Set the FadeTime from saved"
         global TicksOnFull
         global FadeEnableFlag
-        vault = ptVault()
-        entry = vault.findChronicleEntry(kChronicleFadeTime)
-        if type(entry) == type(None):
+        fadeTime = xChronicleStore.Get(kChronicleFadeTime)
+        if fadeTime is None:
             # not found... add current level chronicle
-            vault.addChronicleEntry(kChronicleFadeTime,kChronicleFadeTimeType,"%d" % (TicksOnFull))
+            xChronicleStore.Set(kChronicleFadeTime,TicksOnFull)
         else:
-            TicksOnFull = string.atoi(entry.chronicleGetValue())
+            TicksOnFull = fadeTime
             if TicksOnFull == kFadeTimeMax:
                 # disable the fade all together
                 FadeEnableFlag = 0
@@ -4722,53 +4748,35 @@ class xKI(ptModifier):
     def ISaveFadeTime(self):
         "Set the FadeTime from saved"
         global TicksOnFull
-        vault = ptVault()
-        entry = vault.findChronicleEntry(kChronicleFadeTime)
-        if type(entry) != type(None):
-            entry.chronicleSetValue("%d" % (TicksOnFull))
-            entry.save()
-        else:
-            vault.addChronicleEntry(kChronicleFadeTime,kChronicleFadeTimeType,"%d" % (TicksOnFull))
+        xChronicleStore.Set(kChronicleFadeTime,TicksOnFull)
         PtDebugPrint("xKI: Saving Fade Time of %d" % (TicksOnFull),level=kWarningLevel)
 
     def IDetermineKIFlags(self):
         "Sets the KI flags from the saved chronicle"
         global OnlyGetPMsFromBuddies
         global OnlyAllowBuddiesOnRequest
-        vault = ptVault()
         # Only gets PMs and KIMail from Buddies
-        entry = vault.findChronicleEntry(kChronicleOnlyPMs)
-        if type(entry) == type(None):
+        flag = xChronicleStore.Get(kChronicleOnlyPMs)
+        if flag is None:
             # not found.... then add to chronicle
-            vault.addChronicleEntry(kChronicleOnlyPMs,kChronicleOnlyPMsType,"%d" % (OnlyGetPMsFromBuddies))
+            xChronicleStore.Set(kChronicleOnlyPMs,OnlyGetPMsFromBuddies)
         else:
-            OnlyGetPMsFromBuddies = string.atoi(entry.chronicleGetValue())
+            OnlyGetPMsFromBuddies = flag
         # Only allow people to be buddies if I say so
-        entry = vault.findChronicleEntry(kChronicleBuddiesOnRequest)
-        if type(entry) == type(None):
+        flag = xChronicleStore.Get(kChronicleBuddiesOnRequest)
+        if flag is None:
             # not found.... then add to chronicle
-            vault.addChronicleEntry(kChronicleBuddiesOnRequest,kChronicleBuddiesOnRequestType,"%d" % (OnlyAllowBuddiesOnRequest))
+            xChronicleStore.Set(kChronicleBuddiesOnRequest,OnlyAllowBuddiesOnRequest)
         else:
-            OnlyAllowBuddiesOnRequest = string.atoi(entry.chronicleGetValue())
+            OnlyAllowBuddiesOnRequest = flag
     def ISaveKIFlags(self):
         "Save the KIFlags"
         global OnlyGetPMsFromBuddies
         global OnlyAllowBuddiesOnRequest
-        vault = ptVault()
         # Only gets PMs and KIMail from Buddies
-        entry = vault.findChronicleEntry(kChronicleOnlyPMs)
-        if type(entry) != type(None):
-            entry.chronicleSetValue("%d" % (OnlyGetPMsFromBuddies))
-            entry.save()
-        else:
-            vault.addChronicleEntry(kChronicleOnlyPMs,kChronicleOnlyPMsType,"%d" % (OnlyGetPMsFromBuddies))
+        xChronicleStore.Set(kChronicleOnlyPMs,OnlyGetPMsFromBuddies)
         # Only allow people to be buddies if I say so
-        entry = vault.findChronicleEntry(kChronicleBuddiesOnRequest)
-        if type(entry) != type(None):
-            entry.chronicleSetValue("%d" % (OnlyAllowBuddiesOnRequest))
-            entry.save()
-        else:
-            vault.addChronicleEntry(kChronicleBuddiesOnRequest,kChronicleBuddiesOnRequestType,"%d" % (OnlyAllowBuddiesOnRequest))
+        xChronicleStore.Set(kChronicleBuddiesOnRequest,OnlyAllowBuddiesOnRequest)
 
     def IDetermineGZ(self):
         "Update the GZ globals from chronicle"
@@ -4779,12 +4787,10 @@ class xKI(ptModifier):
         global gMarkerGottenNumber
         if gKIMarkerLevel > kKIMarkerNotUpgraded:
             if gKIMarkerLevel < kKIMarkerNormalLevel:
-                vault = ptVault()
                 # is there a chronicle for the GZ games?
-                entry = vault.findChronicleEntry(kChronicleGZGames)
+                gameString = xChronicleStore.Get(kChronicleGZGames)
                 error = 0
-                if type(entry) != type(None):
-                    gameString = entry.chronicleGetValue()
+                if gameString is not None:
                     PtDebugPrint("xKI:GZ - game string is: %s" % (gameString), level=kWarningLevel)
                     args = gameString.split()
                     if len(args) == 3:
@@ -4891,10 +4897,8 @@ class xKI(ptModifier):
         else:
             PtDebugPrint("xKI:GZ FLASH - Error GZGames string formation error.... Checking Chronicle for corruption")
 
-        vault = ptVault()
-        entry = vault.findChronicleEntry(kChronicleGZGames)
-        if type(entry) != type(None):
-            if gameString == entry.chronicleGetValue():
+        if xChronicleStore.Has(kChronicleGZGames):
+            if gameString == xChronicleStore.Get(kChronicleGZGames):
                 PtDebugPrint("xKI:GZ Flash - ****Error: Vault Corrupted: trying to gracefully reset to a default state****")
                 import grtzKIMarkerMachine
                 grtzKIMarkerMachine.ResetMarkerGame()
@@ -4912,28 +4916,14 @@ class xKI(ptModifier):
         global gMarkerToGetNumber
         global gMarkerGottenNumber
         if gGZPlaying:
-            vault = ptVault()
-            # is there a chronicle for the GZ games?
-            entry = vault.findChronicleEntry(kChronicleGZGames)
             upstring = "%d %s:%s %d:%d" % (gGZPlaying,gMarkerGottenColor,gMarkerToGetColor,gMarkerGottenNumber,gMarkerToGetNumber)
-            if type(entry) != type(None):
-                entry.chronicleSetValue(upstring)
-                entry.save()
-            else:
-                # if there is none, then just add another entry
-                vault.addChronicleEntry(kChronicleGZGames,kChronicleGZGamesType,upstring)
+            # the marker machines read the game progress from the vault
+            xChronicleStore.Set(kChronicleGZGames,upstring,now=1)
 
     def IUpdateKILevelChronicle(self):
         "Update the KILevelChronicle to the new KI level"
-        vault = ptVault()
-        # find the current version (if there is one)
-        entry = vault.findChronicleEntry(kChronicleKILevel)
-        if type(entry) != type(None):
-            entry.chronicleSetValue("%d" % (theKILevel))
-            entry.save()
-        else:
-            # if there is none, then just add another entry
-            vault.addChronicleEntry(kChronicleKILevel,kChronicleKILevelType,"%d" % (theKILevel))
+        # others ask the vault for the KI level (PtDetermineKILevel)
+        xChronicleStore.Set(kChronicleKILevel,theKILevel,now=1)
 
     def IGetNeighborhood(self):
         "find the neighborhood for this player"
@@ -5013,74 +5003,86 @@ class xKI(ptModifier):
                 else:
                     return "Unknown"
 
-            if ageInfo.getAgeFilename() == "PelletBahroCave":
-                return "Unknown"
+            # the rest only depends on the names, so remember it
+            key = (ageInfo.getAgeFilename(),ageInfo.getAgeInstanceName(),ageInfo.getDisplayName(),isChildAge,isSubAge)
+            return xLocCache.GetAgeName("IGetAgeDisplayName",key,self.IAgeDisplayName,ageInfo,isChildAge,isSubAge)
 
-            if ageInfo.getAgeInstanceName() == "Ae'gura" or ageInfo.getAgeFilename() == "city":
-                if isChildAge:
-                    return "D'ni-Ae'gura'"
-                return "D'ni-Ae'gura"
+        else:
+            return "?UNKNOWN?"
 
-            if ageInfo.getAgeFilename() == "AvatarCustomization":
-                return "Avatar Customization"
+    def IAgeDisplayName(self,ageInfo,isChildAge,isSubAge):
+        "the display name of an age other than the Bahro caves"
+        if ageInfo.getAgeFilename() == "PelletBahroCave":
+            return "Unknown"
 
-            if ageInfo.getAgeFilename() == "spyroom":
-                return "D'ni-Ae'gura"
+        if ageInfo.getAgeInstanceName() == "Ae'gura" or ageInfo.getAgeFilename() == "city":
+            if isChildAge:
+                return "D'ni-Ae'gura'"
+            return "D'ni-Ae'gura"
 
-            if ageInfo.getAgeFilename() == "philRelto":
-                return "Phil's Relto"
-
-            if ageInfo.getAgeFilename() == "GuildPub-Cartographers":
-                return "The Cartographers' Pub"
-            if ageInfo.getAgeFilename() == "GuildPub-Greeters":
-                return "The Greeters' Pub"
-            if ageInfo.getAgeFilename() == "GuildPub-Maintainers":
-                return "The Maintainers' Pub"
-            if ageInfo.getAgeFilename() == "GuildPub-Messengers":
-                return "The Messengers' Pub"
-            if ageInfo.getAgeFilename() == "GuildPub-Writers":
-                return "The Writers' Pub"
-            if ageInfo.getAgeFilename() == "GreatTreePub":
-                return "The Watcher's Pub"
-
-            if ageInfo.getAgeFilename() == "Kveer":
-                return "D'ni-K'veer"
+        if ageInfo.getAgeFilename() == "AvatarCustomization":
+            return "Avatar Customization"
 
-            if ageInfo.getAgeFilename() == "GreatZero":
-                return "D'ni-Rezeero"
+        if ageInfo.getAgeFilename() == "spyroom":
+            return "D'ni-Ae'gura"
 
-            if ageInfo.getAgeFilename() == "Descent":
-                return "D'ni-Tiwah"
+        if ageInfo.getAgeFilename() == "philRelto":
+            return "Phil's Relto"
 
-            if ageInfo.getAgeFilename() == "ErcanaCitySilo":
-                return "D'ni-Ashem'en"
+        if ageInfo.getAgeFilename() == "GuildPub-Cartographers":
+            return "The Cartographers' Pub"
+        if ageInfo.getAgeFilename() == "GuildPub-Greeters":
+            return "The Greeters' Pub"
+        if ageInfo.getAgeFilename() == "GuildPub-Maintainers":
+            return "The Maintainers' Pub"
+        if ageInfo.getAgeFilename() == "GuildPub-Messengers":
+            return "The Messengers' Pub"
+        if ageInfo.getAgeFilename() == "GuildPub-Writers":
+            return "The Writers' Pub"
+        if ageInfo.getAgeFilename() == "GreatTreePub":
+            return "The Watcher's Pub"
 
-            if ageInfo.getAgeFilename() in kHideAgesHackList:
-                return "Unknown"
+        if ageInfo.getAgeFilename() == "Kveer":
+            return "D'ni-K'veer"
 
-            # don't include the persons name on D'ni locations
-            iname = ageInfo.getAgeInstanceName()
-            if iname.startswith("D'ni"):
-                return iname
-
-            # For some reason it thinks Er'cana and Ahnonay are
-            # sub ages. Get the display name for them.
-            if (isChildAge or isSubAge) and \
-            not (ageInfo.getAgeFilename() == "Ercana" or ageInfo.getAgeFilename()[:7] == "Ahnonay"):
-                localizeName = ageInfo.getAgeInstanceName()
-                if isChildAge:
-                    localizeName += "'"
-            else:
-                localizeName = ageInfo.getDisplayName()
+        if ageInfo.getAgeFilename() == "GreatZero":
+            return "D'ni-Rezeero"
 
-            return self.IFilterAgeName(xLocTools.LocalizeAgeName(localizeName))
+        if ageInfo.getAgeFilename() == "Descent":
+            return "D'ni-Tiwah"
+
+        if ageInfo.getAgeFilename() == "ErcanaCitySilo":
+            return "D'ni-Ashem'en"
 
+        if ageInfo.getAgeFilename() in kHideAgesHackList:
+            return "Unknown"
+
+        # don't include the persons name on D'ni locations
+        iname = ageInfo.getAgeInstanceName()
+        if iname.startswith("D'ni"):
+            return iname
+
+        # For some reason it thinks Er'cana and Ahnonay are
+        # sub ages. Get the display name for them.
+        if (isChildAge or isSubAge) and \
+        not (ageInfo.getAgeFilename() == "Ercana" or ageInfo.getAgeFilename()[:7] == "Ahnonay"):
+            localizeName = ageInfo.getAgeInstanceName()
+            if isChildAge:
+                localizeName += "'"
         else:
-            return "?UNKNOWN?"
+            localizeName = ageInfo.getDisplayName()
+
+        return self.IFilterAgeName(xLocTools.LocalizeAgeName(localizeName))
 
     def IFilterAgeName(self,ageName):
         """filter and lastminute switching of the age names... can be anywhere in string
            KI Age folders"""
+        if ageName == "???":
+            # depends on the pole states
+            return self.IFilterAgeNameText(ageName)
+        return xLocCache.GetAgeName("IFilterAgeName",ageName,self.IFilterAgeNameText,ageName)
+
+    def IFilterAgeNameText(self,ageName):
         #print "IFilterAgeName input as %s" % (ageName)
         if ageName.find("Garrison") != -1:
             ageName = ageName.replace("Garrison", "Gahreesen")
@@ -5226,6 +5228,12 @@ class xKI(ptModifier):
 
     def IConvertAgeName(self,ageName):
         "Full KI players location"
+        if ageName == "BahroCave":
+            # depends on the pole states
+            return self.IConvertAgeNameText(ageName)
+        return xLocCache.GetAgeName("IConvertAgeName",ageName,self.IConvertAgeNameText,ageName)
+
+    def IConvertAgeNameText(self,ageName):
         if ageName == "Cleft":
             return "D'ni-Riltagamin"
         if ageName == "BahroCave":
@@ -6260,555 +6268,559 @@ class xKI(ptModifier):
             sender = ptPlayer(str(goesToFolder),0)
         self.IAddRTChat(sender,message,cflags)
 
+    def IRegisterChatCommands(self):
+        "Register the KI's own chat commands with the chat command router"
+        # the order of registration decides which command wins when one token is the start of another
+        RegisterChatCommand("CCRBegin",self.IChatCmdCCRBegin,token="//begin",condition=lambda: AmICCR)
+        RegisterChatCommand("CCRSend",self.IChatCmdCCRSend,token="//send",condition=lambda: AmICCR)
+        RegisterChatCommand("CCREnd",self.IChatCmdCCREnd,token="//end",condition=lambda: AmICCR)
+        RegisterChatCommand("CCRSystem",self.IChatCmdCCRSystem,token="//system",condition=lambda: AmICCR)
+        for petCommand in kChatPetitionCommands.keys():
+            RegisterChatCommand("Petition"+petCommand,self.IChatCmdPetition,token=petCommand)
+        RegisterChatCommand("CCR",self.IChatCmdCCR,locKey="KI.Commands.CCR")
+        RegisterChatCommand("ChatClearAll",self.IChatCmdClearAll,locKey="KI.Commands.ChatClearAll",exact=1)
+        RegisterChatCommand("ChatStartLog",self.IChatCmdStartLog,locKey="KI.Commands.ChatStartLog")
+        RegisterChatCommand("ChatStopLog",self.IChatCmdStopLog,locKey="KI.Commands.ChatStopLog")
+        RegisterChatCommand("AddBuddy",self.IChatCmdAddBuddy,locKey="KI.Commands.AddBuddy")
+        RegisterChatCommand("RemoveBuddy",self.IChatCmdRemoveBuddy,locKey="KI.Commands.RemoveBuddy")
+        RegisterChatCommand("Ignore",self.IChatCmdIgnore,locKey="KI.Commands.Ignore")
+        RegisterChatCommand("Unignore",self.IChatCmdUnignore,locKey="KI.Commands.Unignore")
+        RegisterChatCommand("AutoShout",self.IChatCmdAutoShout,locKey="KI.Commands.AutoShout")
+        RegisterChatCommand("DumpLogs",self.IChatCmdDumpLogs,locKey="KI.Commands.DumpLogs")
+        # cause people are too damn lazy to type the s character
+        RegisterChatCommand("DumpLog",self.IChatCmdDumpLogs,locKey="KI.Commands.DumpLog")
+        RegisterChatCommand("ChangePassword",self.IChatCmdChangePassword,locKey="KI.Commands.ChangePassword")
+        RegisterChatCommand("SendFriendInvite",self.IChatCmdSendFriendInvite,locKey="KI.Commands.SendFriendInvite")
+        RegisterChatCommand("RevisitCleft",self.IChatCmdRevisitCleft,token="/revisitcleft",exact=1,caseSensitive=1,condition=PtIsInternalRelease)
+        RegisterChatCommand("Restart",self.IChatCmdRestart,token="/restart",exact=1,caseSensitive=1,condition=PtIsInternalRelease)
+        RegisterChatCommand("LocCacheStats",self.IChatCmdLocCacheStats,token="/loccachestats",exact=1,caseSensitive=1,condition=PtIsInternalRelease)
+        RegisterChatCommand("Look",self.IChatCmdLook,token="/look",exact=1,caseSensitive=1)
+        RegisterChatCommand("Go",self.IChatCmdGo,token="/go",wholeWord=1)
+        RegisterChatCommand("GetFeather",self.IChatCmdGetFeather,token="/get feather")
+        RegisterChatCommand("LookInPocket",self.IChatCmdLookInPocket,token="/look in pocket",exact=1,caseSensitive=1)
+        RegisterChatCommand("Fly",self.IChatCmdFly,token="/fly")
+        RegisterChatCommand("Get",self.IChatCmdGet,token="/get ")
+        # The check for emote commands should be last
+        for emoteCommand in xKIExtChatCommands.xChatEmoteXlate.keys():
+            RegisterChatCommand("Emote"+emoteCommand,self.IChatCmdEmote,token="/"+emoteCommand,wholeWord=1)
+        for extCommand in xKIExtChatCommands.xChatExtendedChat.keys():
+            RegisterChatCommand("ExtChat"+extCommand,self.IChatCmdExtendedChat,token="/"+extCommand,wholeWord=1)
+
     def ICheckChatCommands(self,chatmessage):
         "Check for any chat commands at front of chat message. Returns message"
-        global ChatLogFile
-        global AmICCR
-        global gFeather
-        # if we are a CCR then look for CCR special commands
-        if AmICCR:
-            if chatmessage.lower().startswith("//begin"):
-                pid,ccrmsg = self.IGetPIDMsg(chatmessage[len("//begin"):])
-                if pid:
-                    res = ptCCRMgr().beginCommunication(pid,ccrmsg)
-                    if res >= 0:
-                        self.IAddRTChat(None,"<BEGIN(%u)>"%(pid)+ccrmsg,kChatCCRMessageSelf)
-                    else:
-                        self.IAddRTChat(None,self.ICCRErrorMsg(res),kChatSystemMessage)
-                else:
-                    self.IAddRTChat(None,"Player ID needed",kChatSystemMessage)
-                return None
-            if chatmessage.lower().startswith("//send"):
-                pid,ccrmsg = self.IGetPIDMsg(chatmessage[len("//send"):])
-                if pid:
-                    res = ptCCRMgr().sendCommunication(pid,ccrmsg)
-                    if res >= 0:
-                        self.IAddRTChat(None,"<SEND(%u)>"%(pid)+ccrmsg,kChatCCRMessageSelf)
-                    else:
-                        self.IAddRTChat(None,self.ICCRErrorMsg(res),kChatSystemMessage)
-                else:
-                    self.IAddRTChat(None,"Player ID needed",kChatSystemMessage)
-                return None
-            if chatmessage.lower().startswith("//end"):
-                pid,ccrmsg = self.IGetPIDMsg(chatmessage[len("//end"):])
-                if pid:
-                    res = ptCCRMgr().endCommunication(pid)
-                    if res >= 0:
-                        self.IAddRTChat(None,"<END(%u)>"%(pid),kChatCCRMessageSelf)
-                    else:
-                        self.IAddRTChat(None,self.ICCRErrorMsg(res),kChatSystemMessage)
-                else:
-                    self.IAddRTChat(None,"Player ID needed",kChatSystemMessage)
-                return None
-            if chatmessage.lower(chatmessage).startswith("//system"):
-                ccrmsg = chatmessage[len("//system"):]
-                ptCCRMgr().systemMessage(ccrmsg)
-                self.IAddRTChat(None,"<SYSTEM>"+ccrmsg,kChatCCRMessageSelf)
-                return None
-        for petCommand in kChatPetitionCommands.keys():
-            try:
-                if chatmessage.lower().startswith(petCommand):
-                    #petmessage = chatmessage[len(petCommand):]
-                    #PtSendPetitionToCCR(petmessage,str(kChatPetitionCommands[petCommand]),str(PtGetLocalizedString("KI.CCR.PetitionTitle")))
-                    #self.IAddRTChat(None,PtGetLocalizedString("KI.CCR.PetitionSent", [string.capitalize(petCommand[1:]),petmessage]),kChatCCRMessageSelf)
-                    #
-                    # no petition commands from the chat line... yet
-                    self.IAddRTChat(None,PtGetLocalizedString("KI.Errors.CommandError", [chatmessage]),kChatSystemMessage)
-                    return None
-            except UnicodeDecodeError, detail:
-                PtDebugPrint(detail)
-                self.IAddRTChat(None,PtGetLocalizedString("KI.Errors.TextOnly"),kChatSystemMessage)
-                return None
-        if chatmessage.lower().startswith(PtGetLocalizedString("KI.Commands.CCR")):
-            if CCRConversationInProgress:
-                ccrmessage = chatmessage[len(PtGetLocalizedString("KI.Commands.CCR")):]
-                # CCRConversationInProgress also holds the CCR playerid
-                PtSendChatToCCR(ccrmessage,CCRConversationInProgress)
-                self.IAddRTChat(None,ccrmessage,kChatCCRMessageSelf)
-                return None
-            else:
-                self.IAddRTChat(None,PtGetLocalizedString("KI.CCR.NoCCR"),kChatSystemMessage)
-                return None
-        if chatmessage.lower() == PtGetLocalizedString("KI.Commands.ChatClearAll"):
-            chatareaU = ptGUIControlMultiLineEdit(KIMicro.dialog.getControlFromTag(kChatDisplayArea))
-            chatareaM = ptGUIControlMultiLineEdit(KIMini.dialog.getControlFromTag(kChatDisplayArea))
-            chatareaU.clearBuffer()
-            chatareaM.clearBuffer()
-            return None
-        if chatmessage.lower().startswith(PtGetLocalizedString("KI.Commands.ChatStartLog")):
-            if type(ChatLogFile) == type(None):
-                ChatLogFile = ptStatusLog()
-            ChatLogFile.open("Chat.log",30, int(PtStatusLogFlags.kAppendToLast) + int(PtStatusLogFlags.kTimestamp))
-            self.IDoStatusChatMessage(PtGetLocalizedString("KI.Chat.LogStarted"),netPropagate=0)
+        if not chatmessage:
+            return chatmessage
+        try:
+            handled,chatmessage = DispatchChatCommand(chatmessage)
+        except UnicodeDecodeError, detail:
+            # matching the petition tokens (or sending one) can trip on a non-text chat line
+            PtDebugPrint(detail)
+            self.IAddRTChat(None,PtGetLocalizedString("KI.Errors.TextOnly"),kChatSystemMessage)
             return None
-        if chatmessage.lower().startswith(PtGetLocalizedString("KI.Commands.ChatStopLog")):
-            if type(ChatLogFile) != type(None):
-                if ChatLogFile.isOpen():
-                    self.IDoStatusChatMessage(PtGetLocalizedString("KI.Chat.LogStopped"),netPropagate=0)
-                ChatLogFile.close()
+        if handled:
+            return chatmessage
+        # search message for emote commmand (could embedd into message)
+        if chatmessage.startswith('/'):
+            words = chatmessage.split()
+            # make sure that its not one of the special handled commands
+            if len(words) and unicode(string.lower(words[0])) in xKIExtChatCommands.xChatSpecialHandledCommands:
+                # let the later processing handle these commands
+                return chatmessage
+            else:
+                # if they miss typed then error message
+                self.IAddRTChat(None,PtGetLocalizedString("KI.Errors.CommandError", [chatmessage]),kChatSystemMessage)
             return None
-        if chatmessage.lower().startswith(PtGetLocalizedString("KI.Commands.AddBuddy")):
-            pid,msg = self.IGetPIDMsg(chatmessage[len(PtGetLocalizedString("KI.Commands.AddBuddy")):])
-            if pid:
-                localplayer = PtGetLocalPlayer()
-                if pid != localplayer.getPlayerID():
-                    vault = ptVault()
-                    buddies = vault.getBuddyListFolder()
-                    if type(buddies) != type(None):
-                        if buddies.playerlistHasPlayer(pid):
-                            self.IAddRTChat(None,PtGetLocalizedString("KI.Player.AlreadyAdded"),kChatSystemMessage)
-                        else:
-                            buddies.playerlistAddPlayer(pid)
-                            self.IDoStatusChatMessage(PtGetLocalizedString("KI.Player.Added"),netPropagate=0)
-                else:
-                    self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NotYourself"),kChatSystemMessage)
+        return chatmessage
+
+    def IChatCmdCCRBegin(self,chatmessage,command):
+        "(CCR) Begin talking to a player"
+        pid,ccrmsg = self.IGetPIDMsg(chatmessage[len(command):])
+        if pid:
+            res = ptCCRMgr().beginCommunication(pid,ccrmsg)
+            if res >= 0:
+                self.IAddRTChat(None,"<BEGIN(%u)>"%(pid)+ccrmsg,kChatCCRMessageSelf)
+            else:
+                self.IAddRTChat(None,self.ICCRErrorMsg(res),kChatSystemMessage)
+        else:
+            self.IAddRTChat(None,"Player ID needed",kChatSystemMessage)
+        return None
+    def IChatCmdCCRSend(self,chatmessage,command):
+        "(CCR) Send a message to the player we are talking to"
+        pid,ccrmsg = self.IGetPIDMsg(chatmessage[len(command):])
+        if pid:
+            res = ptCCRMgr().sendCommunication(pid,ccrmsg)
+            if res >= 0:
+                self.IAddRTChat(None,"<SEND(%u)>"%(pid)+ccrmsg,kChatCCRMessageSelf)
             else:
-                self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NumberOnly"),kChatSystemMessage)
+                self.IAddRTChat(None,self.ICCRErrorMsg(res),kChatSystemMessage)
+        else:
+            self.IAddRTChat(None,"Player ID needed",kChatSystemMessage)
+        return None
+    def IChatCmdCCREnd(self,chatmessage,command):
+        "(CCR) Stop talking to a player"
+        pid,ccrmsg = self.IGetPIDMsg(chatmessage[len(command):])
+        if pid:
+            res = ptCCRMgr().endCommunication(pid)
+            if res >= 0:
+                self.IAddRTChat(None,"<END(%u)>"%(pid),kChatCCRMessageSelf)
+            else:
+                self.IAddRTChat(None,self.ICCRErrorMsg(res),kChatSystemMessage)
+        else:
+            self.IAddRTChat(None,"Player ID needed",kChatSystemMessage)
+        return None
+    def IChatCmdCCRSystem(self,chatmessage,command):
+        "(CCR) Send a system message"
+        ccrmsg = chatmessage[len(command):]
+        ptCCRMgr().systemMessage(ccrmsg)
+        self.IAddRTChat(None,"<SYSTEM>"+ccrmsg,kChatCCRMessageSelf)
+        return None
+    def IChatCmdPetition(self,chatmessage,command):
+        "Petitions from the chat line"
+        #petmessage = chatmessage[len(command):]
+        #PtSendPetitionToCCR(petmessage,str(kChatPetitionCommands[command]),str(PtGetLocalizedString("KI.CCR.PetitionTitle")))
+        #self.IAddRTChat(None,PtGetLocalizedString("KI.CCR.PetitionSent", [string.capitalize(command[1:]),petmessage]),kChatCCRMessageSelf)
+        #
+        # no petition commands from the chat line... yet
+        self.IAddRTChat(None,PtGetLocalizedString("KI.Errors.CommandError", [chatmessage]),kChatSystemMessage)
+        return None
+    def IChatCmdCCR(self,chatmessage,command):
+        "Send the rest of the chat line to the CCR we are talking to"
+        if CCRConversationInProgress:
+            ccrmessage = chatmessage[len(command):]
+            # CCRConversationInProgress also holds the CCR playerid
+            PtSendChatToCCR(ccrmessage,CCRConversationInProgress)
+            self.IAddRTChat(None,ccrmessage,kChatCCRMessageSelf)
             return None
-        if chatmessage.lower().startswith(PtGetLocalizedString("KI.Commands.RemoveBuddy")):
-            pid,ccrmsg = self.IGetPIDMsg(chatmessage[len(PtGetLocalizedString("KI.Commands.RemoveBuddy")):])
-            if pid:
+        else:
+            self.IAddRTChat(None,PtGetLocalizedString("KI.CCR.NoCCR"),kChatSystemMessage)
+            return None
+    def IChatCmdClearAll(self,chatmessage,command):
+        "Clear the chat area in both the mini and micro KI"
+        chatareaU = ptGUIControlMultiLineEdit(KIMicro.dialog.getControlFromTag(kChatDisplayArea))
+        chatareaM = ptGUIControlMultiLineEdit(KIMini.dialog.getControlFromTag(kChatDisplayArea))
+        chatareaU.clearBuffer()
+        chatareaM.clearBuffer()
+        ChatHistory.clear()
+        ChatHistory.forget("micro")
+        ChatHistory.forget("mini")
+        return None
+    def IChatCmdStartLog(self,chatmessage,command):
+        "Start logging chat to Chat.log"
+        global ChatLogFile
+        if type(ChatLogFile) == type(None):
+            ChatLogFile = ptStatusLog()
+        ChatLogFile.open("Chat.log",30, int(PtStatusLogFlags.kAppendToLast) + int(PtStatusLogFlags.kTimestamp))
+        self.IDoStatusChatMessage(PtGetLocalizedString("KI.Chat.LogStarted"),netPropagate=0)
+        return None
+    def IChatCmdStopLog(self,chatmessage,command):
+        "Stop logging chat"
+        global ChatLogFile
+        if type(ChatLogFile) != type(None):
+            if ChatLogFile.isOpen():
+                self.IDoStatusChatMessage(PtGetLocalizedString("KI.Chat.LogStopped"),netPropagate=0)
+                ChatLogBuffer.flush(ChatLogFile)
+            ChatLogFile.close()
+        return None
+    def IChatCmdAddBuddy(self,chatmessage,command):
+        "Add a player to the buddy list by player ID"
+        pid,msg = self.IGetPIDMsg(chatmessage[len(command):])
+        if pid:
+            localplayer = PtGetLocalPlayer()
+            if pid != localplayer.getPlayerID():
                 vault = ptVault()
                 buddies = vault.getBuddyListFolder()
                 if type(buddies) != type(None):
                     if buddies.playerlistHasPlayer(pid):
-                        buddies.playerlistRemovePlayer(pid)
-                        self.IDoStatusChatMessage(PtGetLocalizedString("KI.Player.Removed"),netPropagate=0)
+                        self.IAddRTChat(None,PtGetLocalizedString("KI.Player.AlreadyAdded"),kChatSystemMessage)
                     else:
-                        self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NotFound"),kChatSystemMessage)
+                        buddies.playerlistAddPlayer(pid)
+                        self.IDoStatusChatMessage(PtGetLocalizedString("KI.Player.Added"),netPropagate=0)
             else:
-                # check the ignore list to see if they are there by name
-                vault = ptVault()
-                buddies = vault.getBuddyListFolder()
-                if type(buddies) != type(None):
-                    buddyrefs = buddies.getChildNodeRefList()
-                    theName = string.lstrip(chatmessage[len(PtGetLocalizedString("KI.Commands.RemoveBuddy")):])
-                    for plyr in buddyrefs:
-                        if isinstance(plyr,ptVaultNodeRef):
-                            PLR = plyr.getChild()
-                            PLR = PLR.upcastToPlayerInfoNode()
-                            # its an element.. should be a player
-                            if type(PLR) != type(None) and PLR.getType() == PtVaultNodeTypes.kPlayerInfoNode:
-                                if theName.startswith(PLR.playerGetName()):
-                                    # found them
-                                    buddies.playerlistRemovePlayer(PLR.playerGetID())
-                                    self.IDoStatusChatMessage(PtGetLocalizedString("KI.Player.Removed"),netPropagate=0)
-                                    return None
-                self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NumberOnly"),kChatSystemMessage)
-            return None
-        if chatmessage.lower().startswith(PtGetLocalizedString("KI.Commands.Ignore")):
-            pid,ccrmsg = self.IGetPIDMsg(chatmessage[len(PtGetLocalizedString("KI.Commands.Ignore")):])
-            if pid:
-                localplayer = PtGetLocalPlayer()
-                if pid != localplayer.getPlayerID():
-                    vault = ptVault()
-                    ignores = vault.getIgnoreListFolder()
-                    if type(ignores) != type(None):
-                        if ignores.playerlistHasPlayer(pid):
-                            self.IAddRTChat(None,PtGetLocalizedString("KI.Player.AlreadyAdded"),kChatSystemMessage)
-                        else:
-                            ignores.playerlistAddPlayer(pid)
-                            self.IDoStatusChatMessage(PtGetLocalizedString("KI.Player.Added"),netPropagate=0)
+                self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NotYourself"),kChatSystemMessage)
+        else:
+            self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NumberOnly"),kChatSystemMessage)
+        return None
+    def IChatCmdRemoveBuddy(self,chatmessage,command):
+        "Remove a player from the buddy list by player ID or name"
+        pid,ccrmsg = self.IGetPIDMsg(chatmessage[len(command):])
+        if pid:
+            vault = ptVault()
+            buddies = vault.getBuddyListFolder()
+            if type(buddies) != type(None):
+                if buddies.playerlistHasPlayer(pid):
+                    buddies.playerlistRemovePlayer(pid)
+                    self.IDoStatusChatMessage(PtGetLocalizedString("KI.Player.Removed"),netPropagate=0)
                 else:
-                    self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NotYourself"),kChatSystemMessage)
-            else:
-                self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NumberOnly"),kChatSystemMessage)
-            return None
-        if chatmessage.lower().startswith(PtGetLocalizedString("KI.Commands.Unignore")):
-            pid,ccrmsg = self.IGetPIDMsg(chatmessage[len(PtGetLocalizedString("KI.Commands.Unignore")):])
-            if pid:
+                    self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NotFound"),kChatSystemMessage)
+        else:
+            # check the ignore list to see if they are there by name
+            vault = ptVault()
+            buddies = vault.getBuddyListFolder()
+            if type(buddies) != type(None):
+                buddyrefs = buddies.getChildNodeRefList()
+                theName = string.lstrip(chatmessage[len(command):])
+                for plyr in buddyrefs:
+                    if isinstance(plyr,ptVaultNodeRef):
+                        PLR = plyr.getChild()
+                        PLR = PLR.upcastToPlayerInfoNode()
+                        # its an element.. should be a player
+                        if type(PLR) != type(None) and PLR.getType() == PtVaultNodeTypes.kPlayerInfoNode:
+                            if theName.startswith(PLR.playerGetName()):
+                                # found them
+                                buddies.playerlistRemovePlayer(PLR.playerGetID())
+                                self.IDoStatusChatMessage(PtGetLocalizedString("KI.Player.Removed"),netPropagate=0)
+                                return None
+            self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NumberOnly"),kChatSystemMessage)
+        return None
+    def IChatCmdIgnore(self,chatmessage,command):
+        "Add a player to the ignore list by player ID"
+        pid,ccrmsg = self.IGetPIDMsg(chatmessage[len(command):])
+        if pid:
+            localplayer = PtGetLocalPlayer()
+            if pid != localplayer.getPlayerID():
                 vault = ptVault()
                 ignores = vault.getIgnoreListFolder()
                 if type(ignores) != type(None):
                     if ignores.playerlistHasPlayer(pid):
-                        ignores.playerlistRemovePlayer(pid)
-                        self.IDoStatusChatMessage(PtGetLocalizedString("KI.Player.Removed"),netPropagate=0)
+                        self.IAddRTChat(None,PtGetLocalizedString("KI.Player.AlreadyAdded"),kChatSystemMessage)
                     else:
-                        self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NotFound"),kChatSystemMessage)
+                        ignores.playerlistAddPlayer(pid)
+                        self.IDoStatusChatMessage(PtGetLocalizedString("KI.Player.Added"),netPropagate=0)
             else:
-                # check the ignore list to see if they are there by name
-                vault = ptVault()
-                ignores = vault.getIgnoreListFolder()
-                if type(ignores) != type(None):
-                    ignorerefs = ignores.getChildNodeRefList()
-                    theName = string.lstrip(chatmessage[len(PtGetLocalizedString("KI.Commands.Unignore")):])
-                    for plyr in ignorerefs:
-                        if isinstance(plyr,ptVaultNodeRef):
-                            PLR = plyr.getChild()
-                            PLR = PLR.upcastToPlayerInfoNode()
-                            # its an element.. should be a player
-                            if type(PLR) != type(None) and PLR.getType() == PtVaultNodeTypes.kPlayerInfoNode:
-                                if theName.startswith(PLR.playerGetName()):
-                                    # found them
-                                    ignores.playerlistRemovePlayer(PLR.playerGetID())
-                                    self.IDoStatusChatMessage(PtGetLocalizedString("KI.Player.Removed"),netPropagate=0)
-                                    return None
-                self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NumberOnly"),kChatSystemMessage)
+                self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NotYourself"),kChatSystemMessage)
+        else:
+            self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NumberOnly"),kChatSystemMessage)
+        return None
+    def IChatCmdUnignore(self,chatmessage,command):
+        "Remove a player from the ignore list by player ID or name"
+        pid,ccrmsg = self.IGetPIDMsg(chatmessage[len(command):])
+        if pid:
+            vault = ptVault()
+            ignores = vault.getIgnoreListFolder()
+            if type(ignores) != type(None):
+                if ignores.playerlistHasPlayer(pid):
+                    ignores.playerlistRemovePlayer(pid)
+                    self.IDoStatusChatMessage(PtGetLocalizedString("KI.Player.Removed"),netPropagate=0)
+                else:
+                    self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NotFound"),kChatSystemMessage)
+        else:
+            # check the ignore list to see if they are there by name
+            vault = ptVault()
+            ignores = vault.getIgnoreListFolder()
+            if type(ignores) != type(None):
+                ignorerefs = ignores.getChildNodeRefList()
+                theName = string.lstrip(chatmessage[len(command):])
+                for plyr in ignorerefs:
+                    if isinstance(plyr,ptVaultNodeRef):
+                        PLR = plyr.getChild()
+                        PLR = PLR.upcastToPlayerInfoNode()
+                        # its an element.. should be a player
+                        if type(PLR) != type(None) and PLR.getType() == PtVaultNodeTypes.kPlayerInfoNode:
+                            if theName.startswith(PLR.playerGetName()):
+                                # found them
+                                ignores.playerlistRemovePlayer(PLR.playerGetID())
+                                self.IDoStatusChatMessage(PtGetLocalizedString("KI.Player.Removed"),netPropagate=0)
+                                return None
+            self.IAddRTChat(None,PtGetLocalizedString("KI.Player.NumberOnly"),kChatSystemMessage)
+        return None
+    def IChatCmdAutoShout(self,chatmessage,command):
+        "Toggle auto shout"
+        self.autoShout = abs(self.autoShout - 1)
+        if self.autoShout:
+            self.IAddRTChat(None, PtGetLocalizedString("KI.Messages.AutoShoutEnabled"), kChatBroadcastMsg)
+        else:
+            self.IAddRTChat(None, PtGetLocalizedString("KI.Messages.AutoShoutDisabled"), kChatBroadcastMsg)
+        return None
+    def IChatCmdDumpLogs(self,chatmessage,command):
+        "Dump the logs to a folder (for DumpLogs and DumpLog)"
+        destination = chatmessage[len(command):]
+        destination = destination.strip() # remove whitespace
+        if destination == "":
+            self.IAddRTChat(None,PtGetLocalizedString("KI.Errors.MalformedLogDumpCmd"),kChatSystemMessage)
             return None
-        if chatmessage.lower().startswith(PtGetLocalizedString("KI.Commands.AutoShout")):
-            self.autoShout = abs(self.autoShout - 1)
-            if self.autoShout:
-                self.IAddRTChat(None, PtGetLocalizedString("KI.Messages.AutoShoutEnabled"), kChatBroadcastMsg)
-            else:
-                self.IAddRTChat(None, PtGetLocalizedString("KI.Messages.AutoShoutDisabled"), kChatBroadcastMsg)
+        # we are using a timer here so that we can print out some last status messages to the log before
+        # the log is dumped to it's new home
+        PtDebugPrint("-- Logs dumped to: \"" + destination + "\" at " + time.strftime("%d %b %Y %H:%M:%S (GMT)", time.gmtime()))
+        self.logDumpDest = destination # so the timer can get at it
+        PtAtTimeCallback(self.key,0.25,kDumpLogsTimer)
+        return None
+    def IChatCmdChangePassword(self,chatmessage,command):
+        "Change the account password"
+        newpassword = chatmessage[len(command):].strip()
+        if newpassword == "":
+            self.IAddRTChat(None, PtGetLocalizedString("KI.Errors.BadPassword"), kChatSystemMessage)
             return None
-        if chatmessage.lower().startswith(PtGetLocalizedString("KI.Commands.DumpLogs")):
-            destination = chatmessage[len(PtGetLocalizedString("KI.Commands.DumpLogs")):]
-            destination = destination.strip() # remove whitespace
-            if destination == "":
-                self.IAddRTChat(None,PtGetLocalizedString("KI.Errors.MalformedLogDumpCmd"),kChatSystemMessage)
-                return None
-            # we are using a timer here so that we can print out some last status messages to the log before
-            # the log is dumped to it's new home
-            PtDebugPrint("-- Logs dumped to: \"" + destination + "\" at " + time.strftime("%d %b %Y %H:%M:%S (GMT)", time.gmtime()))
-            self.logDumpDest = destination # so the timer can get at it
-            PtAtTimeCallback(self.key,0.25,kDumpLogsTimer)
+        elif len(newpassword) > 15:
+            self.IAddRTChat(None, PtGetLocalizedString("KI.Errors.PasswordTooLong"), kChatSystemMessage)
             return None
-        if chatmessage.lower().startswith(PtGetLocalizedString("KI.Commands.DumpLog")):
-            # cause people are too damn lazy to type the s character
-            destination = chatmessage[len(PtGetLocalizedString("KI.Commands.DumpLog")):]
-            destination = destination.strip() # remove whitespace
-            if destination == "":
-                self.IAddRTChat(None,PtGetLocalizedString("KI.Errors.MalformedLogDumpCmd"),kChatSystemMessage)
-                return None
-            # we are using a timer here so that we can print out some last status messages to the log before
-            # the log is dumped to it's new home
-            PtDebugPrint("-- Logs dumped to: \"" + destination + "\" at " + time.strftime("%d %b %Y %H:%M:%S (GMT)", time.gmtime()))
-            self.logDumpDest = destination # so the timer can get at it
-            PtAtTimeCallback(self.key,0.25,kDumpLogsTimer)
+        PtChangePassword(newpassword)
+        return None
+    def IChatCmdSendFriendInvite(self,chatmessage,command):
+        "Send an email invitation to a friend"
+        commands = chatmessage[len(command):].strip().split(" ", 1)
+        emailaddr = commands[0]
+        toName = None
+
+        if len(commands) == 2:
+            toName = xCensor.xCensor(commands[1], theCensorLevel)
+        if emailaddr == "":
+            self.IAddRTChat(None, PtGetLocalizedString("KI.Errors.MissingEmailAddress"), kChatSystemMessage)
             return None
-        if chatmessage.lower().startswith(PtGetLocalizedString("KI.Commands.ChangePassword")):
-            newpassword = chatmessage[len(PtGetLocalizedString("KI.Commands.ChangePassword")):].strip()
-            if newpassword == "":
-                self.IAddRTChat(None, PtGetLocalizedString("KI.Errors.BadPassword"), kChatSystemMessage)
-                return None
-            elif len(newpassword) > 15:
-                self.IAddRTChat(None, PtGetLocalizedString("KI.Errors.PasswordTooLong"), kChatSystemMessage)
-                return None
-            PtChangePassword(newpassword)
+        elif len(emailaddr) > 63:
+            self.IAddRTChat(None, PtGetLocalizedString("KI.Errors.EmailAddressTooLong"), kChatSystemMessage)
             return None
-        if chatmessage.lower().startswith(PtGetLocalizedString("KI.Commands.SendFriendInvite")):
-            commands = chatmessage[len(PtGetLocalizedString("KI.Commands.SendFriendInvite")):].strip().split(" ", 1)
-            emailaddr = commands[0]
-            toName = None
-
-            if len(commands) == 2:
-                toName = xCensor.xCensor(commands[1], theCensorLevel)
-            if emailaddr == "":
-                self.IAddRTChat(None, PtGetLocalizedString("KI.Errors.MissingEmailAddress"), kChatSystemMessage)
-                return None
-            elif len(emailaddr) > 63:
-                self.IAddRTChat(None, PtGetLocalizedString("KI.Errors.EmailAddressTooLong"), kChatSystemMessage)
-                return None
 
-            if toName and len(toName) > 0:
-                PtSendFriendInvite(emailaddr, toName)
-            else:
-                PtSendFriendInvite(emailaddr)
+        if toName and len(toName) > 0:
+            PtSendFriendInvite(emailaddr, toName)
+        else:
+            PtSendFriendInvite(emailaddr)
 
-            return None
-        if chatmessage.lower().startswith(str("/savecolumns")) and AgeName == "Jalak":
-            fName = chatmessage[13:].strip()
-            if fName:
-                fName = fName + ".txt"
+        return None
+    def IChatCmdRevisitCleft(self,chatmessage,command):
+        "(internal) Forget that the Cleft was solved"
+        # find the cleft chronicle and delete it
+        vault = ptVault()
+        chron = vault.findChronicleEntry("CleftSolved")
+        if type(chron) != type(None):
+            chronFolder = vault.getChronicleFolder()
+            if type(chronFolder) != type(None):
+                chronFolder.removeNode(chron)
+        return None
+    def IChatCmdRestart(self,chatmessage,command):
+        "(internal) Forget the intro was played"
+        # find the cleft chronicle and delete it
+        vault = ptVault()
+        chron = vault.findChronicleEntry("InitialAvCustomizationsDone")
+        if type(chron) != type(None):
+            chronFolder = vault.getChronicleFolder()
+            if type(chronFolder) != type(None):
+                chronFolder.removeNode(chron)
+        chron = vault.findChronicleEntry("IntroPlayed")
+        if type(chron) != type(None):
+            chronFolder = vault.getChronicleFolder()
+            if type(chronFolder) != type(None):
+                chronFolder.removeNode(chron)
+        chron = vault.findChronicleEntry("CleftSolved")
+        if type(chron) != type(None):
+            chronFolder = vault.getChronicleFolder()
+            if type(chronFolder) != type(None):
+                chronFolder.removeNode(chron)
+        return None
+    def IChatCmdLocCacheStats(self,chatmessage,command):
+        "(internal) Show how often the localized strings and age names were remembered"
+        stats = xLocCache.GetLocCacheStats()
+        caches = stats.keys()
+        caches.sort()
+        for cache in caches:
+            hits,misses,rate = stats[cache]
+            self.IAddRTChat(None,"%s: %d hits, %d misses (%d%%)" % (cache,hits,misses,int(rate*100)),kChatSystemMessage)
+        return None
+    def IChatCmdLook(self,chatmessage,command):
+        "Describe where you are and who is standing around"
+        plist = self.IRemoveCCRPlayers(self.IGetPlayersInChatDistance(minPlayers=-1))
+        people = "nobody in particular"
+        if len(plist) > 0:
+            people = ""
+            for p in plist:
+                people += p.getPlayerName() + ", "
+            people = people[:-2]
+        loc = self.IGetAgeFileName()
+        see = ""
+        exits = "North and West"
+        if loc == "city":
+            see = "  You see the remnants of a great civilization, ready to be rebuilt. Where are the flying monkeys?\n"
+            exits = "NorthWest and South"
+        elif loc == "Personal":
+            see = "  You see a small hut... looks deserted.\n"
+            exits = "... well, there are no exits"
+        elif loc == "Teledahn":
+            see = "  You see 'shrooms everywhere! Big ones, small ones. Are they edible?\n"
+            exits = "East"
+        elif loc == "Nexus":
+            see = "  You see a jukebox like machine.\n"
+            exits = "... well, there are no exits"
+        elif loc == "Garden":
+            see = "  You see bugs.   BUGS! I hate bugs.\n"
+            exits = "North and South"
+        elif loc == "EderTsogal":
+            see = "  You see grass, water and things floating in the air (not feathers).\n"
+            exits = "North. But you'll have to climb or fly to get there"
+        elif loc == "Dereno":
+            see = "  Ah, Dah-Ree-Toe. You see... well, if someone would clean those stupid windows you could see a *lot*. Have I been here before? Maybe all pods just look the same.\n"
+            exits = "SouthWest and East but they are both blocked"
+        elif loc == "BahroCave":
+            see = "  You see a darkly lit cavern. Strange images on the wall next to you, flickering in the subdued light.\nBe afraid. Be very afraid!\n"
+            exits = "North, West and East... but they are blocked by a large hole in the floor"
+        elif loc == "Minkata":
+            see = "  You see sand and dust in all directions. Above you there is a filtered sun or two... or more.\nSomewhere there is a horse with no name.\n"
+            exits = "to the east. Nine days away"
+        elif loc == "Cleft":
+            see = "  You see sand for as far as the eye can see. Gonna need a vehicle of some sort.\n"
+            exits = "... well, I don't know. Maybe you can ask the old man (if he ever stops listening to that music!)"
+            people = "an old man. Ok, maybe he's not standing. BTW, wasn't he on M*A*S*H?"
+        self.IAddRTChat(None,"%s:\n%s  Standing near you is %s.\n  There are exits to the %s."%(self.IGetAgeDisplayName(),see,people,exits),0)
+        return None
+    def IChatCmdGo(self,chatmessage,command):
+        "Go somewhere"
+        self.IAddRTChat(None,"Put one foot in front of the other and eventually you will get there.",0)
+        return None
+    def IChatCmdGetFeather(self,chatmessage,command):
+        "Pick up one of the feathers hidden in the ages"
+        global gFeather
+        loc = self.IGetAgeFileName()
+        if loc == "Gira":
+            if gFeather < 7:
+                self.IAddRTChat(None,"You pick up a plain feather and put it in your pocket. I know you didn't see yourself do that... trust me, you have a feather in your pocket.",0)
+                gFeather += 1
+                xChronicleStore.Set(kChronicleFeather,gFeather)
             else:
-                fName = "JalakColumns.txt"
-            self.SendNote("SaveColumns;" + fName)
-            return None
-        if chatmessage.lower().startswith(str("/loadcolumns")) and AgeName == "Jalak":
-            fName = chatmessage[13:].strip()
-            if fName:
-                fName = fName + ".txt"
+                self.IAddRTChat(None,"You can only carry seven plain feathers.",0)
+        elif loc == 'EderDelin':
+            if gFeather == 7:
+                self.IAddRTChat(None,"You search... and find the 'Red' feather and put it in your pocket.",0)
+                gFeather += 1
+                xChronicleStore.Set(kChronicleFeather,gFeather)
+            elif gFeather > 7:
+                self.IAddRTChat(None,"You search... but find no other feathers.",0)
             else:
-                fName = "JalakColumns.txt"
-            self.SendNote("LoadColumns;" + fName)
-            return None
-        if PtIsInternalRelease() and chatmessage == "/revisitcleft":
-            # find the cleft chronicle and delete it
-            vault = ptVault()
-            chron = vault.findChronicleEntry("CleftSolved")
-            if type(chron) != type(None):
-                chronFolder = vault.getChronicleFolder()
-                if type(chronFolder) != type(None):
-                    chronFolder.removeNode(chron)
-            return None
-        if PtIsInternalRelease() and chatmessage == "/restart":
-            # find the cleft chronicle and delete it
-            vault = ptVault()
-            chron = vault.findChronicleEntry("InitialAvCustomizationsDone")
-            if type(chron) != type(None):
-                chronFolder = vault.getChronicleFolder()
-                if type(chronFolder) != type(None):
-                    chronFolder.removeNode(chron)
-            chron = vault.findChronicleEntry("IntroPlayed")
-            if type(chron) != type(None):
-                chronFolder = vault.getChronicleFolder()
-                if type(chronFolder) != type(None):
-                    chronFolder.removeNode(chron)
-            chron = vault.findChronicleEntry("CleftSolved")
-            if type(chron) != type(None):
-                chronFolder = vault.getChronicleFolder()
-                if type(chronFolder) != type(None):
-                    chronFolder.removeNode(chron)
-            return None
-        if chatmessage == "/look":
-            plist = self.IRemoveCCRPlayers(self.IGetPlayersInChatDistance(minPlayers=-1))
-            people = "nobody in particular"
-            if len(plist) > 0:
-                people = ""
-                for p in plist:
-                    people += p.getPlayerName() + ", "
-                people = people[:-2]
-            loc = self.IGetAgeFileName()
-            see = ""
-            exits = "North and West"
-            if loc == "city":
-                see = "  You see the remnants of a great civilization, ready to be rebuilt. Where are the flying monkeys?\n"
-                exits = "NorthWest and South"
-            elif loc == "Personal":
-                see = "  You see a small hut... looks deserted.\n"
-                exits = "... well, there are no exits"
-            elif loc == "Teledahn":
-                see = "  You see 'shrooms everywhere! Big ones, small ones. Are they edible?\n"
-                exits = "East"
-            elif loc == "Nexus":
-                see = "  You see a jukebox like machine.\n"
-                exits = "... well, there are no exits"
-            elif loc == "Garden":
-                see = "  You see bugs.   BUGS! I hate bugs.\n"
-                exits = "North and South"
-            elif loc == "EderTsogal":
-                see = "  You see grass, water and things floating in the air (not feathers).\n"
-                exits = "North. But you'll have to climb or fly to get there"
-            elif loc == "Dereno":
-                see = "  Ah, Dah-Ree-Toe. You see... well, if someone would clean those stupid windows you could see a *lot*. Have I been here before? Maybe all pods just look the same.\n"
-                exits = "SouthWest and East but they are both blocked"
-            elif loc == "BahroCave":
-                see = "  You see a darkly lit cavern. Strange images on the wall next to you, flickering in the subdued light.\nBe afraid. Be very afraid!\n"
-                exits = "North, West and East... but they are blocked by a large hole in the floor"
-            elif loc == "Minkata":
-                see = "  You see sand and dust in all directions. Above you there is a filtered sun or two... or more.\nSomewhere there is a horse with no name.\n"
-                exits = "to the east. Nine days away"
-            elif loc == "Cleft":
-                see = "  You see sand for as far as the eye can see. Gonna need a vehicle of some sort.\n"
-                exits = "... well, I don't know. Maybe you can ask the old man (if he ever stops listening to that music!)"
-                people = "an old man. Ok, maybe he's not standing. BTW, wasn't he on M*A*S*H?"
-            self.IAddRTChat(None,"%s:\n%s  Standing near you is %s.\n  There are exits to the %s."%(self.IGetAgeDisplayName(),see,people,exits),0)
-            return None
-        if chatmessage.lower().startswith("/go ") or chatmessage == "/go":
-            self.IAddRTChat(None,"Put one foot in front of the other and eventually you will get there.",0)
-            return None
-        if chatmessage.lower().startswith("/get feather"):
-            loc = self.IGetAgeFileName()
-            if loc == "Gira":
-                if gFeather < 7:
-                    self.IAddRTChat(None,"You pick up a plain feather and put it in your pocket. I know you didn't see yourself do that... trust me, you have a feather in your pocket.",0)
-                    gFeather += 1
-                    vault = ptVault()
-                    entry = vault.findChronicleEntry("feather")
-                    if type(entry) == type(None):
-                        vault.addChronicleEntry("feather",1,"%d" % (gFeather))
-                    else:
-                        entry.chronicleSetValue("%d" % (gFeather))
-                        entry.save()
-                else:
-                    self.IAddRTChat(None,"You can only carry seven plain feathers.",0)
-            elif loc == 'EderDelin':
-                if gFeather == 7:
-                    self.IAddRTChat(None,"You search... and find the 'Red' feather and put it in your pocket.",0)
-                    gFeather += 1
-                    vault = ptVault()
-                    entry = vault.findChronicleEntry("feather")
-                    if type(entry) == type(None):
-                        vault.addChronicleEntry("feather",1,"%d" % (gFeather))
-                    else:
-                        entry.chronicleSetValue("%d" % (gFeather))
-                        entry.save()
-                elif gFeather > 7:
-                    self.IAddRTChat(None,"You search... but find no other feathers.",0)
-                else:
-                    self.IAddRTChat(None,"You search... but then suddenly stop when you realize that you are missing seven plain feathers.",0)
-            elif loc == 'Dereno':
-                if gFeather == 8:
-                    self.IAddRTChat(None,"You search... and find the 'Blue' feather and put it in your pocket.",0)
-                    gFeather += 1
-                    vault = ptVault()
-                    entry = vault.findChronicleEntry("feather")
-                    if type(entry) == type(None):
-                        vault.addChronicleEntry("feather",1,"%d" % (gFeather))
-                    else:
-                        entry.chronicleSetValue("%d" % (gFeather))
-                        entry.save()
-                elif gFeather > 8:
-                    self.IAddRTChat(None,"You search... but find no other feathers.",0)
-                else:
-                    self.IAddRTChat(None,"You search... but then suddenly stop when you realize that you are missing the 'Red' feather.",0)
-            elif loc == 'Payiferen':
-                if gFeather == 9:
-                    self.IAddRTChat(None,"You search... and find the 'Black' feather and put it in your pocket.",0)
-                    gFeather += 1
-                    vault = ptVault()
-                    entry = vault.findChronicleEntry("feather")
-                    if type(entry) == type(None):
-                        vault.addChronicleEntry("feather",1,"%d" % (gFeather))
-                    else:
-                        entry.chronicleSetValue("%d" % (gFeather))
-                        entry.save()
-                elif gFeather > 9:
-                    self.IAddRTChat(None,"You search... but find no other feathers.",0)
-                else:
-                    self.IAddRTChat(None,"You search... but then suddenly stop when you realize that you are missing the 'Blue' feather.",0)
-            elif loc == 'Ercana':
-                if gFeather == 10:
-                    self.IAddRTChat(None,"You search... and find the 'Silver' feather and put it in your pocket.",0)
-                    gFeather += 1
-                    vault = ptVault()
-                    entry = vault.findChronicleEntry("feather")
-                    if type(entry) == type(None):
-                        vault.addChronicleEntry("feather",1,"%d" % (gFeather))
-                    else:
-                        entry.chronicleSetValue("%d" % (gFeather))
-                        entry.save()
-                elif gFeather > 10:
-                    self.IAddRTChat(None,"You search... but find no other feathers.",0)
-                else:
-                    self.IAddRTChat(None,"You search... but then suddenly stop when you realize that you are missing the 'Black' feather.",0)
-            elif loc == 'Jalak':
-                if gFeather == 11:
-                    self.IAddRTChat(None,"You search... and find the 'Duck' feather and put it in your pocket.",0)
-                    gFeather += 1
-                    vault = ptVault()
-                    entry = vault.findChronicleEntry("feather")
-                    if type(entry) == type(None):
-                        vault.addChronicleEntry("feather",1,"%d" % (gFeather))
-                    else:
-                        entry.chronicleSetValue("%d" % (gFeather))
-                        entry.save()
-                elif gFeather > 11:
-                    self.IAddRTChat(None,"You search... but find no other feathers.",0)
-                else:
-                    self.IAddRTChat(None,"You search... but then suddenly stop when you realize that you are missing the 'Silver' feather.",0)
-            elif loc == 'Ahnonay':
-                if gFeather == 12:
-                    self.IAddRTChat(None,"You search... and find a large 'Rukh' feather (how could you have missed it?) and put it in your pocket.",0)
-                    gFeather += 1
-                    vault = ptVault()
-                    entry = vault.findChronicleEntry("feather")
-                    if type(entry) == type(None):
-                        vault.addChronicleEntry("feather",1,"%d" % (gFeather))
-                    else:
-                        entry.chronicleSetValue("%d" % (gFeather))
-                        entry.save()
-                elif gFeather > 12:
-                    self.IAddRTChat(None,"You search... but find no other feathers.",0)
-                else:
-                    self.IAddRTChat(None,"You search... but then suddenly stop when you realize that you are missing the 'Duck' feather.",0)
+                self.IAddRTChat(None,"You search... but then suddenly stop when you realize that you are missing seven plain feathers.",0)
+        elif loc == 'Dereno':
+            if gFeather == 8:
+                self.IAddRTChat(None,"You search... and find the 'Blue' feather and put it in your pocket.",0)
+                gFeather += 1
+                xChronicleStore.Set(kChronicleFeather,gFeather)
+            elif gFeather > 8:
+                self.IAddRTChat(None,"You search... but find no other feathers.",0)
             else:
-                self.IAddRTChat(None,"There are no feathers here.",0)
-            return None
-        if chatmessage == "/look in pocket":
-            if gFeather:
-                if gFeather == 1:
-                    self.IAddRTChat(None,"You see a feather!",0)
-                else:
-                    pfeathers = gFeather
-                    if pfeathers > 7:
-                        pfeathers = 7
-                    pOut = "You see %d plain feathers" % (pfeathers)
-                    if gFeather>7:
-                        pOut += " and a 'Red' feather"
-                    if gFeather>8:
-                        pOut += " and a 'Blue' feather"
-                    if gFeather>9:
-                        pOut += " and a 'Black' feather"
-                    if gFeather>10:
-                        pOut += " and a 'Silver' feather"
-                    if gFeather>11:
-                        pOut += " and a 'Duck' feather"
-                    if gFeather>12:
-                        pOut += " and a large 'Rukh' feather (sticking out of your pocket)"
-                    pOut += "."
-                    self.IAddRTChat(None,pOut,0)
+                self.IAddRTChat(None,"You search... but then suddenly stop when you realize that you are missing the 'Red' feather.",0)
+        elif loc == 'Payiferen':
+            if gFeather == 9:
+                self.IAddRTChat(None,"You search... and find the 'Black' feather and put it in your pocket.",0)
+                gFeather += 1
+                xChronicleStore.Set(kChronicleFeather,gFeather)
+            elif gFeather > 9:
+                self.IAddRTChat(None,"You search... but find no other feathers.",0)
             else:
-                self.IAddRTChat(None,"There is nothing there but lint.",0)
-            return None
-        if chatmessage.lower().startswith("/fly"):
-            self.IAddRTChat(None,"You close your eyes, you feel light headed and the ground slips away from your feet... Then you open your eyes and WAKE UP! (Ha, you can only dream about flying.)",0)
-            return None
-        if chatmessage.lower().startswith("/get "):
-            if chatmessage[-1:] == "s":
-                v = "are"
+                self.IAddRTChat(None,"You search... but then suddenly stop when you realize that you are missing the 'Blue' feather.",0)
+        elif loc == 'Ercana':
+            if gFeather == 10:
+                self.IAddRTChat(None,"You search... and find the 'Silver' feather and put it in your pocket.",0)
+                gFeather += 1
+                xChronicleStore.Set(kChronicleFeather,gFeather)
+            elif gFeather > 10:
+                self.IAddRTChat(None,"You search... but find no other feathers.",0)
+            else:
+                self.IAddRTChat(None,"You search... but then suddenly stop when you realize that you are missing the 'Black' feather.",0)
+        elif loc == 'Jalak':
+            if gFeather == 11:
+                self.IAddRTChat(None,"You search... and find the 'Duck' feather and put it in your pocket.",0)
+                gFeather += 1
+                xChronicleStore.Set(kChronicleFeather,gFeather)
+            elif gFeather > 11:
+                self.IAddRTChat(None,"You search... but find no other feathers.",0)
             else:
-                v = "is"
-            self.IAddRTChat(None,"The %s %s too heavy to lift. Maybe you should stick to feathers." % (chatmessage[len("/get "):],v),0)
+                self.IAddRTChat(None,"You search... but then suddenly stop when you realize that you are missing the 'Silver' feather.",0)
+        elif loc == 'Ahnonay':
+            if gFeather == 12:
+                self.IAddRTChat(None,"You search... and find a large 'Rukh' feather (how could you have missed it?) and put it in your pocket.",0)
+                gFeather += 1
+                xChronicleStore.Set(kChronicleFeather,gFeather)
+            elif gFeather > 12:
+                self.IAddRTChat(None,"You search... but find no other feathers.",0)
+            else:
+                self.IAddRTChat(None,"You search... but then suddenly stop when you realize that you are missing the 'Duck' feather.",0)
+        else:
+            self.IAddRTChat(None,"There are no feathers here.",0)
+        return None
+    def IChatCmdLookInPocket(self,chatmessage,command):
+        "Show the feathers you have found"
+        if gFeather:
+            if gFeather == 1:
+                self.IAddRTChat(None,"You see a feather!",0)
+            else:
+                pfeathers = gFeather
+                if pfeathers > 7:
+                    pfeathers = 7
+                pOut = "You see %d plain feathers" % (pfeathers)
+                if gFeather>7:
+                    pOut += " and a 'Red' feather"
+                if gFeather>8:
+                    pOut += " and a 'Blue' feather"
+                if gFeather>9:
+                    pOut += " and a 'Black' feather"
+                if gFeather>10:
+                    pOut += " and a 'Silver' feather"
+                if gFeather>11:
+                    pOut += " and a 'Duck' feather"
+                if gFeather>12:
+                    pOut += " and a large 'Rukh' feather (sticking out of your pocket)"
+                pOut += "."
+                self.IAddRTChat(None,pOut,0)
+        else:
+            self.IAddRTChat(None,"There is nothing there but lint.",0)
+        return None
+    def IChatCmdFly(self,chatmessage,command):
+        "Try to fly"
+        self.IAddRTChat(None,"You close your eyes, you feel light headed and the ground slips away from your feet... Then you open your eyes and WAKE UP! (Ha, you can only dream about flying.)",0)
+        return None
+    def IChatCmdGet(self,chatmessage,command):
+        "Try to pick something up"
+        if chatmessage[-1:] == "s":
+            v = "are"
+        else:
+            v = "is"
+        self.IAddRTChat(None,"The %s %s too heavy to lift. Maybe you should stick to feathers." % (chatmessage[len("/get "):],v),0)
+        return None
+    def IChatCmdEmote(self,chatmessage,command):
+        "Play an emote and tell everyone about it"
+        emote = xKIExtChatCommands.xChatEmoteXlate[command[1:]]
+        PtEmoteAvatar(emote[0])
+        if PtGetLanguage() == PtLanguage.kEnglish:
+            # find out what gender they are
+            avatar = PtGetLocalAvatar()
+            gender = avatar.avatar.getAvatarClothingGroup()
+            if gender > kFemaleClothingGroup:
+                gender = kMaleClothingGroup
+            hisher = PtGetLocalizedString("KI.EmoteStrings.His")
+            if gender == kFemaleClothingGroup:
+                hisher = PtGetLocalizedString("KI.EmoteStrings.Her")
+            statusMsg = PtGetLocalizedString(emote[1], [PtGetLocalPlayer().getPlayerName(),hisher])
+        else:
+            statusMsg = PtGetLocalizedString(emote[1], [PtGetLocalPlayer().getPlayerName()])
+        self.IDoStatusChatMessage(statusMsg)
+        chatmessage = chatmessage[len(command):]
+        if chatmessage == "":
             return None
-        #
-        # The check for emote commands should be last
-        # search message for emote commmand (could embedd into message)
-        if chatmessage.startswith('/'):
-            # find the emote at the start of the message
-            words = chatmessage.split()
+        return chatmessage[1:]
+    def IChatCmdExtendedChat(self,chatmessage,command):
+        "Run one of the extended chat commands (a console command or a python function)"
+        extCommand = xKIExtChatCommands.xChatExtendedChat[command[1:]]
+        if type(extCommand) == type(""):
+            # see if there is text afterwords to be passed as arguments to the console command
+            args = chatmessage[len(command):]
+            PtConsole(extCommand+args)
+        else:
+            # must be a functions
             try:
-                emote = xKIExtChatCommands.xChatEmoteXlate[unicode(string.lower(words[0][1:]))]
-                PtEmoteAvatar(emote[0])
-                if PtGetLanguage() == PtLanguage.kEnglish:
-                    # find out what gender they are
-                    avatar = PtGetLocalAvatar()
-                    gender = avatar.avatar.getAvatarClothingGroup()
-                    if gender > kFemaleClothingGroup:
-                        gender = kMaleClothingGroup
-                    hisher = PtGetLocalizedString("KI.EmoteStrings.His")
-                    if gender == kFemaleClothingGroup:
-                        hisher = PtGetLocalizedString("KI.EmoteStrings.Her")
-                    statusMsg = PtGetLocalizedString(emote[1], [PtGetLocalPlayer().getPlayerName(),hisher])
+                args = chatmessage[len(command)+1:]
+                if args != "":
+                    try:
+                        retDisp = extCommand(args)
+                    except TypeError:
+                        retDisp = extCommand()
+                        return args
                 else:
-                    statusMsg = PtGetLocalizedString(emote[1], [PtGetLocalPlayer().getPlayerName()])
-                self.IDoStatusChatMessage(statusMsg)
-                chatmessage = chatmessage[len(words[0]):]
-                if chatmessage == "":
-                    return None
-                return chatmessage[1:]
-            except LookupError:
-                try:
-                    command = xKIExtChatCommands.xChatExtendedChat[unicode(string.lower(words[0][1:]))]
-
-                    if type(command) == type(""):
-                        # see if there is text afterwords to be passed as arguments to the console command
-                        args = chatmessage[len(words[0]):]
-                        PtConsole(command+args)
-                    else:
-                        # must be a functions
-                        try:
-                            args = chatmessage[len(words[0])+1:]
-                            if args != "":
-                                try:
-                                    retDisp = command(args)
-                                except TypeError:
-                                    retDisp = command()
-                                    return args
-                            else:
-                                retDisp = command()
-                            if (type(retDisp) == type(U"")) or (type(retDisp) == type("")):
-                                self.IDoStatusChatMessage(retDisp,netPropagate=0)
-                            elif type(retDisp) == type(()):
-                                if retDisp[0]:
-                                    self.IAddRTChat(None,retDisp[1],kChatSystemMessage)
-                                else:
-                                    self.IDoStatusChatMessage(retDisp[1],netPropagate=0)
-                        except:
-                            PtDebugPrint("xKI: chat command function did not run",command,level=kErrorLevel)
-                    return None
-                except LookupError:
-                    # make sure that its not one of the special handled commands
-                    if unicode(string.lower(words[0])) in xKIExtChatCommands.xChatSpecialHandledCommands:
-                        # let the later processing handle these commands
-                        return chatmessage
+                    retDisp = extCommand()
+                if (type(retDisp) == type(U"")) or (type(retDisp) == type("")):
+                    self.IDoStatusChatMessage(retDisp,netPropagate=0)
+                elif type(retDisp) == type(()):
+                    if retDisp[0]:
+                        self.IAddRTChat(None,retDisp[1],kChatSystemMessage)
                     else:
-                        # if they miss typed then error message
-                        self.IAddRTChat(None,PtGetLocalizedString("KI.Errors.CommandError", [chatmessage]),kChatSystemMessage)
-
-                    return None
-        return chatmessage
+                        self.IDoStatusChatMessage(retDisp[1],netPropagate=0)
+            except:
+                PtDebugPrint("xKI: chat command function did not run",extCommand,level=kErrorLevel)
+        return None
 
     def IGetPIDMsg(self,message):
         lmsg = message.split()
@@ -6869,7 +6881,7 @@ class xKI(ptModifier):
                 return
         
         try:
-            PtDebugPrint("xKI:IAddRTChat: message=%s"%message,player,cflags, level=kDebugDumpLevel)
+            PtDebugPrint(lambda: "xKI:IAddRTChat: message=%s" % (message),player,cflags,level=kDebugDumpLevel)
         except UnicodeDecodeError:
             pass
 
@@ -6899,7 +6911,7 @@ class xKI(ptModifier):
                     else:
                         headerColor = ChatHeaderBuddiesColor
                 if cflags.toSelf:
-                    pretext = PtGetLocalizedString("KI.Chat.InterAgeSendTo")
+                    pretext = xLocCache.GetLocalizedString("KI.Chat.InterAgeSendTo")
                     if message[:2] == "<<":
                         try:
                             idx = message.index(">>")
@@ -6909,13 +6921,13 @@ class xKI(ptModifier):
                 else:
                     if not self.IIfOnlyBuddyCheck(player.getPlayerID()):
                         return
-                    pretext = PtGetLocalizedString("KI.Chat.InterAgeMsgRecvd")
+                    pretext = xLocCache.GetLocalizedString("KI.Chat.InterAgeMsgRecvd")
                     # force the forcing the of the KI when its a private message
                     forceKI = 1
                     if message[:2] == "<<":
                         try:
                             idx = message.index(">>")
-                            player = ptPlayer(PtGetLocalizedString("KI.Chat.InterAgePlayerRecvd", [player.getPlayerName(),message[2:idx]]),player.getPlayerID())
+                            player = ptPlayer(xLocCache.GetLocalizedString("KI.Chat.InterAgePlayerRecvd", [player.getPlayerName(),message[2:idx]]),player.getPlayerID())
                             message = message[idx+2:]
                             # add unknown buddy to recents
                             if ((not cflags.private) and (not cflags.neighbors)):
@@ -6935,7 +6947,7 @@ class xKI(ptModifier):
             elif cflags.admin:
                 if cflags.private:
                     headerColor = ChatHeaderErrorColor
-                    pretext = PtGetLocalizedString("KI.Chat.PrivateMsgRecvd")
+                    pretext = xLocCache.GetLocalizedString("KI.Chat.PrivateMsgRecvd")
                     # force the forcing the of the KI when its a private message
                     forceKI = 1
                 else:
@@ -6946,21 +6958,21 @@ class xKI(ptModifier):
             elif cflags.broadcast:
                 if cflags.toSelf:
                     headerColor = ChatHeaderBroadcastColor
-                    pretext = PtGetLocalizedString("KI.Chat.BroadcastSendTo")
+                    pretext = xLocCache.GetLocalizedString("KI.Chat.BroadcastSendTo")
                 else:
                     headerColor = ChatHeaderBroadcastColor
-                    pretext = PtGetLocalizedString("KI.Chat.BroadcastMsgRecvd")
+                    pretext = xLocCache.GetLocalizedString("KI.Chat.BroadcastMsgRecvd")
                     # add to recents folder
                     self.IAddPlayerToRecents(player.getPlayerID())
             elif cflags.private:
                 if cflags.toSelf:
                     headerColor = ChatHeaderPrivateColor
-                    pretext = PtGetLocalizedString("KI.Chat.PrivateSendTo")
+                    pretext = xLocCache.GetLocalizedString("KI.Chat.PrivateSendTo")
                 else:
                     if not self.IIfOnlyBuddyCheck(player.getPlayerID()):
                         return
                     headerColor = ChatHeaderPrivateColor
-                    pretext = PtGetLocalizedString("KI.Chat.PrivateMsgRecvd")
+                    pretext = xLocCache.GetLocalizedString("KI.Chat.PrivateMsgRecvd")
                     # force the forcing the of the KI when its a private message
                     forceKI = 1
                     # save the playerid for reply
@@ -6971,18 +6983,18 @@ class xKI(ptModifier):
             # else the cflags is just a number
             if cflags == kChatSystemMessage:
                 headerColor = ChatHeaderErrorColor
-                pretext = PtGetLocalizedString("KI.Chat.ErrorMsgRecvd")
+                pretext = xLocCache.GetLocalizedString("KI.Chat.ErrorMsgRecvd")
             elif cflags == kChatCCRMessage:
                 headerColor = ChatHeaderCCRColor
-                pretext = PtGetLocalizedString("KI.Chat.CCRMsgRecvd")
+                pretext = xLocCache.GetLocalizedString("KI.Chat.CCRMsgRecvd")
             elif cflags == kChatCCRMessageSelf:
                 headerColor = ChatHeaderCCRColor
-                pretext = PtGetLocalizedString("KI.Chat.CCRSendTo")
+                pretext = xLocCache.GetLocalizedString("KI.Chat.CCRSendTo")
             elif cflags == kChatCCRMessageFromPlayer:
                 headerColor = ChatHeaderCCRColor
             else:
                 headerColor = ChatHeaderBroadcastColor
-                pretext = PtGetLocalizedString("KI.Chat.BroadcastMsgRecvd")
+                pretext = xLocCache.GetLocalizedString("KI.Chat.BroadcastMsgRecvd")
         # make sure the miniKI is up, if needs to be forced up
         if forceKI and not IKIDisabled and not mKIdialog.isEnabled():
             mKIdialog.show()
@@ -6997,57 +7009,37 @@ class xKI(ptModifier):
             else:
                 chatMessageFormatted = " " + message
 
-        chatarea = ptGUIControlMultiLineEdit(mKIdialog.getControlFromTag(kChatDisplayArea))
-        chatarea.moveCursor(PtGUIMultiLineDirection.kBufferEnd)
-        chatarea.insertStringW(U"\n")
-        chatarea.insertColor(headerColor)
-
-        #Added unicode support here!
-        chatarea.insertStringW(chatHeaderFormatted)
-        chatarea.insertColor(bodyColor)
-
-        #Added unicode support here!
-        chatarea.insertStringW(chatMessageFormatted)
-        chatarea.moveCursor(PtGUIMultiLineDirection.kBufferEnd)
+        ChatHistory.add(headerColor,chatHeaderFormatted,bodyColor,chatMessageFormatted)
         # see if we're logging
         if type(ChatLogFile) != type(None) and ChatLogFile.isOpen():
-            ChatLogFile.write(chatHeaderFormatted[0:]+chatMessageFormatted)
-        # see if we've overflowed the max lines
-        if chatarea.getBufferSize() > kMaxChatSize:
-            # remove from the start
-            while chatarea.getBufferSize() > kMaxChatSize and chatarea.getBufferSize() > 0:
-                PtDebugPrint("xKImini: max chat buffer size reached. Removing top line", level=kDebugDumpLevel)
-                chatarea.deleteLinesFromTop(1)
-
-            #chatarea.moveCursor(PtGUIMultiLineDirection.kBufferEnd)
-        # if this is the micro version then duplicate in miniKIs so its there when they switch
-        if theKILevel == kMicroKI:
-            chatarea2 = ptGUIControlMultiLineEdit(KIMini.dialog.getControlFromTag(kChatDisplayArea))
-            chatarea2.moveCursor(PtGUIMultiLineDirection.kBufferEnd)
-            chatarea2.insertStringW(U"\n")
-            chatarea2.insertColor(headerColor)
-
-            #Added unicode support here!
-            chatarea2.insertStringW(chatHeaderFormatted)
-            chatarea2.insertColor(bodyColor)
-
-            #Added unicode support here!
-            chatarea2.insertStringW(chatMessageFormatted)
-            chatarea2.moveCursor(PtGUIMultiLineDirection.kBufferEnd)
-            # see if we've overflowed the max lines
-            if chatarea2.getBufferSize() > kMaxChatSize:
-                # remove from the start
-                while chatarea2.getBufferSize() > kMaxChatSize and chatarea2.getBufferSize() > 0:
-                    PtDebugPrint("xKImini: max chat buffer size reached. Removing top line", level=kDebugDumpLevel)
-                    chatarea2.deleteLinesFromTop(1)
-
-                #chatarea2.moveCursor(PtGUIMultiLineDirection.kBufferEnd)
-        # set the scroll buttons (hide/show)
-        mKIdialog.refreshAllControls()
+            if ChatLogBuffer.write(chatHeaderFormatted[0:]+chatMessageFormatted):
+                PtAtTimeCallback(self.key,kChatLogFlushTime,kChatLogTimer)
+        # the chat areas are drawn once a frame, however much chat came in
+        if not self.chatDrawPending:
+            self.chatDrawPending = 1
+            PtAtTimeCallback(self.key,0,kChatDrawTimer)
         if not self.isChatting:
             self.IKillFadeTimer()
             self.IStartFadeTimer()
 
+    def IDrawChat(self):
+        "bring the chat areas up to date with the chat history"
+        self.chatDrawPending = 0
+        if PtIsSinglePlayerMode():
+            return
+        if theKILevel == kMicroKI or theKILevel == kNanoKI:
+            mKIdialog = KIMicro.dialog
+            changed = ChatHistory.draw("micro",ptGUIControlMultiLineEdit(mKIdialog.getControlFromTag(kChatDisplayArea)))
+            # if this is the micro version then duplicate in miniKIs so its there when they switch
+            if theKILevel == kMicroKI:
+                ChatHistory.draw("mini",ptGUIControlMultiLineEdit(KIMini.dialog.getControlFromTag(kChatDisplayArea)))
+        else:
+            mKIdialog = KIMini.dialog
+            changed = ChatHistory.draw("mini",ptGUIControlMultiLineEdit(mKIdialog.getControlFromTag(kChatDisplayArea)))
+        # set the scroll buttons (hide/show)
+        if changed:
+            mKIdialog.refreshAllControls()
+
     def IIfOnlyBuddyCheck(self, playerID):
         "determine if there is a buddy check and if so, are they a buddy?"
         global OnlyGetPMsFromBuddies
@@ -7202,138 +7194,68 @@ class xKI(ptModifier):
             PreviouslySelectedPlayer = None
         BKPlayerList = []
         vault = ptVault()
-        # if the bigKI is showing
-        if BigKI.dialog.isEnabled() and not forceSmall:
-            # get the AgeMember and Buddy folders and fill in
-            agemembers = kiFolder(PtVaultStandardNodes.kAgeMembersFolder)
-            if type(agemembers) != type(None):
-                BKPlayerList.append(agemembers)
-                BKPlayerList += self.IRemoveCCRPlayers(PtGetPlayerListDistanceSorted())
+        # get the AgeMember and Buddy folders and fill in
+        agemembers = kiFolder(PtVaultStandardNodes.kAgeMembersFolder)
+        if type(agemembers) != type(None):
+            BKPlayerList.append(agemembers)
+            BKPlayerList += self.IRemoveCCRPlayers(PtGetPlayerListDistanceSorted())
+        else:
+            BKPlayerList.append("?NOAgeMembers?")
+        if PhasedKIBuddies:
+            buddies = vault.getBuddyListFolder()
+            if type(buddies) != type(None):
+                BKPlayerList.append(buddies)
+                BKPlayerList += xKIPlayerList.GetOnlineBuddies(buddies)
             else:
-                BKPlayerList.append("?NOAgeMembers?")
-            if PhasedKIBuddies:
-                buddies = vault.getBuddyListFolder()
-                if type(buddies) != type(None):
-                    BKPlayerList.append(buddies)
-                    BKPlayerList += self.IRemoveOfflinePlayers(buddies.getChildNodeRefList())
-                else:
-                    BKPlayerList.append("?NOBuddies?")
-            if PhasedKINeighborsInDPL:
-                neighbors = self.IGetNeighbors()
-                if type(neighbors) != type(None):
-                    BKPlayerList.append(neighbors)
-                    onlinePlayers = self.IRemoveOfflinePlayers(neighbors.getChildNodeRefList())
-
-                    localplayer = PtGetLocalPlayer()
-                    for idx in range(len(onlinePlayers)):
-                        PLR = onlinePlayers[idx].getChild().upcastToPlayerInfoNode()
-                        if PLR.playerGetID() == localplayer.getPlayerID():
-                            del onlinePlayers[idx]
-                            break
-                    BKPlayerList += onlinePlayers
-                else:
-                    BKPlayerList.append("NEIGHBORS")
+                BKPlayerList.append("?NOBuddies?")
+        if PhasedKINeighborsInDPL:
+            neighbors = self.IGetNeighbors()
+            if type(neighbors) != type(None):
+                BKPlayerList.append(neighbors)
+                BKPlayerList += xKIPlayerList.GetOnlineNeighbors(neighbors,PtGetLocalPlayer().getPlayerID())
+            else:
+                BKPlayerList.append("NEIGHBORS")
+        # the devices are only listed while the bigKI is showing
+        if BigKI.dialog.isEnabled() and not forceSmall:
             if type(FolderOfDevices) != type(None) and len(FolderOfDevices) > 0:
                 BKPlayerList.append(FolderOfDevices)
                 for device in FolderOfDevices:
                     BKPlayerList.append(device)
-            # is there an activate game
-            if MarkerGameState == kMGNotActive:
-                # no, but are we working on one?
-                if type(WorkingMarkerFolder) != type(None):
-                    markerGame = ptMarkerMgr().getWorkingMarkerFolder()
-                    if type(markerGame) != type(None):
-                        BKPlayerList.append(markerGame)
-                        if markerGame.getGameType() != PtMarkerMsgGameType.kGameTypeQuest:
-                            BKPlayerList += WorkingMarkerFolder.invitedPlayers
-            else:
-                if type(CurrentPlayingMarkerGame) != type(None):
-                    # add marker game to the DPL
-                    if CurrentPlayingMarkerGame.gameType == PtMarkerMsgGameType.kGameTypeQuest:
-                        pass
-                        #TODO: what's this??? -- looks like it's commented out anyway....
-                        ### don't display the quest game in the DPL
-                        # markerGame = ptMarkerMgr().getWorkingMarkerFolder()
-                        # if type(markerGame) != type(None):
-                        # BKPlayerList.append(markerGame)
-                    else:
-                        CurrentPlayingMarkerGame.addToDPLPlaying(BKPlayerList)
-                        # add any players that have not joined but were invited
-                        if MarkerGameState == kMGGameCreation and type(WorkingMarkerFolder) != type(None):
-                            inviteTitlePosted = 0
-                            for invitePlayer in WorkingMarkerFolder.invitedPlayers:
-                                if not invitePlayer.isJoined:
-                                    if not inviteTitlePosted:
-                                        BKPlayerList.append("Invited")
-                                        inviteTitlePosted = 1
-                                    BKPlayerList.append(invitePlayer)
-        # else is the big KI is not showing
+        # is there an activate game
+        if MarkerGameState == kMGNotActive:
+            # no, but are we working on one?
+            if type(WorkingMarkerFolder) != type(None):
+                markerGame = ptMarkerMgr().getWorkingMarkerFolder()
+                if type(markerGame) != type(None):
+                    BKPlayerList.append(markerGame)
+                    if markerGame.getGameType() != PtMarkerMsgGameType.kGameTypeQuest:
+                        BKPlayerList += WorkingMarkerFolder.invitedPlayers
         else:
-            # get the AgeMember and Buddy folders and fill in
-            agemembers = kiFolder(PtVaultStandardNodes.kAgeMembersFolder)
-            if type(agemembers) != type(None):
-                BKPlayerList.append(agemembers)
-                BKPlayerList += self.IRemoveCCRPlayers(PtGetPlayerListDistanceSorted())
-            else:
-                BKPlayerList.append("?NOAgeMembers?")
-            if PhasedKIBuddies:
-                buddies = vault.getBuddyListFolder()
-                if type(buddies) != type(None):
-                    BKPlayerList.append(buddies)
-                    BKPlayerList += self.IRemoveOfflinePlayers(buddies.getChildNodeRefList())
-                else:
-                    BKPlayerList.append("?NOBuddies?")
-            if PhasedKINeighborsInDPL:
-                neighbors = self.IGetNeighbors()
-                if type(neighbors) != type(None):
-                    BKPlayerList.append(neighbors)
-                    onlinePlayers = self.IRemoveOfflinePlayers(neighbors.getChildNodeRefList())
-
-                    localplayer = PtGetLocalPlayer()
-                    for idx in range(len(onlinePlayers)):
-                        PLR = onlinePlayers[idx].getChild().upcastToPlayerInfoNode()
-                        if PLR.playerGetID() == localplayer.getPlayerID():
-                            del onlinePlayers[idx]
-                            break
-                    BKPlayerList += onlinePlayers
+            if type(CurrentPlayingMarkerGame) != type(None):
+                # if a quest then just add the name to the list
+                if CurrentPlayingMarkerGame.gameType == PtMarkerMsgGameType.kGameTypeQuest:
+                    pass
+                    ### don't display the quest game in the DPL
+                    # markerGame = ptMarkerMgr().getWorkingMarkerFolder()
+                    # if type(markerGame) != type(None):
+                    # BKPlayerList.append(markerGame)
                 else:
-                    BKPlayerList.append("NEIGHBORS")
-
-            # is there an activate game
-            if MarkerGameState == kMGNotActive:
-                # no, but are we working on one?
-                if type(WorkingMarkerFolder) != type(None):
-                    markerGame = ptMarkerMgr().getWorkingMarkerFolder()
-                    if type(markerGame) != type(None):
-                        BKPlayerList.append(markerGame)
-                        if markerGame.getGameType() != PtMarkerMsgGameType.kGameTypeQuest:
-                            BKPlayerList += WorkingMarkerFolder.invitedPlayers
-            else:
-                if type(CurrentPlayingMarkerGame) != type(None):
-                    # if a quest then just add the name to the list
-                    if CurrentPlayingMarkerGame.gameType == PtMarkerMsgGameType.kGameTypeQuest:
-                        pass
-                        ### don't display the quest game in the DPL
-                        # markerGame = ptMarkerMgr().getWorkingMarkerFolder()
-                        # if type(markerGame) != type(None):
-                        # BKPlayerList.append(markerGame)
-                    else:
-                        # add marker game to the DPL
-                        CurrentPlayingMarkerGame.addToDPLPlaying(BKPlayerList)
-                        # add any players that have not joined but were invited
-                        if MarkerGameState == kMGGameCreation and type(WorkingMarkerFolder) != type(None):
-                            inviteTitlePosted = 0
-                            for invitePlayer in WorkingMarkerFolder.invitedPlayers:
-                                if not invitePlayer.isJoined:
-                                    if not inviteTitlePosted:
-                                        BKPlayerList.append("Invited")
-                                        inviteTitlePosted = 1
-                                    BKPlayerList.append(invitePlayer)
+                    # add marker game to the DPL
+                    CurrentPlayingMarkerGame.addToDPLPlaying(BKPlayerList)
+                    # add any players that have not joined but were invited
+                    if MarkerGameState == kMGGameCreation and type(WorkingMarkerFolder) != type(None):
+                        inviteTitlePosted = 0
+                        for invitePlayer in WorkingMarkerFolder.invitedPlayers:
+                            if not invitePlayer.isJoined:
+                                if not inviteTitlePosted:
+                                    BKPlayerList.append("Invited")
+                                    inviteTitlePosted = 1
+                                BKPlayerList.append(invitePlayer)
 
     def IRemoveOfflinePlayers(self, playerlist):
         "Remove all the offline players in this list... returns result list"
         onlinelist = []
-        ignores = ptVault().getIgnoreListFolder()
+        ignores = xKIPlayerList.GetIgnoredPlayers()
         for plyr in playerlist:
             if isinstance(plyr,ptVaultNodeRef):
                 PLR = plyr.getChild()
@@ -7341,7 +7263,7 @@ class xKI(ptModifier):
                 # its an element.. should be a player
                 if type(PLR) != type(None) and PLR.getType() == PtVaultNodeTypes.kPlayerInfoNode:
                     if PLR.playerIsOnline():
-                        if not ignores.playerlistHasPlayer(PLR.playerGetID()):
+                        if PLR.playerGetID() not in ignores:
                             onlinelist.append(plyr)
         return onlinelist
 
@@ -7370,27 +7292,25 @@ class xKI(ptModifier):
             return
         PtDebugPrint("xKI: refresh playerlist display",level=kDebugDumpLevel)
         playerlist = ptGUIControlListBox(KIMini.dialog.getControlFromTag(kPlayerList))
-        scrollPos = playerlist.getScrollPos()
-        playerlist.lock()
-        playerlist.clearAllElements()
+        # the rows are gathered first, so that only the ones that changed have to be redrawn
+        rows = []
         newselection = -1    # assume no selection
 
         idx = 0
         for plyr in BKPlayerList:
             if isinstance(plyr,DeviceFolder):
-                playerlist.closeBranch()
-                playerlist.addBranch(string.upper(plyr.name),1)
+                rows.append(("branch",string.upper(plyr.name),None,None,1))
             elif isinstance(plyr,Device):
-                playerlist.addStringWithColor(plyr.name,DniSelectableColor,kSelectUseGUIColor)
+                rows.append(("string",plyr.name,DniSelectableColor,kSelectUseGUIColor,0))
             elif isinstance(plyr,ptVaultNodeRef):
                 PLR = plyr.getChild()
                 PLR = PLR.upcastToPlayerInfoNode()
                 # its an element.. should be a player
                 if type(PLR) != type(None) and PLR.getType() == PtVaultNodeTypes.kPlayerInfoNode:
                     if PLR.playerIsOnline():
-                        playerlist.addStringWithColor(PLR.playerGetName(),DniSelectableColor,kSelectUseGUIColor)
+                        rows.append(("string",PLR.playerGetName(),DniSelectableColor,kSelectUseGUIColor,0))
                     else:
-                        playerlist.addStringWithColor(PLR.playerGetName(),AgenBlueDk,kSelectDetermined)
+                        rows.append(("string",PLR.playerGetName(),AgenBlueDk,kSelectDetermined,0))
                 else:
                     PtDebugPrint("xBigKI: unknown player element type %d" % (PLR.getType()),level=kErrorLevel)
             elif isinstance(plyr,ptPlayer):
@@ -7401,27 +7321,24 @@ class xKI(ptModifier):
                         preText = ">"
                         postText = "<"
                 if plyr.getPlayerName() != "":
-                    playerlist.addStringWithColor(preText+plyr.getPlayerName()+postText,DniSelectableColor,kSelectUseGUIColor)
+                    rows.append(("string",preText+plyr.getPlayerName()+postText,DniSelectableColor,kSelectUseGUIColor,0))
                 else:
                     if plyr.getPlayerID() != 0:
-                        playerlist.addStringWithColor(preText+"[ID:%08d]"%(plyr.getPlayerID())+postText,DniSelectableColor,kSelectDetermined)
+                        rows.append(("string",preText+"[ID:%08d]"%(plyr.getPlayerID())+postText,DniSelectableColor,kSelectDetermined,0))
                     else:
-                        playerlist.addStringWithColor(preText+"?unknown user?"+postText,DniSelectableColor,kSelectDetermined)
+                        rows.append(("string",preText+"?unknown user?"+postText,DniSelectableColor,kSelectDetermined,0))
             elif isinstance(plyr,kiFolder):
-                playerlist.closeBranch()
-                playerlist.addBranchW(string.upper(plyr.name),1)
+                rows.append(("branchW",string.upper(plyr.name),None,None,1))
             elif isinstance(plyr,ptVaultPlayerInfoListNode):
                 # its a player list, display its name
                 fldrType = plyr.folderGetType()
                 # if its a list of age owners... must be list of neighbors
                 if fldrType == PtVaultStandardNodes.kAgeOwnersFolder:
                     fldrType = PtVaultStandardNodes.kHoodMembersFolder
-                playerlist.closeBranch()
-                playerlist.addBranch(string.upper(xLocTools.FolderIDToFolderName(fldrType)),1)
+                rows.append(("branch",string.upper(xLocTools.FolderIDToFolderName(fldrType)),None,None,1))
             elif isinstance(plyr,ptVaultMarkerGameNode):
                 # its a marker list, display its name
-                playerlist.closeBranch()
-                playerlist.addBranch(plyr.folderGetName(),1)
+                rows.append(("branch",plyr.folderGetName(),None,None,1))
             elif isinstance(plyr,MarkerPlayer):
                 if type(plyr.player) != type(None):
                     if plyr.player.getPlayerName() != "":
@@ -7431,28 +7348,24 @@ class xKI(ptModifier):
                                 pcolor = DniGreenDk
                             elif plyr.team == PtMarkerMsgTeam.kRedTeam:
                                 pcolor = DniRed
-                        playerlist.addStringWithColor(plyr.player.getPlayerName()+plyr.scoreText,pcolor,kSelectUseGUIColor)
+                        rows.append(("string",plyr.player.getPlayerName()+plyr.scoreText,pcolor,kSelectUseGUIColor,0))
                 else:
-                    playerlist.addStringWithColor("?offline userID[%d]?"%(plyr.player.getPlayerID()),AgenBlueDk,kSelectDetermined)
+                    rows.append(("string","?offline userID[%d]?"%(plyr.player.getPlayerID()),AgenBlueDk,kSelectDetermined,0))
             elif isinstance(plyr,MarkerGame):
                 # its a marker list, display its name
-                playerlist.closeBranch()
-                playerlist.addBranch(plyr.gameName,1)
+                rows.append(("branch",plyr.gameName,None,None,1))
             elif isinstance(plyr,DPLBranchStatusLine):
-                if plyr.closePrev:
-                    playerlist.closeBranch()
                 plyr.position = idx
-                playerlist.addBranch(plyr.text,1)
+                rows.append(("branch",plyr.text,None,None,plyr.closePrev))
             elif isinstance(plyr,DPLStatusLine):
                 plyr.position = idx
                 if type(plyr.color) != type(None):
                     clr = plyr.color
                 else:
                     clr = DniSelectableColor
-                playerlist.addStringWithColor(plyr.text,clr,kSelectUseGUIColor)
+                rows.append(("string",plyr.text,clr,kSelectUseGUIColor,0))
             elif type(plyr) == type(""):
-                playerlist.closeBranch()
-                playerlist.addBranch(plyr,1)
+                rows.append(("branch",plyr,None,None,1))
             else:
                 PtDebugPrint("xBigKI: unknown list type ",plyr,level=kErrorLevel)
                 pass
@@ -7488,6 +7401,9 @@ class xKI(ptModifier):
             # put the caret back to regular prompt
             caret = ptGUIControlTextBox(KIMini.dialog.getControlFromTag(kChatCaretID))
             caret.setString(">")
+        scrollPos = playerlist.getScrollPos()
+        playerlist.lock()
+        self.IDrawPlayerListRows(playerlist,rows)
         PtDebugPrint("xKI:mini: setting new selection to %d"%(newselection),level=kDebugDumpLevel)
         playerlist.setSelection(newselection)
         PreviouslySelectedPlayer = None
@@ -7521,6 +7437,39 @@ class xKI(ptModifier):
                     sendToField.setString("  ")
                     sendToButton.hide()
 
+    def IDrawPlayerListRows(self,playerlist,rows):
+        "puts the rows in the player list, redrawing only the ones that are different from last time"
+        global BKPlayerListRows
+        oldRows = BKPlayerListRows
+        BKPlayerListRows = rows
+        if len(oldRows) == len(rows) and playerlist.getNumElements() == len(rows):
+            changed = []
+            for idx in range(len(rows)):
+                row = rows[idx]
+                oldRow = oldRows[idx]
+                if row == oldRow:
+                    continue
+                # a string can have its text replaced in place, anything else means starting over
+                if row[0] != "string" or oldRow[0] != "string" or row[2:] != oldRow[2:]:
+                    changed = None
+                    break
+                changed.append(idx)
+            if changed is not None:
+                for idx in changed:
+                    playerlist.setElement(idx,rows[idx][1])
+                return
+        playerlist.clearAllElements()
+        for kind,text,color,selectMode,closePrev in rows:
+            if kind == "string":
+                playerlist.addStringWithColor(text,color,selectMode)
+            else:
+                if closePrev:
+                    playerlist.closeBranch()
+                if kind == "branchW":
+                    playerlist.addBranchW(text,1)
+                else:
+                    playerlist.addBranch(text,1)
+
     def IRefreshMiniKIMarkerDisplay(self):
         global PhasedKICreateMarkerGame
         "refresh the display on the miniKI indicator bars"
@@ -7922,11 +7871,9 @@ class xKI(ptModifier):
         if gGZPlaying and gMarkerToGetNumber > gMarkerGottenNumber:
             # set the marker status to 'gotten'
             #   ...in the GZ marker chronicle
-            vault = ptVault()
             # is there a chronicle for the GZ games?
-            entry = vault.findChronicleEntry(kChronicleGZMarkersAquired)
-            if type(entry) != type(None):
-                markers = entry.chronicleGetValue()
+            markers = xChronicleStore.Get(kChronicleGZMarkersAquired)
+            if markers is not None:
                 markerIdx = gGZMarkerInRange - 1
                 if markerIdx >= 0 and markerIdx < len(markers):
                     # Set the marker to "captured"
@@ -7934,8 +7881,7 @@ class xKI(ptModifier):
                         markers = markers[:markerIdx] + kGZMarkerCaptured + markers[-(len(markers)-(markerIdx+1)):]
                     else:
                         markers = markers[:markerIdx] + kGZMarkerCaptured
-                    entry.chronicleSetValue(markers)
-                    entry.save()
+                    xChronicleStore.Set(kChronicleGZMarkersAquired,markers,now=1)
                     # update the marker Gotten count
                     totalGotten = markers.count(kGZMarkerCaptured)
                     if gKIMarkerLevel > kKIMarkerFirstLevel:
@@ -8502,12 +8448,9 @@ class xKI(ptModifier):
                 # but not for AvatarCustomization Age
                 ageName = self.IGetAgeFileName().lower()
                 if ageName != "startup" and ageName != "avatarcustomization" and ageName != "unknown age" and self.IGetAgeInstanceName() != "?unknown?":
-                    vault = ptVault()
-                    entry = vault.findChronicleEntry("CleftSolved")
                     cleftSolved = 0
-                    if type(entry) != type(None):
-                        if entry.chronicleGetValue() == "yes":
-                            cleftSolved = 1
+                    if xChronicleStore.Get("CleftSolved") == "yes":
+                        cleftSolved = 1
                     if self.IGetAgeInstanceName() != "D'ni-Riltagamin" or cleftSolved:
                         instAgeName = self.IGetAgeInstanceName()
                         createAgeFolder = 1
@@ -8745,14 +8688,7 @@ class xKI(ptModifier):
             folder = BKFolderLineDict[foldername]
             if type(folder) != type(None):
                 if isinstance(folder,ptVaultNode):
-                    if folder.getType() == PtVaultNodeTypes.kAgeInfoNode:
-                        try:
-                            BKContentList = folder.getCanVisitFolder().getChildNodeRefList()
-                        except AttributeError:
-                            BKContentList = []
-                    else:
-                        BKContentList = folder.getChildNodeRefList()
-                    self.IBigKIProcessContentList(removeInboxStuff=1)
+                    self.IBigKIGetFolderContents(folder,removeInboxStuff=1)
                     if BKFolderSelectChanged:
                         BKContentListTopLine = 0
                 elif isinstance(folder,kiFolder):
@@ -8778,14 +8714,7 @@ class xKI(ptModifier):
             folder = BKFolderLineDict[foldername]
             if type(folder) != type(None):
                 if isinstance(folder,ptVaultNode):
-                    if folder.getType() == PtVaultNodeTypes.kAgeInfoNode:
-                        try:
-                            BKContentList = folder.getCanVisitFolder().getChildNodeRefList()
-                        except AttributeError:
-                            BKContentList = []
-                    else:
-                        BKContentList = folder.getChildNodeRefList()
-                    self.IBigKIProcessContentList()
+                    self.IBigKIGetFolderContents(folder)
                 elif isinstance(folder,kiFolder):
                     BKContentList = self.IRemoveCCRPlayers(PtGetPlayerListDistanceSorted())
                     self.IBigKIProcessContentList()
@@ -8794,126 +8723,167 @@ class xKI(ptModifier):
         except LookupError:
             pass
 
-    def IBigKIProcessContentList(self,removeInboxStuff=0):
-        "Do extra processing on content folder list"
+    def IBigKIGetFolderContents(self,folder,removeInboxStuff=0):
+        "fill the content list with the processed contents of a vault folder"
         global BKContentList
-        global OnlyGetPMsFromBuddies
-        # start with nothing in the removelist (remove from current content list)
-        removelist = []
+        if folder.getType() == PtVaultNodeTypes.kAgeInfoNode:
+            folder = folder.getCanVisitFolder()
+            if type(folder) == type(None):
+                BKContentList = []
+                return
+        self.IBigKIProcessContentList(removeInboxStuff,folder)
+
+    def IBigKIProcessContentList(self,removeInboxStuff=0,folder=None):
+        """Do extra processing on content folder list
+        if the folder is given, its contents are fetched here and the result is kept until a vault change touches it"""
+        global BKContentList
+        isInbox = BKFolderListOrder[BKFolderSelected] == xLocTools.FolderIDToFolderName(PtVaultStandardNodes.kInboxFolder)
+        cacheKey = None
+        if type(folder) != type(None):
+            cacheKey = (folder.getID(),BKFolderLineDict is BKPlayerFolderDict,isInbox,OnlyGetPMsFromBuddies)
+            entry = BKContentCache.get(cacheKey)
+            if entry is not None:
+                contents = entry[2]
+                if isInbox:
+                    BKContentList = MarkerJoinRequests + contents
+                else:
+                    BKContentList = contents[:]
+                return
+            BKContentList = folder.getChildNodeRefList()
+        contents = BKContentList
+        vault = ptVault()
+        # the folders whose changes make the result stale, and the nodes whose saves do
+        deps = set()
+        if type(folder) != type(None):
+            deps.add(folder.getID())
+        childIDs = set([ref.getChildID() for ref in contents if isinstance(ref,ptVaultNodeRef)])
+        cacheable = 1
+        removed = 0
         # if player list
         if BKFolderLineDict is BKPlayerFolderDict:
-            ignores = ptVault().getIgnoreListFolder()
+            ignores = xKIPlayerList.GetIgnoredPlayers()
+            ignoreFolder = vault.getIgnoreListFolder()
+            if type(ignoreFolder) != type(None):
+                deps.add(ignoreFolder.getID())
             # make sure there are some players to process
-            if len(BKContentList) > 0:
+            if len(contents) > 0:
                 # if this is a ptPlayer
-                if isinstance(BKContentList[0],ptPlayer):
+                if isinstance(contents[0],ptPlayer):
                     # sort the list of age players - up front
+                    players = [player for player in contents if isinstance(player,ptPlayer) and player.getPlayerID() not in ignores]
+                    removed = len(contents) - len(players)
                     try:
-                        BKContentList.sort(lambda a, b: cmp(a.getPlayerName().lower(), b.getPlayerName().lower()))
+                        decorated = [(players[idx].getPlayerName().lower(),idx,players[idx]) for idx in range(len(players))]
+                        decorated.sort()
+                        players = [item[2] for item in decorated]
                     except:
                         PtDebugPrint("xBigKI: Unable to sort age players but let's not break the list", level=kErrorLevel)
-
-                    for idx in range(len(BKContentList)):
-                        player = BKContentList[idx]
-                        if isinstance(player,ptPlayer):
-                            if ignores.playerlistHasPlayer(player.getPlayerID()):
-                                # put into the removelist
-                                removelist.insert(0,idx)
-                            else:
-                                # its a good player
-                                pass
-                        else:
-                            # not really a player, then remove from the list
-                            removelist.insert(0,idx)
+                    contents = players
                 else:
-                    # sort the list of players - online up front
-                    BKContentList.sort(CMPplayerOnline)
-                    # remove all the no-named players and ignored people
-                    #~ PtDebugPrint("xKI: START: there are %d players in the this list" % (len(BKContentList)))
-                    for idx in range(len(BKContentList)):
-                        ref = BKContentList[idx]
+                    # remove all the no-named players, CCRs and ignored people
+                    # and sort the rest - online up front, then by name
+                    decorated = []
+                    for idx in range(len(contents)):
+                        ref = contents[idx]
                         elem = ref.getChild()
-                        if type(elem) != type(None):
-                            if elem.getType() == PtVaultNodeTypes.kPlayerInfoNode:
-                                elem = elem.upcastToPlayerInfoNode()
-                                if elem.playerGetName() == "":
-                                    #~ PtDebugPrint("xKI: removing %d from content internal list" % (elem.playerGetID()))
-                                    # put in them in reverse order in the removelist
-                                    removelist.insert(0,idx)
-                                # check if they are in the ignore list
-                                elif ignores.playerlistHasPlayer(elem.playerGetID()):
-                                    # get parent... in some folders the player has to be still visible
-                                    parent = ref.getParent()
-                                    if parent: parent = parent.upcastToFolderNode()
-                                    if type(parent) != type(None):
-                                        # make sure this is not the IgnoreList
-                                        if parent.folderGetType() != PtVaultStandardNodes.kIgnoreListFolder:
-                                            # put in them in reverse order in the removelist
-                                            removelist.insert(0,idx)
-                                elif (AmICCR and elem.playerGetCCRLevel() > ptCCRMgr().getLevel()) or elem.playerGetCCRLevel() > 0:
-                                    removelist.insert(0,idx)
-                                else:
-                                    # its a good player
-                                    pass
-                            else:
-                                #~ PtDebugPrint("xKI: not a player? its a %d" % (elem.getType()))
-                                removelist.insert(0,idx)
-                        else:
-                            #~ PtDebugPrint("xKI: player, but there is not a node?")
-                            removelist.insert(0,idx)
-            #~ PtDebugPrint("xKI: END: there are %d players in the this list" % (len(BKContentList)))
-        elif BKFolderListOrder[BKFolderSelected] == xLocTools.FolderIDToFolderName(PtVaultStandardNodes.kInboxFolder):
+                        if type(elem) == type(None) or elem.getType() != PtVaultNodeTypes.kPlayerInfoNode:
+                            continue
+                        elem = elem.upcastToPlayerInfoNode()
+                        name = elem.playerGetName()
+                        if name == "":
+                            continue
+                        # check if they are in the ignore list
+                        if elem.playerGetID() in ignores:
+                            # get parent... in some folders the player has to be still visible
+                            parent = ref.getParent()
+                            if parent: parent = parent.upcastToFolderNode()
+                            if type(parent) != type(None):
+                                # make sure this is not the IgnoreList
+                                if parent.folderGetType() != PtVaultStandardNodes.kIgnoreListFolder:
+                                    continue
+                        elif (AmICCR and elem.playerGetCCRLevel() > ptCCRMgr().getLevel()) or elem.playerGetCCRLevel() > 0:
+                            continue
+                        decorated.append((not elem.playerIsOnline(),name.lower(),idx,ref))
+                    decorated.sort()
+                    removed = len(contents) - len(decorated)
+                    contents = [item[3] for item in decorated]
+        elif isInbox:
             # look for KIMail from non-Buddies if they only want KIMail from buddies
-            vault = ptVault()
             inbox = vault.getInbox()
-            buddies = vault.getBuddyListFolder()
-            ignores = vault.getIgnoreListFolder()
-
-            for idx in range(len(BKContentList)):
-                ref = BKContentList[idx]
+            buddies = xKIPlayerList.GetBuddyIDs()
+            ignores = xKIPlayerList.GetIgnoredPlayers()
+            for otherFolder in (vault.getBuddyListFolder(),vault.getIgnoreListFolder()):
+                if type(otherFolder) != type(None):
+                    deps.add(otherFolder.getID())
+            kept = []
+            for ref in contents:
                 if type(ref) != type(None):
                     if type(ref.getSaver()) == type(None) or ref.getSaverID() == 0:
                         # Removed the following print because spitting out this message 2,000
                         # times causes lag out the wazoo. Praise Rand that it's fixed!
                         # If you have any objections, stuff it, fool.
                         #print "Tye: They still haven't fixed getSaver() and getSaverID()!"
+                        kept.append(ref)
                         continue
 
-                    if (OnlyGetPMsFromBuddies and not buddies.playerlistHasPlayer(ref.getSaverID())) or ignores.playerlistHasPlayer(ref.getSaverID()):
+                    saverID = ref.getSaverID()
+                    if (OnlyGetPMsFromBuddies and not buddies.has_key(saverID)) or saverID in ignores:
                         PtDebugPrint("xKI:remove from inbox because from %s"%(ref.getSaver().playerGetName()),level=kWarningLevel)
                         # remove from our list
-                        removelist.insert(0,idx)
+                        removed += 1
                         # only remove from inbox when
                         if removeInboxStuff:
                             PtDebugPrint("xKI:REALLY removed from inbox because from %s, this time"%(ref.getSaver().playerGetName()),level=kWarningLevel)
                             # remove from inbox... not sure how this is going to work!
                             element = ref.getChild()
                             inbox.removeNode(element)
-        if len(removelist):
-            PtDebugPrint("xKI: removing %d contents from being displayed" % (len(removelist)),level=kWarningLevel)
-        for removeidx in removelist:
-            del BKContentList[removeidx]
-
-        if BKFolderListOrder[BKFolderSelected] == xLocTools.FolderIDToFolderName(PtVaultStandardNodes.kInboxFolder):
-            BKContentList = MarkerJoinRequests + BKContentList
+                            # the inbox is about to change anyway
+                            cacheable = 0
+                        continue
+                kept.append(ref)
+            contents = kept
             # also add in the GlobalInbox stuff here
-            vault = ptVault()
             ginbox = vault.getGlobalInbox()
             if type(ginbox) != type(None):
                 #PtDebugPrint("xKI: Global inbox found",level=kWarningLevel)
-                BKContentList = ginbox.getChildNodeRefList() + BKContentList
-                BKContentList.sort(CMPNodeDate)
-
-        removelist = []
-        for contentidx in range(len(BKContentList)):
-            content = BKContentList[contentidx]
+                deps.add(ginbox.getID())
+                grefs = ginbox.getChildNodeRefList()
+                for ref in grefs:
+                    childIDs.add(ref.getChildID())
+                # newest first; the dates are only looked up once per node
+                decorated = []
+                allrefs = grefs + contents
+                for idx in range(len(allrefs)):
+                    ref = allrefs[idx]
+                    element = None
+                    if type(ref) != type(None):
+                        element = ref.getChild()
+                    if type(element) != type(None):
+                        decorated.append((0,-element.getModifyTime(),idx,ref))
+                    else:
+                        decorated.append((1,0,idx,ref))
+                decorated.sort()
+                contents = [item[3] for item in decorated]
+        if removed:
+            PtDebugPrint("xKI: removing %d contents from being displayed" % (removed),level=kWarningLevel)
+
+        # folders aren't listed as content
+        kept = []
+        for content in contents:
             if isinstance(content, ptVaultNodeRef):
                 element = content.getChild()
-                if type(element) != type(None):
-                    if element.getType() == PtVaultNodeTypes.kFolderNode:
-                        removelist.insert(0,contentidx)
-        for removeidx in removelist:
-            del BKContentList[removeidx]
+                if type(element) != type(None) and element.getType() == PtVaultNodeTypes.kFolderNode:
+                    continue
+            kept.append(content)
+        contents = kept
+
+        if cacheable and cacheKey is not None:
+            BKContentCache[cacheKey] = (deps,childIDs,contents)
+        if isInbox:
+            # the marker game join requests go on top
+            BKContentList = MarkerJoinRequests + contents
+        else:
+            BKContentList = contents[:]
 
     def IBigKIRefreshContentListDisplay(self):
         "display the contents of the folder that is selected, if we are in list mode"
@@ -10342,22 +10312,12 @@ class xKI(ptModifier):
     def ICheckCalibrationProgress(self):
         for mg in grtzMarkerGames.mgs:
             gameName = mg[1]
-            startTime = 1.0
             bestTime = 0.0
-            vault = ptVault()
-            entry = vault.findChronicleEntry(gameName)
-            if (type(entry) != type(None)):
-                progressString = entry.chronicleGetValue()
-                progList = progressString.split(',')
-                if (len(progList) == 2):
-                    try:
-                        startTime = string.atof(progList[0])
-                    except ValueError:
-                        pass
-                    try:
-                        bestTime = string.atof(progList[1])
-                    except ValueError:
-                        pass
+            if xChronicleStore.Has(gameName):
+                # (start time, best time)
+                progList = xChronicleStore.Get(gameName)
+                if progList is not None and len(progList) == 2:
+                    bestTime = progList[1]
             else:
                 PtDebugPrint('game missing -> no GPS', level=kDebugDumpLevel)
                 return
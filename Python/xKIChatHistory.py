@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+""" *==LICENSE==*
+
+CyanWorlds.com Engine - MMOG client, server and tools
+Copyright (C) 2011  Cyan Worlds, Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Additional permissions under GNU GPL version 3 section 7
+
+If you modify this Program, or any covered work, by linking or
+combining it with any of RAD Game Tools Bink SDK, Autodesk 3ds Max SDK,
+NVIDIA PhysX SDK, Microsoft DirectX SDK, OpenSSL library, Independent
+JPEG Group JPEG library, Microsoft Windows Media SDK, or Apple QuickTime SDK
+(or a modified version of those libraries),
+containing parts covered by the terms of the Bink SDK EULA, 3ds Max EULA,
+PhysX SDK EULA, DirectX SDK EULA, OpenSSL and SSLeay licenses, IJG
+JPEG Library README, Windows Media SDK EULA, or QuickTime SDK EULA, the
+licensors of this Program grant you additional
+permission to convey the resulting work. Corresponding Source for a
+non-source form of such a combination shall include the source code for
+the parts of OpenSSL and IJG JPEG Library used as well as that of the covered
+work.
+
+You can contact Cyan Worlds, Inc. by email legal@cyan.com
+ or by snail mail at:
+      Cyan Worlds, Inc.
+      14617 N Newport Hwy
+      Mead, WA   99021
+
+ *==LICENSE==* """
+"""
+Module: xKIChatHistory
+Age: global
+Date: October 2026
+Keeps the lines shown in the mini and micro KI chat areas.
+Chat lines are kept (formatted, with their colors) in one bounded history and the chat
+areas are drawn from it: a burst of chat is appended to the history straight away and
+the chat areas catch up once, on the next frame.  When the history grows past its size
+it is trimmed in one go (to kTrimToFraction of the size) and the chat areas are redrawn
+from scratch, instead of deleting a line at a time.
+The chat log is buffered the same way and written out by Flush on a timer.
+"""
+
+from Plasma import *
+from PlasmaTypes import *
+
+# the history is trimmed down to this fraction of its maximum size when it overflows
+kTrimToFraction = 0.75
+
+
+class ChatHistory:
+    "the formatted chat lines, oldest first"
+    def __init__(self,maxSize):
+        self.maxSize = maxSize
+        self.entries = []           # (headerColor,header,bodyColor,message)
+        self.size = 0               # characters in entries
+        self.first = 0              # serial number of entries[0]
+        self.displays = {}          # display name -> (first serial drawn, next serial to draw)
+
+    def clear(self):
+        "forget all the chat lines (the chat areas are cleared on their next draw)"
+        self.first += len(self.entries)
+        self.entries = []
+        self.size = 0
+
+    def add(self,headerColor,header,bodyColor,message):
+        "add a chat line, trimming the oldest lines if the history is full"
+        self.entries.append((headerColor,header,bodyColor,message))
+        self.size += len(header) + len(message) + 1
+        if self.size > self.maxSize:
+            self.ITrim()
+
+    def ITrim(self):
+        target = int(self.maxSize * kTrimToFraction)
+        size = self.size
+        drop = 0
+        while drop < len(self.entries) and size > target:
+            entry = self.entries[drop]
+            size -= len(entry[1]) + len(entry[3]) + 1
+            drop += 1
+        PtDebugPrint("xKIChatHistory: max chat buffer size reached. Removing %d top lines" % (drop),level=kDebugDumpLevel)
+        del self.entries[:drop]
+        self.first += drop
+        self.size = size
+
+    def needsDraw(self,name):
+        "is the display behind the history?"
+        return self.displays.get(name) != (self.first,self.first+len(self.entries))
+
+    def draw(self,name,chatarea):
+        "bring a chat area up to date; returns whether anything changed"
+        end = self.first + len(self.entries)
+        drawn = self.displays.get(name)
+        if drawn == (self.first,end):
+            return 0
+        if drawn is not None and drawn[0] == self.first:
+            # only new lines, add them at the end
+            start = drawn[1] - self.first
+        else:
+            # the top of the history was trimmed (or it was never drawn), start over
+            chatarea.clearBuffer()
+            start = 0
+        chatarea.moveCursor(PtGUIMultiLineDirection.kBufferEnd)
+        for headerColor,header,bodyColor,message in self.entries[start:]:
+            chatarea.insertStringW(U"\n")
+            chatarea.insertColor(headerColor)
+            chatarea.insertStringW(header)
+            chatarea.insertColor(bodyColor)
+            chatarea.insertStringW(message)
+        chatarea.moveCursor(PtGUIMultiLineDirection.kBufferEnd)
+        self.displays[name] = (self.first,end)
+        return 1
+
+    def forget(self,name):
+        "the chat area was changed behind our back, redraw it completely next time"
+        if self.displays.has_key(name):
+            del self.displays[name]
+
+
+class ChatLogBuffer:
+    "chat lines waiting to be written to a ptStatusLog"
+    def __init__(self):
+        self.pending = []
+
+    def write(self,text):
+        "queue a line; returns true if it is the first one since the last flush"
+        self.pending.append(text)
+        return len(self.pending) == 1
+
+    def flush(self,log):
+        "write the queued lines to the log (dropped if the log is not open)"
+        pending = self.pending
+        self.pending = []
+        if type(log) == type(None) or not log.isOpen():
+            return
+        for text in pending:
+            log.write(text)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+""" *==LICENSE==*
+
+CyanWorlds.com Engine - MMOG client, server and tools
+Copyright (C) 2011  Cyan Worlds, Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Additional permissions under GNU GPL version 3 section 7
+
+If you modify this Program, or any covered work, by linking or
+combining it with any of RAD Game Tools Bink SDK, Autodesk 3ds Max SDK,
+NVIDIA PhysX SDK, Microsoft DirectX SDK, OpenSSL library, Independent
+JPEG Group JPEG library, Microsoft Windows Media SDK, or Apple QuickTime SDK
+(or a modified version of those libraries),
+containing parts covered by the terms of the Bink SDK EULA, 3ds Max EULA,
+PhysX SDK EULA, DirectX SDK EULA, OpenSSL and SSLeay licenses, IJG
+JPEG Library README, Windows Media SDK EULA, or QuickTime SDK EULA, the
+licensors of this Program grant you additional
+permission to convey the resulting work. Corresponding Source for a
+non-source form of such a combination shall include the source code for
+the parts of OpenSSL and IJG JPEG Library used as well as that of the covered
+work.
+
+You can contact Cyan Worlds, Inc. by email legal@cyan.com
+ or by snail mail at:
+      Cyan Worlds, Inc.
+      14617 N Newport Hwy
+      Mead, WA   99021
+
+ *==LICENSE==* """
+"""
+Module: xKIChatRouter
+Age: global
+Date: October 2026
+Routes the commands typed on the KI chat line to their handlers.
+The command tokens (most of them localized) are put in a prefix tree once per
+language, so a chat line is matched by walking its first few characters once
+instead of testing every command in turn.
+Age scripts can add their own commands with RegisterChatCommand and remove them
+again with UnregisterChatCommand (usually in BeginAgeUnLoad).
+"""
+
+from Plasma import *
+from PlasmaTypes import *
+
+
+class ChatCommand:
+    "a single chat command"
+    def __init__(self,name,handler,token,locKey,exact,caseSensitive,wholeWord,condition,priority):
+        self.name = name
+        self.handler = handler          # handler(chatmessage,command) -> the chat message left to send (or None)
+        self.literal = token            # token as typed, or...
+        self.locKey = locKey            # ...the localization key of the token
+        self.exact = exact              # the whole chat line must be the token
+        self.caseSensitive = caseSensitive  # the token must match the chat line's case (token must be lowercase)
+        self.wholeWord = wholeWord      # the token must be followed by whitespace or the end of the line
+        self.condition = condition      # if not None, the command is skipped unless condition() is true
+        self.priority = priority        # when several tokens match, the lowest priority wins
+        self.token = None
+
+    def resolveToken(self):
+        if self.locKey:
+            self.token = PtGetLocalizedString(self.locKey)
+        else:
+            self.token = self.literal
+        return self.token
+
+    def matches(self,chatmessage,length):
+        "the token matched the first length chars of the lowercased chat line, check the other rules"
+        if self.exact and length != len(chatmessage):
+            return 0
+        if self.wholeWord and length != len(chatmessage) and not chatmessage[length].isspace():
+            return 0
+        if self.caseSensitive and chatmessage[:length] != self.token:
+            return 0
+        return 1
+
+
+class ChatCommandRouter:
+    "prefix tree of chat command tokens"
+    def __init__(self):
+        self.commands = {}      # name -> ChatCommand
+        self.numRegistered = 0
+        self.tree = None
+        self.language = None
+
+    def register(self,name,handler,token=None,locKey=None,exact=0,caseSensitive=0,wholeWord=0,condition=None):
+        "add (or replace) a command; give either the token or the localization key of the token"
+        self.numRegistered += 1
+        self.commands[name] = ChatCommand(name,handler,token,locKey,exact,caseSensitive,wholeWord,condition,self.numRegistered)
+        self.tree = None
+
+    def unregister(self,name):
+        if name in self.commands:
+            del self.commands[name]
+            self.tree = None
+
+    def IBuild(self):
+        "put all the tokens in the prefix tree, each node is a dict of char -> node and None -> commands ending there"
+        self.language = PtGetLanguage()
+        self.tree = {}
+        for command in self.commands.values():
+            token = command.resolveToken()
+            if not token:
+                continue
+            node = self.tree
+            for char in token:
+                node = node.setdefault(char,{})
+            node.setdefault(None,[]).append(command)
+
+    def match(self,chatmessage):
+        "returns the commands whose token the chat line starts with, best first"
+        if self.tree is None or self.language != PtGetLanguage():
+            self.IBuild()
+        lowered = chatmessage.lower()
+        matches = []
+        node = self.tree
+        length = 0
+        while 1:
+            for command in node.get(None,()):
+                if command.matches(chatmessage,length):
+                    matches.append(command)
+            if length == len(lowered):
+                break
+            node = node.get(lowered[length])
+            if node is None:
+                break
+            length += 1
+        if len(matches) > 1:
+            matches.sort(key=lambda command: command.priority)
+        return matches
+
+    def dispatch(self,chatmessage):
+        "run the command for a chat line; returns (handled,chat message left to send)"
+        for command in self.match(chatmessage):
+            if command.condition is None or command.condition():
+                return 1,command.handler(chatmessage,command.token)
+        return 0,chatmessage
+
+
+# the chat commands of the KI, age scripts can add their own
+gChatCommands = ChatCommandRouter()
+
+def RegisterChatCommand(name,handler,token=None,locKey=None,exact=0,caseSensitive=0,wholeWord=0,condition=None):
+    "add a chat command (see ChatCommand for the options), the handler is called as handler(chatmessage,command)"
+    gChatCommands.register(name,handler,token,locKey,exact,caseSensitive,wholeWord,condition)
+
+def UnregisterChatCommand(name):
+    gChatCommands.unregister(name)
+
+def DispatchChatCommand(chatmessage):
+    "returns (handled,chat message left to send)"
+    return gChatCommands.dispatch(chatmessage)
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+""" *==LICENSE==*
+
+CyanWorlds.com Engine - MMOG client, server and tools
+Copyright (C) 2011  Cyan Worlds, Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Additional permissions under GNU GPL version 3 section 7
+
+If you modify this Program, or any covered work, by linking or
+combining it with any of RAD Game Tools Bink SDK, Autodesk 3ds Max SDK,
+NVIDIA PhysX SDK, Microsoft DirectX SDK, OpenSSL library, Independent
+JPEG Group JPEG library, Microsoft Windows Media SDK, or Apple QuickTime SDK
+(or a modified version of those libraries),
+containing parts covered by the terms of the Bink SDK EULA, 3ds Max EULA,
+PhysX SDK EULA, DirectX SDK EULA, OpenSSL and SSLeay licenses, IJG
+JPEG Library README, Windows Media SDK EULA, or QuickTime SDK EULA, the
+licensors of this Program grant you additional
+permission to convey the resulting work. Corresponding Source for a
+non-source form of such a combination shall include the source code for
+the parts of OpenSSL and IJG JPEG Library used as well as that of the covered
+work.
+
+You can contact Cyan Worlds, Inc. by email legal@cyan.com
+ or by snail mail at:
+      Cyan Worlds, Inc.
+      14617 N Newport Hwy
+      Mead, WA   99021
+
+ *==LICENSE==* """
+"""
+Module: xKIPlayerList
+Age: global
+Date: October 2026
+Keeps the vault sections of the KI's player list (buddies and neighbors) between refreshes.
+Each section remembers the players of its folder by player ID, in folder order, together
+with whether they are online; vault events update single players instead of the whole
+folder being walked again.  The ignore list is kept as a set of player IDs.
+The KI forwards its OnVaultEvent here and asks the sections for their online players.
+"""
+
+from Plasma import *
+from PlasmaTypes import *
+from PlasmaVaultConstants import *
+
+# player IDs on the ignore list, None until it is needed
+gIgnoredPlayers = None
+# node ID of the ignore list folder, so we know when its refs change
+gIgnoreFolderID = None
+
+
+def GetIgnoredPlayers():
+    "returns the set of player IDs on the ignore list"
+    global gIgnoredPlayers
+    global gIgnoreFolderID
+    if gIgnoredPlayers is None:
+        gIgnoredPlayers = set()
+        ignores = ptVault().getIgnoreListFolder()
+        if ignores is not None:
+            gIgnoreFolderID = ignores.getID()
+            for ref in ignores.getChildNodeRefList():
+                PLR = ref.getChild().upcastToPlayerInfoNode()
+                if PLR is not None:
+                    gIgnoredPlayers.add(PLR.playerGetID())
+    return gIgnoredPlayers
+
+def IsIgnored(playerID):
+    return playerID in GetIgnoredPlayers()
+
+
+class DPLSection:
+    "the players of one player list folder, in folder order, and which of them are online"
+    def __init__(self):
+        self.folderID = None
+        self.order = []         # player IDs in folder order
+        self.refs = {}          # player ID -> ptVaultNodeRef
+        self.nodeIDs = {}       # node ID of the player info -> player ID
+        self.state = {}         # player ID -> (online, name)
+        self.online = None      # cached result of OnlineRefs, None when it needs rebuilding
+        self.dirty = 1
+
+    def IAdd(self, ref):
+        PLR = ref.getChild().upcastToPlayerInfoNode()
+        # its an element.. should be a player
+        if PLR is None or PLR.getType() != PtVaultNodeTypes.kPlayerInfoNode:
+            return
+        playerID = PLR.playerGetID()
+        if not self.refs.has_key(playerID):
+            self.order.append(playerID)
+        self.refs[playerID] = ref
+        self.nodeIDs[PLR.getID()] = playerID
+        self.state[playerID] = (PLR.playerIsOnline(), PLR.playerGetName())
+
+    def IRebuild(self, folder):
+        self.folderID = folder.getID()
+        self.order = []
+        self.refs = {}
+        self.nodeIDs = {}
+        self.state = {}
+        for ref in folder.getChildNodeRefList():
+            if isinstance(ref,ptVaultNodeRef):
+                self.IAdd(ref)
+        self.online = None
+        self.dirty = 0
+
+    def ISync(self, folder):
+        if self.dirty or folder.getID() != self.folderID:
+            self.IRebuild(folder)
+
+    def OnlineRefs(self, folder, excludeID=None):
+        "returns the refs of the folder's online players that aren't ignored (or excludeID)"
+        self.ISync(folder)
+        if self.online is None:
+            ignores = GetIgnoredPlayers()
+            self.online = [self.refs[playerID] for playerID in self.order if self.state[playerID][0] and playerID not in ignores]
+        if excludeID is not None and self.refs.has_key(excludeID):
+            return [ref for ref in self.online if ref is not self.refs[excludeID]]
+        return self.online
+
+    def UpdatePlayer(self, PLR):
+        "takes note of a saved player info; returns true if the list of online players looks different now"
+        playerID = PLR.playerGetID()
+        if not self.state.has_key(playerID):
+            return 0
+        state = (PLR.playerIsOnline(), PLR.playerGetName())
+        if state == self.state[playerID]:
+            return 0
+        wasShown = self.state[playerID][0]
+        self.state[playerID] = state
+        self.online = None
+        return state[0] or wasShown
+
+    def AddRef(self, ref):
+        if ref.getParentID() != self.folderID or self.dirty:
+            return 0
+        self.IAdd(ref)
+        self.online = None
+        return 1
+
+    def RemoveRef(self, childID, parentID):
+        if parentID != self.folderID or not self.nodeIDs.has_key(childID):
+            return 0
+        playerID = self.nodeIDs[childID]
+        del self.nodeIDs[childID]
+        del self.refs[playerID]
+        del self.state[playerID]
+        self.order.remove(playerID)
+        self.online = None
+        return 1
+
+    def Invalidate(self):
+        self.dirty = 1
+        self.online = None
+
+
+# the sections of the DPL that come from the vault
+gBuddies = DPLSection()
+gNeighbors = DPLSection()
+
+
+def GetOnlineBuddies(folder):
+    return gBuddies.OnlineRefs(folder)
+
+def GetBuddyIDs():
+    "returns the player IDs on the buddy list (as the keys of a dictionary)"
+    buddies = ptVault().getBuddyListFolder()
+    if buddies is None:
+        return {}
+    gBuddies.ISync(buddies)
+    return gBuddies.refs
+
+def GetOnlineNeighbors(folder, localPlayerID):
+    "the local player is a neighbor too, but isn't listed"
+    return gNeighbors.OnlineRefs(folder, localPlayerID)
+
+def InvalidatePlayerList():
+    "forgets everything; the next request walks the folders again"
+    global gIgnoredPlayers
+    gIgnoredPlayers = None
+    gBuddies.Invalidate()
+    gNeighbors.Invalidate()
+
+def OnVaultEvent(event, tupdata):
+    "applies a vault event to the sections; returns true if the player list has to be refreshed"
+    global gIgnoredPlayers
+    if event == PtVaultCallbackTypes.kVaultConnected or event == PtVaultCallbackTypes.kVaultDisconnected:
+        InvalidatePlayerList()
+        return 1
+    if event == PtVaultCallbackTypes.kVaultNodeSaved:
+        # tupdata is ( ptVaultNode )
+        node = tupdata[0]
+        if node.getType() != PtVaultNodeTypes.kPlayerInfoNode:
+            return 0
+        PLR = node.upcastToPlayerInfoNode()
+        changed = gBuddies.UpdatePlayer(PLR)
+        # (don't short-circuit, both sections have to hear about it)
+        changed = gNeighbors.UpdatePlayer(PLR) or changed
+        return changed
+    if event == PtVaultCallbackTypes.kVaultNodeRefAdded:
+        # tupdata is ( ptVaultNodeRef )
+        ref = tupdata[0]
+        if gIgnoreFolderID is not None and ref.getParentID() == gIgnoreFolderID:
+            gIgnoredPlayers = None
+            gBuddies.online = None
+            gNeighbors.online = None
+            return 1
+        changed = gBuddies.AddRef(ref)
+        changed = gNeighbors.AddRef(ref) or changed
+        return changed
+    if event == PtVaultCallbackTypes.kVaultNodeRefRemoved:
+        # tupdata is ( childID, parentID )
+        childID, parentID = tupdata[0], tupdata[1]
+        if gIgnoreFolderID is not None and parentID == gIgnoreFolderID:
+            gIgnoredPlayers = None
+            gBuddies.online = None
+            gNeighbors.online = None
+            return 1
+        changed = gBuddies.RemoveRef(childID, parentID)
+        changed = gNeighbors.RemoveRef(childID, parentID) or changed
+        return changed
+    return 0
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+""" *==LICENSE==*
+
+CyanWorlds.com Engine - MMOG client, server and tools
+Copyright (C) 2011  Cyan Worlds, Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Additional permissions under GNU GPL version 3 section 7
+
+If you modify this Program, or any covered work, by linking or
+combining it with any of RAD Game Tools Bink SDK, Autodesk 3ds Max SDK,
+NVIDIA PhysX SDK, Microsoft DirectX SDK, OpenSSL library, Independent
+JPEG Group JPEG library, Microsoft Windows Media SDK, or Apple QuickTime SDK
+(or a modified version of those libraries),
+containing parts covered by the terms of the Bink SDK EULA, 3ds Max EULA,
+PhysX SDK EULA, DirectX SDK EULA, OpenSSL and SSLeay licenses, IJG
+JPEG Library README, Windows Media SDK EULA, or QuickTime SDK EULA, the
+licensors of this Program grant you additional
+permission to convey the resulting work. Corresponding Source for a
+non-source form of such a combination shall include the source code for
+the parts of OpenSSL and IJG JPEG Library used as well as that of the covered
+work.
+
+You can contact Cyan Worlds, Inc. by email legal@cyan.com
+ or by snail mail at:
+      Cyan Worlds, Inc.
+      14617 N Newport Hwy
+      Mead, WA   99021
+
+ *==LICENSE==* """
+"""
+Module: xLinkBookModel
+Age: global
+Date: October 2026
+What the linking books and the Relto bookshelf need from the vault, worked out once.
+Keeps the age links in the AgesIOwn folder, the child age links of the player's
+neighborhood, the chronicles in the age's AgeData folder, the spawn point pages of
+each treasure book and of the city book, and the page html that follows the first
+panel.  Everything is dropped when the vault tells us a chronicle or age link changed,
+so opening a book again is just a lookup.
+"""
+
+from Plasma import *
+from PlasmaTypes import *
+from PlasmaVaultConstants import *
+import xLinkingBookDefs
+import xChronicleStore
+
+# the city link panels the player has, in the order they were found
+kChronCityLinks = "CityBookLinks"
+xChronicleStore.Declare(kChronCityLinks,xChronicleStore.kChronList,[],0)
+
+# vault nodes that can change what the books show
+kLinkNodeTypes = (PtVaultNodeTypes.kAgeLinkNode, PtVaultNodeTypes.kChronicleNode, PtVaultNodeTypes.kAgeInfoNode, PtVaultNodeTypes.kFolderNode)
+
+gOwnedLinks = None      # [(age filename, link)] in the AgesIOwn folder of this age
+gOwnedLinkDict = None   # age filename -> first link of that age
+gHoodLinks = None       # age filename -> link in the hood's child ages
+gAgeData = None         # name -> chronicle node in this age's AgeData folder
+gPages = {}             # (age, with bookmarks) -> (spawn point names, spawn point titles)
+gCityPages = None       # (city links, (spawn point names, spawn point titles))
+gPageDefs = {}          # the pages after the first -> their book html
+gStats = {'builds' : 0, 'lookups' : 0, 'resets' : 0}
+
+
+def Reset():
+    "forget everything, it will be read from the vault again when it is needed"
+    global gOwnedLinks
+    global gOwnedLinkDict
+    global gHoodLinks
+    global gAgeData
+    global gCityPages
+    gOwnedLinks = None
+    gOwnedLinkDict = None
+    gHoodLinks = None
+    gAgeData = None
+    gCityPages = None
+    gPages.clear()
+    gPageDefs.clear()
+    gStats['resets'] += 1
+
+def GetLinkBookStats():
+    return gStats.copy()
+
+def OnVaultEvent(event, tupdata):
+    "call from the OnVaultEvent and OnAgeVaultEvent of the scripts using the model"
+    if event == PtVaultCallbackTypes.kVaultNodeRefAdded:
+        # tupdata is ( ptVaultNodeRef )
+        child = tupdata[0].getChild()
+        if child is not None and child.getType() not in kLinkNodeTypes:
+            return
+    elif event == PtVaultCallbackTypes.kVaultNodeSaved:
+        # tupdata is ( ptVaultNode )
+        if tupdata[0].getType() not in kLinkNodeTypes:
+            return
+    elif event != PtVaultCallbackTypes.kVaultNodeRefRemoved and \
+         event != PtVaultCallbackTypes.kVaultConnected and event != PtVaultCallbackTypes.kVaultDisconnected:
+        return
+    Reset()
+
+
+def IReadLinks(folder):
+    "returns the [(age filename, link)] in the folder, and whether every age info was there"
+    links = []
+    complete = 1
+    for content in folder.getChildNodeRefList():
+        link = content.getChild()
+        if link is None:
+            complete = 0
+            continue
+        link = link.upcastToAgeLinkNode()
+        if not link:
+            continue
+        info = link.getAgeInfo()
+        if not info:
+            # don't keep a list that is missing this one, it hasn't been downloaded yet
+            complete = 0
+            continue
+        links.append((info.getAgeFilename(), link))
+    gStats['builds'] += 1
+    return (links, complete)
+
+def IFirstOfEach(links):
+    byName = {}
+    for ageName, link in links:
+        if ageName not in byName:
+            byName[ageName] = link
+    return byName
+
+def GetOwnedAgeLinks():
+    "the (age filename, link) of each link in the AgesIOwn folder of this age, or None if there's no folder"
+    global gOwnedLinks
+    global gOwnedLinkDict
+    gStats['lookups'] += 1
+    if gOwnedLinks is not None:
+        return gOwnedLinks
+    folder = ptAgeVault().getAgesIOwnFolder()
+    if type(folder) == type(None):
+        return None
+    links, complete = IReadLinks(folder)
+    if complete:
+        gOwnedLinks = links
+        gOwnedLinkDict = IFirstOfEach(links)
+    return links
+
+def GetOwnedAgeLink(ageName):
+    "the link to ageName in the AgesIOwn folder of this age"
+    links = GetOwnedAgeLinks()
+    if gOwnedLinkDict is not None:
+        return gOwnedLinkDict.get(ageName)
+    for linkAge, link in links or []:
+        if linkAge == ageName:
+            return link
+    return None
+
+def IGetHoodInfo():
+    folder = ptVault().getAgesIOwnFolder()
+    if type(folder) == type(None):
+        return None
+    links, complete = IReadLinks(folder)
+    for ageName, link in links:
+        if ageName == "Neighborhood":
+            return link.getAgeInfo()
+    return None
+
+def GetHoodChildLink(ageName):
+    "the link to ageName in the child ages of the player's neighborhood"
+    global gHoodLinks
+    gStats['lookups'] += 1
+    if gHoodLinks is not None:
+        return gHoodLinks.get(ageName)
+    hoodInfo = IGetHoodInfo()
+    if not hoodInfo:
+        return None
+    childAgeFolder = hoodInfo.getChildAgesFolder()
+    if type(childAgeFolder) == type(None):
+        return None
+    links, complete = IReadLinks(childAgeFolder)
+    byName = IFirstOfEach(links)
+    if complete:
+        gHoodLinks = byName
+    return byName.get(ageName)
+
+def GetAgeDataNode(name):
+    "the chronicle node called name in this age's AgeData folder, or None"
+    global gAgeData
+    gStats['lookups'] += 1
+    if gAgeData is not None:
+        return gAgeData.get(name)
+    chrons = {}
+    # don't keep what we found unless the age info and its AgeData folder have all been downloaded
+    complete = 0
+    gStats['builds'] += 1
+    ageInfoNode = ptAgeVault().getAgeInfo()
+    if ageInfoNode:
+        for ageInfoChildRef in ageInfoNode.getChildNodeRefList():
+            ageInfoChild = ageInfoChildRef.getChild()
+            if ageInfoChild is None:
+                continue
+            folder = ageInfoChild.upcastToFolderNode()
+            if folder and folder.folderGetName() == "AgeData":
+                complete = 1
+                for ageDataChildRef in folder.getChildNodeRefList():
+                    ageDataChild = ageDataChildRef.getChild()
+                    if ageDataChild is None:
+                        complete = 0
+                        continue
+                    chron = ageDataChild.upcastToChronicleNode()
+                    if chron and chron.getName() not in chrons:
+                        chrons[chron.getName()] = chron
+    if complete:
+        gAgeData = chrons
+    return chrons.get(name)
+
+def GetAgeDataChronicle(name):
+    "the value of a chronicle in this age's AgeData folder, or None"
+    # the node is kept rather than its value so our own changes show up straight away
+    chron = GetAgeDataNode(name)
+    if chron:
+        return chron.getValue()
+    return None
+
+
+def IBuildTreasurePages(ageRequested, bookmarks):
+    spawnPoints = None
+    link = GetOwnedAgeLink(ageRequested)
+    if link:
+        spawnPoints = link.getSpawnPoints()
+
+    if ageRequested == "Ahnonay":
+        spawns = GetAgeDataChronicle("AhnonaySpawnPoints")
+        if spawns is not None:
+            spawnPoints = []
+            for spawn in spawns.split(";"):
+                spawnInfo = spawn.split(",")
+                spawnPoints.append(ptSpawnPointInfo(spawnInfo[0], spawnInfo[1]))
+    if spawnPoints is None:
+        spawnPoints = []
+
+    names = {}
+    titles = {}
+    PtDebugPrint("xLinkBookModel.IBuildTreasurePages(): The %s book has the following %s pages: " % (ageRequested, len(spawnPoints)))
+    # assume that we didn't find the original link
+    HasFoundOriginalBook = false
+    for spawnPoint in spawnPoints:
+        if spawnPoint.getTitle() == "Default":
+            HasFoundOriginalBook = true
+            PtDebugPrint("\tPage #1: You've found the original book. The first panel shows %s" % (ageRequested),level=kDebugDumpLevel)
+            # goes in the front of the list
+            names[xLinkingBookDefs.kFirstLinkPanelID] = "LinkInPointDefault"
+            titles[xLinkingBookDefs.kFirstLinkPanelID] = "Default"
+        elif spawnPoint.getTitle() == "JCSavePoint" or spawnPoint.getTitle() == "SCSavePoint":
+            if bookmarks:
+                titles[xLinkingBookDefs.kBookMarkID] = spawnPoint.getTitle()
+                names[xLinkingBookDefs.kBookMarkID] = spawnPoint.getName()
+        else:
+            if HasFoundOriginalBook:
+                page = len(titles) + xLinkingBookDefs.kFirstLinkPanelID
+            else:
+                page = len(titles) + xLinkingBookDefs.kFirstLinkPanelID + 1
+            PtDebugPrint("\tPage #%s: spawnpoint: %s, LinkPanel/Title: %s" % (page,spawnPoint.getName(),spawnPoint.getTitle()))
+            names[page] = spawnPoint.getName()
+            titles[page] = spawnPoint.getTitle()
+    # if we didn't find the default (original) then put the NotPossible link
+    if not HasFoundOriginalBook:
+        if ageRequested == "Neighborhood":
+            PtDebugPrint("\tPage #1: You didn't find the original book, but you're looking at the neighborhood. The first panel shows %s" % (ageRequested))
+            names[xLinkingBookDefs.kFirstLinkPanelID] = "LinkInPointDefault"
+            titles[xLinkingBookDefs.kFirstLinkPanelID] = "Default"
+        else:
+            PtDebugPrint("\tPage #1: You haven't found the original book. The first panel shows black.")
+            names[xLinkingBookDefs.kFirstLinkPanelID] = "NotPossible"
+            titles[xLinkingBookDefs.kFirstLinkPanelID] = "NotPossible"
+    return (names, titles)
+
+def GetTreasurePages(ageRequested, bookmarks=0):
+    "returns (spawn point names, spawn point titles) by page for an age's book"
+    gStats['lookups'] += 1
+    key = (ageRequested, bookmarks)
+    try:
+        names, titles = gPages[key]
+    except KeyError:
+        gStats['builds'] += 1
+        names, titles = gPages[key] = IBuildTreasurePages(ageRequested, bookmarks)
+    # the callers add pages of their own
+    return (names.copy(), titles.copy())
+
+
+def GetCityLinks():
+    return xChronicleStore.Get(kChronCityLinks)
+
+def HasCityLinks():
+    "does the player have any of the city book pages?"
+    for tmpLink in GetCityLinks():
+        if tmpLink in xLinkingBookDefs.CityBookLinks:
+            return 1
+    return 0
+
+def GetCityPages():
+    "returns (spawn point names, spawn point titles) by page for the city book"
+    global gCityPages
+    gStats['lookups'] += 1
+    # Because a player can see only their chron, and not another player's,
+    # a visitor would see their linking pages in the owner's city book.
+    # So for now, visitors will only see the black void in an owner's book.
+    if not ptVault().amOwnerOfCurrentAge():
+        return ({xLinkingBookDefs.kFirstLinkPanelID: "NotPossible"}, {xLinkingBookDefs.kFirstLinkPanelID: "NotPossible"})
+    # the marker machine and the imager add to the chronicle without telling us, so check it
+    CityLinks = tuple(GetCityLinks())
+    if gCityPages is None or gCityPages[0] != CityLinks:
+        gStats['builds'] += 1
+        names = {}
+        titles = {}
+        x = xLinkingBookDefs.kFirstLinkPanelID
+        for tmpLink in CityLinks:
+            if tmpLink in xLinkingBookDefs.CityBookLinks:
+                titles[x] = tmpLink
+                spName = xLinkingBookDefs.xLinkDestinations[tmpLink][1]
+                if spName == "p":
+                    PtDebugPrint("xLinkBookModel.GetCityPages(): shouldn't be a 'p' as the spawnpoint name of %s" % (tmpLink))
+                    names[x] = "LinkInPointDefault"
+                else:
+                    names[x] = spName
+                x += 1
+        gCityPages = (CityLinks, (names, titles))
+    names, titles = gCityPages[1]
+    return (names.copy(), titles.copy())
+
+
+def GetPagesDef(titles):
+    "the book html for the pages after the first one"
+    gStats['lookups'] += 1
+    key = tuple(titles.items())
+    try:
+        return gPageDefs[key]
+    except KeyError:
+        pass
+    gStats['builds'] += 1
+    pagesDef = ""
+    for linkID in titles.keys():
+        if linkID == xLinkingBookDefs.kFirstLinkPanelID or linkID == xLinkingBookDefs.kBookMarkID:
+            continue
+        try:
+            pagedef = xLinkingBookDefs.xLinkingPages[titles[linkID]]
+            # pages are not sharable at the moment, not sure if they ever will
+            try:
+                pagesDef += pagedef % (linkID)
+            except:
+                PtDebugPrint("xLinkBookModel: Treasure page %s's book definition doesn't look like a page???" % (titles[linkID]),level=kErrorLevel)
+        except LookupError:
+            PtDebugPrint("xLinkBookModel: could not find treasure book page %s's linking panel" % (titles[linkID]),level=kErrorLevel)
+    gPageDefs[key] = pagesDef
+    return pagesDef
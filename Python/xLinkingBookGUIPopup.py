@@ -67,6 +67,8 @@ import xLinkingBookDefs
 from xPsnlVaultSDL import *
 import time
 import xVisitorUtils
+import xChronicleStore
+import xLinkBookModel
 
 
 # define the attributes that will be entered in max
@@ -109,6 +111,8 @@ kFirstPersonEnableTime = 0.5
 
 pelletCaveGUID = None
 
+kChronCityLinks = xLinkBookModel.kChronCityLinks
+
 
 class xLinkingBookGUIPopup(ptModifier):
     "The Linking Book GUI Popup python code"
@@ -125,6 +129,8 @@ class xLinkingBookGUIPopup(ptModifier):
 
 
     def OnServerInitComplete(self):
+        # the model may still hold the books of the last age we were in
+        xLinkBookModel.Reset()
         # only in the personal age should actBookshelf be anything, so this should only happen in the personal age
         if len(actBookshelf.value) != 0:
             ageSDL = PtGetAgeSDL()
@@ -137,6 +143,14 @@ class xLinkingBookGUIPopup(ptModifier):
         PtUnloadDialog(xVisitorUtils.kVisitorNagDialog)
 
 
+    def OnVaultEvent(self,event,tupdata):
+        xLinkBookModel.OnVaultEvent(event,tupdata)
+
+
+    def OnAgeVaultEvent(self,event,tupdata):
+        xLinkBookModel.OnVaultEvent(event,tupdata)
+
+
     def OnNotify(self,state,id,events):
         global OfferedBookMode
         global BookOfferer
@@ -627,18 +641,7 @@ class xLinkingBookGUIPopup(ptModifier):
             # build the rest of the pages into the book
             #linkID = xLinkingBookDefs.kFirstLinkPanelID + 1
             if agePanel != "CleftWithTomahna":
-                for linkID in SpawnPointTitle_Dict.keys():
-                    if linkID == xLinkingBookDefs.kFirstLinkPanelID or linkID == xLinkingBookDefs.kBookMarkID:
-                        continue
-                    try:
-                        pagedef = xLinkingBookDefs.xLinkingPages[SpawnPointTitle_Dict[linkID]]
-                        # pages are not sharable at the moment, not sure if they ever will
-                        try:
-                            allPagesDef += pagedef % (linkID)
-                        except:
-                            PtDebugPrint("xLinkingBookGUIPopup: Treasure page %s's book definition doesn't look like a page???" % (SpawnPointTitle_Dict[linkID]),level=kErrorLevel)
-                    except LookupError:
-                        PtDebugPrint("xLinkingBookGUIPopup: could not find treasure book page %s's linking panel" % (SpawnPointTitle_Dict[linkID]),level=kErrorLevel)
+                allPagesDef += xLinkBookModel.GetPagesDef(SpawnPointTitle_Dict)
                     
             if allPagesDef != "":
                 print allPagesDef
@@ -662,126 +665,30 @@ class xLinkingBookGUIPopup(ptModifier):
             PtDebugPrint("xLinkingBookGUIPopup: no age link panel" % (agePanel),level=kErrorLevel)
 
 
-    def IGetHoodLinkNode(self):
-        vault = ptVault()
-        folder = vault.getAgesIOwnFolder()
-        contents = folder.getChildNodeRefList()
-        for content in contents:
-            link = content.getChild()
-            link = link.upcastToAgeLinkNode()
-            if type(link) != type(None):
-                info = link.getAgeInfo()
-            if not info: continue
-            ageName = info.getAgeFilename()
-            if ageName == "Neighborhood":
-                return link
-        return None
-
-
-    def IGetHoodInfoNode(self):
-        link = self.IGetHoodLinkNode()
-        if type(link) == type(None):
-            return None
-        info = link.getAgeInfo()
-        return info
-
-
     def BuildCityBook(self):
         global SpawnPointTitle_Dict
         global SpawnPointName_Dict
         global CurrentPage
 
-        SpawnPointTitle_Dict = {}
-        SpawnPointName_Dict = {}
-        
-        # This section is neccessary because of the chronicle hack.
-        # Because a player can see only their chron, and not another player's,
-        # a visitor would see their linking pages in the owner's city book.
-        # So for now, visitors will only see the black void in an owner's book.
-        if not ptVault().amOwnerOfCurrentAge():
-            SpawnPointName_Dict[xLinkingBookDefs.kFirstLinkPanelID] = "NotPossible"
-            SpawnPointTitle_Dict[xLinkingBookDefs.kFirstLinkPanelID] = "NotPossible"
-            CurrentPage = 1
-            return
-        
-        # citybook links have been changed to Hood childages, so we search there now
-        #vault = ptAgeVault()
-        #OwnedAges = vault.getAgesIOwnFolder().getChildNodeRefList()
-        childAgeFolder = self.IGetHoodInfoNode().getChildAgesFolder()
-        HoodChildAges = childAgeFolder.getChildNodeRefList()
-        spawnPoints = []
-
-        CityLinks = self.IGetCityLinksChron()
-        for tmpLink in CityLinks:
-            if tmpLink in xLinkingBookDefs.CityBookLinks:
-                spName = tmpLink
-                spTitle = xLinkingBookDefs.xLinkDestinations[tmpLink][1]
-                tmpSp = ptSpawnPointInfo(spName, spTitle)
-                spawnPoints.append(tmpSp)
-
-        for NodeRef in HoodChildAges:
-            tmpLink = NodeRef.getChild().upcastToAgeLinkNode()
-            if tmpLink:
-                linkAge = tmpLink.getAgeInfo().getAgeFilename()
-                print "BuildCityBook():  linkAge = ",linkAge
-                sps = tmpLink.getSpawnPoints()
-                for sp in sps:
-                    print "before, sp title = ",sp.getTitle()
-                    print "before, sp name = ",sp.getName()
-
-#                if linkAge == "city" or linkAge == "Descent":
-#                    spawnPoints.extend(tmpLink.getSpawnPoints())
-#                elif linkAge == "GreatZero":
-#                    sps = tmpLink.getSpawnPoints()
-#                    for sp in sps:
-#                        if sp.getTitle() == "grtzGrtZeroLinkRm":
-#                            spawnPoints.append(sp)
-#                            break
-#                elif linkAge == "BaronCityOffice":
-#                    bcosp = ptSpawnPointInfo("BaronCityOffice", "LinkInPointDefault")
-#                    spawnPoints.append(bcosp)
-#                elif linkAge == "spyroom":
-#                    spysp = ptSpawnPointInfo("Spyroom", "LinkInPointDefault")
-#                    spawnPoints.append(spysp)
-
-        x = xLinkingBookDefs.kFirstLinkPanelID
-        for sp in spawnPoints:
-            print "after, sp title = ",sp.getTitle()
-            print "after, sp name = ",sp.getName()
-            if sp.getTitle() in xLinkingBookDefs.CityBookLinks:
-                SpawnPointTitle_Dict[x] = sp.getTitle()
-                if sp.getName() == "p":
-                    print "shouldn't be a 'p' as the spawnpoint name"
-                    SpawnPointName_Dict[x] = "LinkInPointDefault"
-                else:
-                    SpawnPointName_Dict[x] = sp.getName()
-                x += 1
-
+        SpawnPointName_Dict, SpawnPointTitle_Dict = xLinkBookModel.GetCityPages()
         if CurrentPage > len(SpawnPointName_Dict.keys()):
             CurrentPage = 1
 
 
     def IDoCityLinksChron(self,agePanel):
-        CityLinks = []
-        vault = ptVault()
-        entryCityLinks = vault.findChronicleEntry("CityBookLinks")
-        if type(entryCityLinks) != type(None):
-            valCityLinks = entryCityLinks.chronicleGetValue()
-            print "valCityLinks = ",valCityLinks
-            CityLinks = valCityLinks.split(",")
+        if xChronicleStore.Has(kChronCityLinks):
+            CityLinks = xChronicleStore.Get(kChronCityLinks)
             print "CityLinks = ",CityLinks
             if agePanel not in CityLinks:
-                NewLinks = valCityLinks + "," + agePanel
-                entryCityLinks.chronicleSetValue(NewLinks)
-                entryCityLinks.save()
+                CityLinks.append(agePanel)
+                # the marker machine and the imager add to it without the store
+                xChronicleStore.Set(kChronCityLinks,CityLinks,now=1)
                 print "xLinkingBookGUIPopup.IDoCityLinksChron():  setting citylinks chron entry to include: ",agePanel
-                valCityLinks = entryCityLinks.chronicleGetValue()
-                CityLinks = valCityLinks.split(",")
                 print "xLinkingBookGUIPopup.IDoCityLinksChron():  citylinks now = ",CityLinks
             else:
                 print "xLinkingBookGUIPopup.IDoCityLinksChron():  do nothing, citylinks chron already contains: ",agePanel
         else:
-            vault.addChronicleEntry("CityBookLinks",0,agePanel)
+            xChronicleStore.Set(kChronCityLinks,[agePanel],now=1)
             print "xLinkingBookGUIPopup.IDoCityLinksChron():  creating citylinks chron entry and adding: ",agePanel
         
         psnlSDL = xPsnlVaultSDL()
@@ -792,13 +699,8 @@ class xLinkingBookGUIPopup(ptModifier):
 
 
     def IGetCityLinksChron(self):
-        CityLinks = []
-        vault = ptVault()
-        entryCityLinks = vault.findChronicleEntry("CityBookLinks")
-        if type(entryCityLinks) != type(None):
-            valCityLinks = entryCityLinks.chronicleGetValue()
-            print "xLinkingBookGUIPopup.IGetCityLinksChron(): valCityLinks = ",valCityLinks
-            CityLinks = valCityLinks.split(",")
+        CityLinks = xChronicleStore.Get(kChronCityLinks)
+        print "xLinkingBookGUIPopup.IGetCityLinksChron(): CityLinks = ",CityLinks
         return CityLinks	
 
 
@@ -846,79 +748,8 @@ class xLinkingBookGUIPopup(ptModifier):
         global SpawnPointTitle_Dict
         global CurrentPage
         
-        # Step 1: Find this age's spawnPoints
-        vault = ptAgeVault()
-        OwnedAges = vault.getAgesIOwnFolder().getChildNodeRefList()
-        spawnPoints = None
-        for NodeRef in OwnedAges:
-            tmpLink = NodeRef.getChild().upcastToAgeLinkNode()
-            if tmpLink:
-                # make sure Micah doesn't try to break it by not waiting for the AgeInfo to be downloaded
-                if type(tmpLink.getAgeInfo()) != type(None):
-                    if ageRequested == tmpLink.getAgeInfo().getAgeFilename():
-                        spawnPoints = tmpLink.getSpawnPoints()
-                        break
-
-        if ageRequested == "Ahnonay":
-            ageVault = ptAgeVault()
-            ageInfoNode = ageVault.getAgeInfo()
-            ageInfoChildren = ageInfoNode.getChildNodeRefList()
-            for ageInfoChildRef in ageInfoChildren:
-                ageInfoChild = ageInfoChildRef.getChild()
-                folder = ageInfoChild.upcastToFolderNode()
-                if folder and folder.folderGetName() == "AgeData":
-                    ageDataChildren = folder.getChildNodeRefList()
-                    for ageDataChildRef in ageDataChildren:
-                        ageDataChild = ageDataChildRef.getChild()
-                        chron = ageDataChild.upcastToChronicleNode()
-                        if chron and chron.getName() == "AhnonaySpawnPoints":
-                            spawns = chron.getValue().split(";")
-                            spawnPoints = []
-                            for spawn in spawns:
-                                spawnInfo = spawn.split(",")
-                                spawnPointInfo = ptSpawnPointInfo(spawnInfo[0], spawnInfo[1])
-                                spawnPoints.append(spawnPointInfo)
-                            break
-
-        SpawnPointName_Dict = {}
-        SpawnPointTitle_Dict = {}
-        PtDebugPrint ("xLinkingBookGUI.BuildTreasureLinks():The %s book has the following %s pages: " % (ageRequested, len(spawnPoints)))
-        # assume that we didn't find the original link
-        HasFoundOriginalBook = false
-        # Step 2: Determine what other links they have to this age.
-        for spawnPoint in spawnPoints:
-            #toss this is it's the "default" link. We've already processed that in step #1 above
-            if spawnPoint.getTitle() == "Default": 
-                HasFoundOriginalBook = true
-                PtDebugPrint("\tPage #1: You've found the original book. The first panel shows %s" % (ageRequested),level=kDebugDumpLevel)
-                # goes in the front of the list
-                SpawnPointName_Dict[xLinkingBookDefs.kFirstLinkPanelID] = "LinkInPointDefault"
-                SpawnPointTitle_Dict[xLinkingBookDefs.kFirstLinkPanelID] = "Default"
-            elif spawnPoint.getTitle() == "JCSavePoint" or spawnPoint.getTitle() == "SCSavePoint":
-                if len(actBookshelf.value) > 0:
-                    SpawnPointTitle_Dict[xLinkingBookDefs.kBookMarkID] = spawnPoint.getTitle()
-                    SpawnPointName_Dict[xLinkingBookDefs.kBookMarkID] = spawnPoint.getName()
-            else:
-                if HasFoundOriginalBook:
-                    page = len(SpawnPointTitle_Dict) + xLinkingBookDefs.kFirstLinkPanelID
-                else:
-                    page = len(SpawnPointTitle_Dict) + xLinkingBookDefs.kFirstLinkPanelID + 1
-                    
-                PtDebugPrint("\tPage #%s: spawnpoint: %s, LinkPanel/Title: %s" % (page,spawnPoint.getName(),spawnPoint.getTitle()))
-                SpawnPointName_Dict[page] = spawnPoint.getName()
-                SpawnPointTitle_Dict[page] = spawnPoint.getTitle()
-        # if we didn't find the default (original) then put the NotPossible link
-        print "HasFoundOriginalBook = ",HasFoundOriginalBook
-        if not HasFoundOriginalBook:
-            if ageRequested == "Neighborhood":
-                PtDebugPrint("\tPage #1: You didn't find the original book, but you're looking at the neighborhood. The first panel shows %s" % (ageRequested))
-                # goes in the front of the list
-                SpawnPointName_Dict[xLinkingBookDefs.kFirstLinkPanelID] = "LinkInPointDefault"
-                SpawnPointTitle_Dict[xLinkingBookDefs.kFirstLinkPanelID] = "Default"
-            else:
-                PtDebugPrint("\tPage #1: You haven't found the original book. The first panel shows black.")
-                SpawnPointName_Dict[xLinkingBookDefs.kFirstLinkPanelID] = "NotPossible"
-                SpawnPointTitle_Dict[xLinkingBookDefs.kFirstLinkPanelID] = "NotPossible"
+        # the bookmark pages are only used by the Relto bookshelf
+        SpawnPointName_Dict, SpawnPointTitle_Dict = xLinkBookModel.GetTreasurePages(ageRequested, len(actBookshelf.value) > 0)
 
         if CurrentPage > len(SpawnPointName_Dict.keys()):
             CurrentPage = 1
@@ -985,20 +816,8 @@ class xLinkingBookGUIPopup(ptModifier):
 
 
     def GetOwnedAgeLink(self, vault, age):
-        PAL = vault.getAgesIOwnFolder()
-        if type(PAL) != type(None):
-            contents = PAL.getChildNodeRefList()
-            for content in contents:
-                link = content.getChild().upcastToAgeLinkNode()
-                info = link.getAgeInfo()
-                if not info:
-                    continue
-                ageName = info.getAgeFilename()
-                #print "found %s, looking for %s" % (ageName, age)
-                if ageName == age:
-                    return link
-
-        return None
+        # only this age's AgesIOwn folder is ever asked for
+        return xLinkBookModel.GetOwnedAgeLink(age)
 
 
     def DoErcanaAndAhnonayStuff(self):
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+""" *==LICENSE==*
+
+CyanWorlds.com Engine - MMOG client, server and tools
+Copyright (C) 2011  Cyan Worlds, Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Additional permissions under GNU GPL version 3 section 7
+
+If you modify this Program, or any covered work, by linking or
+combining it with any of RAD Game Tools Bink SDK, Autodesk 3ds Max SDK,
+NVIDIA PhysX SDK, Microsoft DirectX SDK, OpenSSL library, Independent
+JPEG Group JPEG library, Microsoft Windows Media SDK, or Apple QuickTime SDK
+(or a modified version of those libraries),
+containing parts covered by the terms of the Bink SDK EULA, 3ds Max EULA,
+PhysX SDK EULA, DirectX SDK EULA, OpenSSL and SSLeay licenses, IJG
+JPEG Library README, Windows Media SDK EULA, or QuickTime SDK EULA, the
+licensors of this Program grant you additional
+permission to convey the resulting work. Corresponding Source for a
+non-source form of such a combination shall include the source code for
+the parts of OpenSSL and IJG JPEG Library used as well as that of the covered
+work.
+
+You can contact Cyan Worlds, Inc. by email legal@cyan.com
+ or by snail mail at:
+      Cyan Worlds, Inc.
+      14617 N Newport Hwy
+      Mead, WA   99021
+
+ *==LICENSE==* """
+"""
+Module: xLocCache
+Age: global
+Date: October 2026
+Remembers localized strings and age display names for the current language.
+Strings without arguments are looked up in the localization manager once; strings
+with arguments have their text split up once at the %1s, %2s... markers and are then
+filled in here.  The age name helpers keep their results keyed by the names they
+were given.  Everything is thrown away when the language changes (or when
+InvalidateLocCache is called); GetLocCacheStats reports how well the caches do.
+"""
+
+import re
+from Plasma import *
+from PlasmaTypes import *
+
+kArgMarker = re.compile(r"%(\d+)s")
+
+gLanguage = None
+gStrings = {}       # key -> localized string
+gTemplates = {}     # key -> list of text and argument numbers, or None if it can't be filled in here
+gAgeNames = {}      # (helper,name...) -> age display name
+gStats = {}         # cache name -> [hits,misses]
+
+
+def ICheckLanguage():
+    global gLanguage
+    language = PtGetLanguage()
+    if language != gLanguage:
+        InvalidateLocCache()
+        gLanguage = language
+
+def ICount(cache,hit):
+    counts = gStats.get(cache)
+    if counts is None:
+        counts = gStats[cache] = [0,0]
+    counts[not hit] += 1
+
+def ICompileTemplate(text):
+    "split text at its argument markers, None if it has stray %'s"
+    parts = []
+    pos = 0
+    for match in kArgMarker.finditer(text):
+        if text.find(U"%",pos,match.start()) != -1:
+            return None
+        if match.start() > pos:
+            parts.append(text[pos:match.start()])
+        parts.append(int(match.group(1))-1)
+        pos = match.end()
+    if text.find(U"%",pos) != -1:
+        return None
+    if pos < len(text):
+        parts.append(text[pos:])
+    return parts
+
+def IFillTemplate(parts,arguments):
+    text = []
+    for part in parts:
+        if isinstance(part,int):
+            if part < 0 or part >= len(arguments):
+                return None
+            arg = arguments[part]
+            try:
+                arg = unicode(arg)
+            except:
+                pass
+            text.append(arg)
+        else:
+            text.append(part)
+    return U"".join(text)
+
+def GetLocalizedString(name,arguments=None):
+    "same as PtGetLocalizedString, but remembered for the current language"
+    ICheckLanguage()
+    if not arguments:
+        text = gStrings.get(name)
+        ICount("strings",text is not None)
+        if text is None:
+            text = gStrings[name] = PtGetLocalizedString(name)
+        return text
+    if gTemplates.has_key(name):
+        parts = gTemplates[name]
+        ICount("templates",1)
+    else:
+        text = gStrings.get(name)
+        if text is None:
+            text = gStrings[name] = PtGetLocalizedString(name)
+        parts = None
+        if type(text) != type(None):
+            parts = ICompileTemplate(text)
+        gTemplates[name] = parts
+        ICount("templates",0)
+    if parts is not None:
+        text = IFillTemplate(parts,arguments)
+        if text is not None:
+            return text
+    return PtGetLocalizedString(name,arguments)
+
+def GetAgeName(helper,key,compute,*args):
+    "returns compute(*args), remembered by helper and key (the caller leaves out names that depend on more than key)"
+    ICheckLanguage()
+    cacheKey = (helper,key)
+    name = gAgeNames.get(cacheKey)
+    ICount(helper,name is not None)
+    if name is None:
+        name = gAgeNames[cacheKey] = compute(*args)
+    return name
+
+def InvalidateLocCache():
+    "forget all the remembered strings and names"
+    gStrings.clear()
+    gTemplates.clear()
+    gAgeNames.clear()
+
+def GetLocCacheStats():
+    "returns {cache name: (hits,misses,hit rate)}"
+    stats = {}
+    for cache, (hits,misses) in gStats.items():
+        total = hits + misses
+        rate = 0.0
+        if total:
+            rate = float(hits) / total
+        stats[cache] = (hits,misses,rate)
+    return stats
@@ -42,6 +42,7 @@ You can contact Cyan Worlds, Inc. by email legal@cyan.com
  *==LICENSE==* """
 from Plasma import *
 from PlasmaVaultConstants import *
+import xLocCache
 
 xFolderIDToFolderName = {
     PtVaultStandardNodes.kUserDefinedNode:          PtGetLocalizedString("Global.FolderNames.UserDefined"),
@@ -112,6 +113,12 @@ def SafeEncode(text):
 
 def LocalizeAgeName(displayName):
     "Returns a localized version of the age display name you give it"
+    if displayName == "D'ni-Rudenna":
+        # depends on the pole states
+        return ILocalizeAgeName(displayName)
+    return xLocCache.GetAgeName("LocalizeAgeName",displayName,ILocalizeAgeName,displayName)
+
+def ILocalizeAgeName(displayName):
     localizedName = displayName
 #    localizedName = localizedName + unichr(200)   #Tye: Remove me!!!!
 
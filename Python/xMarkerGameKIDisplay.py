@@ -134,26 +134,18 @@ class xMarkerGameKIDisplay:
     def registerMarker(self, msg):
         "received register marker message from the game server, and show the marker if we're editing"
         #Save the marker
-        marker = MarkerData()
-        marker.data['x']    = msg.x()
-        marker.data['y']    = msg.y()
-        marker.data['z']    = msg.z()
-        marker.data['id']   = msg.markerId()
-        marker.data['name'] = msg.name()
-        marker.data['age']  = msg.age()
-
-        self.gameData.data['markers'].append(marker)
+        markers = self.gameData.data['markers']
+        marker = markers.add(msg.markerId(), msg.x(), msg.y(), msg.z(), msg.name(), msg.age())
         self.gameData.data['numMarkers'] += 1
         PtDebugPrint("DEBUG: xMarkerGameKIDisplay():\tRegistered Marker: %s" %marker)
 
         #Show the marker if necessary
         if self.showMarkers:
             mrkrDisplay = ptMarkerMgr()
-            ageName = PtGetAgeInfo().getAgeFilename()
             #Only add markers that exist within this age (only a concern for quest games)
-            if marker.data['age'].lower() != unicode(ageName).lower():
+            if markers.ageKey(marker.age) != markers.ageKey(PtGetAgeInfo().getAgeFilename()):
                 return
-            mrkrDisplay.addMarker(marker.data['x'], marker.data['y'], marker.data['z'], marker.data['id'], 0)
+            mrkrDisplay.addMarker(marker.x, marker.y, marker.z, marker.id, 0)
 
     def registerMarkerCaptured(self, msg):
         "received a marker captured message from the game server, update our marker count"
@@ -161,11 +153,7 @@ class xMarkerGameKIDisplay:
         mrkrDisplay = ptMarkerMgr()
 
         mrkrDisplay.captureQuestMarker(markerID,1)
-        for marker in self.gameData.data['markers']:
-            marker = marker.data
-            if marker['id'] == markerID:
-                marker['captured'] = 1
-                break
+        self.gameData.data['markers'].capture(markerID)
         self.gameData.data['numCapturedMarkers'] += 1
 
     def registerGameName(self, msg):
@@ -193,26 +181,18 @@ class xMarkerGameKIDisplay:
         markerDisplay.removeMarker(markerID)
 
         #remove the marker from the internal marker list
-        i = 0
-        for x in self.gameData.data['markers']:
-            if x.data['id'] == markerID:
-                del self.gameData.data['markers'][i]
-                self.selectedMarker = -1
-                self.gameData.data['numMarkers'] -= 1
-                PtDebugPrint("DEBUG: xMarkerGameKIDisplay.registerDeleteMarker():\tFound and deleted markerID: %s." %markerID)
-                break
-            i += 1
+        if self.gameData.data['markers'].remove(markerID):
+            self.selectedMarker = -1
+            self.gameData.data['numMarkers'] -= 1
+            PtDebugPrint("DEBUG: xMarkerGameKIDisplay.registerDeleteMarker():\tFound and deleted markerID: %s." %markerID)
 
     def registerMarkerNameChanged(self, msg):
         "received a marker name changed message from the server, need to process it!"
         markerID = msg.markerId()
         #Update the marker data
-        for marker in self.gameData.data['markers']:
-            data = marker.data
-            #Only add markers that exist within this age (only a concern for quest games)
-            if data['id'] == markerID:
-                data['name'] = msg.name()
-                return
+        marker = self.gameData.data['markers'].find(markerID)
+        if marker is not None:
+            marker.name = msg.name()
             
 
     def registerResetGame(self, msg):
@@ -221,10 +201,7 @@ class xMarkerGameKIDisplay:
         self.gameData.data['numCapturedMarkers'] = 0
         
         #Reset Markers
-        for marker in self.gameData.data['markers']:
-            marker = marker.data
-            if marker['captured']:
-                marker['captured'] = 0
+        self.gameData.data['markers'].resetCaptured()
 
         PtDebugPrint("DEBUG: xMarkerGameKIDisplay.registerResetGame():\tResetting KI Marker Display's game progress...")
         
@@ -255,15 +232,10 @@ class xMarkerGameKIDisplay:
         mrkrDisplay.removeAllMarkers()
         PtDebugPrint("DEBUG: xMarkerGameKIDisplay.editMarkers():\tEntering Edit Mode: Displaying all markers")
 
-        ageName = unicode(PtGetAgeInfo().getAgeFilename()).lower()
-       
         #Update the marker display manager
-        for marker in self.gameData.data['markers']:
-            data = marker.data
-            #Only add markers that exist within this age (only a concern for quest games)
-            if data['age'].lower() != ageName:
-                return
-            mrkrDisplay.addMarker(data['x'], data['y'], data['z'], data['id'], 0)
+        #Only add markers that exist within this age (only a concern for quest games)
+        for marker in self.gameData.data['markers'].inAge(PtGetAgeInfo().getAgeFilename()):
+            mrkrDisplay.addMarker(marker.x, marker.y, marker.z, marker.id, 0)
 
     def exitEditMarkers(self):
         "exits the edit mode"
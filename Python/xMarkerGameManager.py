@@ -97,6 +97,8 @@ class MarkerGameManager:
 
         self.queuedGame = -1
         self.clientUpdatedMarker = 0
+        #The manager is re-created for every age, so the age we're in is only looked up once
+        self.ageName = None
 
         #Now that we've got the player's data loaded, we had better start any previously played games....
         if self.gameData.data['svrGameTemplateID'] != self.gameData.default['svrGameTemplateID']:
@@ -110,18 +112,7 @@ class MarkerGameManager:
                 if existingGame:
                     PtDebugPrint("DEBUG: __init__: Game already loaded, loading markers and starting the game!")
                     #we've already loaded the game, now, after we register the markers, we just start playing!
-                    mrkrDisplay = ptMarkerMgr()
-                    mrkrDisplay.removeAllMarkers()
-                    
-                    ageName = unicode(PtGetAgeInfo().getAgeFilename()).lower()
-                    for marker in self.gameData.data['markers']:
-                        data = marker.data
-                        #Only add markers that exist within this age (only a concern for quest games)
-                        if data['age'].lower() != ageName:
-                            continue
-                        if data['captured'] == 0:
-                            mrkrDisplay.addMarker(data['x'], data['y'], data['z'], data['id'], data['captured'])
-
+                    self.ShowAgeMarkers()
                     self.StartGame()
                 else:
                     #Need to load the game's marker states from the server, we'll just re-instanciate a game to intiate the process
@@ -271,8 +262,13 @@ class MarkerGameManager:
             #Store the Game Client ID
             self.gameData.data['isPlayerJoined'] = 1
             self.SaveGameClientID(msg.getGameCli().gameID())
-            self.gameData.save()
-            self.StartGame()
+            #StartGame may save again, write it all to the chronicle once
+            BeginGameDataBatch()
+            try:
+                self.gameData.save()
+                self.StartGame()
+            finally:
+                EndGameDataBatch()
 
 
     def registerTemplateCreated(self, msg):
@@ -284,8 +280,12 @@ class MarkerGameManager:
         self.isNewGame = 1
         #Store the Game Client ID
         self.SaveGameClientID(msg.getGameCli().gameID())
-        self.gameData.save()
-        self.StartGame()
+        BeginGameDataBatch()
+        try:
+            self.gameData.save()
+            self.StartGame()
+        finally:
+            EndGameDataBatch()
 
 
     def registerGameType(self, msg):
@@ -294,8 +294,12 @@ class MarkerGameManager:
         PtDebugPrint("DEBUG: xMarkerGameManager.registerGameType(): Received Game type Message for game type: %s" %msg.gameType())
         #Store the Game Client ID
         self.SaveGameClientID(msg.getGameCli().gameID())
-        self.gameData.save()
-        self.StartGame()
+        BeginGameDataBatch()
+        try:
+            self.gameData.save()
+            self.StartGame()
+        finally:
+            EndGameDataBatch()
 
 
     def registerMarkerGameOver(self, msg):
@@ -308,8 +312,6 @@ class MarkerGameManager:
 
     def registerMarker(self, msg):
         "received register marker message from the game server, display the marker if we're in the same age"
-        ageName = PtGetAgeInfo().getAgeFilename()
-
         x = msg.x()
         y = msg.y()
         z = msg.z()
@@ -318,19 +320,12 @@ class MarkerGameManager:
         #Create local marker storage as we may need to display the data....
         #Note: Markers are not "saved" in the chronicle as they reside on the mini-game server.
         #      Thus there is no: self.gameData.save() here...
-        marker = MarkerData()
-        marker.data['x']    = x
-        marker.data['y']    = y
-        marker.data['z']    = z
-        marker.data['id']   = id
-        marker.data['name'] = msg.name()
-        marker.data['age']  = msg.age()
-
-        self.gameData.data['markers'].append(marker)
+        markers = self.gameData.data['markers']
+        marker = markers.add(id, x, y, z, msg.name(), msg.age())
         self.gameData.data['numMarkers'] += 1
         PtDebugPrint("DEBUG: xMarkerGameManager():\tRegistered Marker: %s" %marker)
 
-        if msg.age().lower() != unicode(ageName).lower():
+        if markers.ageKey(marker.age) != self.GetAgeName():
             #PtDebugPrint("DEBUG: xMarkerGameManager.registerMarker():\tMarker exists in a different age, bypassing marker manager display update")
             PtDebugPrint("****> Register Marker #%s: (%s,%s,%s), ageName = %s\t\thidden, wrong age" %(id,x,y,z,msg.age()))
             #~print "\t\tCurrent Age: %s" %ageName
@@ -368,22 +363,17 @@ class MarkerGameManager:
                 except:
                     PtDebugPrint("ERROR: xMarkerGameManager.captureMarker():\tCould not get data for CGZ marker captured message!")
         else:
+            #TODO: eventually this will need to be different for Hold games as they change colors...
+            #Quest game: Hide the marker....
             mrkrDisplay.captureQuestMarker(markerID,1)
-            for marker in self.gameData.data['markers']:
-                marker = marker.data
-                if marker['id'] == markerID:
-                    marker['captured'] = 1
-                    if self.clientUpdatedMarker:
-                        self.clientUpdatedMarker -= 1
-                        output = "Found marker: '%s'" %marker['name']
-                        PtSendKIMessage(kKILocalChatStatusMsg, output)
-                        #check for completion of game...
-                        if self.gameData.data['numCapturedMarkers'] >= self.gameData.data['numMarkers']:
-                            PtSendKIMessage(kKILocalChatStatusMsg, PtGetLocalizedString("KI.MarkerGame.FinishedGame", [self.gameData.data['svrGameName']]))
-                    #TODO: eventually this will need to be different for Hold games as they change colors...
-                    #Quest game: Hide the marker....
-                    mrkrDisplay.captureQuestMarker(markerID,1)                        
-                    break
+            marker = self.gameData.data['markers'].capture(markerID)
+            if marker is not None and self.clientUpdatedMarker:
+                self.clientUpdatedMarker -= 1
+                output = "Found marker: '%s'" %marker.name
+                PtSendKIMessage(kKILocalChatStatusMsg, output)
+                #check for completion of game...
+                if self.gameData.data['numCapturedMarkers'] >= self.gameData.data['numMarkers']:
+                    PtSendKIMessage(kKILocalChatStatusMsg, PtGetLocalizedString("KI.MarkerGame.FinishedGame", [self.gameData.data['svrGameName']]))
 
         #Setup the KI display
         self.UpdateKIMarkerDisplay()
@@ -392,36 +382,44 @@ class MarkerGameManager:
     def registerDeleteGame(self, msg):
         "received a delete game message from the server; make sure to update our internal data"
         PtDebugPrint("DEBUG: xMarkerGameManager.registerDeleteGame():\t---Received Delete Game message, resetting game data---")
-        #Reset game data
-        self.gameData.initDefaultValues()
-        self.gameData.save()
+        #Reset game data (a queued game saves its own settings right after, so write them together)
+        BeginGameDataBatch()
+        try:
+            self.gameData.initDefaultValues()
+            self.gameData.save()
 
-        # Reset KI's Marker Display
-        self.UpdateKIMarkerDisplay()
+            # Reset KI's Marker Display
+            self.UpdateKIMarkerDisplay()
 
-        # Delete all markers from the Marker Manager Display
-        mrkrDisplay = ptMarkerMgr()
-        mrkrDisplay.removeAllMarkers()
-        self.isNewGame = 0
+            # Delete all markers from the Marker Manager Display
+            mrkrDisplay = ptMarkerMgr()
+            mrkrDisplay.removeAllMarkers()
+            self.isNewGame = 0
 
-        #Start any queued game
-        if self.queuedGame > -1:
-            PtDebugPrint("DEBUG: xMarkerGameManager.registerDeleteGame():\t---Starting Queued game: %s---"%self.queuedGame)
-            #TODO: setup for user created marker games...
-            self.createCGZMarkerGame(self.queuedGame)
-            self.queuedGame = -1
+            #Start any queued game
+            if self.queuedGame > -1:
+                PtDebugPrint("DEBUG: xMarkerGameManager.registerDeleteGame():\t---Starting Queued game: %s---"%self.queuedGame)
+                #TODO: setup for user created marker games...
+                self.createCGZMarkerGame(self.queuedGame)
+                self.queuedGame = -1
+        finally:
+            EndGameDataBatch()
 
     def registerGameName(self, msg):
         "Saves the game name as dictated by the server"
-        #save the name
-        self.gameData.data['svrGameName'] = msg.name()
-        self.gameData.save()
-        PtDebugPrint("DEBUG: xMarkerGameManager.registerMarkerGameName():\tChange game name to: %s" % msg.name())
+        BeginGameDataBatch()
+        try:
+            #save the name
+            self.gameData.data['svrGameName'] = msg.name()
+            self.gameData.save()
+            PtDebugPrint("DEBUG: xMarkerGameManager.registerMarkerGameName():\tChange game name to: %s" % msg.name())
 
-        #Store the Game Client ID
-        self.SaveGameClientID(msg.getGameCli().gameID())
-        self.gameData.save()
-        self.StartGame()      
+            #Store the Game Client ID
+            self.SaveGameClientID(msg.getGameCli().gameID())
+            self.gameData.save()
+            self.StartGame()
+        finally:
+            EndGameDataBatch()
 
     def registerPauseGame(self, msg):
         "pauses the current game"
@@ -466,6 +464,21 @@ class MarkerGameManager:
             PtDebugPrint("DEBUG: xMarkerGameManager.SaveGameClientID():\tRegistering game client ID: %s" % id)
 
     
+    def GetAgeName(self):
+        "Returns the lowercase name of the age we're in"
+        if self.ageName is None:
+            self.ageName = self.gameData.data['markers'].ageKey(PtGetAgeInfo().getAgeFilename())
+        return self.ageName
+
+    def ShowAgeMarkers(self):
+        "Puts all the uncaptured markers of the age we're in into the marker manager display"
+        mrkrDisplay = ptMarkerMgr()
+        mrkrDisplay.removeAllMarkers()
+        #Only add markers that exist within this age (only a concern for quest games)
+        for marker in self.gameData.data['markers'].inAge(self.GetAgeName()):
+            if not marker.captured:
+                mrkrDisplay.addMarker(marker.x, marker.y, marker.z, marker.id, 0)
+
     def PlayCGZMarkerGame(self, gameNum):
         "Prepares and starts a CGZ Marker Game"
         PtDebugPrint("DEBUG: xMarkerGameManager.PlayCGZMarkerGame():\tServer finished creating CGZ marker game, adding markers and starting the game")
@@ -51,6 +51,7 @@ Contains various functions and data structures to support the new marker game mi
 from PlasmaTypes import *
 from PlasmaGameConstants import *
 from PlasmaGame import *
+import re
 
 #---------------------------------------#
 #                                       #
@@ -80,47 +81,229 @@ def GameTypeToString(gameType):
     return gameString
 
 
+#Tokens of a python literal as written by str()/repr() of a dict, list or tuple
+kLiteralTokenRE = re.compile(r"""\s*(?:(?P<str>[uU]?(?:'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"))|(?P<num>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?[lL]?)|(?P<const>None|True|False)|(?P<punct>[{}\[\](),:]))""")
+kLiteralConstants = {'None' : None, 'True' : True, 'False' : False}
+
+def ParseLiteral(text):
+    "Safely parses a python literal (dict, list, tuple, string, number, None/True/False) without using eval"
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = kLiteralTokenRE.match(text, pos)
+        if match is None:
+            raise ValueError("ParseLiteral: unexpected character at position %d" % pos)
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        pos = match.end()
+    value, idx = _ParseLiteralToken(tokens, 0)
+    if idx != len(tokens):
+        raise ValueError("ParseLiteral: trailing data after literal")
+    return value
+
+def _ParseLiteralToken(tokens, idx):
+    "Parses a single value starting at tokens[idx]; returns the value and the index of the next token"
+    try:
+        kind, tok = tokens[idx]
+    except IndexError:
+        raise ValueError("ParseLiteral: unexpected end of data")
+    if kind == 'str':
+        if tok[0] in "uU":
+            return tok[2:-1].decode('unicode_escape'), idx + 1
+        return tok[1:-1].decode('string_escape'), idx + 1
+    if kind == 'num':
+        if tok[-1] in "lL":
+            return long(tok[:-1]), idx + 1
+        if '.' in tok or 'e' in tok or 'E' in tok:
+            return float(tok), idx + 1
+        return int(tok), idx + 1
+    if kind == 'const':
+        return kLiteralConstants[tok], idx + 1
+    if tok == '{':
+        result = {}
+        idx += 1
+        while tokens[idx:idx+1] != [('punct', '}')]:
+            key, idx = _ParseLiteralToken(tokens, idx)
+            if tokens[idx:idx+1] != [('punct', ':')]:
+                raise ValueError("ParseLiteral: expected ':' in dict")
+            result[key], idx = _ParseLiteralToken(tokens, idx + 1)
+            if tokens[idx:idx+1] == [('punct', ',')]:
+                idx += 1
+            elif tokens[idx:idx+1] != [('punct', '}')]:
+                raise ValueError("ParseLiteral: expected ',' or '}' in dict")
+        return result, idx + 1
+    if tok in "[(":
+        close = {'[' : ']', '(' : ')'}[tok]
+        result = []
+        idx += 1
+        while tokens[idx:idx+1] != [('punct', close)]:
+            item, idx = _ParseLiteralToken(tokens, idx)
+            result.append(item)
+            if tokens[idx:idx+1] == [('punct', ',')]:
+                idx += 1
+            elif tokens[idx:idx+1] != [('punct', close)]:
+                raise ValueError("ParseLiteral: expected ',' or '%s' in sequence" % close)
+        if close == ')':
+            return tuple(result), idx + 1
+        return result, idx + 1
+    raise ValueError("ParseLiteral: unexpected token '%s'" % tok)
+
+
 
 #---------------------------------------#
 #                                       #
 #            Data Structures            #
 #                                       #
 #---------------------------------------#
-class MarkerData:
-    "A class interface for housing marker data"
-    def __init__(self):
-        #Setup Default vars
-        self.default = {}
-        self.default['id']       = -1   # markerID
-        self.default['age']      = None # the age filename the marker is within
-        self.default['x']        = -1   # x coord
-        self.default['y']        = -1   # y coord
-        self.default['z']        = -1   # z coord
-        self.default['name']     = None # description of the marker (i.e. when you get it)
-        self.default['captured'] = 0    # flag If this marker was captured
-        
-        self.initDefaultValues()
+class MarkerData(object):
+    "A class interface for housing marker data (marker.data[...] is the marker itself)"
+    __slots__ = ('id', 'age', 'x', 'y', 'z', 'name', 'captured')
+    default = {
+        'id'       : -1,    # markerID
+        'age'      : None,  # the age filename the marker is within
+        'x'        : -1,    # x coord
+        'y'        : -1,    # y coord
+        'z'        : -1,    # z coord
+        'name'     : None,  # description of the marker (i.e. when you get it)
+        'captured' : 0,     # flag If this marker was captured
+    }
+
+    def __init__(self, id=-1, x=-1, y=-1, z=-1, name=None, age=None):
+        self.id = id
+        self.age = age
+        self.x = x
+        self.y = y
+        self.z = z
+        self.name = name
+        self.captured = 0
 
     def initDefaultValues(self):
         "Sets all variables to their default states"
-        self.data = {}
-        #Must do a deep copy here; otherwise, we'll overwrite the defaults!
-        for x in self.default.keys():
-            self.data[x] = self.default[x]
+        for x in self.__slots__:
+            setattr(self, x, self.default[x])
+
+    #Markers used to keep their fields in a dictionary, these keep marker.data['x'] working
+    def _getData(self):
+        return self
+    data = property(_getData)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key)
 
     def __str__(self):
-        d = self.data
-        retStr = "Marker #%s: age = %s, (%s,%s,%s), description = %s, status: %s" % (d['id'], d['age'], d['x'], d['y'], d['z'], d['name'], self.capturedStatus())
+        retStr = "Marker #%s: age = %s, (%s,%s,%s), description = %s, status: %s" % (self.id, self.age, self.x, self.y, self.z, self.name, self.capturedStatus())
         return retStr
 
     def capturedStatus(self):
-        if self.data['captured']:
+        if self.captured:
             return "captured"
         else:
             return "not captured"
 
 
-
+class MarkerStore:
+    "The markers of a game in the order the server sent them, indexed by marker ID and by age"
+    def __init__(self):
+        self.ageKeys = {}       #age filename as sent -> lowercase unicode age name
+        self.clear()
+
+    def clear(self):
+        "Removes all the markers"
+        self.markers = []
+        self.index = {}         #marker ID -> position in self.markers
+        self.ages = {}          #lowercase age name -> markers within that age
+        self.numCaptured = 0
+
+    #The store can still be used like the old list of markers
+    def __len__(self):
+        return len(self.markers)
+
+    def __iter__(self):
+        return iter(self.markers)
+
+    def __getitem__(self, i):
+        return self.markers[i]
+
+    def __delitem__(self, i):
+        marker = self.markers[i]
+        del self.markers[i]
+        self.ages[self.ageKey(marker.age)].remove(marker)
+        if marker.captured:
+            self.numCaptured -= 1
+        self.IReindex()
+
+    def append(self, marker):
+        "Adds a marker that was built by the caller"
+        self.index.setdefault(marker.id, len(self.markers))
+        self.markers.append(marker)
+        self.ages.setdefault(self.ageKey(marker.age), []).append(marker)
+        if marker.captured:
+            self.numCaptured += 1
+
+    def add(self, id, x, y, z, name, age):
+        "Adds a marker as registered by the server, returns it"
+        marker = MarkerData(id, x, y, z, name, age)
+        self.append(marker)
+        return marker
+
+    def IReindex(self):
+        self.index = {}
+        for i in range(len(self.markers)-1, -1, -1):
+            self.index[self.markers[i].id] = i
+
+    def ageKey(self, age):
+        "Returns the lowercase name markers of the age are kept under"
+        key = self.ageKeys.get(age)
+        if key is None:
+            key = self.ageKeys[age] = unicode(age).lower()
+        return key
+
+    def find(self, id):
+        "Returns the marker with the ID (or None)"
+        i = self.index.get(id)
+        if i is None:
+            return None
+        return self.markers[i]
+
+    def position(self, id):
+        "Returns the marker's position in the store (or -1)"
+        return self.index.get(id, -1)
+
+    def remove(self, id):
+        "Removes the marker with the ID, returns whether it was found"
+        i = self.index.get(id)
+        if i is None:
+            return 0
+        del self[i]
+        return 1
+
+    def inAge(self, age):
+        "Returns the markers within the age"
+        return self.ages.get(self.ageKey(age), [])
+
+    def capture(self, id):
+        "Marks the marker with the ID as captured, returns it (or None)"
+        marker = self.find(id)
+        if marker is not None and not marker.captured:
+            marker.captured = 1
+            self.numCaptured += 1
+        return marker
+
+    def resetCaptured(self):
+        "Marks all the markers as not captured"
+        if self.numCaptured:
+            for marker in self.markers:
+                marker.captured = 0
+            self.numCaptured = 0
 
 
 class MarkerGameData:
@@ -144,7 +327,7 @@ class MarkerGameData:
         self.default['svrGameName']        = ""     #The Name of user-created marker games
         self.default['svrGameStarted']     =  0     #If the user-created marker game has been started
 
-        self.default['markers']             = []    #Houses all markers for the game
+        self.default['markers']             = None  #Houses all markers for the game (a MarkerStore)
         self.default['timeLimit']           = -1    #Time limit on the game....
 
         #Init the game data structure
@@ -155,6 +338,7 @@ class MarkerGameData:
         self.data = {}
         #Must do a deep copy here; otherwise, we'll overwrite the defaults!
         self.copy(self.default)
+        self.data['markers'] = MarkerStore()
 
 
     def copy(self, src):
@@ -180,6 +364,87 @@ class MarkerGameData:
 
 
 
+#Process-wide cache of the MarkerGameData chronicle, shared by every chronicleMarkerGameData instance
+#   'owner'   - client ID the cache was loaded for (the cache is dropped if the player changes)
+#   'data'    - the last known chronicle contents as a dict
+#   'value'   - the chronicle string as last read from or written to the vault
+#   'dirty'   - the data has changed but hasn't been written to the vault yet
+#   'batch'   - nesting depth of BeginGameDataBatch()/EndGameDataBatch()
+gGameDataCache = {'owner' : None, 'data' : None, 'value' : None, 'dirty' : 0, 'batch' : 0}
+gGameDataStats = {'loads' : 0, 'writes' : 0, 'skippedWrites' : 0}
+
+def _GetCachedGameData():
+    "Returns the cached chronicle contents, loading them from the vault on first use"
+    owner = PtGetLocalClientID()
+    if gGameDataCache['data'] is not None and gGameDataCache['owner'] == owner:
+        return gGameDataCache['data']
+
+    gGameDataCache['owner'] = owner
+    gGameDataCache['data'] = {}
+    gGameDataCache['value'] = None
+    gGameDataCache['dirty'] = 0
+
+    vault = ptVault()
+    entry = vault.findChronicleEntry(chronicleMarkerGameData.kChronMarkerGameData)
+    gGameDataStats['loads'] += 1
+    if type(entry) == type(None):
+        return gGameDataCache['data']
+    value = entry.chronicleGetValue()
+    gGameDataCache['value'] = value
+    if type(value) == type(None) or value == "":
+        return gGameDataCache['data']
+    try:
+        data = ParseLiteral(value)
+        if type(data) == type({}):
+            gGameDataCache['data'] = data
+        else:
+            PtDebugPrint("xMarkerGameUtils._GetCachedGameData():\tERROR: Chronicle Entry is not a dictionary, using defaults")
+    except ValueError:
+        PtDebugPrint("xMarkerGameUtils._GetCachedGameData():\tERROR: Could not parse Chronicle Entry, using defaults")
+    return gGameDataCache['data']
+
+def FlushGameData():
+    "Writes the cached marker game data to the chronicle if it has changed since the last write"
+    if not gGameDataCache['dirty'] or gGameDataCache['batch'] > 0:
+        return
+    gGameDataCache['dirty'] = 0
+    value = str(gGameDataCache['data'])
+    if value == gGameDataCache['value']:
+        gGameDataStats['skippedWrites'] += 1
+        return
+
+    vault = ptVault()
+    entry = vault.findChronicleEntry(chronicleMarkerGameData.kChronMarkerGameData)
+    if type(entry) == type(None):
+        vault.addChronicleEntry(chronicleMarkerGameData.kChronMarkerGameData, 1, value)
+    else:
+        entry.chronicleSetValue(value)
+        entry.save()
+    gGameDataCache['value'] = value
+    gGameDataStats['writes'] += 1
+
+def BeginGameDataBatch():
+    "Defers chronicle writes until the matching EndGameDataBatch() call"
+    gGameDataCache['batch'] += 1
+
+def EndGameDataBatch():
+    "Ends a batch of changes and flushes them to the chronicle in a single write"
+    if gGameDataCache['batch'] > 0:
+        gGameDataCache['batch'] -= 1
+    FlushGameData()
+
+def InvalidateGameDataCache():
+    "Drops the cached chronicle contents, the next access will reload them from the vault"
+    gGameDataCache['owner'] = None
+    gGameDataCache['data'] = None
+    gGameDataCache['value'] = None
+    gGameDataCache['dirty'] = 0
+
+def GetGameDataStats():
+    "Returns a copy of the chronicle cache counters (vault loads, writes and writes skipped because nothing changed)"
+    return gGameDataStats.copy()
+
+
 class chronicleMarkerGameData(MarkerGameData):
     "A class interface for housing CGZ marker game data (has chronicle hooks)"
     kChronMarkerGameData = "MarkerGameData"
@@ -197,23 +462,17 @@ class chronicleMarkerGameData(MarkerGameData):
             else:
                 self.copy(existingData)
 
+        #Only reaches the vault if the data actually differs from the chronicle (e.g. new player, new fields)
         self.save()
 
 
     def load(self):
         "Initializes all variables from the chronicle, if it doesn't exist, defaults are used."
-        vault = ptVault()
-        entry = vault.findChronicleEntry(self.kChronMarkerGameData)
-
-        #Only retrieve if the chronicle entry exists; otherwise, we'll just save later.
-        if type(entry) == type(None) or type(entry.chronicleGetValue()) == type(None) or entry.chronicleGetValue() == "":
-            return
-
         #Here will do a little magic...
         #To protect against versioning issues, we'll initialize whatever data the user has.
         #All other data will remain at default values....
-        temp = eval(entry.chronicleGetValue())
-        self.copy(temp)
+        #The chronicle is only read from the vault once, after that the cached copy is used
+        self.copy(_GetCachedGameData())
 
         #self.printData()
 
@@ -225,14 +484,11 @@ class chronicleMarkerGameData(MarkerGameData):
         del saveData['markers']
         del saveData['timeLimit']  #also delete this as we don't need it in the chronicle
 
-        vault = ptVault()
-        entry = vault.findChronicleEntry(self.kChronMarkerGameData)
-
-        if type(entry) == type(None):
-            vault.addChronicleEntry(self.kChronMarkerGameData, 1, str(saveData))
-        else:
-            entry.chronicleSetValue(str(saveData))
-            entry.save()
+        _GetCachedGameData()
+        if saveData != gGameDataCache['data'] or gGameDataCache['value'] is None:
+            gGameDataCache['data'] = saveData
+            gGameDataCache['dirty'] = 1
+        FlushGameData()
 
         #~self.printData()            
 
@@ -244,12 +500,9 @@ class chronicleMarkerGameData(MarkerGameData):
             PtDebugPrint("chronicleMarkerGameData.printData():\t****ERROR****  Chronicle Entry does not exist, aborting print command")
             return
 
-        temp = eval(entry.chronicleGetValue())
+        temp = ParseLiteral(entry.chronicleGetValue())
 
         print "--------------[Start of CZG Marker Data Chronicle Entry]---------------------"
         for x in temp.keys():
             print "\t\tdata[%s] = %s" %(x,temp[x])
         print "--------------[END of CZG Marker Data Chronicle Entry]---------------------"
-
-
-
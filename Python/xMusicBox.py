@@ -49,6 +49,8 @@ A music box type thing
 
 from Plasma import *
 from PlasmaTypes import *
+from PlasmaVaultConstants import *
+import xVaultIndex
 
 #=============================================================
 # define the attributes that will be entered in max
@@ -85,23 +87,13 @@ class xMusicBox(ptModifier):
         global CurrentFile
 
         musicBoxChronFound = 0
-        ageDataFolder = None
 
         ageVault = ptAgeVault()
         ageInfoNode = ageVault.getAgeInfo()
 
-        ageInfoChildren = ageInfoNode.getChildNodeRefList()
-        for ageInfoChildRef in ageInfoChildren:
-            ageInfoChild = ageInfoChildRef.getChild()
-            folder = ageInfoChild.upcastToFolderNode()
-            if folder and folder.folderGetName() == "AgeData":
-                ageDataFolder = folder
-                ageDataChildren = folder.getChildNodeRefList()
-                for ageDataChildRef in ageDataChildren:
-                    ageDataChild = ageDataChildRef.getChild()
-                    chron = ageDataChild.upcastToChronicleNode()
-                    if chron and chron.getName() == "MusicBoxSongs":
-                        musicBoxChronFound = 1
+        ageDataFolder = xVaultIndex.FindNode(ageInfoNode, PtVaultNodeTypes.kFolderNode, "AgeData")
+        if ageDataFolder and xVaultIndex.FindNode(ageDataFolder, PtVaultNodeTypes.kChronicleNode, "MusicBoxSongs"):
+            musicBoxChronFound = 1
 
         if not ageDataFolder:
             newFolder = ptVaultFolderNode(0)
@@ -208,15 +200,9 @@ class xMusicBox(ptModifier):
         ageVault = ptAgeVault()
         ageInfoNode = ageVault.getAgeInfo()
 
-        ageInfoChildren = ageInfoNode.getChildNodeRefList()
-        for ageInfoChildRef in ageInfoChildren:
-            ageInfoChild = ageInfoChildRef.getChild()
-            folder = ageInfoChild.upcastToFolderNode()
-            if folder and folder.folderGetName() == "AgeData":
-                ageDataChildren = folder.getChildNodeRefList()
-                for ageDataChildRef in ageDataChildren:
-                    ageDataChild = ageDataChildRef.getChild()
-                    chron = ageDataChild.upcastToChronicleNode()
-                    if chron and chron.getName() == "MusicBoxSongs":
-                        songList = chron.getValue().split(";")
+        folder = xVaultIndex.FindNode(ageInfoNode, PtVaultNodeTypes.kFolderNode, "AgeData")
+        if folder:
+            chron = xVaultIndex.FindNode(folder, PtVaultNodeTypes.kChronicleNode, "MusicBoxSongs")
+            if chron:
+                songList = chron.getValue().split(";")
         return songList
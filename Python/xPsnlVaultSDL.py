@@ -46,12 +46,134 @@ Age: Global
 Date: June 2003
 Author: Adam Van Ornum
 Allows ptSDL-like access to Psnl Age SDL from anywhere
+
+The state record is fetched from the vault once and shared by every
+xPsnlVaultSDL instance; writes go through to the cached record and are
+sent back with a single update (or one update per transaction() ...
+commit() batch).  The snapshot is thrown away on vault change events.
 """
 
 from Plasma import *
 from PlasmaConstants import *
+from PlasmaVaultConstants import *
 import types
 
+def _SetInt(var, val):
+    if type(val) in (types.IntType, types.LongType):
+        var.setInt(val)
+
+def _SetFloat(var, val):
+    if type(val) in (types.IntType, types.LongType, types.FloatType):
+        var.setFloat(val)
+
+def _SetDouble(var, val):
+    if type(val) in (types.IntType, types.LongType, types.FloatType):
+        var.setDouble(val)
+
+def _SetBool(var, val):
+    if val:
+        var.setBool(1)
+    else:
+        var.setBool(0)
+
+def _SetString(var, val):
+    if type(val) == type(""):
+        var.setString(val)
+    else:
+        var.setString(str(val))
+
+# PtSDLVarType -> (getter, setter); anything else is read and written as an int
+kVarAccessors = {
+    PtSDLVarType.kInt : (lambda var: var.getInt(), _SetInt),
+    PtSDLVarType.kFloat : (lambda var: var.getFloat(), _SetFloat),
+    PtSDLVarType.kDouble : (lambda var: var.getDouble(), _SetDouble),
+    PtSDLVarType.kBool : (lambda var: var.getBool(), _SetBool),
+    PtSDLVarType.kString32 : (lambda var: var.getString(), _SetString),
+}
+kDefaultAccessors = kVarAccessors[PtSDLVarType.kInt]
+
+# one shared snapshot per vault kind (0 = personal age vault, 1 = current age vault)
+class _SDLSnapshot:
+    def __init__(self, useAgeVault):
+        self.useAgeVault = useAgeVault
+        self.sdl = None
+        self.vars = {}
+        self.dirty = {}
+        self.batch = 0
+
+    def IGetRecord(self, vault):
+        "returns the cached state record, fetching it from the vault on first use"
+        if self.sdl is None:
+            if self.useAgeVault:
+                self.sdl = vault.getAgeSDL()
+            else:
+                self.sdl = vault.getPsnlAgeSDL()
+            gSDLStats['fetches'] += 1
+        return self.sdl
+
+    def IFindVar(self, vault, sub):
+        "returns (var, getter, setter); the variable's type is only asked for when it is first looked up"
+        entry = self.vars.get(sub)
+        if entry is None:
+            var = self.IGetRecord(vault).findVar(sub)
+            getter, setter = kVarAccessors.get(var.getType(), kDefaultAccessors)
+            entry = (var, getter, setter)
+            self.vars[sub] = entry
+            gSDLStats['finds'] += 1
+        return entry
+
+    def IFlush(self, vault):
+        "sends the cached record back to the vault if anything changed"
+        if self.batch > 0:
+            return
+        if not self.dirty:
+            return
+        self.dirty = {}
+        if self.useAgeVault:
+            vault.updateAgeSDL(self.sdl)
+        else:
+            vault.updatePsnlAgeSDL(self.sdl)
+        gSDLStats['updates'] += 1
+
+    def IReset(self):
+        self.sdl = None
+        self.vars = {}
+        self.dirty = {}
+
+gSDLSnapshots = {0 : _SDLSnapshot(0), 1 : _SDLSnapshot(1)}
+gSDLStats = {'fetches' : 0, 'finds' : 0, 'updates' : 0, 'skippedWrites' : 0}
+
+def InvalidateSDLCache(useAgeVault = None):
+    "drops the cached state record(s); pending changes of an open transaction are discarded"
+    if useAgeVault is None:
+        for snapshot in gSDLSnapshots.values():
+            snapshot.IReset()
+    elif useAgeVault:
+        gSDLSnapshots[1].IReset()
+    else:
+        gSDLSnapshots[0].IReset()
+
+def OnSDLVaultEvent(event, tupdata):
+    "keep the cached records current; call from the OnVaultEvent/OnAgeVaultEvent of a global script"
+    if event == PtVaultCallbackTypes.kVaultNodeSaved:
+        # tupdata is ( ptVaultNode )
+        node = tupdata[0]
+        if node is not None and node.getType() == PtVaultNodeTypes.kSDLNode:
+            for snapshot in gSDLSnapshots.values():
+                # don't throw away our own uncommitted changes
+                if snapshot.batch == 0:
+                    snapshot.IReset()
+    elif event == PtVaultCallbackTypes.kVaultConnected or event == PtVaultCallbackTypes.kVaultDisconnected:
+        InvalidateSDLCache()
+
+def GetSDLStats():
+    "returns the vault round trip counters (fetches, finds, updates, skippedWrites)"
+    return gSDLStats.copy()
+
+def ResetSDLStats():
+    for key in gSDLStats.keys():
+        gSDLStats[key] = 0
+
 class xPsnlVaultSDL:
     def __init__(self, useAgeVault = 0):
         if useAgeVault:
@@ -60,21 +182,13 @@ class xPsnlVaultSDL:
         else:
             self.useAgeVault = 0
             self.vault = ptVault()
+        self.snapshot = gSDLSnapshots[self.useAgeVault]
 
     def __getitem__(self, sub):
-        if 1:#try:
-            if self.useAgeVault:
-                sdl = self.vault.getAgeSDL()
-            else:
-                sdl = self.vault.getPsnlAgeSDL()
+        var, getter, setter = self.snapshot.IFindVar(self.vault, sub)
+        retval = getter(var)
 
-            var = sdl.findVar(sub)
-            retval = self.IGetVar(var)
-            
-            return (retval,)
-        #except:
-        #    print "ERROR:xPsnlVaultSDL.__getitem__:\tError getting sdl & var"
-        #    return None
+        return (retval,)
 
     def __setitem__(self, sub, val):
 
@@ -82,117 +196,57 @@ class xPsnlVaultSDL:
             val = val[0]
         else:
             raise "Value must be tuple type"
-        
-        if 1:#try:
-            if self.useAgeVault:
-                sdl = self.vault.getAgeSDL()
-            else:
-                sdl = self.vault.getPsnlAgeSDL()
-            
-            var = sdl.findVar(sub)
-            self.ISetVar(var, val)
-            
-            if self.useAgeVault:
-                self.vault.updateAgeSDL(sdl)
-            else:
-                self.vault.updatePsnlAgeSDL(sdl)
-
-        #except:
-        #    print "ERROR:xPsnlVaultSDL.__setitem__:\tError getting sdl & var"
-
-    def IGetVar(self, var):
-        vartype = var.getType()
-
-        if vartype == PtSDLVarType.kInt:
-            retval = var.getInt()
-
-        elif vartype == PtSDLVarType.kFloat:
-            retval = var.getFloat()
-
-        elif vartype == PtSDLVarType.kDouble:
-            retval = var.getDouble()
-
-        elif vartype == PtSDLVarType.kBool:
-            retval = var.getBool()
-
-        elif vartype == PtSDLVarType.kString32:
-            retval = var.getString()
 
+        self.ISetCached(sub, val)
+        self.snapshot.IFlush(self.vault)
+
+    def transaction(self):
+        "defers vault updates until the matching commit(); transactions may be nested"
+        self.snapshot.batch += 1
+
+    def commit(self):
+        "ends a transaction and sends all its changes to the vault in a single update"
+        snapshot = self.snapshot
+        if snapshot.batch > 0:
+            snapshot.batch -= 1
+        snapshot.IFlush(self.vault)
+
+    def rollback(self):
+        "ends all open transactions, discarding their changes"
+        self.snapshot.batch = 0
+        self.snapshot.IReset()
+
+    def ISetCached(self, sub, val):
+        snapshot = self.snapshot
+        var, getter, setter = snapshot.IFindVar(self.vault, sub)
+        oldval = getter(var)
+        setter(var, val)
+        # only a variable that really changed needs to go back to the vault
+        if getter(var) == oldval:
+            gSDLStats['skippedWrites'] += 1
         else:
-            retval = var.getInt()
+            snapshot.dirty[sub] = 1
 
-        return retval
+    def IGetVar(self, var):
+        getter, setter = kVarAccessors.get(var.getType(), kDefaultAccessors)
+        return getter(var)
 
     def ISetVar(self, var, val):
-        vartype = var.getType()
-        #print "Attempting to set item %s to %s" % (sub, str(val))
-
-        if vartype == PtSDLVarType.kInt:
-            if type(val) in (types.IntType, types.LongType):
-                #print "Set int"
-                var.setInt(val)
-
-        elif vartype == PtSDLVarType.kFloat:
-            if type(val) in (types.IntType, types.LongType, types.FloatType):
-                #print "Set float"
-                var.setFloat(val)
-
-        elif vartype == PtSDLVarType.kDouble:
-            if type(val) in (types.IntType, types.LongType, types.FloatType):
-                #print "Set double"
-                var.setDouble(val)
-
-        elif vartype == PtSDLVarType.kBool:
-            #print "Set bool"
-            if val:
-                var.setBool(1)
-            else:
-                var.setBool(0)
-
-        elif vartype == PtSDLVarType.kString32:
-            #print "Set string"
-            if type(val) == type(""):
-                var.setString(val)
-            else:
-                var.setString(str(val))
-
-        else:
-            if type(val) in (types.IntType, types.LongType):
-                #print "Set int"
-                var.setInt(val)
+        getter, setter = kVarAccessors.get(var.getType(), kDefaultAccessors)
+        setter(var, val)
 
     def BatchGet(self, vars):
-        if 1:#try:
-            retval = {}
-            if self.useAgeVault:
-                sdl = self.vault.getAgeSDL()
-            else:
-                sdl = self.vault.getPsnlAgeSDL()
-            
-            for sub in vars:
-                var = sdl.findVar(sub)
-                retval[sub] = self.IGetVar(var)
+        retval = {}
+        for sub in vars:
+            retval[sub] = self[sub][0]
 
-            return retval
-        #except:
-        #    print "ERROR:xPsnlVaultSDL.BatchGet:  problem doing a batch get"
+        return retval
 
     def BatchSet(self, vars):
-        if 1:#try:
-            if self.useAgeVault:
-                sdl = self.vault.getAgeSDL()
-            else:
-                sdl = self.vault.getPsnlAgeSDL()
-
+        self.transaction()
+        try:
             for sub in vars:
-                var = sdl.findVar(sub[0])
                 vallist = sub[1]
-                self.ISetVar(var, vallist[0])
-            
-            if self.useAgeVault:
-                self.vault.updateAgeSDL(sdl)
-            else:
-                self.vault.updatePsnlAgeSDL(sdl)
-
-        #except:
-        #    print "ERROR:xPsnlVaultSDL.BatchSet:  problem doing a batch set"
\ No newline at end of file
+                self.ISetCached(sub[0], vallist[0])
+        finally:
+            self.commit()
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+""" *==LICENSE==*
+
+CyanWorlds.com Engine - MMOG client, server and tools
+Copyright (C) 2011  Cyan Worlds, Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Additional permissions under GNU GPL version 3 section 7
+
+If you modify this Program, or any covered work, by linking or
+combining it with any of RAD Game Tools Bink SDK, Autodesk 3ds Max SDK,
+NVIDIA PhysX SDK, Microsoft DirectX SDK, OpenSSL library, Independent
+JPEG Group JPEG library, Microsoft Windows Media SDK, or Apple QuickTime SDK
+(or a modified version of those libraries),
+containing parts covered by the terms of the Bink SDK EULA, 3ds Max EULA,
+PhysX SDK EULA, DirectX SDK EULA, OpenSSL and SSLeay licenses, IJG
+JPEG Library README, Windows Media SDK EULA, or QuickTime SDK EULA, the
+licensors of this Program grant you additional
+permission to convey the resulting work. Corresponding Source for a
+non-source form of such a combination shall include the source code for
+the parts of OpenSSL and IJG JPEG Library used as well as that of the covered
+work.
+
+You can contact Cyan Worlds, Inc. by email legal@cyan.com
+ or by snail mail at:
+      Cyan Worlds, Inc.
+      14617 N Newport Hwy
+      Mead, WA   99021
+
+ *==LICENSE==* """
+"""
+Module: xPublicAgeIndex
+Age: global
+Date: October 2026
+Keeps the public age instances the server lists (e.g. the public neighborhoods) keyed by
+instance guid.  There is a sorted view by display name and one by population, each read
+in either direction.  A new list from the server is merged in, so only the instances
+that were added, dropped, renamed or changed population move in the views.  Views
+filtered by language are made on demand and kept until the next change.  Pages are
+handed out a slice at a time, and display names can be searched by prefix.
+"""
+
+import bisect
+
+# the orders the views can be read in
+kSortNone = 0
+kSortNameAsc = 1
+kSortNameDesc = 2
+kSortPopAsc = 3
+kSortPopDesc = 4
+
+
+class PublicAgeInstance:
+    "one entry of the server's public age list: (ageInfo, population, owners)"
+    def __init__(self, ageData):
+        self.ageInfo = ageData[0]
+        self.population = ageData[1]
+        self.owners = ageData[2]
+        self.guid = self.ageInfo.getAgeInstanceGuid()
+        self.displayName = self.ageInfo.getDisplayName()
+        self.language = self.ageInfo.getAgeLanguage()
+        self.nameKey = (self.displayName.lower(), self.guid)
+        self.popKey = (self.population, self.guid)
+
+
+class PublicAgeIndex:
+    def __init__(self):
+        self.Clear()
+
+    def Clear(self):
+        self.instances = {}     # guid -> PublicAgeInstance
+        self.order = []         # guids in the order the server sent them
+        self.byName = []        # sorted nameKeys
+        self.byPop = []         # sorted popKeys
+        self.views = {}         # (sort, hidden languages) -> list of guids
+        self.changes = 0
+
+    def __len__(self):
+        return len(self.instances)
+
+    def IInsert(self, instance):
+        self.instances[instance.guid] = instance
+        bisect.insort(self.byName, instance.nameKey)
+        bisect.insort(self.byPop, instance.popKey)
+
+    def IRemove(self, instance):
+        del self.instances[instance.guid]
+        del self.byName[bisect.bisect_left(self.byName, instance.nameKey)]
+        del self.byPop[bisect.bisect_left(self.byPop, instance.popKey)]
+
+    def Update(self, ages):
+        "merges a new list from the server, returns true if anything changed (even just the order)"
+        changes = 0
+        order = []
+        gone = self.instances.copy()
+        for age in ages:
+            instance = PublicAgeInstance(age)
+            old = self.instances.get(instance.guid)
+            if old is not None:
+                if instance.guid not in gone:
+                    # listed twice
+                    continue
+                del gone[instance.guid]
+                if old.nameKey == instance.nameKey and old.popKey == instance.popKey and old.language == instance.language:
+                    old.ageInfo = instance.ageInfo
+                    old.owners = instance.owners
+                    order.append(instance.guid)
+                    continue
+                self.IRemove(old)
+            self.IInsert(instance)
+            order.append(instance.guid)
+            changes += 1
+        for instance in gone.values():
+            self.IRemove(instance)
+            changes += 1
+        reordered = (order != self.order)
+        if changes or reordered:
+            self.views.clear()
+        self.order = order
+        self.changes += changes
+        return changes or reordered
+
+    def Get(self, guid):
+        return self.instances.get(guid)
+
+    def IView(self, sort, hiddenLanguages):
+        key = (sort, tuple(hiddenLanguages))
+        view = self.views.get(key)
+        if view is not None:
+            return view
+        if sort == kSortNameAsc or sort == kSortNameDesc:
+            view = [guid for (name, guid) in self.byName]
+        elif sort == kSortPopAsc or sort == kSortPopDesc:
+            view = [guid for (pop, guid) in self.byPop]
+        else:
+            view = self.order[:]
+        if sort == kSortNameDesc or sort == kSortPopDesc:
+            view.reverse()
+        if hiddenLanguages:
+            view = [guid for guid in view if self.instances[guid].language not in hiddenLanguages]
+        self.views[key] = view
+        return view
+
+    def Count(self, sort=kSortNone, hiddenLanguages=()):
+        return len(self.IView(sort, hiddenLanguages))
+
+    def GetPage(self, start, count, sort=kSortNone, hiddenLanguages=()):
+        "returns count instances from start in the sort order, leaving out the hidden languages"
+        view = self.IView(sort, hiddenLanguages)
+        return [self.instances[guid] for guid in view[start:start + count]]
+
+    def Search(self, prefix):
+        "returns the instances whose display name starts with prefix (any case), by name"
+        prefix = prefix.lower()
+        found = []
+        for i in range(bisect.bisect_left(self.byName, (prefix,)), len(self.byName)):
+            name, guid = self.byName[i]
+            if not name.startswith(prefix):
+                break
+            found.append(self.instances[guid])
+        return found
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+""" *==LICENSE==*
+
+CyanWorlds.com Engine - MMOG client, server and tools
+Copyright (C) 2011  Cyan Worlds, Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Additional permissions under GNU GPL version 3 section 7
+
+If you modify this Program, or any covered work, by linking or
+combining it with any of RAD Game Tools Bink SDK, Autodesk 3ds Max SDK,
+NVIDIA PhysX SDK, Microsoft DirectX SDK, OpenSSL library, Independent
+JPEG Group JPEG library, Microsoft Windows Media SDK, or Apple QuickTime SDK
+(or a modified version of those libraries),
+containing parts covered by the terms of the Bink SDK EULA, 3ds Max EULA,
+PhysX SDK EULA, DirectX SDK EULA, OpenSSL and SSLeay licenses, IJG
+JPEG Library README, Windows Media SDK EULA, or QuickTime SDK EULA, the
+licensors of this Program grant you additional
+permission to convey the resulting work. Corresponding Source for a
+non-source form of such a combination shall include the source code for
+the parts of OpenSSL and IJG JPEG Library used as well as that of the covered
+work.
+
+You can contact Cyan Worlds, Inc. by email legal@cyan.com
+ or by snail mail at:
+      Cyan Worlds, Inc.
+      14617 N Newport Hwy
+      Mead, WA   99021
+
+ *==LICENSE==* """
+"""
+Module: xSDLDispatch
+Age: global
+Date: October 2026
+Fans age SDL change notifications out to the modifiers that care about each variable.
+Only one subscriber per variable (the relay) registers with the engine; its OnSDLNotify
+hands the notification to DispatchSDLNotify, which reads the new value once and calls
+OnSDLChange(VARname,SDLname,playerID,tag,value) on every subscriber of that variable.
+Subscribers are held weakly, and the relay is handed to another subscriber when it goes away.
+"""
+
+from Plasma import *
+from PlasmaTypes import *
+import weakref
+import traceback
+
+# variable name -> list of weak references to subscribed modifiers
+gSDLSubscribers = {}
+# variable name -> weak reference to the modifier registered with the engine for it
+gSDLRelays = {}
+# id(modifier) -> weak reference to it (one per modifier, so they can be compared)
+gSDLRefs = {}
+
+gSDLDispatchStats = {'notifies' : 0, 'callbacks' : 0}
+
+def _GetRef(modifier):
+    ref = gSDLRefs.get(id(modifier))
+    if ref is None or ref() is not modifier:
+        ref = weakref.ref(modifier, _OnModifierGone)
+        gSDLRefs[id(modifier)] = ref
+    return ref
+
+def _SetRelay(varName, ref):
+    "registers the modifier with the engine as the one to notify about varName"
+    gSDLRelays[varName] = ref
+    modifier = ref()
+    if modifier is not None:
+        PtGetAgeSDL().setNotify(modifier.key,varName,0.0)
+
+def _OnModifierGone(deadRef):
+    "a subscriber has been unloaded: forget it and hand its relays to someone else"
+    for key, ref in gSDLRefs.items():
+        if ref is deadRef:
+            del gSDLRefs[key]
+    for varName in gSDLSubscribers.keys():
+        refs = [ref for ref in gSDLSubscribers[varName] if ref is not deadRef]
+        if not refs:
+            del gSDLSubscribers[varName]
+            if gSDLRelays.has_key(varName):
+                del gSDLRelays[varName]
+            continue
+        gSDLSubscribers[varName] = refs
+        if gSDLRelays.get(varName) is deadRef:
+            try:
+                _SetRelay(varName,refs[0])
+            except:
+                # the age is probably going away
+                del gSDLRelays[varName]
+
+def SubscribeSDL(modifier, varName):
+    "routes changes of the age SDL variable varName to modifier.OnSDLChange()"
+    if not varName:
+        return
+    ref = _GetRef(modifier)
+    refs = gSDLSubscribers.setdefault(varName,[])
+    if ref not in refs:
+        refs.append(ref)
+    relay = gSDLRelays.get(varName)
+    if relay is None or relay() is None:
+        _SetRelay(varName,ref)
+
+def UnsubscribeSDL(modifier, varName=None):
+    "stops routing changes of varName (or of all variables) to the modifier"
+    ref = gSDLRefs.get(id(modifier))
+    if ref is None:
+        return
+    if varName is None:
+        varNames = gSDLSubscribers.keys()
+    else:
+        varNames = [varName]
+    for name in varNames:
+        refs = gSDLSubscribers.get(name)
+        if refs is None or ref not in refs:
+            continue
+        refs.remove(ref)
+        if not refs:
+            del gSDLSubscribers[name]
+            if gSDLRelays.has_key(name):
+                del gSDLRelays[name]
+        elif gSDLRelays.get(name) is ref:
+            # the engine still notifies the old relay too, but DispatchSDLNotify ignores it from now on
+            _SetRelay(name,refs[0])
+
+def DispatchSDLNotify(relay, VARname, SDLname, playerID, tag):
+    "call from the OnSDLNotify of a subscribed modifier; returns the number of subscribers called"
+    refs = gSDLSubscribers.get(VARname)
+    if not refs:
+        return 0
+    # only the current relay speaks for a variable, so no one hears about a change twice
+    relayRef = gSDLRelays.get(VARname)
+    if relayRef is None or relayRef() is not relay:
+        return 0
+    gSDLDispatchStats['notifies'] += 1
+    value = PtGetAgeSDL()[VARname]
+    called = 0
+    # copy, a subscriber may (un)subscribe while we are calling it
+    for ref in refs[:]:
+        modifier = ref()
+        if modifier is None:
+            continue
+        try:
+            modifier.OnSDLChange(VARname,SDLname,playerID,tag,value)
+        except:
+            PtDebugPrint("xSDLDispatch: error delivering %s change to %s" % (VARname,modifier.__class__.__name__),level=kErrorLevel)
+            traceback.print_exc()
+        called += 1
+    gSDLDispatchStats['callbacks'] += called
+    return called
+
+def GetSDLDispatchStats():
+    "returns the number of notifications dispatched and the number of subscriber callbacks they made"
+    return gSDLDispatchStats.copy()
+
+def ResetSDLDispatch():
+    "forgets every subscription; call when the age unloads (the KI does this for everyone)"
+    global gSDLSubscribers
+    global gSDLRelays
+    global gSDLRefs
+    gSDLSubscribers = {}
+    gSDLRelays = {}
+    gSDLRefs = {}
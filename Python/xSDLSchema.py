@@ -0,0 +1,762 @@
+# -*- coding: utf-8 -*-
+""" *==LICENSE==*
+
+CyanWorlds.com Engine - MMOG client, server and tools
+Copyright (C) 2011  Cyan Worlds, Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Additional permissions under GNU GPL version 3 section 7
+
+If you modify this Program, or any covered work, by linking or
+combining it with any of RAD Game Tools Bink SDK, Autodesk 3ds Max SDK,
+NVIDIA PhysX SDK, Microsoft DirectX SDK, OpenSSL library, Independent
+JPEG Group JPEG library, Microsoft Windows Media SDK, or Apple QuickTime SDK
+(or a modified version of those libraries),
+containing parts covered by the terms of the Bink SDK EULA, 3ds Max EULA,
+PhysX SDK EULA, DirectX SDK EULA, OpenSSL and SSLeay licenses, IJG
+JPEG Library README, Windows Media SDK EULA, or QuickTime SDK EULA, the
+licensors of this Program grant you additional
+permission to convey the resulting work. Corresponding Source for a
+non-source form of such a combination shall include the source code for
+the parts of OpenSSL and IJG JPEG Library used as well as that of the covered
+work.
+
+You can contact Cyan Worlds, Inc. by email legal@cyan.com
+ or by snail mail at:
+      Cyan Worlds, Inc.
+      14617 N Newport Hwy
+      Mead, WA   99021
+
+ *==LICENSE==* """
+"""
+Module: xSDLSchema
+Age: global
+Date: October 2026
+Compiles the STATEDESC descriptors of the SDL/*.sdl files into schema tables: per variable
+type, default, array length and packed offset for every version, plus migration maps from
+each older version to the latest one.  Records are packed into compact binary snapshots.
+Nothing here needs the engine, so tools can validate, diff and load age state offline.
+A record is a dictionary of variable name -> tuple of values, the way ptSDL hands them out.
+Run it as a script to parse a whole SDL directory and round-trip every default record:
+    python xSDLSchema.py [sdl directory]
+"""
+
+import os
+import re
+import struct
+import time
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+# these match PtSDLVarType
+kSDLInt = 0
+kSDLFloat = 1
+kSDLBool = 2
+kSDLString32 = 3
+kSDLKey = 4
+kSDLStateDescriptor = 5
+kSDLCreatable = 6
+kSDLDouble = 7
+kSDLTime = 8
+kSDLByte = 9
+kSDLShort = 10
+kSDLVector3 = 50
+kSDLPoint3 = 51
+kSDLRGB = 52
+kSDLRGBA = 53
+kSDLQuaternion = 54
+
+kString32Len = 32
+kSnapshotMagic = "SDLS"
+kCompiledMagic = "SDLC1"
+# length marker of a None key/creatable in a snapshot
+kNoneLen = 0xFFFF
+
+class SDLSchemaError(Exception):
+    pass
+
+try:
+    _unicode = unicode
+except NameError:
+    _unicode = str
+
+def _ToBytes(val):
+    if isinstance(val, _unicode) and not isinstance(val, bytes):
+        return val.encode("latin-1")
+    return val
+
+def _FromBytes(val):
+    val = val.split(_ToBytes("\0"), 1)[0]
+    if not isinstance(val, str):
+        val = val.decode("latin-1")
+    return val
+
+kSnapshotMagic = _ToBytes(kSnapshotMagic)
+
+
+#-------------------------------------------------------------------------------
+# variable types
+#-------------------------------------------------------------------------------
+def _Int(val):
+    return int(val)
+
+def _Float(val):
+    return float(val)
+
+def _Bool(val):
+    if val:
+        return 1
+    return 0
+
+def _String(val):
+    if val is None:
+        return ""
+    if not isinstance(val, (str, _unicode)):
+        val = str(val)
+    return val
+
+def _Opaque(val):
+    return val
+
+def _Tuple(size, coerce):
+    def _CoerceTuple(val):
+        val = tuple([coerce(item) for item in val])
+        if len(val) != size:
+            raise ValueError("expected %d components, got %d" % (size,len(val)))
+        return val
+    return _CoerceTuple
+
+class SDLType:
+    "one SDL data type: its PtSDLVarType code, struct format per element and value coercion"
+    def __init__(self, name, code, fmt, zero, coerce):
+        self.name = name
+        self.code = code
+        # None for the types that can't be packed at a fixed size (keys, creatables)
+        self.fmt = fmt
+        if fmt is None:
+            self.size = None
+            self.width = 1
+        else:
+            self.size = struct.calcsize("<" + fmt)
+            self.width = len(struct.unpack("<" + fmt, _ToBytes("\0") * self.size))
+        self.zero = zero
+        self.coerce = coerce
+
+    def IFlatten(self, val):
+        if type(val) == type(()):
+            return val
+        return (val,)
+
+gSDLTypes = {}
+def _AddType(name, code, fmt, zero, coerce):
+    gSDLTypes[name] = SDLType(name, code, fmt, zero, coerce)
+
+_AddType("INT", kSDLInt, "i", 0, _Int)
+_AddType("SHORT", kSDLShort, "h", 0, _Int)
+_AddType("BYTE", kSDLByte, "B", 0, _Int)
+_AddType("BOOL", kSDLBool, "B", 0, _Bool)
+_AddType("FLOAT", kSDLFloat, "f", 0.0, _Float)
+_AddType("DOUBLE", kSDLDouble, "d", 0.0, _Float)
+# the engine reads the age time of day as a float
+_AddType("AGETIMEOFDAY", kSDLFloat, "f", 0.0, _Float)
+# (seconds, microseconds)
+_AddType("TIME", kSDLTime, "II", (0,0), _Tuple(2,_Int))
+_AddType("STRING32", kSDLString32, "%ds" % (kString32Len), "", _String)
+_AddType("VECTOR3", kSDLVector3, "fff", (0.0,0.0,0.0), _Tuple(3,_Float))
+_AddType("POINT3", kSDLPoint3, "fff", (0.0,0.0,0.0), _Tuple(3,_Float))
+_AddType("RGB", kSDLRGB, "fff", (0.0,0.0,0.0), _Tuple(3,_Float))
+_AddType("RGBA", kSDLRGBA, "ffff", (0.0,0.0,0.0,0.0), _Tuple(4,_Float))
+_AddType("RGB8", kSDLRGB, "BBB", (0,0,0), _Tuple(3,_Int))
+_AddType("RGBA8", kSDLRGBA, "BBBB", (0,0,0,0), _Tuple(4,_Int))
+_AddType("QUATERNION", kSDLQuaternion, "ffff", (0.0,0.0,0.0,1.0), _Tuple(4,_Float))
+# only the engine knows what's in these; snapshots carry them as opaque strings
+_AddType("PLKEY", kSDLKey, None, None, _Opaque)
+_AddType("CREATABLE", kSDLCreatable, None, None, _Opaque)
+
+def _ParseDefault(sdlType, text):
+    "turns the text of a DEFAULT= option into an element value of the given type"
+    text = text.strip().rstrip(";")
+    if text.startswith("(") and text.endswith(")"):
+        text = text[1:-1]
+    if len(text) >= 2 and text[0] == '"' and text[-1] == '"':
+        return sdlType.coerce(text[1:-1])
+    if text.lower() in ("empty", "nil"):
+        return sdlType.zero
+    parts = []
+    for part in text.split(","):
+        part = part.strip()
+        if part.lower() == "true":
+            parts.append(1)
+        elif part.lower() == "false":
+            parts.append(0)
+        elif sdlType.code == kSDLString32:
+            parts.append(part)
+        else:
+            try:
+                parts.append(int(part))
+            except ValueError:
+                parts.append(float(part))
+    if type(sdlType.zero) == type(()):
+        if len(parts) == 1:
+            # a plain number is a time in seconds, or the same value for every component
+            if sdlType.code == kSDLTime:
+                parts = [parts[0], 0]
+            else:
+                parts = parts * len(sdlType.zero)
+        return sdlType.coerce(parts)
+    if len(parts) != 1:
+        raise ValueError("too many components")
+    return sdlType.coerce(parts[0])
+
+
+#-------------------------------------------------------------------------------
+# descriptors
+#-------------------------------------------------------------------------------
+class SDLVar:
+    "one VAR line of a STATEDESC"
+    def __init__(self, name, typeName, count, options, flags):
+        self.name = name
+        self.typeName = typeName
+        # None for variable length arrays (name[])
+        self.count = count
+        self.options = options
+        self.flags = flags
+        if typeName.startswith("$"):
+            self.type = None
+            self.descName = typeName[1:]
+            self.code = kSDLStateDescriptor
+            self.default = None
+        else:
+            self.type = gSDLTypes[typeName]
+            self.descName = None
+            self.code = self.type.code
+            if "DEFAULT" in options:
+                self.default = _ParseDefault(self.type, options["DEFAULT"])
+            else:
+                self.default = self.type.zero
+        self.defaultOption = options.get("DEFAULTOPTION")
+        self.displayOption = options.get("DISPLAYOPTION")
+        # byte offset in the packed fixed-size block, None if the var is stored after it
+        self.offset = None
+        self.index = None
+
+    def IsFixed(self):
+        return self.count is not None and self.type is not None and self.type.fmt is not None
+
+    def DefaultValue(self):
+        if self.count is None:
+            return ()
+        return (self.default,) * self.count
+
+class SDLDescriptor:
+    "one VERSION of a STATEDESC, compiled into its packed layout"
+    def __init__(self, name, version, vars, fileName=None):
+        self.name = name
+        self.version = version
+        self.fileName = fileName
+        # things the engine lets through but that are probably mistakes
+        self.warnings = []
+        self.vars = []
+        self.varIndex = {}
+        for var in vars:
+            # the engine finds the first one of a duplicated var, so that's the one we keep
+            if var.name in self.varIndex:
+                self.warnings.append("%s: %s version %d declares %s twice" % (fileName,name,version,var.name))
+                continue
+            var.index = len(self.vars)
+            self.vars.append(var)
+            self.varIndex[var.name] = var
+        vars = self.vars
+        # every fixed-size var is packed into one block with a single struct
+        fmt = "<"
+        self.fixedVars = []
+        self.otherVars = []
+        for var in vars:
+            if var.IsFixed():
+                var.offset = struct.calcsize(fmt)
+                fmt = fmt + var.type.fmt * var.count
+                self.fixedVars.append(var)
+            else:
+                self.otherVars.append(var)
+        self.fixedStruct = struct.Struct(fmt)
+        self.fixedSize = self.fixedStruct.size
+        self.defaults = {}
+        for var in vars:
+            self.defaults[var.name] = var.DefaultValue()
+
+    def __repr__(self):
+        return "<SDLDescriptor %s version %d, %d vars>" % (self.name,self.version,len(self.vars))
+
+    def GetVar(self, name):
+        return self.varIndex.get(name)
+
+    def DefaultRecord(self):
+        return self.defaults.copy()
+
+
+#-------------------------------------------------------------------------------
+# parser
+#-------------------------------------------------------------------------------
+_kStateDescRE = re.compile(r"^STATEDESC\s+(\w+)\s*(\{)?$")
+_kVersionRE = re.compile(r"^VERSION\s+(\d+)$")
+_kVarRE = re.compile(r"^VAR\s+(\$?\w+)\s+(\w+)\s*\[\s*(\d*)\s*\]\s*(.*)$")
+_kOptionRE = re.compile(r'(\w+)\s*=\s*("[^"]*"|\([^)]*\)|[^\s]+)|(\w+)')
+
+def ParseSDL(text, fileName="<sdl>"):
+    "returns the SDLDescriptors declared in the text of an .sdl file, in file order"
+    descriptors = []
+    name = None
+    version = None
+    vars = None
+    inBody = 0
+    lineNum = 0
+    for line in text.splitlines():
+        lineNum += 1
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        where = "%s(%d)" % (fileName,lineNum)
+        match = _kStateDescRE.match(line)
+        if match:
+            if name is not None:
+                raise SDLSchemaError("%s: STATEDESC %s inside STATEDESC %s" % (where,match.group(1),name))
+            name = match.group(1)
+            version = None
+            vars = []
+            inBody = match.group(2) is not None
+            continue
+        if name is None:
+            raise SDLSchemaError("%s: '%s' outside of a STATEDESC" % (where,line))
+        if line == "{":
+            inBody = 1
+            continue
+        if not inBody:
+            raise SDLSchemaError("%s: expected '{' after STATEDESC %s" % (where,name))
+        if line == "}":
+            if version is None:
+                raise SDLSchemaError("%s: STATEDESC %s has no VERSION" % (where,name))
+            descriptors.append(SDLDescriptor(name, version, vars, fileName))
+            name = None
+            continue
+        match = _kVersionRE.match(line)
+        if match:
+            version = int(match.group(1))
+            continue
+        match = _kVarRE.match(line)
+        if match is None:
+            raise SDLSchemaError("%s: can't parse '%s'" % (where,line))
+        typeName, varName, count, rest = match.groups()
+        if not typeName.startswith("$") and typeName not in gSDLTypes:
+            raise SDLSchemaError("%s: unknown type %s" % (where,typeName))
+        if count:
+            count = int(count)
+        else:
+            count = None
+        options = {}
+        flags = []
+        for option in _kOptionRE.finditer(rest):
+            if option.group(3):
+                flags.append(option.group(3).upper())
+            else:
+                options[option.group(1).upper()] = option.group(2)
+        try:
+            vars.append(SDLVar(varName, typeName, count, options, flags))
+        except ValueError:
+            raise SDLSchemaError("%s: bad default for %s: %s" % (where,varName,options.get("DEFAULT")))
+    if name is not None:
+        raise SDLSchemaError("%s: STATEDESC %s is not closed" % (fileName,name))
+    return descriptors
+
+
+#-------------------------------------------------------------------------------
+# schema
+#-------------------------------------------------------------------------------
+class SDLSchema:
+    "every version of every STATEDESC, with migration maps to the latest versions"
+    def __init__(self):
+        # name -> {version : SDLDescriptor}
+        self.descriptors = {}
+        # name -> latest SDLDescriptor
+        self.latest = {}
+        # (name, old version) -> tuple of (var name, old var or None, needs conversion)
+        self.migrations = {}
+
+    def AddText(self, text, fileName="<sdl>"):
+        for desc in ParseSDL(text, fileName):
+            versions = self.descriptors.setdefault(desc.name, {})
+            if desc.version in versions:
+                raise SDLSchemaError("%s: %s version %d is already declared in %s" % (fileName,desc.name,desc.version,versions[desc.version].fileName))
+            versions[desc.version] = desc
+
+    def AddFile(self, path):
+        f = open(path, "r")
+        try:
+            self.AddText(f.read(), os.path.basename(path))
+        finally:
+            f.close()
+
+    def AddDirectory(self, path):
+        fileNames = [fileName for fileName in os.listdir(path) if fileName.lower().endswith(".sdl")]
+        fileNames.sort()
+        for fileName in fileNames:
+            self.AddFile(os.path.join(path, fileName))
+
+    def Compile(self):
+        "checks nested descriptor references and builds the migration maps"
+        self.latest = {}
+        self.migrations = {}
+        for name, versions in self.descriptors.items():
+            self.latest[name] = versions[max(versions.keys())]
+        for name, versions in self.descriptors.items():
+            latest = self.latest[name]
+            for desc in versions.values():
+                for var in desc.vars:
+                    if var.descName is None:
+                        continue
+                    if var.descName not in self.latest:
+                        raise SDLSchemaError("%s: %s.%s refers to unknown STATEDESC %s" % (desc.fileName,name,var.name,var.descName))
+                    # a nested record defaults to the defaults of the latest version of its descriptor
+                    var.default = self.latest[var.descName].defaults
+                    desc.defaults[var.name] = var.DefaultValue()
+                if desc is latest:
+                    continue
+                varMap = []
+                for var in latest.vars:
+                    oldVar = desc.varIndex.get(var.name)
+                    if oldVar is None:
+                        varMap.append((var.name, None, 0))
+                    else:
+                        convert = oldVar.typeName != var.typeName or oldVar.count != var.count
+                        varMap.append((var.name, oldVar, convert))
+                self.migrations[(name, desc.version)] = tuple(varMap)
+        return self
+
+    def GetDescriptor(self, name, version=None):
+        "returns the given (or the latest) version of a STATEDESC"
+        if version is None:
+            desc = self.latest.get(name)
+        else:
+            desc = self.descriptors.get(name, {}).get(version)
+        if desc is None:
+            raise SDLSchemaError("no STATEDESC %s version %s" % (name,version))
+        return desc
+
+    def GetVar(self, name, varName, version=None):
+        return self.GetDescriptor(name, version).GetVar(varName)
+
+    def DefaultRecord(self, name, version=None):
+        return self.GetDescriptor(name, version).DefaultRecord()
+
+    def Migrate(self, desc, record):
+        "converts a record of an older version of desc into one for the latest version"
+        latest = self.latest[desc.name]
+        if desc is latest:
+            return record
+        newRecord = {}
+        for varName, oldVar, convert in self.migrations[(desc.name, desc.version)]:
+            var = latest.varIndex[varName]
+            if oldVar is None or varName not in record:
+                newRecord[varName] = latest.defaults[varName]
+            elif convert:
+                newRecord[varName] = self.IConvert(oldVar, var, record[varName])
+            else:
+                newRecord[varName] = record[varName]
+        return newRecord
+
+    def IConvert(self, oldVar, var, value):
+        "fits a value to a var whose type or length changed, falling back to its default"
+        if var.type is None or oldVar.type is None:
+            if var.descName != oldVar.descName:
+                return var.DefaultValue()
+            items = list(value)
+        else:
+            items = []
+            for item in value:
+                try:
+                    items.append(var.type.coerce(item))
+                except (TypeError, ValueError):
+                    items.append(var.default)
+        if var.count is not None:
+            items = items[:var.count] + [var.default] * (var.count - len(items))
+        return tuple(items)
+
+    def Validate(self, name, record, version=None):
+        "returns a list of problems with the record, empty if it fits the descriptor"
+        desc = self.GetDescriptor(name, version)
+        problems = []
+        for varName in record.keys():
+            if varName not in desc.varIndex:
+                problems.append("%s: unknown variable" % (varName))
+        for var in desc.vars:
+            if var.name not in record:
+                problems.append("%s: missing" % (var.name))
+                continue
+            value = record[var.name]
+            if type(value) not in (type(()), type([])):
+                problems.append("%s: value is not a tuple" % (var.name))
+                continue
+            if var.count is not None and len(value) != var.count:
+                problems.append("%s: %d values instead of %d" % (var.name,len(value),var.count))
+            for item in value:
+                if var.descName is not None:
+                    if type(item) != type({}):
+                        problems.append("%s: nested record is not a dictionary" % (var.name))
+                    else:
+                        nested = self.latest[var.descName]
+                        problems.extend(["%s.%s" % (var.name,problem) for problem in self.Validate(nested.name, item)])
+                elif var.type.fmt is not None:
+                    try:
+                        item = var.type.coerce(item)
+                        struct.pack("<" + var.type.fmt, *[_ToBytes(part) for part in var.type.IFlatten(item)])
+                        if var.type.code == kSDLString32 and len(_ToBytes(item)) > kString32Len:
+                            raise ValueError
+                    except (TypeError, ValueError, struct.error):
+                        problems.append("%s: %r doesn't fit a %s" % (var.name,item,var.typeName))
+        return problems
+
+    def Diff(self, name, oldRecord, newRecord, version=None):
+        "returns (var name, old value, new value) for every variable that differs"
+        desc = self.GetDescriptor(name, version)
+        changes = []
+        for var in desc.vars:
+            oldValue = oldRecord.get(var.name, desc.defaults[var.name])
+            newValue = newRecord.get(var.name, desc.defaults[var.name])
+            if oldValue != newValue:
+                changes.append((var.name, oldValue, newValue))
+        return changes
+
+    #---------------------------------------------------------------------------
+    # snapshot codec
+    #   header: magic, name length (byte), name, version (ushort)
+    #   body:   the fixed-size vars packed at their offsets, then every other var in
+    #           declaration order: an element count (ushort) for name[] arrays, then
+    #           the elements: packed values, opaque strings (ushort length) or nested
+    #           bodies (ushort version first)
+    #---------------------------------------------------------------------------
+    def Encode(self, name, record, version=None):
+        "packs a record into a snapshot string"
+        desc = self.GetDescriptor(name, version)
+        descName = _ToBytes(desc.name)
+        chunks = [kSnapshotMagic, struct.pack("<B", len(descName)), descName, struct.pack("<H", desc.version)]
+        self.IEncodeBody(desc, record, chunks)
+        return _ToBytes("").join(chunks)
+
+    def Decode(self, data, migrate=1):
+        "unpacks a snapshot; returns (name, version, record), migrated to the latest version unless told not to"
+        if data[:len(kSnapshotMagic)] != kSnapshotMagic:
+            raise SDLSchemaError("not an SDL snapshot")
+        pos = len(kSnapshotMagic)
+        nameLen = struct.unpack_from("<B", data, pos)[0]
+        pos += 1
+        name = _FromBytes(data[pos:pos + nameLen])
+        pos += nameLen
+        version = struct.unpack_from("<H", data, pos)[0]
+        pos += 2
+        desc = self.GetDescriptor(name, version)
+        record, pos = self.IDecodeBody(desc, data, pos)
+        if pos != len(data):
+            raise SDLSchemaError("%d bytes left over after %s version %d" % (len(data) - pos,name,version))
+        if migrate:
+            record = self.Migrate(desc, record)
+            version = self.latest[name].version
+        return name, version, record
+
+    def IEncodeBody(self, desc, record, chunks):
+        flat = []
+        for var in desc.fixedVars:
+            value = record.get(var.name, desc.defaults[var.name])
+            coerce = var.type.coerce
+            if var.type.code == kSDLString32:
+                flat.extend([_ToBytes(coerce(item)) for item in value])
+            elif var.type.width == 1:
+                flat.extend([coerce(item) for item in value])
+            else:
+                for item in value:
+                    flat.extend(coerce(item))
+        try:
+            chunks.append(desc.fixedStruct.pack(*flat))
+        except struct.error:
+            raise SDLSchemaError("%s version %d: value out of range (%s)" % (desc.name,desc.version,self.Validate(desc.name,record,desc.version)))
+        for var in desc.otherVars:
+            value = record.get(var.name, desc.defaults[var.name])
+            if var.count is None:
+                chunks.append(struct.pack("<H", len(value)))
+            if var.descName is not None:
+                nested = self.latest[var.descName]
+                for item in value:
+                    chunks.append(struct.pack("<H", nested.version))
+                    self.IEncodeBody(nested, item, chunks)
+            elif var.type.fmt is None:
+                for item in value:
+                    if item is None:
+                        chunks.append(struct.pack("<H", kNoneLen))
+                    else:
+                        item = _ToBytes(item)
+                        chunks.append(struct.pack("<H", len(item)))
+                        chunks.append(item)
+            else:
+                flat = []
+                for item in value:
+                    item = var.type.coerce(item)
+                    if var.type.code == kSDLString32:
+                        item = _ToBytes(item)
+                    flat.extend(var.type.IFlatten(item))
+                chunks.append(struct.pack("<" + var.type.fmt * len(value), *flat))
+
+    def IDecodeBody(self, desc, data, pos):
+        record = {}
+        flat = desc.fixedStruct.unpack_from(data, pos)
+        pos += desc.fixedSize
+        start = 0
+        for var in desc.fixedVars:
+            width = var.type.width
+            end = start + width * var.count
+            record[var.name] = self.IUnflatten(var, flat[start:end])
+            start = end
+        for var in desc.otherVars:
+            count = var.count
+            if count is None:
+                count = struct.unpack_from("<H", data, pos)[0]
+                pos += 2
+            if var.descName is not None:
+                items = []
+                for i in range(count):
+                    version = struct.unpack_from("<H", data, pos)[0]
+                    nested = self.GetDescriptor(var.descName, version)
+                    item, pos = self.IDecodeBody(nested, data, pos + 2)
+                    items.append(self.Migrate(nested, item))
+                record[var.name] = tuple(items)
+            elif var.type.fmt is None:
+                items = []
+                for i in range(count):
+                    length = struct.unpack_from("<H", data, pos)[0]
+                    pos += 2
+                    if length == kNoneLen:
+                        items.append(None)
+                    else:
+                        items.append(data[pos:pos + length])
+                        pos += length
+                record[var.name] = tuple(items)
+            else:
+                fmt = "<" + var.type.fmt * count
+                record[var.name] = self.IUnflatten(var, struct.unpack_from(fmt, data, pos))
+                pos += struct.calcsize(fmt)
+        return record, pos
+
+    def IUnflatten(self, var, flat):
+        if var.type.code == kSDLString32:
+            return tuple([_FromBytes(item) for item in flat])
+        width = var.type.width
+        if width == 1:
+            return tuple(flat)
+        return tuple([tuple(flat[i:i + width]) for i in range(0, len(flat), width)])
+
+
+#-------------------------------------------------------------------------------
+# loading
+#-------------------------------------------------------------------------------
+def CompileSDLDir(path):
+    "parses and compiles every .sdl file in a directory"
+    schema = SDLSchema()
+    schema.AddDirectory(path)
+    return schema.Compile()
+
+def SaveCompiledSchema(schema, path):
+    "writes the parsed descriptors to a file that LoadSchema() reads without parsing the .sdl text"
+    tables = []
+    for name, versions in schema.descriptors.items():
+        for desc in versions.values():
+            vars = [(var.name, var.typeName, var.count, var.options, var.flags) for var in desc.vars]
+            tables.append((desc.name, desc.version, desc.fileName, vars))
+    f = open(path, "wb")
+    try:
+        f.write(_ToBytes(kCompiledMagic))
+        pickle.dump(tables, f, 2)
+    finally:
+        f.close()
+
+def LoadSchema(path):
+    "loads a schema from an SDL directory, a single .sdl file or a file written by SaveCompiledSchema()"
+    if os.path.isdir(path):
+        return CompileSDLDir(path)
+    f = open(path, "rb")
+    try:
+        if f.read(len(kCompiledMagic)) != _ToBytes(kCompiledMagic):
+            schema = SDLSchema()
+            schema.AddFile(path)
+            return schema.Compile()
+        tables = pickle.load(f)
+    finally:
+        f.close()
+    schema = SDLSchema()
+    for name, version, fileName, vars in tables:
+        vars = [SDLVar(varName, typeName, count, options, flags) for varName, typeName, count, options, flags in vars]
+        schema.descriptors.setdefault(name, {})[version] = SDLDescriptor(name, version, vars, fileName)
+    return schema.Compile()
+
+
+#-------------------------------------------------------------------------------
+# benchmark: parse all of SDL/ and round-trip every default record
+#-------------------------------------------------------------------------------
+def Benchmark(path, rounds=10):
+    startTime = time.time()
+    schema = CompileSDLDir(path)
+    parseTime = time.time() - startTime
+    descs = []
+    for versions in schema.descriptors.values():
+        descs.extend(versions.values())
+    numVars = 0
+    for desc in descs:
+        numVars += len(desc.vars)
+    print("xSDLSchema: parsed %d STATEDESCs (%d versions, %d vars) in %.3fs" % (len(schema.latest),len(descs),numVars,parseTime))
+    for desc in descs:
+        for warning in desc.warnings:
+            print("xSDLSchema: warning: %s" % (warning))
+
+    snapshots = []
+    startTime = time.time()
+    for i in range(rounds):
+        snapshots = []
+        for desc in descs:
+            snapshots.append(schema.Encode(desc.name, desc.DefaultRecord(), desc.version))
+    encodeTime = (time.time() - startTime) / rounds
+    startTime = time.time()
+    for i in range(rounds):
+        records = []
+        for data in snapshots:
+            records.append(schema.Decode(data, 0))
+    decodeTime = (time.time() - startTime) / rounds
+    failures = 0
+    for desc, (name, version, record) in zip(descs, records):
+        if name != desc.name or version != desc.version or schema.Diff(name, desc.defaults, record, version):
+            print("xSDLSchema: %s version %d doesn't round-trip" % (desc.name,desc.version))
+            failures += 1
+        else:
+            schema.Migrate(desc, record)
+    size = 0
+    for data in snapshots:
+        size += len(data)
+    print("xSDLSchema: encoded %d default records (%d bytes) in %.4fs, decoded in %.4fs, %d failures" % (len(snapshots),size,encodeTime,decodeTime,failures))
+    return failures
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1:
+        sdlPath = sys.argv[1]
+    else:
+        sdlPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDL")
+    sys.exit(Benchmark(sdlPath) and 1 or 0)
@@ -88,6 +88,12 @@ kTextWrapHeight = 400
 
 theCensorLevel = 0
 
+# inbox element ID -> ptVaultNodeRef, rebuilt whenever the inbox is refreshed
+ImagerRefs = {}
+# element ID -> prepared display frame: (key,elemType,payload) where key is (modify time, censor level)
+# and payload is the ptImage of an image node or the localized, censored text of a text note
+ImagerFrames = {}
+
 CurrentDisplayedElementID = -1
 RegionMembers = 0
 
@@ -118,13 +124,13 @@ class xSimpleImager(ptModifier):
         PtDebugPrint("xSimpleImager: vaultOperationStarted(%s)"%(context),level=kDebugDumpLevel)
 
     def vaultOperationComplete(self,context,args,resultCode):
-        PtDebugPrint("xSimpleImager: vaultOperationComplete(%s,%s)"%(context,resultCode),level=kDebugDumpLevel)
+        PtDebugPrint(lambda: "xSimpleImager: vaultOperationComplete(%s,%s)" % (context,resultCode),level=kDebugDumpLevel)
         if context==kAddingDevice:
             PtDebugPrint("\tkAddingDevice",level=kDebugDumpLevel)
             if resultCode>=0:
                 node = args[0].upcastToTextNoteNode()
                 if node:
-                    PtDebugPrint("\tAdded device: %s"%(ImagerName.value),level=kDebugDumpLevel)
+                    PtDebugPrint(lambda: "\tAdded device: %s" % (ImagerName.value),level=kDebugDumpLevel)
                     name = ""
                     if type(ImagerInboxVariable.value) == type("") and ImagerInboxVariable.value != "":
                         ageSDL = PtGetAgeSDL()
@@ -135,7 +141,7 @@ class xSimpleImager(ptModifier):
                             name = node.noteGetTitle()
                     else:
                         name = node.noteGetTitle()
-                    PtDebugPrint("\tSetting device inbox: %s"%(name),level=kDebugDumpLevel)
+                    PtDebugPrint(lambda: "\tSetting device inbox: %s" % (name),level=kDebugDumpLevel)
                     node.setDeviceInbox(name, self, kSettingDeviceInbox)
                 else:
                     PtDebugPrint("xSimpleImager:ERROR! device node not found",level=kErrorLevel)
@@ -149,6 +155,7 @@ class xSimpleImager(ptModifier):
             
             if resultCode>=0:
                 CurrentContentIdx = 0
+                Instance.IDetermineCensorLevel()
                 Instance.IRefreshImagerFolder()
                 Instance.IChangeCurrentContent()
                 # set up our timer callback
@@ -181,6 +188,7 @@ class xSimpleImager(ptModifier):
     
     def OnServerInitComplete(self):
         if AgeStartedIn == PtGetAgeName():
+            self.IDetermineCensorLevel()
             ageSDL = PtGetAgeSDL()
             ageSDL.setNotify(self.key,ImagerInboxVariable.value,0.0)
             if type(ImagerInboxVariable.value) == type("") and ImagerInboxVariable.value != "":
@@ -225,6 +233,8 @@ class xSimpleImager(ptModifier):
                 CurrentContentIdx += 1
                 if CurrentContentIdx >= len(ImagerContents):
                     CurrentContentIdx = 0
+                    # pick up a changed censor level once per trip through the contents
+                    self.IDetermineCensorLevel()
             self.IChangeCurrentContent()
             PtAtTimeCallback(self.key,ImagerTime.value,kFlipImagesTimerCurrent)
 
@@ -268,6 +278,7 @@ class xSimpleImager(ptModifier):
         elif event == PtVaultCallbackTypes.kVaultNodeSaved:
             PtDebugPrint("xSimpleImager: kVaultNodeSaved event (id=%d,type=%d)" % (tupdata[0].getID(),tupdata[0].getType()), level=kDebugDumpLevel)
             # tupdata is ( ptVaultNode )
+            self.IForgetFrame(tupdata[0].getID())
             self.IRefreshImagerFolder()
             self.IRefreshImagerElement(tupdata[0])
         elif event == PtVaultCallbackTypes.kVaultNodeRefAdded:
@@ -282,8 +293,8 @@ class xSimpleImager(ptModifier):
         elif event == PtVaultCallbackTypes.kVaultNodeRefRemoved:
             PtDebugPrint("xSimpleImager: kVaultNodeRefRemoved event (childID,parentID) ",tupdata,level=kDebugDumpLevel)
             # tupdata is ( childID, parentID )
+            self.IForgetFrame(tupdata[0])
             self.IRefreshImagerFolder()
-            pass
         elif event == PtVaultCallbackTypes.kVaultOperationFailed:
             #~ print "xSimpleImager: kVaultOperationFailed event  (operation,resultCode) ",tupdata
             #tupdata is ( operation, resultCode )
@@ -386,6 +397,7 @@ class xSimpleImager(ptModifier):
         if type(folder) != type(None):
             prevsize = len(ImagerContents)
             ImagerContents = folder.getChildNodeRefList()
+            self.IIndexInbox(ImagerContents)
             # check to make sure we are not over budget... but only on the master
             if ImagerObject.sceneobject.isLocallyOwned():
                 if len(ImagerContents) > ImagerMax.value:
@@ -401,6 +413,24 @@ class xSimpleImager(ptModifier):
             # there is no folders
             #~ print "simpleImager: folder(%s) had nothing in it!" % (ImagerName.value)
             ImagerContents = []
+            self.IIndexInbox(ImagerContents)
+
+    def IIndexInbox(self,refs):
+        "Rebuild the element ID -> ref index, and drop the frames of elements that have left the inbox"
+        global ImagerRefs
+        ImagerRefs = {}
+        for ref in refs:
+            elem = ref.getChild()
+            if type(elem) != type(None):
+                ImagerRefs[elem.getID()] = ref
+        for elemID in ImagerFrames.keys():
+            if not ImagerRefs.has_key(elemID):
+                del ImagerFrames[elemID]
+
+    def IForgetFrame(self,elemID):
+        "The element changed (or is gone), so its frame has to be prepared again"
+        if ImagerFrames.has_key(elemID):
+            del ImagerFrames[elemID]
 
     def IRefreshImagerContent(self,updated_content):
         "Refresh a content of the Imager (if being displayed)"
@@ -421,16 +451,9 @@ class xSimpleImager(ptModifier):
             if updated_element.getID() == CurrentDisplayedElementID:
                 self.IShowCurrentContent()
             else:
-                ageVault = ptAgeVault()
-                folder = ageVault.getDeviceInbox(ImagerName.value)
-                if type(folder) != type(None):
-                    frefs = folder.getChildNodeRefList()
-                    for ref in frefs:
-                        elem = ref.getChild()
-                        if type(elem) != type(None) and elem.getID() == updated_element.getID():
-                            if not ref.beenSeen():
-                                self.IChangeCurrentContent(updated_element.getID())
-                                return
+                ref = ImagerRefs.get(updated_element.getID())
+                if type(ref) != type(None) and not ref.beenSeen():
+                    self.IChangeCurrentContent(updated_element.getID())
 
     def IChangeCurrentContent(self,next=None):
         "send a message to ourselves to say what the next"
@@ -467,58 +490,82 @@ class xSimpleImager(ptModifier):
         global CurrentDisplayedElementID
         global theCensorLevel
         if CurrentDisplayedElementID != -1:
-            ageVault = ptAgeVault()
-            folder = ageVault.getDeviceInbox(ImagerName.value)
-            if type(folder) != type(None):
-                fcontents = folder.getChildNodeRefList()
-                for content in fcontents:
-                    element = content.getChild()
-                    if type(element) != type(None) and element.getID() == CurrentDisplayedElementID:
-                        # set that we've seen this... at least once
-                        content.setSeen()
-                        elemType = element.getType()
-                        if elemType == PtVaultNodeTypes.kImageNode:
-                            element = element.upcastToImageNode()
-                            PtDebugPrint("simpleImager: now showing image %s" % (element.imageGetTitle()),level=kDebugDumpLevel)
-                            ImagerMap.textmap.drawImage(0,0,element.imageGetImage(),0)
-                            ImagerMap.textmap.flush()
-                        elif elemType == PtVaultNodeTypes.kTextNoteNode:
-                            element = element.upcastToTextNoteNode()
-                            textbody = element.noteGetText()
-                            if textbody == "cleardaImager":
-                                PtDebugPrint("xSimpleImager[%s]: clearing the imager of images" % (ImagerName.value),level=kWarningLevel)
-                                folder.removeAllNodes()
-                            else:
-                                self.IDetermineCensorLevel()
-                                ImagerMap.textmap.clearToColor(ptColor().black())
-                                ImagerMap.textmap.setTextColor(ptColor().white())
-                                ImagerMap.textmap.setWrapping(kTextWrapWidth,kTextWrapHeight)
-                                ImagerMap.textmap.setFont(kTextFontFace,kTextFontSize)
-                                try:
-                                    textfrom = content.getSaver().playerGetName()
-                                except:
-                                    textfrom = "System"
-                                try:
-                                    textsubject = element.noteGetTitle()
-                                except:
-                                    textsubject = "Imager Transmission"
-                                PtDebugPrint("simpleImager: now showing textnote %s" % (textsubject),level=kDebugDumpLevel)
-                                message = PtGetLocalizedString("Neighborhood.Messages.Imager", [textfrom, textsubject, textbody])
-                                message = xCensor.xCensor(message,theCensorLevel)
-                                ImagerMap.textmap.drawTextW(kTextXStart,kTextYStart,message)
-                                ImagerMap.textmap.flush()
-                        else:
-                            PtDebugPrint("xSimpleImager[%s]: Can't display element type %d" % (ImagerName.value,elemType),level=kWarningLevel)
-                            pass
-                        return
-            else:
-                PtDebugPrint("xSimpleImager[%s]: Inbox for imager is None" % (ImagerName.value),level=kWarningLevel)
+            content = ImagerRefs.get(CurrentDisplayedElementID)
+            if type(content) == type(None):
+                # we may have been told about the element before we heard from the vault
+                ageVault = ptAgeVault()
+                folder = ageVault.getDeviceInbox(ImagerName.value)
+                if type(folder) == type(None):
+                    PtDebugPrint("xSimpleImager[%s]: Inbox for imager is None" % (ImagerName.value),level=kWarningLevel)
+                    return
+                self.IIndexInbox(folder.getChildNodeRefList())
+                content = ImagerRefs.get(CurrentDisplayedElementID)
+                if type(content) == type(None):
+                    return
+            element = content.getChild()
+            if type(element) == type(None):
+                return
+            # set that we've seen this... at least once
+            content.setSeen()
+            frame = self.IGetFrame(content,element)
+            if type(frame) == type(None):
+                return
+            elemType = frame[1]
+            if elemType == PtVaultNodeTypes.kImageNode:
+                ImagerMap.textmap.drawImage(0,0,frame[2],0)
+                ImagerMap.textmap.flush()
+            elif elemType == PtVaultNodeTypes.kTextNoteNode:
+                ImagerMap.textmap.clearToColor(ptColor().black())
+                ImagerMap.textmap.setTextColor(ptColor().white())
+                ImagerMap.textmap.setWrapping(kTextWrapWidth,kTextWrapHeight)
+                ImagerMap.textmap.setFont(kTextFontFace,kTextFontSize)
+                ImagerMap.textmap.drawTextW(kTextXStart,kTextYStart,frame[2])
+                ImagerMap.textmap.flush()
         else:
             # undisplaying all images... to be done later...
             ImagerMap.textmap.clearToColor(ptColor(0,0,0,0))
             ImagerMap.textmap.flush()
             PtDebugPrint("xSimpleImager[%s]: no current element id to display" % (ImagerName.value),level=kDebugDumpLevel)
 
+    def IGetFrame(self,content,element):
+        "Returns the prepared display frame for an element, preparing it only if the element or censor level changed"
+        elemID = element.getID()
+        key = (element.getModifyTime(),theCensorLevel)
+        frame = ImagerFrames.get(elemID)
+        if type(frame) != type(None) and frame[0] == key:
+            return frame
+        elemType = element.getType()
+        if elemType == PtVaultNodeTypes.kImageNode:
+            element = element.upcastToImageNode()
+            PtDebugPrint("simpleImager: now showing image %s" % (element.imageGetTitle()),level=kDebugDumpLevel)
+            frame = (key,elemType,element.imageGetImage())
+        elif elemType == PtVaultNodeTypes.kTextNoteNode:
+            element = element.upcastToTextNoteNode()
+            textbody = element.noteGetText()
+            if textbody == "cleardaImager":
+                PtDebugPrint("xSimpleImager[%s]: clearing the imager of images" % (ImagerName.value),level=kWarningLevel)
+                folder = ptAgeVault().getDeviceInbox(ImagerName.value)
+                if type(folder) != type(None):
+                    folder.removeAllNodes()
+                return None
+            try:
+                textfrom = content.getSaver().playerGetName()
+            except:
+                textfrom = "System"
+            try:
+                textsubject = element.noteGetTitle()
+            except:
+                textsubject = "Imager Transmission"
+            PtDebugPrint("simpleImager: now showing textnote %s" % (textsubject),level=kDebugDumpLevel)
+            message = PtGetLocalizedString("Neighborhood.Messages.Imager", [textfrom, textsubject, textbody])
+            message = xCensor.xCensor(message,theCensorLevel)
+            frame = (key,elemType,message)
+        else:
+            PtDebugPrint("xSimpleImager[%s]: Can't display element type %d" % (ImagerName.value,elemType),level=kWarningLevel)
+            return None
+        ImagerFrames[elemID] = frame
+        return frame
+
     def OnSDLNotify(self,VARname,SDLname,playerID,tag):        
         if VARname != ImagerInboxVariable.value:
             return
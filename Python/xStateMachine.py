@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+""" *==LICENSE==*
+
+CyanWorlds.com Engine - MMOG client, server and tools
+Copyright (C) 2011  Cyan Worlds, Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Additional permissions under GNU GPL version 3 section 7
+
+If you modify this Program, or any covered work, by linking or
+combining it with any of RAD Game Tools Bink SDK, Autodesk 3ds Max SDK,
+NVIDIA PhysX SDK, Microsoft DirectX SDK, OpenSSL library, Independent
+JPEG Group JPEG library, Microsoft Windows Media SDK, or Apple QuickTime SDK
+(or a modified version of those libraries),
+containing parts covered by the terms of the Bink SDK EULA, 3ds Max EULA,
+PhysX SDK EULA, DirectX SDK EULA, OpenSSL and SSLeay licenses, IJG
+JPEG Library README, Windows Media SDK EULA, or QuickTime SDK EULA, the
+licensors of this Program grant you additional
+permission to convey the resulting work. Corresponding Source for a
+non-source form of such a combination shall include the source code for
+the parts of OpenSSL and IJG JPEG Library used as well as that of the covered
+work.
+
+You can contact Cyan Worlds, Inc. by email legal@cyan.com
+ or by snail mail at:
+      Cyan Worlds, Inc.
+      14617 N Newport Hwy
+      Mead, WA   99021
+
+ *==LICENSE==* """
+"""
+Module: xStateMachine
+Age: global
+Date: October 2026
+Table driven state machines for the age brains.
+The transitions are given as a dictionary keyed by (state, input), usually with the
+state and input values of two xEnum.Enum's.  Each transition is one of:
+    newState                    - go to newState
+    (newState, fastforward)     - go to newState, with the fastforward flag for the responders
+    {val: transition, ...}      - pick the transition by the value that came with the input
+    function                    - function(context, val) returns one of the above
+The table is checked and compiled once, when the machine is created, so a transition
+is a single dictionary lookup.  Machines can keep the last few transitions they made
+(the trace) for debugging and profiling.
+"""
+
+from Plasma import *
+from PlasmaTypes import *
+
+kTraceSize = 32
+
+
+class StateMachine:
+    "a state machine built from a transition table"
+    def __init__(self, name, states, inputs, table, traceSize=kTraceSize):
+        self.name = name
+        self.states = states
+        self.inputs = inputs
+        self.table = {}
+        for (state, input), transition in table.items():
+            if states.ToString(state) is None or inputs.ToString(input) is None:
+                raise ValueError, "%s: transition from unknown state %s or input %s" % (name, state, input)
+            self.table[(state, input)] = self.ICompile(transition)
+        self.traceSize = traceSize
+        self.trace = []
+        self.traceNext = 0
+        self.count = 0
+
+    def ICompile(self, transition):
+        "turns a transition into (newState, fastforward) or a dictionary/function that gives one"
+        if type(transition) == type(()):
+            newState, fastforward = transition
+            if self.states.ToString(newState) is None:
+                raise ValueError, "%s: transition to unknown state %s" % (self.name, newState)
+            return (newState, fastforward)
+        if type(transition) == type({}):
+            byVal = {}
+            for val, sub in transition.items():
+                byVal[val] = self.ICompile(sub)
+            return byVal
+        if callable(transition):
+            return transition
+        return self.ICompile((transition, 0))
+
+    def Transition(self, state, input, val=0, context=None):
+        "returns (newState, fastforward) for the input in the state, or None if the input isn't valid there"
+        result = self.table.get((state, input))
+        while result is not None and type(result) != type(()):
+            if type(result) == type({}):
+                result = result.get(val)
+            else:
+                result = self.ICompile(result(context, val))
+        if self.traceSize:
+            self.IRecord((state, input, val, result))
+        return result
+
+    def IRecord(self, entry):
+        self.count += 1
+        if len(self.trace) < self.traceSize:
+            self.trace.append(entry)
+        else:
+            self.trace[self.traceNext] = entry
+        self.traceNext = (self.traceNext + 1) % self.traceSize
+
+    def GetTrace(self):
+        "returns the remembered transitions as (state, input, val, (newState, fastforward) or None), oldest first"
+        if len(self.trace) < self.traceSize:
+            return self.trace[:]
+        return self.trace[self.traceNext:] + self.trace[:self.traceNext]
+
+    def PrintTrace(self):
+        "prints the remembered transitions with the state and input names"
+        PtDebugPrint("%s: last %d of %d transitions" % (self.name, len(self.trace), self.count))
+        for state, input, val, result in self.GetTrace():
+            if result is None:
+                target = "(invalid)"
+            else:
+                target = "%s, fastforward = %s" % (self.states.ToString(result[0]), result[1])
+            PtDebugPrint("\t%s --%s(%s)--> %s" % (self.states.ToString(state), self.inputs.ToString(input), val, target))
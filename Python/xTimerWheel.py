@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+""" *==LICENSE==*
+
+CyanWorlds.com Engine - MMOG client, server and tools
+Copyright (C) 2011  Cyan Worlds, Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Additional permissions under GNU GPL version 3 section 7
+
+If you modify this Program, or any covered work, by linking or
+combining it with any of RAD Game Tools Bink SDK, Autodesk 3ds Max SDK,
+NVIDIA PhysX SDK, Microsoft DirectX SDK, OpenSSL library, Independent
+JPEG Group JPEG library, Microsoft Windows Media SDK, or Apple QuickTime SDK
+(or a modified version of those libraries),
+containing parts covered by the terms of the Bink SDK EULA, 3ds Max EULA,
+PhysX SDK EULA, DirectX SDK EULA, OpenSSL and SSLeay licenses, IJG
+JPEG Library README, Windows Media SDK EULA, or QuickTime SDK EULA, the
+licensors of this Program grant you additional
+permission to convey the resulting work. Corresponding Source for a
+non-source form of such a combination shall include the source code for
+the parts of OpenSSL and IJG JPEG Library used as well as that of the covered
+work.
+
+You can contact Cyan Worlds, Inc. by email legal@cyan.com
+ or by snail mail at:
+      Cyan Worlds, Inc.
+      14617 N Newport Hwy
+      Mead, WA   99021
+
+ *==LICENSE==* """
+"""
+Module: xTimerWheel
+Age: global
+Date: October 2026
+Multiplexes any number of logical timers per modifier onto a single engine timer callback.
+Timers are named (so they can be replaced or cancelled one at a time), may repeat, may have
+a random jitter added to their deadline, and timers that fall within the same tick are fired
+by the same engine callback.  A modifier that uses it forwards its OnTimer first:
+    def OnTimer(self,id):
+        if xTimerWheel.OnTimer(self,id):
+            return
+        ...
+AtTime(self,time,id) then works like PtAtTimeCallback(self.key,time,id): OnTimer(id) is called
+when the timer is due.  A callable may be given instead of an id; it is called with no arguments.
+"""
+
+from Plasma import *
+from PlasmaTypes import *
+import heapq
+import random
+import weakref
+import traceback
+
+# the engine timer id the wheel arms for itself; don't use it for anything else
+kTimerWheelID = 0x7E1D
+# timers due within this many seconds of each other are fired by the same engine callback
+kTickLength = 1.0 / 30.0
+
+# id(modifier) -> _TimerQueue
+gTimerQueues = {}
+
+
+class _Timer:
+    def __init__(self, name, deadline, target, repeat, jitter):
+        self.name = name
+        self.deadline = deadline
+        self.target = target
+        self.repeat = repeat
+        self.jitter = jitter
+        self.cancelled = 0
+
+
+class _TimerQueue:
+    "the pending timers of one modifier and the engine callbacks armed for them"
+    def __init__(self, modifier):
+        self.key = modifier.key
+        self.name = modifier.__class__.__name__
+        self.ref = weakref.ref(modifier, self.IOnModifierGone)
+        # heap of (deadline, sequence, _Timer); cancelled timers are dropped when they come up
+        self.heap = []
+        # name -> _Timer
+        self.timers = {}
+        # deadlines of the engine callbacks that are on their way, earliest first
+        self.armed = []
+        self.sequence = 0
+        # 'requests' counts every time a timer was (re)armed, i.e. the PtAtTimeCallbacks it would have cost
+        self.stats = {'requests' : 0, 'fired' : 0, 'cancelled' : 0, 'engineCallbacks' : 0}
+
+    def IOnModifierGone(self, ref):
+        for key, queue in gTimerQueues.items():
+            if queue is self:
+                del gTimerQueues[key]
+
+    def IPush(self, timer):
+        self.sequence += 1
+        heapq.heappush(self.heap, (timer.deadline, self.sequence, timer))
+        self.stats['requests'] += 1
+        self.IArm(timer.deadline)
+
+    def IArm(self, deadline):
+        "makes sure an engine callback arrives no later than a tick after the deadline"
+        if self.armed and self.armed[0] <= deadline + kTickLength:
+            return
+        delay = deadline - PtGetGameTime()
+        if delay < 0.0:
+            delay = 0.0
+        PtAtTimeCallback(self.key, delay, kTimerWheelID)
+        self.armed.append(deadline)
+        self.armed.sort()
+        self.stats['engineCallbacks'] += 1
+
+    def IPopDue(self, now):
+        "returns every live timer due by the end of the current tick, in deadline order"
+        due = []
+        horizon = now + kTickLength
+        while self.heap and self.heap[0][0] <= horizon:
+            timer = heapq.heappop(self.heap)[2]
+            if timer.cancelled:
+                continue
+            due.append(timer)
+        return due
+
+
+def _GetQueue(modifier, create=1):
+    queue = gTimerQueues.get(id(modifier))
+    if queue is not None and queue.ref() is not modifier:
+        queue = None
+    if queue is None and create:
+        queue = _TimerQueue(modifier)
+        gTimerQueues[id(modifier)] = queue
+    return queue
+
+def _Deadline(now, time, jitter):
+    if jitter:
+        time += random.uniform(0.0, jitter)
+    return now + time
+
+def AtTime(modifier, time, target, name=None, repeat=0.0, jitter=0.0):
+    """calls modifier.OnTimer(target) (or target(), if it is callable) in time seconds
+    a timer with the same name is replaced; repeat re-arms it every repeat seconds until it is
+    cancelled, and jitter adds up to that many random seconds to every deadline
+    returns the timer's name"""
+    queue = _GetQueue(modifier)
+    if name is None:
+        name = ("timer", queue.sequence + 1)
+    CancelTimer(modifier, name)
+    timer = _Timer(name, _Deadline(PtGetGameTime(), time, jitter), target, repeat, jitter)
+    queue.timers[name] = timer
+    queue.IPush(timer)
+    return name
+
+def CancelTimer(modifier, name):
+    "cancels the named timer; returns true if it was pending"
+    queue = _GetQueue(modifier, 0)
+    if queue is None:
+        return 0
+    timer = queue.timers.get(name)
+    if timer is None:
+        return 0
+    # it stays in the heap until it comes up, which is cheaper than digging it out now
+    timer.cancelled = 1
+    del queue.timers[name]
+    queue.stats['cancelled'] += 1
+    return 1
+
+def ClearTimers(modifier):
+    "cancels every timer of the modifier; unlike PtClearTimerCallbacks its other engine timers are left alone"
+    queue = _GetQueue(modifier, 0)
+    if queue is None:
+        return
+    for name in queue.timers.keys():
+        CancelTimer(modifier, name)
+    queue.heap = []
+
+def HasTimer(modifier, name):
+    queue = _GetQueue(modifier, 0)
+    return queue is not None and name in queue.timers
+
+def OnTimer(modifier, id):
+    "call first thing from the modifier's OnTimer; returns true if the callback was the wheel's"
+    if id != kTimerWheelID:
+        return 0
+    queue = _GetQueue(modifier, 0)
+    if queue is None:
+        return 1
+    now = PtGetGameTime()
+    if queue.armed:
+        del queue.armed[0]
+    for timer in queue.IPopDue(now):
+        # a timer cancelled by one fired earlier in this batch doesn't go off
+        if timer.cancelled:
+            continue
+        if timer.repeat > 0.0:
+            # fixed rate, but a timer that fell behind doesn't try to catch up
+            timer.deadline = _Deadline(max(timer.deadline + timer.repeat, now), 0.0, timer.jitter)
+            if timer.deadline < now + kTickLength:
+                timer.deadline = _Deadline(now, timer.repeat, timer.jitter)
+            queue.IPush(timer)
+        else:
+            del queue.timers[timer.name]
+        queue.stats['fired'] += 1
+        try:
+            if callable(timer.target):
+                timer.target()
+            else:
+                modifier.OnTimer(timer.target)
+        except:
+            PtDebugPrint("xTimerWheel: error firing timer %s of %s" % (str(timer.name),queue.name),level=kErrorLevel)
+            traceback.print_exc()
+    # skip past cancelled timers so that we don't wake up for nothing
+    while queue.heap and queue.heap[0][2].cancelled:
+        heapq.heappop(queue.heap)
+    if queue.heap:
+        queue.IArm(queue.heap[0][0])
+    return 1
+
+def GetTimerStats(modifier=None):
+    """returns the counters of one modifier (or {class name: counters} for all of them)
+    'saved' is the number of engine callbacks that would have been registered without the wheel"""
+    if modifier is not None:
+        queues = [_GetQueue(modifier, 0)]
+    else:
+        queues = gTimerQueues.values()
+    stats = {}
+    for queue in queues:
+        if queue is None:
+            continue
+        counters = queue.stats.copy()
+        counters['pending'] = len(queue.timers)
+        counters['saved'] = counters['requests'] - counters['engineCallbacks']
+        if modifier is not None:
+            return counters
+        if queue.name in stats:
+            for key in counters.keys():
+                stats[queue.name][key] += counters[key]
+        else:
+            stats[queue.name] = counters
+    return stats
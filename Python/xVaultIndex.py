@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+""" *==LICENSE==*
+
+CyanWorlds.com Engine - MMOG client, server and tools
+Copyright (C) 2011  Cyan Worlds, Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Additional permissions under GNU GPL version 3 section 7
+
+If you modify this Program, or any covered work, by linking or
+combining it with any of RAD Game Tools Bink SDK, Autodesk 3ds Max SDK,
+NVIDIA PhysX SDK, Microsoft DirectX SDK, OpenSSL library, Independent
+JPEG Group JPEG library, Microsoft Windows Media SDK, or Apple QuickTime SDK
+(or a modified version of those libraries),
+containing parts covered by the terms of the Bink SDK EULA, 3ds Max EULA,
+PhysX SDK EULA, DirectX SDK EULA, OpenSSL and SSLeay licenses, IJG
+JPEG Library README, Windows Media SDK EULA, or QuickTime SDK EULA, the
+licensors of this Program grant you additional
+permission to convey the resulting work. Corresponding Source for a
+non-source form of such a combination shall include the source code for
+the parts of OpenSSL and IJG JPEG Library used as well as that of the covered
+work.
+
+You can contact Cyan Worlds, Inc. by email legal@cyan.com
+ or by snail mail at:
+      Cyan Worlds, Inc.
+      14617 N Newport Hwy
+      Mead, WA   99021
+
+ *==LICENSE==* """
+"""
+Module: xVaultIndex
+Age: global
+Date: October 2026
+Indexes the children of vault folders by name, node type and node ID so that
+scripts don't have to walk getChildNodeRefList() every time they look for something.
+The indexes are built the first time a folder is searched and are kept current by
+forwarding OnVaultEvent/OnVaultNotify to this module (the KI does this for everyone).
+"""
+
+from Plasma import *
+from PlasmaTypes import *
+from PlasmaVaultConstants import *
+
+# all of these upcast to a folder node and are indexed as kFolderNode
+kFolderNodeTypes = (PtVaultNodeTypes.kFolderNode, PtVaultNodeTypes.kPlayerInfoListNode, PtVaultNodeTypes.kAgeInfoListNode)
+
+# folder node ID -> FolderIndex
+gFolderIndexes = {}
+
+
+def _UpcastNode(node):
+    "returns the node upcast to its real type, its index type and its name"
+    nodeType = node.getType()
+    if nodeType in kFolderNodeTypes:
+        node = node.upcastToFolderNode()
+        return node, PtVaultNodeTypes.kFolderNode, node.folderGetName()
+    if nodeType == PtVaultNodeTypes.kChronicleNode:
+        node = node.upcastToChronicleNode()
+        return node, nodeType, node.chronicleGetName()
+    if nodeType == PtVaultNodeTypes.kAgeLinkNode:
+        node = node.upcastToAgeLinkNode()
+        info = node.getAgeInfo()
+        if info is None:
+            return node, nodeType, None
+        return node, nodeType, info.getAgeFilename()
+    if nodeType == PtVaultNodeTypes.kAgeInfoNode:
+        node = node.upcastToAgeInfoNode()
+        return node, nodeType, node.getAgeFilename()
+    if nodeType == PtVaultNodeTypes.kMarkerGameNode:
+        node = node.upcastToMarkerGameNode()
+        return node, nodeType, node.getGameName()
+    if nodeType == PtVaultNodeTypes.kTextNoteNode:
+        node = node.upcastToTextNoteNode()
+        return node, nodeType, node.noteGetTitle()
+    if nodeType == PtVaultNodeTypes.kImageNode:
+        node = node.upcastToImageNode()
+        return node, nodeType, node.imageGetTitle()
+    if nodeType == PtVaultNodeTypes.kPlayerInfoNode:
+        node = node.upcastToPlayerInfoNode()
+        return node, nodeType, node.playerGetName()
+    return node, nodeType, None
+
+
+class FolderIndex:
+    "name/type/ID hash maps over the children of a single vault folder"
+    def __init__(self, folder):
+        self.folderID = folder.getID()
+        self.folder = folder
+        self.build()
+
+    def build(self):
+        "(re)builds the maps from the folder's child ref list"
+        self.order = []     # child IDs in folder order
+        self.byID = {}      # child ID -> (upcast node, index type, name)
+        self.byType = {}    # index type -> list of child IDs
+        self.byName = {}    # (index type, lowercase name) -> list of child IDs
+        for ref in self.folder.getChildNodeRefList():
+            child = ref.getChild()
+            if child is not None:
+                self.add(child)
+
+    def add(self, child):
+        childID = child.getID()
+        if childID in self.byID:
+            self.remove(childID)
+        node, nodeType, name = _UpcastNode(child)
+        if node is None:
+            return
+        self.order.append(childID)
+        self.byID[childID] = (node, nodeType, name)
+        self.byType.setdefault(nodeType, []).append(childID)
+        if name is not None:
+            self.byName.setdefault((nodeType, name.lower()), []).append(childID)
+
+    def remove(self, childID):
+        try:
+            node, nodeType, name = self.byID.pop(childID)
+        except KeyError:
+            return
+        self.order.remove(childID)
+        self.byType[nodeType].remove(childID)
+        if name is not None:
+            ids = self.byName[(nodeType, name.lower())]
+            ids.remove(childID)
+            if not ids:
+                del self.byName[(nodeType, name.lower())]
+
+    def update(self, child):
+        "a child was saved, its name might have changed"
+        childID = child.getID()
+        try:
+            oldNode, nodeType, oldName = self.byID[childID]
+        except KeyError:
+            return
+        node, nodeType, name = _UpcastNode(child)
+        self.byID[childID] = (node, nodeType, name)
+        if name == oldName:
+            return
+        if oldName is not None:
+            ids = self.byName[(nodeType, oldName.lower())]
+            ids.remove(childID)
+            if not ids:
+                del self.byName[(nodeType, oldName.lower())]
+        if name is not None:
+            ids = self.byName.setdefault((nodeType, name.lower()), [])
+            ids.append(childID)
+            # keep same-named children in folder order so find() still returns the first one
+            if len(ids) > 1:
+                ids.sort(key=self.order.index)
+
+    def isCurrent(self):
+        "cheap check that we haven't missed an add or remove"
+        return self.folder.getChildNodeCount() == len(self.byID)
+
+    def find(self, nodeType, name, ignoreCase=0):
+        "returns the first child of the type with the name (or None)"
+        for childID in self.byName.get((nodeType, name.lower()), ()):
+            node, childType, childName = self.byID[childID]
+            if ignoreCase or childName == name:
+                return node
+        return None
+
+    def findAll(self, nodeType):
+        "returns all the children of the type, in folder order"
+        return [self.byID[childID][0] for childID in self.byType.get(nodeType, ())]
+
+    def getNode(self, childID):
+        try:
+            return self.byID[childID][0]
+        except KeyError:
+            return None
+
+
+def GetFolderIndex(folder):
+    "returns the index for a folder, building it on first use"
+    if folder is None:
+        return None
+    folderID = folder.getID()
+    index = gFolderIndexes.get(folderID)
+    if index is None or not index.isCurrent():
+        index = FolderIndex(folder)
+        # unsaved folders don't have an ID yet and can't be kept current
+        if folderID:
+            gFolderIndexes[folderID] = index
+    else:
+        index.folder = folder
+    return index
+
+def FindNode(folder, nodeType, name, ignoreCase=0):
+    "find a child of a folder by type and name (kFolderNode matches all the folder types)"
+    index = GetFolderIndex(folder)
+    if index is None:
+        return None
+    return index.find(nodeType, name, ignoreCase)
+
+def FindNodes(folder, nodeType):
+    "all children of a folder of a type"
+    index = GetFolderIndex(folder)
+    if index is None:
+        return []
+    return index.findAll(nodeType)
+
+def FindNodeByID(folder, nodeID):
+    "find a child of a folder by node ID"
+    index = GetFolderIndex(folder)
+    if index is None:
+        return None
+    return index.getNode(nodeID)
+
+def FindAgeLink(folder, ageFilename):
+    "find an age in a folder holding age links or age infos, returns the link node (or the info node if there is no link)"
+    link = FindNode(folder, PtVaultNodeTypes.kAgeLinkNode, ageFilename, ignoreCase=1)
+    if link is not None:
+        return link
+    return FindNode(folder, PtVaultNodeTypes.kAgeInfoNode, ageFilename, ignoreCase=1)
+
+def FindAgeInfo(folder, ageFilename):
+    "find an age in a folder holding age links or age infos, returns the age info node"
+    link = FindNode(folder, PtVaultNodeTypes.kAgeLinkNode, ageFilename, ignoreCase=1)
+    if link is not None:
+        return link.getAgeInfo()
+    return FindNode(folder, PtVaultNodeTypes.kAgeInfoNode, ageFilename, ignoreCase=1)
+
+def InvalidateFolder(folderID):
+    "forget the index of a folder, it will be rebuilt on next use"
+    try:
+        del gFolderIndexes[folderID]
+    except KeyError:
+        pass
+
+def InvalidateAll():
+    gFolderIndexes.clear()
+
+
+def OnVaultEvent(event, tupdata):
+    "keep the indexes current; call from the OnVaultEvent of a global script"
+    if event == PtVaultCallbackTypes.kVaultNodeRefAdded:
+        # tupdata is ( ptVaultNodeRef )
+        index = gFolderIndexes.get(tupdata[0].getParentID())
+        if index is not None:
+            child = tupdata[0].getChild()
+            if child is not None:
+                index.add(child)
+    elif event == PtVaultCallbackTypes.kVaultNodeRefRemoved:
+        # tupdata is ( childID, parentID )
+        index = gFolderIndexes.get(tupdata[1])
+        if index is not None:
+            index.remove(tupdata[0])
+    elif event == PtVaultCallbackTypes.kVaultNodeSaved:
+        # tupdata is ( ptVaultNode )
+        node = tupdata[0]
+        nodeID = node.getID()
+        for index in gFolderIndexes.values():
+            if nodeID in index.byID:
+                index.update(node)
+    elif event == PtVaultCallbackTypes.kVaultConnected or event == PtVaultCallbackTypes.kVaultDisconnected:
+        InvalidateAll()
+
+def OnVaultNotify(event, tupdata):
+    "keep the indexes current; call from the OnVaultNotify of a global script"
+    if event in (PtVaultNotifyTypes.kRegisteredOwnedAge, PtVaultNotifyTypes.kUnRegisteredOwnedAge, PtVaultNotifyTypes.kRegisteredVisitAge, PtVaultNotifyTypes.kUnRegisteredVisitAge):
+        vault = ptVault()
+        for folder in (vault.getAgesIOwnFolder(), vault.getAgesICanVisitFolder()):
+            if folder is not None:
+                InvalidateFolder(folder.getID())